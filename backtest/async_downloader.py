@@ -0,0 +1,234 @@
+"""비동기 히스토리 다운로더 — aiohttp 동시 조회 + Binance request weight 토큰 버킷
+
+심볼 × 시리즈 × 페이지 구간을 하나의 이벤트 루프에서 동시에 조회한다.
+각 누락 구간(backtest.cache.missing_ranges)은 페이지 크기 단위 윈도우로 미리 나눠
+병렬 요청하고, 한 구간의 모든 페이지가 도착하면 캐시에 병합한다.
+
+Rate limit:
+- /fapi/*         : IP당 1분 2400 weight — 응답 헤더 X-MBX-USED-WEIGHT-1M으로 버킷 보정
+- /futures/data/* : IP당 5분 1000 요청
+- fundingRate     : IP당 5분 500 요청
+429/418 응답은 Retry-After만큼 대기 후 재시도한다.
+
+base_url / fear_greed_url을 바꾸면 로컬 스텁 HTTP 서버를 대상으로 실행할 수 있다.
+"""
+import asyncio
+import time as real_time
+
+import aiohttp
+
+from backtest import cache
+from backtest.downloader import (
+    BINANCE_FUTURES_BASE, FEAR_GREED_URL,
+    _parse_kline, _parse_oi, _parse_long_short, _parse_taker, _parse_funding,
+    _parse_fear_greed, _fear_greed_limit,
+)
+
+MAX_CONCURRENCY = 8        # 동시 요청 수
+MAX_RETRIES = 3            # 429/418/네트워크 오류 재시도 횟수
+WEIGHT_SAFETY = 0.8        # 한도의 80%만 사용 (다른 프로세스/라이브 봇 몫)
+
+# limiter 키 → (용량, 윈도우 초)
+RATE_LIMITS = {
+    "fapi": (2400, 60),
+    "data": (1000, 300),
+    "funding": (500, 300),
+}
+
+# 시리즈별 요청 정의
+#   path: 엔드포인트, params: 고정 파라미터, limit: 페이지 크기, step: 행 간격(ms)
+#   weight: 요청 가중치, limiter: RATE_LIMITS 키, next: 마지막 행 → 다음 startTime
+SPECS = {
+    "klines_1m": {
+        "path": "/fapi/v1/klines", "params": {"interval": "1m"},
+        "limit": 1500, "step": 60_000, "weight": 10, "limiter": "fapi",
+        "parse": _parse_kline, "next": lambda k: int(k[0]) + 60_000,
+    },
+    "klines_5m": {
+        "path": "/fapi/v1/klines", "params": {"interval": "5m"},
+        "limit": 1500, "step": 300_000, "weight": 10, "limiter": "fapi",
+        "parse": _parse_kline, "next": lambda k: int(k[0]) + 300_000,
+    },
+    "klines_1d": {
+        "path": "/fapi/v1/klines", "params": {"interval": "1d"},
+        "limit": 1500, "step": 86_400_000, "weight": 10, "limiter": "fapi",
+        "parse": _parse_kline, "next": lambda k: int(k[0]) + 86_400_000,
+    },
+    "oi": {
+        "path": "/futures/data/openInterestHist", "params": {"period": "1h"},
+        "limit": 500, "step": 3600_000, "weight": 1, "limiter": "data",
+        "parse": _parse_oi, "next": lambda e: int(e["timestamp"]) + 3600_000,
+    },
+    "ls_ratio": {
+        "path": "/futures/data/globalLongShortAccountRatio", "params": {"period": "1h"},
+        "limit": 500, "step": 3600_000, "weight": 1, "limiter": "data",
+        "parse": _parse_long_short, "next": lambda e: int(e["timestamp"]) + 3600_000,
+    },
+    "taker": {
+        "path": "/futures/data/takerlongshortRatio", "params": {"period": "1h"},
+        "limit": 500, "step": 3600_000, "weight": 1, "limiter": "data",
+        "parse": _parse_taker, "next": lambda e: int(e["timestamp"]) + 3600_000,
+    },
+    "funding": {
+        "path": "/fapi/v1/fundingRate", "params": {},
+        "limit": 1000, "step": 8 * 3600_000, "weight": 1, "limiter": "funding",
+        "parse": _parse_funding, "next": lambda e: int(e["fundingTime"]) + 1,
+    },
+}
+
+
+class WeightLimiter:
+    """토큰 버킷 — capacity weight가 window초에 걸쳐 균등 충전"""
+
+    def __init__(self, capacity: float, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self._tokens = capacity
+        self._last = real_time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = real_time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, weight: float):
+        """weight만큼 토큰이 찰 때까지 대기 후 차감"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < weight:
+                await asyncio.sleep((weight - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= weight
+
+    def observe(self, used_weight: int, server_limit: int):
+        """서버가 보고한 사용량 반영 — 로컬 추정보다 적게 남았으면 맞춤"""
+        self._refill()
+        remaining = self.capacity - used_weight * self.capacity / server_limit
+        self._tokens = min(self._tokens, remaining)
+
+    def penalize(self, seconds: float):
+        """429/418 — seconds 동안 충전분을 소진한 것으로 처리"""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class AsyncDownloader:
+    """누락 구간 동시 다운로드 → backtest.cache 병합"""
+
+    def __init__(self, base_url: str = BINANCE_FUTURES_BASE,
+                 fear_greed_url: str = FEAR_GREED_URL,
+                 max_concurrency: int = MAX_CONCURRENCY):
+        self.base_url = base_url.rstrip("/")
+        self.fear_greed_url = fear_greed_url
+        self.max_concurrency = max_concurrency
+        self.requests = 0
+
+    async def run(self, jobs: list[tuple]) -> dict:
+        """jobs: [(symbol, series, start_ms, end_ms)] → {(symbol, series): 새로 받은 건수}"""
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+        self._limiters = {key: WeightLimiter(cap * WEIGHT_SAFETY, window)
+                          for key, (cap, window) in RATE_LIMITS.items()}
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            self._session = session
+            counts = await asyncio.gather(*(self._sync_series(*job) for job in jobs))
+        return {(job[0], job[1]): n for job, n in zip(jobs, counts)}
+
+    async def _sync_series(self, symbol: str | None, series: str,
+                           start_ms: int, end_ms: int) -> int:
+        gaps = cache.missing_ranges(symbol, series, start_ms, end_ms)
+        label = f"{symbol} {series}" if symbol else series
+        if not gaps:
+            print(f"[Download] {label}: 캐시 사용")
+            return 0
+
+        results = await asyncio.gather(
+            *(self._fetch_gap(symbol, series, a, b) for a, b in gaps),
+            return_exceptions=True,
+        )
+        total = 0
+        for (a, b), rows in zip(gaps, results):
+            if isinstance(rows, Exception):
+                # 실패 구간은 캐시에 기록하지 않음 → 다음 실행에서 재시도
+                print(f"[Download] {label} 실패: {rows}")
+                continue
+            cache.store(symbol, series, rows, a, b)
+            total += len(rows)
+
+        print(f"[Download] {label}: {total}건 (누락 구간 {len(gaps)}개)")
+        return total
+
+    async def _fetch_gap(self, symbol: str | None, series: str,
+                         start_ms: int, end_ms: int) -> list[tuple]:
+        """누락 구간 하나를 페이지 윈도우로 나눠 동시 조회"""
+        if series == "fear_greed":
+            data = await self._get(self.fear_greed_url,
+                                   {"limit": _fear_greed_limit(start_ms), "format": "json"})
+            return _parse_fear_greed(data.get("data", []), start_ms, end_ms)
+
+        spec = SPECS[series]
+        span = spec["limit"] * spec["step"]
+        windows = [(t, min(t + span, end_ms)) for t in range(start_ms, end_ms, span)]
+        pages = await asyncio.gather(
+            *(self._fetch_window(spec, symbol, a, b) for a, b in windows)
+        )
+        return [row for page in pages for row in page]
+
+    async def _fetch_window(self, spec: dict, symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+        """윈도우 하나 조회 — 한 페이지를 넘으면(간격이 step보다 촘촘한 경우) 이어서 조회"""
+        rows = []
+        current_start = start_ms
+        while current_start < end_ms:
+            params = {**spec["params"], "symbol": symbol, "startTime": current_start,
+                      "endTime": end_ms - 1, "limit": spec["limit"]}
+            data = await self._get(self.base_url + spec["path"], params,
+                                   spec["limiter"], spec["weight"])
+            if not data:
+                break
+            rows.extend(spec["parse"](entry) for entry in data)
+            if len(data) < spec["limit"]:
+                break
+            current_start = spec["next"](data[-1])
+        return rows
+
+    async def _get(self, url: str, params: dict, limiter: str = None, weight: int = 1):
+        """GET + JSON (weight 대기, 429/418 Retry-After 재시도)"""
+        for attempt in range(MAX_RETRIES + 1):
+            if limiter:
+                await self._limiters[limiter].acquire(weight)
+            async with self._sem:
+                try:
+                    async with self._session.get(url, params=params) as resp:
+                        self.requests += 1
+                        used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+                        if used and limiter == "fapi":
+                            self._limiters["fapi"].observe(int(used), RATE_LIMITS["fapi"][0])
+                        if resp.status in (429, 418):
+                            retry_after = float(resp.headers.get("Retry-After", 5))
+                            print(f"[Download] rate limit ({resp.status}) — {retry_after:.0f}초 대기")
+                            if attempt < MAX_RETRIES:
+                                if limiter:
+                                    self._limiters[limiter].penalize(retry_after)
+                                else:
+                                    await asyncio.sleep(retry_after)
+                                continue
+                        resp.raise_for_status()
+                        return await resp.json(content_type=None)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(2 ** attempt)
+        raise RuntimeError(f"재시도 초과: {url}")
+
+
+def sync_all(jobs: list[tuple], base_url: str = BINANCE_FUTURES_BASE,
+             fear_greed_url: str = FEAR_GREED_URL,
+             max_concurrency: int = MAX_CONCURRENCY) -> dict:
+    """동기 진입점 — jobs의 누락 구간을 동시 다운로드해 캐시에 병합"""
+    downloader = AsyncDownloader(base_url, fear_greed_url, max_concurrency)
+    wall_start = real_time.time()
+    counts = asyncio.run(downloader.run(jobs))
+    print(f"[Download] 비동기 조회 완료: {downloader.requests}회 요청, "
+          f"{sum(counts.values()):,}건 ({real_time.time() - wall_start:.1f}초)")
+    return counts
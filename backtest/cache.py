@@ -0,0 +1,184 @@
+"""히스토리 데이터 로컬 캐시 — 심볼/시리즈/월 단위 컬럼형 .npz 파일
+
+data/cache/{symbol}/{series}/{YYYY-MM}.npz
+    ts       : int64 타임스탬프(ms, 정렬/중복 제거)
+    <컬럼>   : float64 값 컬럼 (SERIES 정의 순서)
+    <텍스트> : 고정폭 유니코드 배열 (fear_greed classification)
+    covered  : (n, 2) int64 — 이미 조회한 [start_ms, end_ms) 구간 목록
+
+다운로더는 missing_ranges()로 아직 조회하지 않은 구간만 받아 store()로 병합하고,
+load_range()로 필요한 구간을 읽어 backtest.db를 조립한다.
+"""
+import os
+import time as real_time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backtest.config_bt import BT_CACHE_DIR
+
+# 시리즈 정의: 값 컬럼 / 텍스트 컬럼 /
+#   step: 봉 간격(ms, 캔들 — 미완성 봉 캐시 방지) / period: 발행 주기(ms, 그 외 — 미발행 구간 캐시 방지)
+SERIES = {
+    "klines_1m": {"cols": ("open", "high", "low", "close", "volume"), "step": 60_000},
+    "klines_5m": {"cols": ("open", "high", "low", "close", "volume"), "step": 300_000},
+    "klines_1d": {"cols": ("open", "high", "low", "close", "volume"), "step": 86_400_000},
+    "oi": {"cols": ("open_interest",), "period": 3_600_000},
+    "funding": {"cols": ("funding_rate",), "period": 28_800_000},
+    "ls_ratio": {"cols": ("long_short_ratio", "long_account", "short_account"),
+                 "period": 3_600_000},
+    "taker": {"cols": ("buy_sell_ratio", "buy_vol", "sell_vol"), "period": 3_600_000},
+    "fear_greed": {"cols": ("value",), "text": ("classification",), "period": 86_400_000},
+}
+
+# 심볼 무관 시리즈 저장용 디렉토리명
+GLOBAL_KEY = "_global"
+
+
+def cache_path(symbol: str | None, series: str, month: str):
+    """캐시 파일 경로 (month = 'YYYY-MM')"""
+    return BT_CACHE_DIR / (symbol or GLOBAL_KEY) / series / f"{month}.npz"
+
+
+def _month_key(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000, timezone.utc).strftime("%Y-%m")
+
+
+def _month_bounds(month: str) -> tuple[int, int]:
+    """월 [시작, 다음 달 시작) ms (UTC)"""
+    year, mon = int(month[:4]), int(month[5:])
+    start = datetime(year, mon, 1, tzinfo=timezone.utc)
+    end = datetime(year + (mon == 12), mon % 12 + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def _months(start_ms: int, end_ms: int) -> list[str]:
+    """[start_ms, end_ms)에 걸친 월 키 목록"""
+    months = []
+    t = start_ms
+    while t < end_ms:
+        month = _month_key(t)
+        months.append(month)
+        t = _month_bounds(month)[1]
+    return months
+
+
+def _merge_intervals(intervals) -> list[tuple[int, int]]:
+    """겹치거나 맞닿은 구간 병합"""
+    merged = []
+    for a, b in sorted((int(a), int(b)) for a, b in intervals if b > a):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def _subtract(start_ms: int, end_ms: int, covered) -> list[tuple[int, int]]:
+    """[start_ms, end_ms) 중 covered에 포함되지 않는 구간"""
+    gaps = []
+    t = start_ms
+    for a, b in _merge_intervals(covered):
+        if b <= t:
+            continue
+        if a >= end_ms:
+            break
+        if a > t:
+            gaps.append((t, a))
+        t = max(t, b)
+    if t < end_ms:
+        gaps.append((t, end_ms))
+    return gaps
+
+
+def _read(path) -> dict | None:
+    if not path.exists():
+        return None
+    with np.load(path) as npz:
+        return {k: npz[k] for k in npz.files}
+
+
+def _write(path, arrays: dict):
+    """임시 파일에 쓴 뒤 교체 (중단 시 기존 캐시 보존)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+
+def missing_ranges(symbol: str | None, series: str, start_ms: int, end_ms: int) -> list[tuple[int, int]]:
+    """캐시에 없는 [start, end) 구간 목록 (인접 월 구간은 하나로 병합)"""
+    gaps = []
+    for month in _months(start_ms, end_ms):
+        m_start, m_end = _month_bounds(month)
+        data = _read(cache_path(symbol, series, month))
+        covered = data["covered"] if data is not None else []
+        gaps.extend(_subtract(max(start_ms, m_start), min(end_ms, m_end), covered))
+    return _merge_intervals(gaps)
+
+
+def store(symbol: str | None, series: str, rows: list[tuple], start_ms: int, end_ms: int):
+    """[start_ms, end_ms) 조회 결과를 월별 파일에 병합
+
+    rows: (ts_ms, *값 컬럼, *텍스트 컬럼) 튜플 목록
+    캔들 시리즈는 아직 닫히지 않은 마지막 봉을 제외하고 닫힌 봉까지만 조회 완료로 기록한다.
+    그 외 시리즈는 최근 두 발행 주기(구간 시작 시각이 찍힌 값은 구간이 끝난 뒤 발행 — 아직 발행 전일
+    수 있는 구간)를 마지막으로 받은 행까지만 조회 완료로 기록한다 — 나머지는 다음 실행에서 다시 조회.
+    """
+    spec = SERIES[series]
+    cols, text = spec["cols"], spec.get("text", ())
+    if spec.get("step"):
+        end_ms = end_ms // spec["step"] * spec["step"]
+        rows = [r for r in rows if r[0] < end_ms]
+    elif spec.get("period"):
+        settled_ms = int(real_time.time() * 1000) - 2 * spec["period"]
+        if end_ms > settled_ms:
+            last_ms = max((r[0] for r in rows), default=start_ms - 1)
+            end_ms = min(end_ms, max(settled_ms, last_ms + 1))
+    if end_ms <= start_ms:
+        return
+
+    ts = np.array([r[0] for r in rows], dtype=np.int64)
+    values = {c: np.array([r[1 + i] for r in rows], dtype=np.float64) for i, c in enumerate(cols)}
+    texts = {c: np.array([r[1 + len(cols) + i] for r in rows], dtype="U32") for i, c in enumerate(text)}
+
+    for month in _months(start_ms, end_ms):
+        m_start, m_end = _month_bounds(month)
+        mask = (ts >= m_start) & (ts < m_end)
+        new = {"ts": ts[mask], **{c: v[mask] for c, v in values.items()},
+               **{c: v[mask] for c, v in texts.items()}}
+
+        path = cache_path(symbol, series, month)
+        old = _read(path)
+        covered = [(max(start_ms, m_start), min(end_ms, m_end))]
+        if old is not None:
+            covered += [tuple(c) for c in old["covered"]]
+            # 새 조회값 우선으로 병합 후 ts 기준 중복 제거
+            merged = {k: np.concatenate([new[k], old[k]]) for k in new}
+            _, idx = np.unique(merged["ts"], return_index=True)
+            new = {k: v[idx] for k, v in merged.items()}
+        else:
+            order = np.argsort(new["ts"], kind="stable")
+            new = {k: v[order] for k, v in new.items()}
+
+        new["covered"] = np.array(_merge_intervals(covered), dtype=np.int64).reshape(-1, 2)
+        _write(path, new)
+
+
+def load_range(symbol: str | None, series: str, start_ms: int, end_ms: int) -> dict:
+    """[start_ms, end_ms) 구간 배열 로드 → {"ts": ..., 컬럼: ...}"""
+    spec = SERIES[series]
+    keys = ("ts",) + spec["cols"] + spec.get("text", ())
+    parts = {k: [] for k in keys}
+    for month in _months(start_ms, end_ms):
+        data = _read(cache_path(symbol, series, month))
+        if data is None or not len(data["ts"]):
+            continue
+        mask = (data["ts"] >= start_ms) & (data["ts"] < end_ms)
+        for k in keys:
+            parts[k].append(data[k][mask])
+
+    if not parts["ts"]:
+        return {k: np.array([], dtype=np.int64 if k == "ts" else np.float64) for k in keys}
+    return {k: np.concatenate(v) for k, v in parts.items()}
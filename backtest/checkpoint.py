@@ -0,0 +1,97 @@
+"""백테스트 체크포인트 — 중단된 장기 실행을 마지막 체크포인트부터 재개
+
+data/checkpoints/{db 이름}.*
+    .db           : 체크포인트 시점 백테스트 DB 스냅샷 (sqlite backup API)
+    .state.json   : 가상 시계, 스텝 수, 엔진 last_run, _DataFeeder 커서, 엔진 캐시, equity 스냅샷
+    .buffers.pkl  : _DataFeeder 원본 버퍼 (실행 시작 시 1회 저장 — 재개 시 미삽입분 복원용)
+
+재개 시 스냅샷 DB를 실행 DB 위치로 되돌린 뒤 같은 커서에서 drip을 이어가므로
+엔진이 보는 상태는 중단 없이 실행한 경우와 같다.
+"""
+import json
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+
+from backtest.config_bt import BT_CHECKPOINT_DIR
+
+
+def checkpoint_paths(db_path: Path) -> dict:
+    """실행 DB별 체크포인트 파일 경로"""
+    stem = Path(db_path).stem
+    return {
+        "db": BT_CHECKPOINT_DIR / f"{stem}.db",
+        "state": BT_CHECKPOINT_DIR / f"{stem}.state.json",
+        "buffers": BT_CHECKPOINT_DIR / f"{stem}.buffers.pkl",
+    }
+
+
+def has_checkpoint(db_path: Path) -> bool:
+    paths = checkpoint_paths(db_path)
+    return all(p.exists() for p in paths.values())
+
+
+def checkpoint_params(db_path: Path) -> dict | None:
+    """체크포인트 실행 파라미터 (days, symbols, end_ts, event_skip) — 없으면 None"""
+    if not has_checkpoint(db_path):
+        return None
+    state = json.loads(checkpoint_paths(db_path)["state"].read_text(encoding="utf-8"))
+    return state["params"]
+
+
+def save_buffers(db_path: Path, buffers: dict):
+    """_DataFeeder 원본 버퍼 저장 (실행당 1회)"""
+    path = checkpoint_paths(db_path)["buffers"]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(buffers, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def save_checkpoint(conn: sqlite3.Connection, db_path: Path, state: dict):
+    """DB 스냅샷 + 실행 상태 저장 (state 파일을 마지막에 교체 → 중간 실패 시 이전 체크포인트 유지)"""
+    paths = checkpoint_paths(db_path)
+    paths["db"].parent.mkdir(parents=True, exist_ok=True)
+
+    conn.commit()
+    tmp_db = paths["db"].with_suffix(".db.tmp")
+    disk_conn = sqlite3.connect(str(tmp_db))
+    try:
+        conn.backup(disk_conn)
+    finally:
+        disk_conn.close()
+    os.replace(tmp_db, paths["db"])
+
+    tmp_state = paths["state"].with_suffix(".tmp")
+    tmp_state.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_state, paths["state"])
+
+
+def load_checkpoint(db_path: Path) -> tuple[dict, dict]:
+    """체크포인트 DB를 db_path로 복원하고 (state, buffers) 반환"""
+    paths = checkpoint_paths(db_path)
+    if not has_checkpoint(db_path):
+        raise FileNotFoundError(f"체크포인트 없음: {paths['state']}")
+
+    state = json.loads(paths["state"].read_text(encoding="utf-8"))
+    with open(paths["buffers"], "rb") as f:
+        buffers = pickle.load(f)
+
+    for suffix in ("-wal", "-shm"):
+        Path(str(db_path) + suffix).unlink(missing_ok=True)
+    src = sqlite3.connect(str(paths["db"]))
+    dst = sqlite3.connect(str(db_path))
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return state, buffers
+
+
+def clear_checkpoint(db_path: Path):
+    """체크포인트 파일 삭제 (정상 완료 후)"""
+    for path in checkpoint_paths(db_path).values():
+        path.unlink(missing_ok=True)
@@ -4,6 +4,63 @@ from pathlib import Path
 BT_DAYS = 90                    # 90일 백테스트 윈도우
 BT_STEP_SECONDS = 300           # 5분 단위 시간 스텝 (= 5m 캔들 간격)
 BT_DB_PATH = Path(__file__).parent.parent / "data" / "backtest.db"
+BT_CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"  # 다운로드 캐시 (심볼/시리즈/월별 .npz)
+BT_ASYNC_DOWNLOAD = True       # True: aiohttp 동시 다운로드 (request weight 토큰 버킷)
+BT_KLINES_1M = True            # True: 1분봉 다운로드 → paper L4 그리드 캔들 내부 체결 시뮬레이션
 BT_SYMBOLS = ["BTCUSDT"]       # BTC만 (속도 우선)
 BT_INITIAL_CAPITAL = 10000     # $10,000 가상 자본
 BT_LOG_INTERVAL = 86400        # 24시간 시뮬레이션마다 일별 요약 출력
+BT_IN_MEMORY = False           # True: :memory: DB에서 실행 후 디스크로 스냅샷
+BT_SNAPSHOT_INTERVAL = 0       # in-memory 체크포인트 간격 (시뮬레이션 초, 0=종료 시에만)
+BT_EVENT_SKIP = False          # True: 다음 엔진 실행 스텝으로 바로 점프 (유휴 스텝 생략 — 모든 엔진 간격 > 스텝일 때만 효과)
+BT_CHECKPOINT_INTERVAL = 7 * 86400  # 체크포인트 간격 (시뮬레이션 초, 0=비활성) — --resume으로 재개
+BT_CHECKPOINT_DIR = Path(__file__).parent.parent / "data" / "checkpoints"
+BT_PROFILE = False             # True: 엔진별 호출 수/시간/예외/SQL 수 집계 후 출력
+BT_GRID_V2 = False             # True: live_trader Grid V2 루프를 SimExchange로 함께 재생
+BT_GRID_CYCLE_SECONDS = 30     # Grid V2 재생 사이클 간격 (라이브 스케줄러와 동일)
+BT_SIM_MARKET_SLIPPAGE = 0.0002  # SimExchange 시장가 체결 슬리피지 (0.02%)
+BT_ENGINE_CACHE = False        # True: ATR/Threshold/Grid/Score 출력을 실행 간 재사용 (스윕은 기본 사용)
+BT_ENGINE_CACHE_PATH = BT_CACHE_DIR / "engine_outputs.db"
+BT_SEARCH_ETA = 3              # Successive Halving / Hyperband 승급 비율 (상위 1/eta, 기간 x eta)
+BT_SEARCH_MIN_DAYS = 7         # 첫 rung 시뮬레이션 기간 (일)
+BT_SEARCH_SEED = 0             # 조합 표본 추출 시드
+BT_DATASET_DIR = Path(__file__).parent.parent / "data" / "datasets"  # 준비된 데이터셋 템플릿 (--prepare-dataset)
+BT_MC_PATHS = 20000            # Monte Carlo 부트스트랩 경로 수
+BT_MC_TRADE_BLOCK = 1          # 거래 시퀀스 블록 길이 (1 = iid 부트스트랩)
+BT_MC_DAILY_BLOCK = 5          # 일간 수익률 블록 길이 (일, 자기상관 보존)
+BT_MC_SEED = 42                # 재현 가능한 난수 시드
+
+# 합성 청산 (downloader.generate_synthetic_liquidations) — 모델: "oi_delta" | "poisson_burst"
+BT_LIQ_MODEL = "oi_delta"      # OI 변동 휴리스틱 (기존 방식)
+BT_LIQ_SEED = 11               # 확률 모델 난수 시드
+BT_LIQ_BURST_PER_HOUR = 2.0    # poisson_burst: 중앙값 변동폭 캔들에서의 시간당 청산 건수
+BT_LIQ_BURST_VOL_EXPONENT = 2.0  # poisson_burst: 강도 = (변동폭 / 중앙값)^지수
+BT_LIQ_BURST_VOLUME_SHARE = 0.002  # poisson_burst: 건당 평균 청산 수량 (캔들 거래량 대비)
+
+# 합성 시장 생성기 (backtest.synthetic) — 오프라인 대규모 벤치마크용
+BT_SYNTH_SEED = 7
+BT_SYNTH_BASE_INTERVAL = "5m"  # 가격 경로 해상도 ("1m"이면 1분봉도 기록 — 용량 5배)
+BT_SYNTH_WARMUP_DAYS = 100     # 1h/4h/1d/1w 캔들 선행 구간 (ATR/MTF 워밍업, 다운로더와 동일)
+BT_SYNTH_CORRELATION = 0.6     # 심볼 간 시장 팩터 상관계수
+BT_SYNTH_MIN_PRICE = 10.0      # 시작가 하한 (엔진이 가격을 소수 2자리로 반올림 — 저가 심볼은 그리드가 한 점으로 붕괴)
+BT_SYNTH_MAX_PRICE = 60_000.0  # 시작가 상한 (로그 균등 분포)
+BT_SYNTH_JUMP_MEAN = -0.005    # 점프 크기 (로그 수익률) 평균
+BT_SYNTH_JUMP_STD = 0.04       # 점프 크기 표준편차
+BT_SYNTH_LIQ_PER_HOUR = 2.0    # 평상시 청산 이벤트 수 (심볼당 시간당)
+BT_SYNTH_WALLS_PER_SIDE = 10   # 오더북 스캔당 매수/매도벽 수
+# 레짐: 연율 drift/vol, 평균 지속 기간(일), 시장 점프 빈도(일당)
+BT_SYNTH_REGIMES = {
+    "bull": {"drift": 0.8, "vol": 0.55, "days": 45, "jump_rate": 0.05},
+    "bear": {"drift": -0.9, "vol": 0.75, "days": 30, "jump_rate": 0.15},
+    "range": {"drift": 0.0, "vol": 0.35, "days": 40, "jump_rate": 0.03},
+}
+
+# 엔진 실행 간격 (초) — 라이브 스케줄러와 동일
+BT_ENGINE_INTERVALS = {
+    "atr": 86400,           # 매일
+    "threshold": 300,       # 5분
+    "grid": 14400,          # 4시간
+    "score": 600,           # 10분
+    "strategy": 60,         # 1분 → step 단위로 매번
+    "paper_trader": 60,     # 1분 → step 단위로 매번
+}
@@ -1,21 +1,28 @@
 """백테스트 컨텍스트 — 라이브 시스템 의존성을 가상 시간/DB로 교체
 
+시간: 엔진/컬렉터는 루트 clock 모듈(clock.time/now/today)로 현재 시각을 읽으므로
+      clock.bind(VirtualClock)만으로 가상 시간이 적용된다 (모듈별 패치 불필요).
+
 monkey-patch 대상:
 1. db.get_connection()         → backtest.db 연결
-2. time.time()                 → clock.time()  (dynamic_threshold, macro_guard, gemini_client 등)
-3. datetime.now()              → clock.now()    (strategy_manager)
-4. date.today()                → clock.today()  (strategy_manager, paper_trader, gemini_client, cryptoquant)
-5. gemini_client.analyze_sentiment_majority() → neutral stub
-6. arkham.get_whale_direction()               → neutral stub
-7. cryptoquant.get_mvrv_signal()              → neutral stub
-8. macro_events.load_calendar()               → empty list
+2. gemini_client.analyze_sentiment_majority() → neutral stub
+3. arkham.get_whale_direction()               → neutral stub
+4. cryptoquant.get_mvrv_signal()              → neutral stub
+5. macro_events.load_calendar()               → empty list
+
+in_memory=True: backtest.db를 sqlite backup API로 :memory: DB에 복제해 실행하고,
+결과는 snapshot() 호출 시점(체크포인트)과 종료 시에만 디스크로 되돌려 쓴다.
+
+shareable=True: 다른 연결이 공유 DB를 ATTACH할 수 있도록 attach_target을 제공한다
+(전략 팬아웃 변형 연결). in_memory면 이름 있는 shared-cache 메모리 DB를 사용.
 """
+import os
 import sqlite3
 from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import patch, MagicMock
-from datetime import date, datetime
+from unittest.mock import patch
 
+import clock as clock_source
 from backtest.clock import VirtualClock
 
 
@@ -53,21 +60,23 @@ class _NoCloseConnection:
 class BacktestContext:
     """라이브 엔진을 백테스트 모드로 전환하는 컨텍스트 매니저"""
 
-    def __init__(self, clock: VirtualClock, bt_db_path: Path):
+    def __init__(self, clock: VirtualClock, bt_db_path: Path, in_memory: bool = False,
+                 shareable: bool = False):
         self.clock = clock
         self.bt_db_path = bt_db_path
+        self.in_memory = in_memory
+        self.shareable = shareable
         self._stack = ExitStack()
         # 공유 DB 연결 (매번 open/close 대신 재사용 → 대폭 속도 향상)
         self._shared_conn = None
+        # 다른 연결의 ATTACH 대상 (shareable일 때 — 파일 경로 또는 메모리 DB URI)
+        self.attach_target = None
 
     def __enter__(self):
         # ============================
         # 0. 공유 DB 연결 초기화 (즉시 — lazy 아님)
         # ============================
-        self._shared_conn = sqlite3.connect(str(self.bt_db_path))
-        self._shared_conn.execute("PRAGMA journal_mode=WAL")
-        self._shared_conn.execute("PRAGMA synchronous=NORMAL")
-        self._shared_conn.execute("PRAGMA wal_autocheckpoint=500")
+        self._shared_conn = self._open_shared_conn()
 
         # ============================
         # 1. DB 연결 패치
@@ -85,6 +94,7 @@ class BacktestContext:
             'engines.scorer',
             'engines.strategy_manager',
             'engines.paper_trader',
+            'engines.live_trader',
             'engines.gemini_client',
             'collectors.arkham',
             'collectors.cryptoquant',
@@ -94,73 +104,13 @@ class BacktestContext:
             )
 
         # ============================
-        # 2. time.time() 패치 — 각 모듈별로 패치
+        # 2. 시간 소스 — 가상 시계 바인딩
         # ============================
-        mock_time_module = MagicMock()
-        mock_time_module.time = self._mock_time
-        mock_time_module.sleep = lambda s: None  # sleep 무시
+        clock_source.bind(self.clock)
+        self._stack.callback(clock_source.reset)
 
-        # dynamic_threshold.py: import time → time.time() 사용
-        self._stack.enter_context(
-            patch('engines.dynamic_threshold.time', mock_time_module)
-        )
-
-        # macro_guard.py: import time → time.time() 사용
-        self._stack.enter_context(
-            patch('engines.macro_guard.time', mock_time_module)
-        )
-
-        # gemini_client.py: import time → time.time() 사용
-        self._stack.enter_context(
-            patch('engines.gemini_client.time', mock_time_module)
-        )
-
-        # strategy_manager.py: import time → time.time() 사용
-        self._stack.enter_context(
-            patch('engines.strategy_manager.time', mock_time_module)
-        )
-
-        # arkham.py: import time → time.time() 사용
-        self._stack.enter_context(
-            patch('collectors.arkham.time', mock_time_module)
-        )
-
-        # ============================
-        # 3. datetime 패치 — strategy_manager, gemini_client
         # ============================
-        # strategy_manager.py: from datetime import date, datetime
-        # 사용: date.today(), datetime.now(), datetime.fromisoformat()
-        mock_datetime = MagicMock(wraps=datetime)
-        mock_datetime.now = self._mock_datetime_now
-        mock_datetime.fromisoformat = datetime.fromisoformat
-        mock_datetime.fromtimestamp = datetime.fromtimestamp
-
-        self._stack.enter_context(
-            patch('engines.strategy_manager.datetime', mock_datetime)
-        )
-
-        # ============================
-        # 4. date 패치 — strategy_manager, paper_trader, gemini_client, cryptoquant
-        # ============================
-        mock_date = MagicMock(wraps=date)
-        mock_date.today = self._mock_date_today
-        mock_date.fromisoformat = date.fromisoformat
-
-        self._stack.enter_context(
-            patch('engines.strategy_manager.date', mock_date)
-        )
-        self._stack.enter_context(
-            patch('engines.paper_trader.date', mock_date)
-        )
-        self._stack.enter_context(
-            patch('engines.gemini_client.date', mock_date)
-        )
-        self._stack.enter_context(
-            patch('collectors.cryptoquant.date', mock_date)
-        )
-
-        # ============================
-        # 5. 외부 API stub — Gemini
+        # 3. 외부 API stub — Gemini
         # ============================
         self._stack.enter_context(
             patch('engines.gemini_client.analyze_sentiment_majority',
@@ -173,20 +123,15 @@ class BacktestContext:
         )
 
         # ============================
-        # 6. 외부 API stub — Whale (Arkham)
+        # 4. 외부 API stub — Whale (Arkham)
         # ============================
         self._stack.enter_context(
             patch('collectors.arkham.get_whale_direction',
                   self._stub_whale)
         )
-        # scorer.py에서 직접 import: from collectors.arkham import get_whale_direction
-        self._stack.enter_context(
-            patch('engines.scorer.get_whale_direction',
-                  self._stub_whale)
-        )
 
         # ============================
-        # 7. 외부 API stub — MVRV
+        # 5. 외부 API stub — MVRV
         # ============================
         self._stack.enter_context(
             patch('collectors.cryptoquant.get_mvrv_signal',
@@ -199,7 +144,7 @@ class BacktestContext:
         )
 
         # ============================
-        # 8-1. check_data_freshness stub — 백테스트에서는 항상 fresh
+        # 6. check_data_freshness stub — 백테스트에서는 항상 fresh
         # ============================
         self._stack.enter_context(
             patch('db.check_data_freshness', self._stub_freshness)
@@ -210,7 +155,14 @@ class BacktestContext:
         )
 
         # ============================
-        # 8. 매크로 이벤트 stub — 빈 캘린더
+        # 6-1. 최신값 레지스트리 비활성 — 엔진 캐시 재삽입 등 엔진 밖 쓰기가 있으므로 이력 테이블 직접 조회
+        # ============================
+        self._stack.enter_context(
+            patch('latest_values.ENABLED', False)
+        )
+
+        # ============================
+        # 7. 매크로 이벤트 stub — 빈 캘린더
         # ============================
         self._stack.enter_context(
             patch('collectors.macro_events.load_calendar',
@@ -224,39 +176,65 @@ class BacktestContext:
 
         return self
 
-    def __exit__(self, *args):
-        self._stack.__exit__(*args)
+    def __exit__(self, exc_type, *args):
+        self._stack.__exit__(exc_type, *args)
         if self._shared_conn:
             try:
                 self._shared_conn.commit()
+                if self.in_memory:
+                    self.snapshot()
+            except Exception as e:
+                # 최종 기록 실패 = 실행 결과 유실 — 전파 (이미 예외 전파 중이면 원래 예외 유지)
+                if exc_type is None:
+                    raise
+                print(f"[BT] 종료 시 DB 기록 실패: {e}")
+            finally:
                 self._shared_conn.close()
-            except Exception:
-                pass
-            self._shared_conn = None
+                self._shared_conn = None
+
+    def snapshot(self):
+        """in-memory DB 전체를 bt_db_path로 기록 (체크포인트). 디스크 모드에서는 commit만."""
+        self._shared_conn.commit()
+        if not self.in_memory:
+            return
+        disk_conn = sqlite3.connect(str(self.bt_db_path))
+        try:
+            self._shared_conn.backup(disk_conn)
+        finally:
+            disk_conn.close()
+
+    def _open_shared_conn(self) -> sqlite3.Connection:
+        """공유 연결 생성 — in_memory면 디스크 DB를 :memory:로 복제"""
+        if self.in_memory:
+            if self.shareable:
+                self.attach_target = f"file:bt_mem_{os.getpid()}_{id(self)}?mode=memory&cache=shared"
+                conn = sqlite3.connect(self.attach_target, uri=True)
+            else:
+                conn = sqlite3.connect(":memory:")
+            disk_conn = sqlite3.connect(str(self.bt_db_path))
+            try:
+                disk_conn.backup(conn)
+            finally:
+                disk_conn.close()
+            conn.execute("PRAGMA temp_store=MEMORY")
+            return conn
+
+        if self.shareable:
+            self.attach_target = str(self.bt_db_path)
+        conn = sqlite3.connect(str(self.bt_db_path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA wal_autocheckpoint=500")
+        return conn
 
     # ---- Patch implementations ----
 
     def _get_bt_connection(self) -> sqlite3.Connection:
         """공유 backtest.db 연결 반환 (conn.close() 호출을 무시하는 래퍼)"""
         if self._shared_conn is None:
-            self._shared_conn = sqlite3.connect(str(self.bt_db_path))
-            self._shared_conn.execute("PRAGMA journal_mode=WAL")
-            self._shared_conn.execute("PRAGMA synchronous=NORMAL")
-            self._shared_conn.execute("PRAGMA wal_autocheckpoint=500")
+            self._shared_conn = self._open_shared_conn()
         return _NoCloseConnection(self._shared_conn)
 
-    def _mock_time(self) -> float:
-        """가상 시계의 Unix timestamp 반환"""
-        return self.clock.time()
-
-    def _mock_datetime_now(self, tz=None) -> datetime:
-        """가상 시계의 datetime 반환"""
-        return self.clock.now()
-
-    def _mock_date_today(self) -> date:
-        """가상 시계의 date 반환"""
-        return self.clock.today()
-
     def _stub_gemini(self, symbol: str = None, calls: int = 3) -> dict:
         """Gemini API stub — neutral 반환"""
         return {
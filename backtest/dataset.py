@@ -0,0 +1,150 @@
+"""준비된 데이터셋 — 반복 실행용 불변 소스 DB + 실행 DB 템플릿 + 정렬된 이벤트 스트림
+
+다운로드/합성 직후의 backtest.db를 한 번 가공해 두면, 같은 데이터로 반복 실행할 때
+다운로드 / 스키마 생성 / ISO 시각 파싱 / 정렬 / DELETE를 모두 건너뛴다.
+
+data/datasets/{name}/
+    source.db      : 원본 DB 사본 (읽기 전용, 인덱스 포함 — 데이터 재생성이 필요한 스윕 조합용)
+    template.db    : _DataFeeder.load_and_clear() 직후 상태 (drip 대상 시계열 제외) — 실행마다 파일 복사
+    events.pkl     : _DataFeeder.load_buffers() 결과 (Unix 초로 변환 + 시각순 정렬된 (ts, row))
+    manifest.json  : 형식 버전 / 심볼 / 이벤트 수 / 데이터셋 지문 (엔진 캐시 키 — drip 전 전체 데이터 기준)
+"""
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import stat
+import time as real_time
+from datetime import datetime
+from pathlib import Path
+
+from backtest.config_bt import BT_DATASET_DIR, BT_DB_PATH
+from backtest.db_bt import clear_output_tables, remove_backtest_db
+from backtest.engine_cache import dataset_fingerprints
+
+# 이벤트 스트림 / 템플릿 형식 (_DataFeeder.TABLE_SPECS 변경 시 올림)
+DATASET_FORMAT = 3
+
+
+def dataset_paths(name: str) -> dict:
+    """데이터셋 파일 경로"""
+    root = BT_DATASET_DIR / name
+    return {
+        "root": root,
+        "source": root / "source.db",
+        "template": root / "template.db",
+        "events": root / "events.pkl",
+        "manifest": root / "manifest.json",
+    }
+
+
+def prepare_dataset(name: str, src_db: Path = None) -> dict:
+    """backtest.db(다운로드/합성 완료 상태)로 데이터셋 생성 — 같은 이름이 있으면 교체
+
+    Returns:
+        manifest dict
+    """
+    from backtest.runner import _DataFeeder
+
+    src_db = Path(src_db or BT_DB_PATH)
+    if not src_db.exists():
+        raise FileNotFoundError(f"원본 DB 없음: {src_db}")
+    paths = dataset_paths(name)
+    wall_start = real_time.time()
+    _remove_dataset(paths)
+    paths["root"].mkdir(parents=True)
+
+    src_conn = sqlite3.connect(str(src_db))
+    try:
+        symbols = [r[0] for r in src_conn.execute(
+            "SELECT DISTINCT symbol FROM klines ORDER BY symbol")]
+        fingerprints = dataset_fingerprints(src_conn, symbols)
+        buffers = _DataFeeder.load_buffers(src_conn)
+        for target in (paths["source"], paths["template"]):
+            _backup(src_conn, target)
+    finally:
+        src_conn.close()
+
+    # 템플릿: drip 대상 행 + 이전 실행 결과 제거 (clone_backtest_db 사본과 같은 시작 상태)
+    conn = sqlite3.connect(str(paths["template"]))
+    try:
+        _DataFeeder.clear_tables(conn)
+        clear_output_tables(conn)
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    tmp = paths["events"].with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(buffers, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, paths["events"])
+
+    manifest = {
+        "format": DATASET_FORMAT,
+        "name": paths["root"].name,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source_db": str(src_db),
+        "symbols": symbols,
+        "events": {key: len(items) for key, items in buffers.items()},
+        "fingerprints": fingerprints,
+    }
+    paths["manifest"].write_text(json.dumps(manifest, indent=2, ensure_ascii=False),
+                                 encoding="utf-8")
+    # 소스는 불변 — 실행은 항상 템플릿 사본에서
+    os.chmod(paths["source"], stat.S_IREAD)
+
+    total = sum(manifest["events"].values())
+    print(f"[Dataset] {manifest['name']}: 심볼 {len(symbols)}개 | 이벤트 {total:,}건 | "
+          f"template {paths['template'].stat().st_size / 1e6:.1f}MB | "
+          f"{real_time.time() - wall_start:.1f}초 → {paths['root']}")
+    return manifest
+
+
+def load_manifest(name: str) -> dict:
+    """데이터셋 manifest (없거나 형식이 다르면 예외)"""
+    paths = dataset_paths(name)
+    if not paths["manifest"].exists():
+        raise FileNotFoundError(f"데이터셋 없음: {paths['root']} (--prepare-dataset으로 생성)")
+    manifest = json.loads(paths["manifest"].read_text(encoding="utf-8"))
+    if manifest.get("format") != DATASET_FORMAT:
+        raise ValueError(f"데이터셋 형식 불일치: {paths['root']} "
+                         f"(v{manifest.get('format')} != v{DATASET_FORMAT}) — 다시 생성 필요")
+    return manifest
+
+
+def load_events(name: str) -> dict:
+    """이벤트 스트림 (_DataFeeder 버퍼 — 읽기 전용으로 공유)"""
+    with open(dataset_paths(name)["events"], "rb") as f:
+        return pickle.load(f)
+
+
+def clone_template(name: str, dst: Path) -> Path:
+    """실행 DB를 템플릿 사본으로 교체 (파일 복사 — 템플릿은 WAL 없는 단일 파일)"""
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    remove_backtest_db(dst)
+    shutil.copyfile(dataset_paths(name)["template"], dst)
+    return dst
+
+
+def source_db(name: str) -> Path:
+    """데이터셋 원본 DB 경로 (읽기 전용)"""
+    return dataset_paths(name)["source"]
+
+
+def _backup(src_conn: sqlite3.Connection, target: Path):
+    conn = sqlite3.connect(str(target))
+    try:
+        src_conn.backup(conn)
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
+
+def _remove_dataset(paths: dict):
+    if not paths["root"].exists():
+        return
+    if paths["source"].exists():
+        os.chmod(paths["source"], stat.S_IREAD | stat.S_IWRITE)
+    shutil.rmtree(paths["root"])
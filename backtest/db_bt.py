@@ -4,18 +4,23 @@ from pathlib import Path
 from backtest.config_bt import BT_DB_PATH
 
 
-def init_backtest_db() -> Path:
-    """backtest.db 생성 + 테이블 초기화. 기존 파일 삭제 후 재생성."""
-    if BT_DB_PATH.exists():
+def init_backtest_db(db_path: Path = None) -> Path:
+    """backtest.db 생성 + 테이블 초기화. 기존 파일 삭제 후 재생성.
+
+    Args:
+        db_path: DB 경로 (기본: BT_DB_PATH)
+    """
+    db_path = Path(db_path or BT_DB_PATH)
+    if db_path.exists():
         # WAL/SHM 파일도 함께 정리
         for suffix in ("", "-wal", "-shm"):
-            p = Path(str(BT_DB_PATH) + suffix)
+            p = Path(str(db_path) + suffix)
             try:
                 p.unlink(missing_ok=True)
             except PermissionError:
                 # 프로세스가 잡고 있으면 내용만 비움
                 if suffix == "":
-                    conn = sqlite3.connect(str(BT_DB_PATH))
+                    conn = sqlite3.connect(str(db_path))
                     for t in conn.execute(
                         "SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence'"
                     ).fetchall():
@@ -24,9 +29,9 @@ def init_backtest_db() -> Path:
                     conn.close()
         print(f"[BT-DB] 기존 backtest.db 삭제")
 
-    BT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(BT_DB_PATH))
+    conn = sqlite3.connect(str(db_path))
     conn.execute("PRAGMA journal_mode=WAL")
     c = conn.cursor()
 
@@ -283,6 +288,11 @@ def init_backtest_db() -> Path:
         CREATE INDEX IF NOT EXISTS idx_strategy_symbol
         ON strategy_state(symbol, updated_at)
     """)
+    # 심볼당 1행 (run_strategy의 ON CONFLICT(symbol) 대상 — 프로덕션 스키마와 동일)
+    c.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_strategy_symbol_unique
+        ON strategy_state(symbol)
+    """)
 
     c.execute("""
         CREATE TABLE IF NOT EXISTS signal_log (
@@ -386,10 +396,162 @@ def init_backtest_db() -> Path:
         )
     """)
 
+    # ---- MTF 분석 결과 ----
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS mtf_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            alignment_score REAL NOT NULL DEFAULT 0,
+            bias TEXT,
+            pattern_1d TEXT,
+            pattern_4h TEXT,
+            nearest_support REAL,
+            nearest_resistance REAL,
+            detail_json TEXT,
+            calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_mtf_symbol
+        ON mtf_analysis(symbol, calculated_at)
+    """)
+
+    # ---- Grid V2 재생 (SimExchange) ----
+    create_grid_v2_tables(conn)
+
     conn.commit()
     conn.close()
-    print(f"[BT-DB] backtest.db 초기화 완료: {BT_DB_PATH}")
-    return BT_DB_PATH
+    print(f"[BT-DB] backtest.db 초기화 완료: {db_path}")
+    return db_path
+
+
+def create_grid_v2_tables(conn):
+    """live_trader Grid V2 테이블 생성 (프로덕션 스키마와 동일, 기존 backtest.db에도 적용 가능)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS live_daily_pnl (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trade_date TEXT NOT NULL UNIQUE,
+            realized_pnl REAL NOT NULL DEFAULT 0,
+            unrealized_pnl REAL NOT NULL DEFAULT 0,
+            total_orders INTEGER NOT NULL DEFAULT 0,
+            circuit_breaker_hit INTEGER NOT NULL DEFAULT 0,
+            starting_balance REAL NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS grid_positions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            grid_price REAL NOT NULL,
+            status TEXT NOT NULL DEFAULT 'EMPTY',
+            direction TEXT DEFAULT NULL,
+            quantity REAL DEFAULT 0,
+            buy_fill_price REAL,
+            entry_fill_price REAL,
+            buy_order_id TEXT,
+            sell_order_id TEXT,
+            buy_client_order_id TEXT,
+            sell_client_order_id TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(symbol, grid_price)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_grid_pos_symbol
+        ON grid_positions(symbol, status)
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS grid_order_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            side TEXT NOT NULL,
+            direction TEXT DEFAULT NULL,
+            grid_price REAL NOT NULL,
+            quantity REAL NOT NULL,
+            limit_price REAL NOT NULL,
+            order_id TEXT,
+            client_order_id TEXT,
+            status TEXT NOT NULL,
+            fill_price REAL,
+            fee REAL DEFAULT 0,
+            pnl_usd REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            filled_at TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_grid_log_symbol
+        ON grid_order_log(symbol, created_at)
+    """)
+
+
+# 실행 결과 테이블 (엔진 출력 / 전략 / 페이퍼 / Grid V2 재생) — drip 대상 시계열과 별개.
+# 원본 backtest.db에서 run_backtest를 실행한 적이 있으면 이전 실행의 행이 남아 있다.
+OUTPUT_TABLES = (
+    "atr_values", "threshold_signals", "grid_configs", "ssm_scores", "mtf_analysis",
+    "strategy_state", "signal_log", "gemini_usage",
+    "paper_trades", "paper_l1_funding", "paper_l4_grid", "paper_summary",
+    "live_daily_pnl", "grid_positions", "grid_order_log",
+)
+
+
+def clear_output_tables(conn):
+    """이전 실행 결과 행 삭제 + AUTOINCREMENT 시퀀스 초기화 (새 실행이 빈 상태에서 시작)"""
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    tables = [t for t in OUTPUT_TABLES if t in existing]
+    for table in tables:
+        conn.execute(f"DELETE FROM {table}")
+    if "sqlite_sequence" in existing and tables:
+        conn.execute(
+            f"DELETE FROM sqlite_sequence WHERE name IN ({','.join(['?'] * len(tables))})",
+            tables,
+        )
+    conn.commit()
+
+
+def clone_backtest_db(src: Path, dst: Path, symbols: list = None) -> Path:
+    """실행용 backtest.db 사본 생성 (sqlite backup API — WAL 내용까지 일관되게 복사)
+
+    결과 테이블(OUTPUT_TABLES)은 비움 — 스윕/워크포워드/탐색/샤드 실행이 원본에 남은
+    이전 실행 상태(strategy_state, 페이퍼 포지션 등)에서 시작하지 않도록.
+
+    Args:
+        symbols: 지정 시 symbol 컬럼이 있는 테이블에서 해당 심볼 행만 남김 (샤드용)
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    remove_backtest_db(dst)
+    src_conn = sqlite3.connect(str(src))
+    dst_conn = sqlite3.connect(str(dst))
+    try:
+        src_conn.backup(dst_conn)
+        clear_output_tables(dst_conn)
+        if symbols:
+            placeholders = ",".join(["?"] * len(symbols))
+            tables = [r[0] for r in dst_conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence'"
+            ).fetchall()]
+            for table in tables:
+                cols = [r[1] for r in dst_conn.execute(f"PRAGMA table_info({table})")]
+                if "symbol" in cols:
+                    dst_conn.execute(
+                        f"DELETE FROM {table} WHERE symbol NOT IN ({placeholders})",
+                        symbols,
+                    )
+            dst_conn.commit()
+    finally:
+        dst_conn.close()
+        src_conn.close()
+    return dst
+
+
+def remove_backtest_db(path: Path):
+    """DB 파일 + WAL/SHM 삭제"""
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(path) + suffix).unlink(missing_ok=True)
 
 
 def get_bt_connection() -> sqlite3.Connection:
@@ -1,26 +1,39 @@
-"""백테스트용 히스토리 데이터 다운로더 — Binance REST + alternative.me"""
+"""백테스트용 히스토리 데이터 다운로더 — Binance REST + alternative.me
+
+조회 결과는 backtest.cache(data/cache/, 심볼/시리즈/월별 .npz)에 누적되며,
+이후 실행에서는 캐시에 없는 구간만 조회한 뒤 캐시에서 backtest.db를 조립한다.
+"""
+import itertools
 import time
 import sqlite3
 import requests
 from datetime import datetime, timedelta
 
-from backtest.config_bt import BT_DB_PATH, BT_DAYS, BT_SYMBOLS
+import numpy as np
+
+from backtest import cache
+from backtest.config_bt import (
+    BT_DB_PATH, BT_DAYS, BT_SYMBOLS, BT_ASYNC_DOWNLOAD, BT_KLINES_1M,
+    BT_LIQ_MODEL, BT_LIQ_SEED, BT_LIQ_BURST_PER_HOUR, BT_LIQ_BURST_VOL_EXPONENT,
+    BT_LIQ_BURST_VOLUME_SHARE,
+)
 
 BINANCE_FUTURES_BASE = "https://fapi.binance.com"
 BINANCE_DATA_BASE = "https://fapi.binance.com/futures/data"
+FEAR_GREED_URL = "https://api.alternative.me/fng/"
 
 # 요청 간 대기 (rate limit 방지)
 REQUEST_DELAY = 0.3
 
 
-def _get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(BT_DB_PATH))
+def _get_conn(db_path=None) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path or BT_DB_PATH))
     conn.execute("PRAGMA journal_mode=WAL")
     return conn
 
 
 def download_all(days: int = None):
-    """모든 히스토리 데이터 다운로드"""
+    """모든 히스토리 데이터 다운로드 — 캐시에 없는 구간만 조회 후 backtest.db 조립"""
     days = days or BT_DAYS
     end_ms = int(time.time() * 1000)
     start_ms = end_ms - (days * 86400 * 1000)
@@ -29,525 +42,597 @@ def download_all(days: int = None):
     # 30일 제한 적용
     max_data_days = 29
     data_start_ms = max(start_ms, end_ms - (max_data_days * 86400 * 1000))
+    # ATR(14)는 최소 15일 필요. 넉넉히 100일 전부터 일봉 확보
+    daily_start_ms = min(start_ms, end_ms - (100 * 86400 * 1000))
+
+    # (시리즈, 조회 시작) — OI/LS/Taker: Binance API는 최근 30일만 지원
+    ranges = {
+        "klines_5m": start_ms,
+        "klines_1d": daily_start_ms,
+        "oi": data_start_ms,
+        "funding": start_ms,  # funding은 1000개까지 OK
+        "ls_ratio": data_start_ms,
+        "taker": data_start_ms,
+    }
+    if BT_KLINES_1M:
+        ranges["klines_1m"] = start_ms  # paper L4 캔들 내부 체결용
+
+    if BT_ASYNC_DOWNLOAD:
+        # 심볼/시리즈/페이지 동시 조회 (request weight 한도 내)
+        from backtest.async_downloader import sync_all
+        jobs = [(symbol, series, series_start, end_ms)
+                for symbol in BT_SYMBOLS for series, series_start in ranges.items()]
+        jobs.append((None, "fear_greed", start_ms, end_ms))
+        print(f"\n[Download] {', '.join(BT_SYMBOLS)} ({days}일) 비동기 다운로드 시작")
+        sync_all(jobs)
+    else:
+        for symbol in BT_SYMBOLS:
+            print(f"\n{'='*50}")
+            print(f"  다운로드 시작: {symbol} ({days}일)")
+            print(f"{'='*50}")
 
-    for symbol in BT_SYMBOLS:
-        print(f"\n{'='*50}")
-        print(f"  다운로드 시작: {symbol} ({days}일)")
-        print(f"{'='*50}")
+            for series, series_start in ranges.items():
+                sync_series(symbol, series, series_start, end_ms)
 
-        download_klines_5m(symbol, start_ms, end_ms)
-        download_klines_1d(symbol, start_ms, end_ms)
-        # OI/LS/Taker: Binance API는 최근 30일만 지원
-        download_oi_history(symbol, data_start_ms, end_ms)
-        download_funding_rates(symbol, start_ms, end_ms)  # funding은 1000개까지 OK
-        download_long_short_ratio(symbol, data_start_ms, end_ms)
-        download_taker_ratio(symbol, data_start_ms, end_ms)
+        sync_series(None, "fear_greed", start_ms, end_ms)
 
-    download_fear_greed(days)
+    build_backtest_db(BT_SYMBOLS, ranges, start_ms, end_ms)
     print(f"\n[Download] 전체 다운로드 완료!")
 
 
-# ============================
-# 5분봉 (5m klines)
-# ============================
+def sync_series(symbol: str | None, series: str, start_ms: int, end_ms: int) -> int:
+    """캐시에 없는 구간만 API로 받아 캐시에 병합. 반환: 새로 받은 건수"""
+    gaps = cache.missing_ranges(symbol, series, start_ms, end_ms)
+    label = f"{symbol} {series}" if symbol else series
+    if not gaps:
+        print(f"[Download] {label}: 캐시 사용")
+        return 0
 
-def download_klines_5m(symbol: str, start_ms: int, end_ms: int):
-    """5분봉 다운로드 (limit=1500 per request)"""
-    conn = _get_conn()
     total = 0
-    current_start = start_ms
-    chunk_size = 1500  # max per request
-    interval_ms = 300_000  # 5분 = 300,000ms
-
-    while current_start < end_ms:
+    for gap_start, gap_end in gaps:
         try:
-            resp = requests.get(
-                f"{BINANCE_FUTURES_BASE}/fapi/v1/klines",
-                params={
-                    "symbol": symbol,
-                    "interval": "5m",
-                    "startTime": current_start,
-                    "limit": chunk_size,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            rows = _FETCHERS[series](symbol, gap_start, gap_end)
         except Exception as e:
-            print(f"[Download] 5m klines 실패: {e}")
-            break
+            # 실패 구간은 캐시에 기록하지 않음 → 다음 실행에서 재시도
+            print(f"[Download] {label} 실패: {e}")
+            continue
+        cache.store(symbol, series, rows, gap_start, gap_end)
+        total += len(rows)
 
-        if not data:
-            break
+    print(f"[Download] {label}: {total}건 (누락 구간 {len(gaps)}개)")
+    return total
 
-        for k in data:
-            open_time = int(k[0])
-            try:
-                conn.execute(
-                    "INSERT OR IGNORE INTO klines "
-                    "(symbol, interval, open_time, open, high, low, close, volume) "
-                    "VALUES (?, '5m', ?, ?, ?, ?, ?, ?)",
-                    (symbol, open_time,
-                     float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])),
-                )
-            except sqlite3.IntegrityError:
-                pass
-
-        total += len(data)
-        current_start = int(data[-1][0]) + interval_ms
 
-        if len(data) < chunk_size:
-            break
+def build_backtest_db(symbols: list, ranges: dict, start_ms: int, end_ms: int):
+    """캐시 → backtest.db 테이블 일괄 삽입"""
+    conn = _get_conn()
 
-        time.sleep(REQUEST_DELAY)
+    for symbol in symbols:
+        for series, interval in (("klines_5m", "5m"), ("klines_1d", "1d"), ("klines_1m", "1m")):
+            if series not in ranges:
+                continue
+            d = cache.load_range(symbol, series, ranges[series], end_ms)
+            conn.executemany(
+                "INSERT OR IGNORE INTO klines "
+                "(symbol, interval, open_time, open, high, low, close, volume) "
+                f"VALUES (?, '{interval}', ?, ?, ?, ?, ?, ?)",
+                zip([symbol] * len(d["ts"]), d["ts"].tolist(), d["open"].tolist(),
+                    d["high"].tolist(), d["low"].tolist(), d["close"].tolist(),
+                    d["volume"].tolist()),
+            )
+
+        d = cache.load_range(symbol, "oi", ranges["oi"], end_ms)
+        conn.executemany(
+            "INSERT INTO oi_snapshots (symbol, open_interest, collected_at) VALUES (?, ?, ?)",
+            [(symbol, oi, _iso(ts)) for ts, oi in zip(d["ts"].tolist(), d["open_interest"].tolist())],
+        )
+
+        d = cache.load_range(symbol, "funding", ranges["funding"], end_ms)
+        conn.executemany(
+            "INSERT INTO funding_rates (symbol, funding_rate, funding_time, collected_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(symbol, rate, ts, _iso(ts)) for ts, rate in zip(d["ts"].tolist(), d["funding_rate"].tolist())],
+        )
+
+        d = cache.load_range(symbol, "ls_ratio", ranges["ls_ratio"], end_ms)
+        conn.executemany(
+            "INSERT INTO long_short_ratios "
+            "(symbol, long_short_ratio, long_account, short_account, timestamp, collected_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(symbol, ratio, long_acc, short_acc, ts, _iso(ts))
+             for ts, ratio, long_acc, short_acc in zip(
+                 d["ts"].tolist(), d["long_short_ratio"].tolist(),
+                 d["long_account"].tolist(), d["short_account"].tolist())],
+        )
+
+        d = cache.load_range(symbol, "taker", ranges["taker"], end_ms)
+        conn.executemany(
+            "INSERT OR IGNORE INTO taker_ratio "
+            "(symbol, buy_sell_ratio, buy_vol, sell_vol, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            zip([symbol] * len(d["ts"]), d["buy_sell_ratio"].tolist(),
+                d["buy_vol"].tolist(), d["sell_vol"].tolist(), d["ts"].tolist()),
+        )
+
+    d = cache.load_range(None, "fear_greed", start_ms, end_ms)
+    conn.executemany(
+        "INSERT INTO fear_greed (value, classification, fg_timestamp, collected_at) "
+        "VALUES (?, ?, ?, ?)",
+        [(int(value), classification, ts // 1000, _iso(ts))
+         for ts, value, classification in zip(
+             d["ts"].tolist(), d["value"].tolist(), d["classification"].tolist())],
+    )
 
     conn.commit()
     conn.close()
-    print(f"[Download] {symbol} 5m klines: {total}건")
+    print(f"[Download] 캐시 → backtest.db 조립 완료")
+
+
+def _iso(ts_ms: int) -> str:
+    """ms timestamp → 로컬 ISO 문자열 (기존 collected_at 형식)"""
+    return datetime.fromtimestamp(ts_ms / 1000).isoformat()
 
 
 # ============================
-# 일봉 (1d klines)
+# 캔들 (5m / 1d klines)
 # ============================
 
-def download_klines_1d(symbol: str, start_ms: int, end_ms: int):
-    """일봉 다운로드 — ATR(14) 계산을 위해 최소 100일치 확보"""
-    conn = _get_conn()
-
-    # ATR(14)는 최소 15일 필요. 넉넉히 100일 전부터 다운로드
-    min_start = end_ms - (100 * 86400 * 1000)
-    actual_start = min(start_ms, min_start)
+def _fetch_klines(symbol: str, interval: str, interval_ms: int,
+                  start_ms: int, end_ms: int) -> list[tuple]:
+    """klines 조회 (limit=1500 per request) → (open_time, o, h, l, c, v)"""
+    rows = []
+    current_start = start_ms
+    chunk_size = 1500  # max per request
 
-    try:
+    while current_start < end_ms:
         resp = requests.get(
             f"{BINANCE_FUTURES_BASE}/fapi/v1/klines",
             params={
                 "symbol": symbol,
-                "interval": "1d",
-                "startTime": actual_start,
-                "limit": 100,
+                "interval": interval,
+                "startTime": current_start,
+                "endTime": end_ms - 1,
+                "limit": chunk_size,
             },
             timeout=30,
         )
         resp.raise_for_status()
         data = resp.json()
-    except Exception as e:
-        print(f"[Download] 1d klines 실패: {e}")
-        return
 
-    for k in data:
-        try:
-            conn.execute(
-                "INSERT OR IGNORE INTO klines "
-                "(symbol, interval, open_time, open, high, low, close, volume) "
-                "VALUES (?, '1d', ?, ?, ?, ?, ?, ?)",
-                (symbol, int(k[0]),
-                 float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])),
-            )
-        except sqlite3.IntegrityError:
-            pass
+        if not data:
+            break
 
-    conn.commit()
-    conn.close()
-    print(f"[Download] {symbol} 1d klines: {len(data)}건")
-    time.sleep(REQUEST_DELAY)
+        rows.extend(_parse_kline(k) for k in data)
 
+        current_start = int(data[-1][0]) + interval_ms
 
-# ============================
-# OI 히스토리
-# ============================
+        if len(data) < chunk_size:
+            break
 
-def download_oi_history(symbol: str, start_ms: int, end_ms: int):
-    """Open Interest 히스토리 다운로드 (1h 간격)"""
-    conn = _get_conn()
-    total = 0
-    current_start = start_ms
+        time.sleep(REQUEST_DELAY)
 
-    while current_start < end_ms:
-        try:
-            resp = requests.get(
-                f"{BINANCE_DATA_BASE}/openInterestHist",
-                params={
-                    "symbol": symbol,
-                    "period": "1h",
-                    "startTime": current_start,
-                    "limit": 500,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"[Download] OI history 실패: {e}")
-            break
+    return rows
 
-        if not data:
-            break
 
-        for entry in data:
-            ts = int(entry["timestamp"])
-            oi = float(entry["sumOpenInterest"])
-            collected_at = datetime.fromtimestamp(ts / 1000).isoformat()
-            conn.execute(
-                "INSERT INTO oi_snapshots (symbol, open_interest, collected_at) "
-                "VALUES (?, ?, ?)",
-                (symbol, oi, collected_at),
-            )
+def _parse_kline(k: list) -> tuple:
+    """kline 배열 → (open_time, o, h, l, c, v)"""
+    return (int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]))
 
-        total += len(data)
-        current_start = int(data[-1]["timestamp"]) + 3600_000  # +1h
 
-        if len(data) < 500:
-            break
+def _fetch_klines_1m(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """1분봉 — paper L4 그리드 캔들 내부 체결 시뮬레이션용"""
+    return _fetch_klines(symbol, "1m", 60_000, start_ms, end_ms)
 
-        time.sleep(REQUEST_DELAY)
 
-    conn.commit()
-    conn.close()
-    print(f"[Download] {symbol} OI history: {total}건")
+def _fetch_klines_5m(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """5분봉 (5분 = 300,000ms)"""
+    return _fetch_klines(symbol, "5m", 300_000, start_ms, end_ms)
+
+
+def _fetch_klines_1d(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """일봉 — ATR(14) 계산용"""
+    return _fetch_klines(symbol, "1d", 86_400_000, start_ms, end_ms)
 
 
 # ============================
-# 펀딩비
+# 1시간 통계 (OI / 롱숏비율 / 테이커 비율)
 # ============================
 
-def download_funding_rates(symbol: str, start_ms: int, end_ms: int):
-    """Funding rate 히스토리 다운로드"""
-    conn = _get_conn()
-    total = 0
+def _fetch_data_hist(endpoint: str, symbol: str, start_ms: int, end_ms: int,
+                     parse) -> list[tuple]:
+    """/futures/data/* 1h 히스토리 조회 (limit=500 per request)"""
+    rows = []
     current_start = start_ms
 
     while current_start < end_ms:
-        try:
-            resp = requests.get(
-                f"{BINANCE_FUTURES_BASE}/fapi/v1/fundingRate",
-                params={
-                    "symbol": symbol,
-                    "startTime": current_start,
-                    "limit": 1000,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"[Download] funding rates 실패: {e}")
-            break
+        resp = requests.get(
+            f"{BINANCE_DATA_BASE}/{endpoint}",
+            params={
+                "symbol": symbol,
+                "period": "1h",
+                "startTime": current_start,
+                "endTime": end_ms - 1,
+                "limit": 500,
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         if not data:
             break
 
-        for entry in data:
-            funding_time = int(entry["fundingTime"])
-            funding_rate = float(entry["fundingRate"])
-            collected_at = datetime.fromtimestamp(funding_time / 1000).isoformat()
-            conn.execute(
-                "INSERT INTO funding_rates (symbol, funding_rate, funding_time, collected_at) "
-                "VALUES (?, ?, ?, ?)",
-                (symbol, funding_rate, funding_time, collected_at),
-            )
-
-        total += len(data)
-        current_start = int(data[-1]["fundingTime"]) + 1
+        rows.extend(parse(entry) for entry in data)
+        current_start = int(data[-1]["timestamp"]) + 3600_000  # +1h
 
-        if len(data) < 1000:
+        if len(data) < 500:
             break
 
         time.sleep(REQUEST_DELAY)
 
-    conn.commit()
-    conn.close()
-    print(f"[Download] {symbol} funding rates: {total}건")
+    return rows
 
 
-# ============================
-# 롱숏비율
-# ============================
+def _parse_oi(e: dict) -> tuple:
+    """Open Interest → (ts, open_interest)"""
+    return (int(e["timestamp"]), float(e["sumOpenInterest"]))
 
-def download_long_short_ratio(symbol: str, start_ms: int, end_ms: int):
-    """Global Long/Short Account Ratio 히스토리"""
-    conn = _get_conn()
-    total = 0
-    current_start = start_ms
 
-    while current_start < end_ms:
-        try:
-            resp = requests.get(
-                f"{BINANCE_DATA_BASE}/globalLongShortAccountRatio",
-                params={
-                    "symbol": symbol,
-                    "period": "1h",
-                    "startTime": current_start,
-                    "limit": 500,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"[Download] L/S ratio 실패: {e}")
-            break
+def _parse_long_short(e: dict) -> tuple:
+    """Global Long/Short Account Ratio → (ts, ratio, long_account, short_account)"""
+    return (int(e["timestamp"]), float(e["longShortRatio"]),
+            float(e["longAccount"]), float(e["shortAccount"]))
 
-        if not data:
-            break
 
-        for entry in data:
-            ts = int(entry["timestamp"])
-            ratio = float(entry["longShortRatio"])
-            long_acc = float(entry["longAccount"])
-            short_acc = float(entry["shortAccount"])
-            collected_at = datetime.fromtimestamp(ts / 1000).isoformat()
-            conn.execute(
-                "INSERT INTO long_short_ratios "
-                "(symbol, long_short_ratio, long_account, short_account, timestamp, collected_at) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (symbol, ratio, long_acc, short_acc, ts, collected_at),
-            )
+def _parse_taker(e: dict) -> tuple:
+    """Taker Buy/Sell Ratio → (ts, ratio, buy_vol, sell_vol)"""
+    return (int(e["timestamp"]), float(e["buySellRatio"]),
+            float(e["buyVol"]), float(e["sellVol"]))
 
-        total += len(data)
-        current_start = int(data[-1]["timestamp"]) + 3600_000
 
-        if len(data) < 500:
-            break
+def _fetch_oi_history(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """Open Interest 히스토리"""
+    return _fetch_data_hist("openInterestHist", symbol, start_ms, end_ms, _parse_oi)
 
-        time.sleep(REQUEST_DELAY)
 
-    conn.commit()
-    conn.close()
-    print(f"[Download] {symbol} L/S ratio: {total}건")
+def _fetch_long_short_ratio(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """Global Long/Short Account Ratio 히스토리"""
+    return _fetch_data_hist("globalLongShortAccountRatio", symbol, start_ms, end_ms,
+                            _parse_long_short)
+
+
+def _fetch_taker_ratio(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """Taker Buy/Sell Ratio 히스토리"""
+    return _fetch_data_hist("takerlongshortRatio", symbol, start_ms, end_ms, _parse_taker)
 
 
 # ============================
-# 테이커 비율
+# 펀딩비
 # ============================
 
-def download_taker_ratio(symbol: str, start_ms: int, end_ms: int):
-    """Taker Buy/Sell Ratio 히스토리"""
-    conn = _get_conn()
-    total = 0
+def _parse_funding(e: dict) -> tuple:
+    """Funding rate → (funding_time, funding_rate)"""
+    return (int(e["fundingTime"]), float(e["fundingRate"]))
+
+
+def _fetch_funding_rates(symbol: str, start_ms: int, end_ms: int) -> list[tuple]:
+    """Funding rate 히스토리 → (funding_time, funding_rate)"""
+    rows = []
     current_start = start_ms
 
     while current_start < end_ms:
-        try:
-            resp = requests.get(
-                f"{BINANCE_DATA_BASE}/takerlongshortRatio",
-                params={
-                    "symbol": symbol,
-                    "period": "1h",
-                    "startTime": current_start,
-                    "limit": 500,
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"[Download] taker ratio 실패: {e}")
-            break
+        resp = requests.get(
+            f"{BINANCE_FUTURES_BASE}/fapi/v1/fundingRate",
+            params={
+                "symbol": symbol,
+                "startTime": current_start,
+                "endTime": end_ms - 1,
+                "limit": 1000,
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         if not data:
             break
 
-        for entry in data:
-            ts = int(entry["timestamp"])
-            ratio = float(entry["buySellRatio"])
-            buy_vol = float(entry["buyVol"])
-            sell_vol = float(entry["sellVol"])
-            try:
-                conn.execute(
-                    "INSERT OR IGNORE INTO taker_ratio "
-                    "(symbol, buy_sell_ratio, buy_vol, sell_vol, timestamp) "
-                    "VALUES (?, ?, ?, ?, ?)",
-                    (symbol, ratio, buy_vol, sell_vol, ts),
-                )
-            except sqlite3.IntegrityError:
-                pass
-
-        total += len(data)
-        current_start = int(data[-1]["timestamp"]) + 3600_000
+        rows.extend(_parse_funding(entry) for entry in data)
 
-        if len(data) < 500:
+        current_start = int(data[-1]["fundingTime"]) + 1
+
+        if len(data) < 1000:
             break
 
         time.sleep(REQUEST_DELAY)
 
-    conn.commit()
-    conn.close()
-    print(f"[Download] {symbol} taker ratio: {total}건")
+    return rows
 
 
 # ============================
 # Fear & Greed Index
 # ============================
 
-def download_fear_greed(days: int):
-    """Crypto Fear & Greed Index 다운로드"""
-    conn = _get_conn()
+def _fear_greed_limit(start_ms: int) -> int:
+    """alternative.me는 기간 지정이 없으므로 start_ms부터 현재까지 일수만큼 조회"""
+    return int((time.time() * 1000 - start_ms) // (86400 * 1000)) + 2
 
-    try:
-        resp = requests.get(
-            f"https://api.alternative.me/fng/",
-            params={"limit": days, "format": "json"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        data = resp.json().get("data", [])
-    except Exception as e:
-        print(f"[Download] F&G 실패: {e}")
-        return
 
+def _parse_fear_greed(data: list, start_ms: int, end_ms: int) -> list[tuple]:
+    """F&G 응답 → [start_ms, end_ms) 범위 (ts_ms, value, classification)"""
+    rows = []
     for entry in data:
-        value = int(entry["value"])
-        classification = entry["value_classification"]
-        fg_timestamp = int(entry["timestamp"])
-        collected_at = datetime.fromtimestamp(fg_timestamp).isoformat()
-
-        conn.execute(
-            "INSERT INTO fear_greed (value, classification, fg_timestamp, collected_at) "
-            "VALUES (?, ?, ?, ?)",
-            (value, classification, fg_timestamp, collected_at),
-        )
-
-    conn.commit()
-    conn.close()
-    print(f"[Download] F&G index: {len(data)}건")
+        ts_ms = int(entry["timestamp"]) * 1000
+        if start_ms <= ts_ms < end_ms:
+            rows.append((ts_ms, float(entry["value"]), entry["value_classification"]))
+    return rows
+
+
+def _fetch_fear_greed(symbol, start_ms: int, end_ms: int) -> list[tuple]:
+    """Crypto Fear & Greed Index (일 단위, 최근 N일) → (ts_ms, value, classification)"""
+    resp = requests.get(
+        FEAR_GREED_URL,
+        params={"limit": _fear_greed_limit(start_ms), "format": "json"},
+        timeout=15,
+    )
+    resp.raise_for_status()
+    return _parse_fear_greed(resp.json().get("data", []), start_ms, end_ms)
+
+
+# 시리즈 → 조회 함수 (symbol, start_ms, end_ms)
+_FETCHERS = {
+    "klines_1m": _fetch_klines_1m,
+    "klines_5m": _fetch_klines_5m,
+    "klines_1d": _fetch_klines_1d,
+    "oi": _fetch_oi_history,
+    "funding": _fetch_funding_rates,
+    "ls_ratio": _fetch_long_short_ratio,
+    "taker": _fetch_taker_ratio,
+    "fear_greed": _fetch_fear_greed,
+}
 
 
 # ============================
 # 합성 청산 데이터 생성
 # ============================
 
-def generate_synthetic_liquidations(symbols: list = None):
-    """OI 변동 기반 합성 청산 데이터 생성
+_HOUR_MS = 3_600_000
+_KLINE_5M_MS = 300_000
+_EPOCH = datetime(1970, 1, 1)
+
+
+def generate_synthetic_liquidations(symbols: list = None, model: str = None,
+                                    seed: int = None, db_path=None,
+                                    replace: bool = False) -> dict:
+    """합성 청산 데이터 생성 — OI/kline 시리즈를 배열로 한 번 읽고 모델로 이벤트 생성 후 일괄 기록
 
-    논리: 1시간 OI 변동률 > 2% → 대형 청산 이벤트 가정
-    - OI 감소 + 가격 하락 → SELL (롱 청산)
-    - OI 감소 + 가격 상승 → BUY (숏 청산)
+    Args:
+        model: LIQUIDATION_MODELS 키 (기본: BT_LIQ_MODEL)
+        seed: 확률 모델 난수 시드 (기본: BT_LIQ_SEED, 심볼별 SeedSequence 분기)
+        db_path: 대상 DB (기본: BT_DB_PATH)
+        replace: True면 심볼의 기존 청산 데이터를 지우고 다시 생성 (스윕의 모델 교체용)
+
+    Returns:
+        dict: {symbol: 생성 건수}
     """
     symbols = symbols or BT_SYMBOLS
-    conn = _get_conn()
-
-    for symbol in symbols:
-        # OI 스냅샷 (시간순)
-        oi_rows = conn.execute(
-            "SELECT open_interest, collected_at FROM oi_snapshots "
-            "WHERE symbol = ? ORDER BY collected_at ASC",
-            (symbol,),
-        ).fetchall()
-
-        if len(oi_rows) < 2:
-            print(f"[Synthetic] {symbol}: OI 데이터 부족")
+    model = model or BT_LIQ_MODEL
+    if model not in LIQUIDATION_MODELS:
+        raise ValueError(f"알 수 없는 청산 모델: {model} ({', '.join(LIQUIDATION_MODELS)})")
+    seed = BT_LIQ_SEED if seed is None else seed
+    generate = LIQUIDATION_MODELS[model]
+
+    conn = _get_conn(db_path)
+    seeds = np.random.SeedSequence(seed).spawn(len(symbols))
+    counts = {}
+
+    for symbol, sym_seed in zip(symbols, seeds):
+        events = generate(conn, symbol, np.random.default_rng(sym_seed))
+        if events is None:
             continue
 
-        # 5m kline으로 가격 조회용 캐시 구축
-        kline_rows = conn.execute(
-            "SELECT open_time, close FROM klines "
-            "WHERE symbol = ? AND interval = '5m' ORDER BY open_time ASC",
-            (symbol,),
-        ).fetchall()
+        if replace:
+            conn.execute("DELETE FROM liquidations WHERE symbol = ?", (symbol,))
+        n = len(events["trade_time"])
+        conn.executemany(
+            "INSERT INTO liquidations (symbol, side, price, qty, trade_time) "
+            "VALUES (?, ?, ?, ?, ?)",
+            zip([symbol] * n, events["side"].tolist(), events["price"].tolist(),
+                events["qty"].tolist(), events["trade_time"].tolist()),
+        )
+        conn.commit()
+        counts[symbol] = n
+        print(f"[Synthetic] {symbol}: {n}건 합성 청산 생성 ({model})")
 
-        if not kline_rows:
-            print(f"[Synthetic] {symbol}: kline 데이터 부족")
-            continue
+    conn.close()
+    return counts
 
-        # open_time(ms) → close 가격 딕셔너리
-        price_map = {int(r[0]): r[1] for r in kline_rows}
-        price_times = sorted(price_map.keys())
 
-        total_events = 0
+def _liquidations_oi_delta(conn, symbol: str, rng) -> dict | None:
+    """OI 변동 기반 청산 — 연속 OI 스냅샷 변동률 > 1% 구간을 청산 이벤트로 가정
 
-        for i in range(1, len(oi_rows)):
-            oi_now = oi_rows[i][0]
-            oi_prev = oi_rows[i - 1][0]
-            collected_at = oi_rows[i][1]
+    - OI 감소 + 가격 하락 → SELL (롱 청산) / OI 감소 + 가격 상승 → BUY (숏 청산)
+    - OI 증가 + 가격 하락 → BUY (숏 스퀴즈) / OI 증가 + 가격 상승 → SELL (롱 스퀴즈)
+    - 규모: |OI 변동| 수량을 int(|변동률| x 100)건(최소 1건)으로 나눠 1분 간격 분산
+    - 가격: 각 스냅샷 시각에 가장 가까운 5m kline 종가 (동일 거리면 이전 캔들)
+    """
+    rows = conn.execute(
+        "SELECT open_interest, collected_at FROM oi_snapshots "
+        "WHERE symbol = ? ORDER BY collected_at ASC",
+        (symbol,),
+    ).fetchall()
+    if len(rows) < 2:
+        print(f"[Synthetic] {symbol}: OI 데이터 부족")
+        return None
 
-            if oi_prev == 0:
-                continue
+    klines = _load_klines_5m(conn, symbol, ("open_time", "close"))
+    if klines is None:
+        return None
 
-            oi_delta_pct = (oi_now - oi_prev) / oi_prev
+    oi = np.array([r[0] for r in rows], dtype=np.float64)
+    ts = _iso_to_ms([r[1] for r in rows])
+    close = klines["close"]
+    price = close[_nearest_index(klines["open_time"], ts)]
+
+    oi_prev, oi_now = oi[:-1], oi[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (oi_now - oi_prev) / oi_prev
+    price_now, price_prev = price[1:], price[:-1]
+    valid = ((oi_prev != 0) & (np.abs(delta) > 0.01)
+             & (ts[1:] >= 0) & (ts[:-1] >= 0)
+             & (price_now != 0) & (price_prev != 0))
+
+    delta, price_now = delta[valid], price_now[valid]
+    price_delta = price_now - price_prev[valid]
+    ts_now = ts[1:][valid]
+    liq_qty = np.abs(oi_now - oi_prev)[valid]
+
+    sell = ((delta < 0) & (price_delta < 0)) | ((delta > 0) & (price_delta >= 0))
+    event_count = np.maximum(1, (np.abs(delta) * 100).astype(np.int64))
+    # Python round와 같은 반올림 (np.round는 최하위 자리가 다를 수 있음) — 스냅샷 단위라 소량
+    qty_per_event = np.array([round(q, 6) for q in (liq_qty / event_count).tolist()])
+
+    # 스냅샷 i → event_count[i]건, j번째 이벤트는 j분 뒤
+    idx = np.repeat(np.arange(len(delta)), event_count)
+    j = np.arange(len(idx)) - np.repeat(np.cumsum(event_count) - event_count, event_count)
+    return {
+        "side": np.where(sell, "SELL", "BUY")[idx],
+        "price": price_now[idx],
+        "qty": qty_per_event[idx],
+        "trade_time": ts_now[idx] + j * 60_000,
+    }
+
+
+def _liquidations_poisson_burst(conn, symbol: str, rng) -> dict | None:
+    """변동성 스케일 Poisson 버스트 — 5m 캔들 변동폭에 비례해 청산이 몰림 (OI 불필요)
+
+    - 강도: BT_LIQ_BURST_PER_HOUR x (캔들 변동폭 / 중앙값)^BT_LIQ_BURST_VOL_EXPONENT
+    - 방향: 하락 캔들 → SELL (롱 청산), 상승 캔들 → BUY (숏 청산), 몸통 비율이 작을수록 반대 방향 혼재
+    - 가격: 종가와 캔들 극단(SELL=저가, BUY=고가) 사이 / 수량: 캔들 거래량 x BT_LIQ_BURST_VOLUME_SHARE (로그정규)
+    """
+    klines = _load_klines_5m(conn, symbol, ("open_time", "open", "high", "low", "close", "volume"))
+    if klines is None:
+        return None
 
-            # 1% OI 변동 이상 시 합성 청산 이벤트 생성
-            if abs(oi_delta_pct) <= 0.01:
-                continue
+    open_time, close = klines["open_time"], klines["close"]
+    high, low = klines["high"], klines["low"]
+    span = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = np.where(close > 0, span / close, 0.0)
+    ref = np.median(vol[vol > 0]) if (vol > 0).any() else 0.0
+    if ref <= 0:
+        print(f"[Synthetic] {symbol}: 변동폭 데이터 부족")
+        return None
 
-            # collected_at → timestamp (ms)
-            try:
-                ts = int(datetime.fromisoformat(collected_at.replace("Z", "+00:00")).timestamp() * 1000)
-            except Exception:
-                continue
+    lam = (BT_LIQ_BURST_PER_HOUR * _KLINE_5M_MS / _HOUR_MS
+           * (vol / ref) ** BT_LIQ_BURST_VOL_EXPONENT)
+    idx = np.repeat(np.arange(len(open_time)), rng.poisson(lam))
+    n = len(idx)
+
+    down = close < klines["open"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        body = np.where(span > 0, np.abs(close - klines["open"]) / span, 0.0)
+    dominant = rng.random(n) < 0.5 + 0.5 * body[idx]
+    sell = np.where(dominant, down[idx], ~down[idx])
+
+    extreme = np.where(sell, low[idx], high[idx])
+    price = np.round(close[idx] + rng.random(n) * (extreme - close[idx]), _price_decimals(close))
+    qty = klines["volume"][idx] * BT_LIQ_BURST_VOLUME_SHARE * rng.lognormal(-0.5, 1.0, n)
+    trade_time = open_time[idx] + rng.integers(0, _KLINE_5M_MS, n)
+
+    order = np.argsort(trade_time, kind="stable")
+    return {
+        "side": np.where(sell, "SELL", "BUY")[order],
+        "price": price[order],
+        "qty": np.round(qty, 6)[order],
+        "trade_time": trade_time[order],
+    }
+
+
+# 청산 모델 레지스트리: 이름 → (conn, symbol, rng) → {side, price, qty, trade_time} 배열 (데이터 부족 시 None)
+LIQUIDATION_MODELS = {
+    "oi_delta": _liquidations_oi_delta,
+    "poisson_burst": _liquidations_poisson_burst,
+}
+
+
+def _load_klines_5m(conn, symbol: str, columns: tuple) -> dict | None:
+    """5m kline 컬럼 → {컬럼: 배열} (시간순, open_time은 int64) — 데이터가 없으면 None"""
+    rows = conn.execute(
+        f"SELECT {', '.join(columns)} FROM klines "
+        "WHERE symbol = ? AND interval = '5m' ORDER BY open_time ASC",
+        (symbol,),
+    ).fetchall()
+    if not rows:
+        print(f"[Synthetic] {symbol}: kline 데이터 부족")
+        return None
 
-            # 가장 가까운 5m kline에서 가격 가져오기
-            price = _find_nearest_price(price_times, price_map, ts)
-            if not price:
-                continue
+    flat = np.fromiter(itertools.chain.from_iterable(rows), np.float64, len(rows) * len(columns))
+    series = dict(zip(columns, flat.reshape(-1, len(columns)).T))
+    series["open_time"] = series["open_time"].astype(np.int64)
+    return series
 
-            # 이전 시점 가격
-            prev_collected_at = oi_rows[i - 1][1]
-            try:
-                prev_ts = int(datetime.fromisoformat(
-                    prev_collected_at.replace("Z", "+00:00")).timestamp() * 1000)
-            except Exception:
-                continue
 
-            prev_price = _find_nearest_price(price_times, price_map, prev_ts)
-            if not prev_price:
-                continue
+def _price_decimals(prices: np.ndarray) -> int:
+    """kline 가격의 소수 자릿수 (합성 가격을 같은 호가 단위로 반올림)"""
+    for decimals in range(9):
+        if np.allclose(prices, np.round(prices, decimals), rtol=0, atol=1e-9):
+            return decimals
+    return 8
 
-            price_delta = price - prev_price
-
-            # 방향 결정
-            if oi_delta_pct < 0 and price_delta < 0:
-                side = "SELL"  # 롱 청산
-            elif oi_delta_pct < 0 and price_delta >= 0:
-                side = "BUY"   # 숏 청산
-            elif oi_delta_pct > 0 and price_delta < 0:
-                side = "BUY"   # 숏 스퀴즈
-            else:
-                side = "SELL"  # 롱 스퀴즈
-
-            # 청산 규모 추정 (OI 변동 = 청산된 BTC 수량)
-            liq_qty_btc = abs(oi_now - oi_prev)  # BTC 단위
-
-            # 여러 건으로 분산 (현실감)
-            event_count = max(1, int(abs(oi_delta_pct) * 100))
-            qty_per_event = liq_qty_btc / event_count
-
-            for j in range(event_count):
-                trade_time = ts + (j * 60_000)  # 1분 간격으로 분산
-                conn.execute(
-                    "INSERT INTO liquidations (symbol, side, price, qty, trade_time) "
-                    "VALUES (?, ?, ?, ?, ?)",
-                    (symbol, side, price, round(qty_per_event, 6), trade_time),
-                )
-                total_events += 1
 
-        conn.commit()
-        print(f"[Synthetic] {symbol}: {total_events}건 합성 청산 생성")
+def _nearest_index(sorted_times: np.ndarray, target_ms: np.ndarray) -> np.ndarray:
+    """target별 가장 가까운 sorted_times 인덱스 (동일 거리면 이전 값)"""
+    last = len(sorted_times) - 1
+    idx = np.searchsorted(sorted_times, target_ms, side="left")
+    before = np.clip(idx - 1, 0, last)
+    after = np.clip(idx, 0, last)
+    use_before = (target_ms - sorted_times[before]) <= (sorted_times[after] - target_ms)
+    return np.where(use_before, before, after)
 
-    conn.close()
 
+def _iso_to_ms(values: list) -> np.ndarray:
+    """ISO 문자열 목록 → ms timestamp 배열 (datetime.fromisoformat().timestamp()와 동일, 파싱 실패 = -1)
 
-def _find_nearest_price(sorted_times: list, price_map: dict, target_ms: int) -> float | None:
-    """이진 탐색으로 가장 가까운 5m kline 가격 찾기"""
-    if not sorted_times:
-        return None
+    타임존 없는 문자열(_iso 형식)은 로컬 시각 — UTC로 읽은 뒤 시간 단위 로컬 오프셋을 보정.
+    """
+    out = np.full(len(values), -1, dtype=np.int64)
+    if not len(values):
+        return out
+    text = np.array([v if isinstance(v, str) else "" for v in values])
+    aware = (np.char.endswith(text, "Z") | (np.char.find(text, "+", 10) >= 0)
+             | (np.char.find(text, "-", 19) >= 0) | (text == ""))
+
+    naive = ~aware
+    try:
+        local = np.array(text[naive], dtype="datetime64[ms]").astype(np.int64)
+    except ValueError:
+        # 다른 형식이 섞여 있으면 전부 행 단위 파싱
+        naive, aware = np.zeros_like(naive), np.ones_like(aware)
+        local = np.empty(0, dtype=np.int64)
 
-    import bisect
-    idx = bisect.bisect_left(sorted_times, target_ms)
+    if len(local):
+        out[naive] = local + _local_offsets(local // _HOUR_MS)
 
-    if idx == 0:
-        return price_map[sorted_times[0]]
-    if idx >= len(sorted_times):
-        return price_map[sorted_times[-1]]
+    for i in np.flatnonzero(aware):
+        try:
+            out[i] = int(datetime.fromisoformat(values[i].replace("Z", "+00:00")).timestamp() * 1000)
+        except Exception:
+            pass
+    return out
 
-    before = sorted_times[idx - 1]
-    after = sorted_times[idx]
 
-    if (target_ms - before) <= (after - target_ms):
-        return price_map[before]
-    else:
-        return price_map[after]
+def _local_offsets(hours: np.ndarray) -> np.ndarray:
+    """로컬 시각(시간 단위) → UTC 변환 보정값(ms) — 일 단위로 계산, 오프셋이 바뀌는 날(DST)만 시간 단위"""
+    offset = lambda h: int((_EPOCH + timedelta(hours=int(h))).timestamp() * 1000) - int(h) * _HOUR_MS
 
+    days, inverse = np.unique(hours // 24, return_inverse=True)
+    start = np.array([offset(d * 24) for d in days], dtype=np.int64)
+    end = np.array([offset(d * 24 + 23) for d in days], dtype=np.int64)
+    out = start[inverse]
+    for i in np.flatnonzero((start != end)[inverse]):
+        out[i] = offset(hours[i])
+    return out
 
 if __name__ == "__main__":
     import sys, os
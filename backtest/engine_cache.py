@@ -0,0 +1,238 @@
+"""엔진 출력 캐시 — 데이터셋/엔진/파라미터/가상 시각 기준 content-addressed 재사용
+
+전략 파라미터(L2_*, L1_* 등)만 바꾸는 스윕에서 ATR / Threshold / Grid / Score 엔진의
+스텝별 출력은 실행 간 동일하다. 엔진 호출이 새로 기록한 출력 행을 저장해 두고,
+같은 키의 다음 실행에서는 엔진을 호출하지 않고 행만 다시 삽입한다
+(strategy / paper_trader만 실제 실행).
+
+data/cache/engine_outputs.db
+    engine_outputs(key, step, rows)
+    key  : sha256(데이터셋 지문, 엔진명, config 파라미터, 엔진 소스, 실행 간격, 시작 시각) — 심볼별,
+           상류 엔진(grid ← atr, score ← threshold)의 파라미터/소스/간격 포함
+    step : 시작 시각 기준 스텝 번호 (가상 시각)
+    rows : 해당 스텝에 엔진이 기록한 행 JSON (id, calculated_at 제외 — 삽입 시 DB 기본값)
+
+데이터셋 지문: 실행 시작 시점(drip 전) 입력 테이블의 심볼별 행 수 / 숫자 컬럼 합계 / 기타 컬럼 범위.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import sqlite3
+
+import config
+from backtest.config_bt import BT_ENGINE_CACHE_PATH, BT_STEP_SECONDS
+
+# 캐시 대상 엔진: 출력 테이블 / 파라미터·소스 모듈 / 상류 엔진
+ENGINE_SPECS = {
+    "atr": {
+        "table": "atr_values",
+        "modules": ("engines.atr",),
+        "deps": (),
+    },
+    "threshold": {
+        "table": "threshold_signals",
+        "modules": ("engines.dynamic_threshold",),
+        "deps": (),
+    },
+    "grid": {
+        "table": "grid_configs",
+        "modules": ("engines.grid_range",),
+        "deps": ("atr",),
+    },
+    "score": {
+        "table": "ssm_scores",
+        "modules": ("engines.scorer", "collectors.cryptoquant", "backtest.context"),
+        "deps": ("threshold",),
+    },
+}
+
+# 데이터셋 지문 대상 — 엔진이 읽는 입력 테이블 + 캐시 대상 출력 테이블의 초기 상태
+_FINGERPRINT_TABLES = (
+    "klines", "liquidations", "oi_snapshots", "funding_rates", "long_short_ratios",
+    "taker_ratio", "orderbook_walls", "fear_greed", "exchange_netflow",
+    "onchain_metrics", "mtf_analysis",
+    *(spec["table"] for spec in ENGINE_SPECS.values()),
+)
+
+# 출력 행에서 제외하는 컬럼 (재삽입 시 DB가 채움)
+_SKIP_COLUMNS = ("id", "calculated_at")
+
+# 입력 재생 규칙 (runner._DataFeeder drip 시점) — 바뀌면 같은 데이터에서도 엔진 출력이 달라지므로 올림
+# 2: 1h/4h/1d/1w 봉을 마감 시각에 삽입 (이전: 전 구간 일봉이 처음부터 DB에 있음)
+_FEED_FORMAT = 2
+
+# 미기록 항목이 이만큼 쌓이면 캐시 DB에 기록
+_FLUSH_ENTRIES = 2000
+
+
+def dataset_fingerprints(conn: sqlite3.Connection, symbols: list) -> dict:
+    """심볼별 데이터셋 지문 {symbol: sha256 hex} — 심볼 없는 테이블(fear_greed 등)은 모든 심볼에 포함"""
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    shared = hashlib.sha256()
+    per_symbol = {sym: hashlib.sha256() for sym in symbols}
+
+    for table in _FINGERPRINT_TABLES:
+        if table not in existing:
+            continue
+        info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        aggs = ["COUNT(*)"]
+        for _, name, col_type, *_ in info:
+            if name in ("id", "symbol"):
+                continue
+            if col_type.upper() in ("REAL", "INTEGER"):
+                aggs.append(f"TOTAL({name})")
+            else:
+                aggs += [f"MIN({name})", f"MAX({name})"]
+
+        if any(col[1] == "symbol" for col in info):
+            for row in conn.execute(
+                f"SELECT symbol, {', '.join(aggs)} FROM {table} GROUP BY symbol"
+            ):
+                if row[0] in per_symbol:
+                    per_symbol[row[0]].update(repr((table, *row[1:])).encode())
+        else:
+            row = conn.execute(f"SELECT {', '.join(aggs)} FROM {table}").fetchone()
+            shared.update(repr((table, *row)).encode())
+
+    return {
+        sym: hashlib.sha256((h.hexdigest() + shared.hexdigest()).encode()).hexdigest()
+        for sym, h in per_symbol.items()
+    }
+
+
+def engine_signature(name: str, intervals: dict) -> dict:
+    """엔진 출력에 영향을 주는 설정 — 모듈의 config 상수(스윕 오버라이드 반영) / 소스 해시 / 실행 간격
+
+    상류 엔진의 시그니처를 재귀적으로 포함한다.
+    """
+    spec = ENGINE_SPECS[name]
+    params, sources = {}, {}
+    for mod_name in spec["modules"]:
+        module = importlib.import_module(mod_name)
+        params[mod_name] = {
+            attr: repr(getattr(module, attr)) for attr in sorted(dir(module))
+            if attr.isupper() and attr != "SYMBOLS" and hasattr(config, attr)
+        }
+        sources[mod_name] = hashlib.sha256(inspect.getsource(module).encode()).hexdigest()
+
+    return {
+        "engine": name,
+        "interval": intervals[name],
+        "params": params,
+        "sources": sources,
+        "deps": [engine_signature(dep, intervals) for dep in spec["deps"]],
+    }
+
+
+class EngineCache:
+    """실행 1회의 엔진 출력 캐시 — wrap()으로 감싼 엔진은 캐시 적중 시 행 재삽입으로 대체
+
+    Args:
+        conn: 백테스트 공유 연결 (출력 행 조회/재삽입)
+        clock: VirtualClock (현재 스텝 번호 계산)
+        start_ts: 시뮬레이션 시작 시각 (키에 포함 — 실행 구간이 같아야 엔진 이력이 같음)
+        intervals: 엔진 실행 간격 (BT_ENGINE_INTERVALS)
+        fingerprints: 체크포인트 재개 시 저장된 지문 (없으면 conn에서 계산 — drip 전에 생성할 것)
+    """
+
+    def __init__(self, conn: sqlite3.Connection, clock, symbols: list, start_ts: float,
+                 intervals: dict, fingerprints: dict = None, path=None):
+        self._conn = conn
+        self._clock = clock
+        self._start_ts = start_ts
+        self.fingerprints = fingerprints or dataset_fingerprints(conn, symbols)
+
+        self._columns = {}
+        self._keys = {}
+        for name, spec in ENGINE_SPECS.items():
+            info = conn.execute(f"PRAGMA table_info({spec['table']})").fetchall()
+            self._columns[name] = [col[1] for col in info if col[1] not in _SKIP_COLUMNS]
+            signature = json.dumps({**engine_signature(name, intervals),
+                                    "columns": self._columns[name],
+                                    "start_ts": round(start_ts, 3),
+                                    "step_seconds": BT_STEP_SECONDS,
+                                    "feed_format": _FEED_FORMAT}, sort_keys=True)
+            for sym in symbols:
+                self._keys[(name, sym)] = hashlib.sha256(
+                    (self.fingerprints[sym] + signature).encode()).hexdigest()
+
+        path = path or BT_ENGINE_CACHE_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 스윕 워커들이 같은 캐시 DB를 공유 — WAL + 대기
+        self._store = sqlite3.connect(str(path), timeout=60)
+        self._store.execute("PRAGMA journal_mode=WAL")
+        self._store.execute(
+            "CREATE TABLE IF NOT EXISTS engine_outputs ("
+            "key TEXT NOT NULL, step INTEGER NOT NULL, rows TEXT NOT NULL, "
+            "PRIMARY KEY (key, step)) WITHOUT ROWID"
+        )
+        self._store.commit()
+
+        self._pending = []
+        self.stats = {name: {"hits": 0, "misses": 0} for name in ENGINE_SPECS}
+
+    def wrap(self, name: str, engine):
+        """engine(symbol) 호출을 캐시 조회/기록으로 감쌈 (함수명 유지 — 프로파일러 집계용)"""
+        @functools.wraps(engine)
+        def cached(symbol):
+            return self.run(name, symbol, engine)
+        return cached
+
+    def run(self, name: str, symbol: str, engine):
+        """현재 스텝의 캐시 행이 있으면 재삽입, 없으면 엔진 실행 후 새 행 기록"""
+        key = self._keys[(name, symbol)]
+        step = round((self._clock.timestamp - self._start_ts) / BT_STEP_SECONDS)
+        table = ENGINE_SPECS[name]["table"]
+        columns = self._columns[name]
+
+        hit = self._store.execute(
+            "SELECT rows FROM engine_outputs WHERE key = ? AND step = ?", (key, step),
+        ).fetchone()
+        if hit is not None:
+            rows = json.loads(hit[0])
+            if rows:
+                self._conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))})",
+                    rows,
+                )
+            self.stats[name]["hits"] += 1
+            return None
+
+        last_id = self._conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+        result = engine(symbol)
+        rows = self._conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id",
+            (last_id,),
+        ).fetchall()
+        self._pending.append((key, step, json.dumps(rows, ensure_ascii=False)))
+        self.stats[name]["misses"] += 1
+        if len(self._pending) >= _FLUSH_ENTRIES:
+            self.flush()
+        return result
+
+    def flush(self):
+        """미기록 항목을 캐시 DB에 기록 (체크포인트/종료 시)"""
+        if not self._pending:
+            return
+        self._store.executemany(
+            "INSERT OR IGNORE INTO engine_outputs (key, step, rows) VALUES (?, ?, ?)",
+            self._pending,
+        )
+        self._store.commit()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._store.close()
+
+    def print_summary(self):
+        parts = []
+        for name, s in self.stats.items():
+            total = s["hits"] + s["misses"]
+            if total:
+                parts.append(f"{name} {s['hits']:,}/{total:,}")
+        if parts:
+            print(f"[EngineCache] 적중: {' | '.join(parts)}")
@@ -0,0 +1,281 @@
+"""스텝 해상도 equity 곡선 + NumPy 성과 지표
+
+EquityCurve는 러너의 실행 스텝마다 심볼별 L1/L2(실현+미실현)/L4 누적 PnL(%, 자본 대비)을
+배열에 기록한다. 테이블마다 마지막으로 읽은 id 커서를 두고 새 행만 합산하므로
+스텝당 비용이 누적 거래 수와 무관하다 (paper_trades는 청산 전까지 커서가 머문다).
+
+curve_metrics()는 기록된 곡선 전체 해상도로 낙폭/낙폭 기간/노출도/회전율을,
+일 경계 리샘플링으로 Sharpe/Sortino/Calmar/롤링 윈도우를 계산한다.
+"""
+import numpy as np
+
+# 기록 컬럼 (ts 제외) — l2_exposure: 보유 중인 L2 비중 (LONG +, SHORT -)
+FIELDS = ("l2_realized", "l2_unrealized", "l1_pnl", "l4_pnl", "l2_exposure")
+
+# 롤링 윈도우 (일)
+ROLLING_DAYS = (7, 30)
+
+
+class EquityCurve:
+    """심볼별 스텝 해상도 PnL 곡선 (러너 공유 커넥션으로 증분 집계)"""
+
+    def __init__(self, symbols: list, capacity: int = 1024):
+        self.symbols = list(symbols)
+        self._n = {sym: 0 for sym in self.symbols}
+        self._data = {sym: np.zeros((len(FIELDS) + 1, capacity)) for sym in self.symbols}
+        # 증분 커서: 테이블별 마지막 id + 누적 합계
+        self._cursors = {sym: {"l1_id": 0, "l1_sum": 0.0, "l4_id": 0, "l4_sum": 0.0,
+                               "l2_id": 0, "l2_sum": 0.0}
+                         for sym in self.symbols}
+
+    def record(self, conn, ts: float):
+        """현재 DB 상태를 ts 시점 값으로 심볼마다 1행 기록"""
+        for sym in self.symbols:
+            self._append(sym, ts, self._read(conn, sym))
+
+    def _read(self, conn, symbol: str) -> tuple:
+        cur = self._cursors[symbol]
+
+        # L1/L4: 추가만 되는 테이블 → 새 행만 합산
+        # (+symbol: symbol 인덱스 대신 rowid 범위 검색 — 테이블이 커져도 스텝당 비용 일정)
+        last_id, pnl = conn.execute(
+            "SELECT MAX(id), COALESCE(SUM(funding_pnl_pct), 0) FROM paper_l1_funding "
+            "WHERE +symbol = ? AND id > ?",
+            (symbol, cur["l1_id"]),
+        ).fetchone()
+        if last_id is not None:
+            cur["l1_id"], cur["l1_sum"] = last_id, cur["l1_sum"] + pnl
+
+        last_id, pnl = conn.execute(
+            "SELECT MAX(id), COALESCE(SUM(pnl_pct), 0) FROM paper_l4_grid "
+            "WHERE +symbol = ? AND side = 'SELL' AND id > ?",
+            (symbol, cur["l4_id"]),
+        ).fetchone()
+        if last_id is not None:
+            cur["l4_id"], cur["l4_sum"] = last_id, cur["l4_sum"] + pnl
+
+        # L2: 청산(UPDATE)으로 상태가 바뀌므로 첫 미청산 id부터 다시 읽음
+        rows = conn.execute(
+            "SELECT id, status, direction, entry_price, entry_pct, pnl_weighted "
+            "FROM paper_trades WHERE +symbol = ? AND id >= ? ORDER BY id",
+            (symbol, cur["l2_id"]),
+        ).fetchall()
+        l2_pending = 0.0
+        open_trade = None
+        settled = True
+        for trade_id, status, direction, entry, pct, pnl_weighted in rows:
+            if status == "CLOSED":
+                if settled:
+                    cur["l2_id"] = trade_id + 1
+                    cur["l2_sum"] += pnl_weighted or 0
+                else:
+                    l2_pending += pnl_weighted or 0
+            else:
+                settled = False
+                if status == "OPEN":
+                    open_trade = (direction, entry, pct)
+
+        l2_unrealized = 0.0
+        exposure = 0.0
+        if open_trade:
+            direction, entry, pct = open_trade
+            sign = 1 if direction == "LONG" else -1
+            exposure = sign * (pct or 0)
+            price_row = conn.execute(
+                "SELECT close FROM klines WHERE symbol = ? AND interval = '5m' "
+                "ORDER BY open_time DESC LIMIT 1",
+                (symbol,),
+            ).fetchone()
+            if price_row and entry:
+                l2_unrealized = sign * (price_row[0] - entry) / entry * 100 * (pct or 0)
+
+        return (cur["l2_sum"] + l2_pending, l2_unrealized,
+                cur["l1_sum"], cur["l4_sum"], exposure)
+
+    def _append(self, symbol: str, ts: float, values: tuple):
+        data = self._data[symbol]
+        n = self._n[symbol]
+        if n == data.shape[1]:
+            data = self._data[symbol] = np.concatenate([data, np.zeros_like(data)], axis=1)
+        data[0, n] = ts
+        data[1:, n] = values
+        self._n[symbol] = n + 1
+
+    def snapshot(self, symbol: str) -> dict:
+        """마지막 기록 값 (일별 equity 스냅샷 형식)"""
+        n = self._n[symbol]
+        if n == 0:
+            return {}
+        row = dict(zip(FIELDS, self._data[symbol][1:, n - 1].tolist()))
+        snap = {k: round(row[k], 4) for k in FIELDS if k != "l2_exposure"}
+        snap["total_pnl"] = round(row["l2_realized"] + row["l2_unrealized"]
+                                  + row["l1_pnl"] + row["l4_pnl"], 4)
+        return snap
+
+    def arrays(self, symbol: str) -> dict:
+        """기록된 곡선 {ts, 각 FIELDS, total} NumPy 배열"""
+        data = self._data[symbol][:, :self._n[symbol]].copy()
+        out = {"ts": data[0], **dict(zip(FIELDS, data[1:]))}
+        out["total"] = (out["l2_realized"] + out["l2_unrealized"]
+                        + out["l1_pnl"] + out["l4_pnl"])
+        return out
+
+    def state(self) -> dict:
+        """체크포인트용 직렬화 (JSON 호환)"""
+        return {sym: {"rows": self._data[sym][:, :self._n[sym]].tolist(),
+                      "cursors": self._cursors[sym]}
+                for sym in self.symbols}
+
+    @classmethod
+    def from_state(cls, symbols: list, state: dict) -> "EquityCurve":
+        """state() 결과로 복원"""
+        curve = cls(symbols)
+        for sym in curve.symbols:
+            saved = state.get(sym)
+            if not saved:
+                continue
+            rows = np.array(saved["rows"], dtype=np.float64).reshape(len(FIELDS) + 1, -1)
+            n = rows.shape[1]
+            curve._data[sym] = np.zeros((len(FIELDS) + 1, max(n * 2, 1024)))
+            curve._data[sym][:, :n] = rows
+            curve._n[sym] = n
+            curve._cursors[sym] = dict(saved["cursors"])
+        return curve
+
+
+# ============================
+# 지표 계산 (NumPy)
+# ============================
+
+def daily_values(ts, total) -> np.ndarray:
+    """곡선을 시작 시각 기준 24시간 경계로 리샘플링 (경계 직전 마지막 값, 시작값 0 포함)"""
+    ts = np.asarray(ts, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    if not len(ts):
+        return np.zeros(1)
+    n_days = int(np.ceil((ts[-1] - ts[0]) / 86400)) or 1
+    bounds = ts[0] + np.arange(1, n_days + 1) * 86400
+    idx = np.searchsorted(ts, bounds, side="right") - 1
+    return np.concatenate([[0.0], total[np.clip(idx, 0, len(total) - 1)]])
+
+
+def sharpe_ratio(returns, risk_free: float = 0.0) -> float:
+    """Sharpe Ratio (일간 수익률, 365일 연간화)"""
+    r = np.asarray(returns, dtype=np.float64)
+    if len(r) < 2:
+        return 0.0
+    std = r.std(ddof=1)
+    if std == 0:
+        return 0.0
+    return float((r.mean() - risk_free) / std * np.sqrt(365))
+
+
+def sortino_ratio(returns, risk_free: float = 0.0) -> float | None:
+    """Sortino Ratio (하방 편차, 365일 연간화)
+
+    손실일이 없어 하방 편차가 0인데 평균 초과 수익이 양수면 None (상한 없음 — 0.0은 '우위 없음')
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    if len(r) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(r - risk_free, 0) ** 2))
+    if downside == 0:
+        return None if r.mean() > risk_free else 0.0
+    return float((r.mean() - risk_free) / downside * np.sqrt(365))
+
+
+def max_drawdown(total) -> float:
+    """최대 낙폭 (%p, 누적 PnL 기준 — 시작값 0을 고점 후보로 포함)"""
+    total = np.asarray(total, dtype=np.float64)
+    if not len(total):
+        return 0.0
+    peak = np.maximum.accumulate(np.maximum(total, 0.0))
+    return float((peak - total).max())
+
+
+def max_drawdown_duration(ts, total) -> float:
+    """최장 수중 기간 (초) — 마지막 고점 이후 경과 시간의 최대값 (진행 중 낙폭 포함)"""
+    ts = np.asarray(ts, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    if len(ts) < 2:
+        return 0.0
+    peak = np.maximum.accumulate(np.maximum(total, 0.0))
+    at_peak = total >= peak - 1e-12
+    at_peak[0] = True
+    peak_idx = np.maximum.accumulate(np.where(at_peak, np.arange(len(ts)), 0))
+    return float((ts - ts[peak_idx]).max())
+
+
+def rolling_stats(daily, window: int) -> dict:
+    """window일 롤링 수익률 최고/최저 + 롤링 Sharpe 최저/중앙값 (daily: 일 경계 누적값)"""
+    daily = np.asarray(daily, dtype=np.float64)
+    if len(daily) <= window:
+        return {}
+    window_returns = daily[window:] - daily[:-window]
+    out = {
+        "best": round(float(window_returns.max()), 4),
+        "worst": round(float(window_returns.min()), 4),
+    }
+    r = np.diff(daily)
+    if window >= 2 and len(r) >= window:
+        c1 = np.concatenate([[0.0], np.cumsum(r)])
+        c2 = np.concatenate([[0.0], np.cumsum(r * r)])
+        mean = (c1[window:] - c1[:-window]) / window
+        var = ((c2[window:] - c2[:-window]) - window * mean ** 2) / (window - 1)
+        std = np.sqrt(np.maximum(var, 0))
+        valid = std > 1e-12
+        if valid.any():
+            sharpe = mean[valid] / std[valid] * np.sqrt(365)
+            out["sharpe_min"] = round(float(sharpe.min()), 2)
+            out["sharpe_median"] = round(float(np.median(sharpe)), 2)
+    return out
+
+
+def curve_metrics(ts, total, exposure=None) -> dict:
+    """equity 곡선 → 성과 지표
+
+    Args:
+        ts: 기록 시각 (초, 오름차순)
+        total: 누적 PnL (%, 자본 대비)
+        exposure: L2 보유 비중 (부호 포함, 선택)
+
+    Returns:
+        {total_pnl, sharpe, sortino, calmar, max_drawdown, max_dd_duration_days,
+         exposure_pct, avg_exposure, turnover, rolling}
+        sortino는 하방 편차 0 + 양의 수익이면 None (리포트에 n/a)
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    daily = daily_values(ts, total)
+    returns = np.diff(daily)
+
+    total_pnl = float(total[-1]) if len(total) else 0.0
+    sortino = sortino_ratio(returns)
+    max_dd = max_drawdown(total)
+    years = max((ts[-1] - ts[0]) / (365 * 86400), 1 / 365) if len(ts) > 1 else 0
+    calmar = float(total_pnl / years / max_dd) if years and max_dd > 0 else 0.0
+
+    exposure_pct = avg_exposure = turnover = 0.0
+    if exposure is not None and len(ts) > 1:
+        signed = np.asarray(exposure, dtype=np.float64)
+        exp = np.abs(signed)
+        # 시간 가중: 각 기록 값은 다음 기록 시각까지 유지
+        dt = np.diff(ts)
+        span = dt.sum()
+        if span > 0:
+            exposure_pct = float(dt[exp[:-1] > 0].sum() / span * 100)
+            avg_exposure = float((exp[:-1] * dt).sum() / span)
+        turnover = float(np.abs(np.diff(np.concatenate([[0.0], signed]))).sum())
+
+    return {
+        "total_pnl": round(total_pnl, 4),
+        "sharpe": round(sharpe_ratio(returns), 2),
+        "sortino": None if sortino is None else round(sortino, 2),
+        "calmar": round(calmar, 2),
+        "max_drawdown": round(max_dd, 2),
+        "max_dd_duration_days": round(max_drawdown_duration(ts, total) / 86400, 2),
+        "exposure_pct": round(exposure_pct, 1),
+        "avg_exposure": round(avg_exposure, 4),
+        "turnover": round(turnover, 2),
+        "rolling": {f"{w}d": rolling_stats(daily, w) for w in ROLLING_DAYS},
+    }
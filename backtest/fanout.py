@@ -0,0 +1,216 @@
+"""전략 팬아웃 — 한 번의 데이터 패스로 K개 전략 설정을 나란히 평가
+
+drip / ATR / Threshold / Grid / Score는 스텝마다 한 번만 실행하고,
+strategy_manager / paper_trader만 변형(variant)별로 격리된 상태에서 실행한다.
+
+격리 방식:
+- 변형마다 별도 SQLite 연결 — main은 변형 전용 in-memory DB(PRIVATE_TABLES),
+  공유 백테스트 DB는 ATTACH. 한정자 없는 테이블명은 main이 우선이므로 엔진 SQL을 바꾸지 않고도
+  시장 데이터/엔진 출력은 공유하고 전략 상태만 변형별로 분리된다.
+- 변형 실행 직전에 strategy_manager / paper_trader의 get_connection, 변형 config 오버라이드,
+  전략 측 모듈 캐시를 변형 것으로 교체하고 실행 후 되돌린다.
+
+종료 시 변형별 전용 DB를 data/variants/{실행 DB}_{변형}.db로 기록한다
+(generate_report(db_path=...)가 읽는 paper_* / signal_log가 모두 들어 있음).
+"""
+import functools
+import importlib
+import sqlite3
+from pathlib import Path
+
+from backtest.config_bt import BT_DB_PATH
+from backtest.context import _NoCloseConnection
+from backtest.db_bt import remove_backtest_db
+from backtest.engine_cache import ENGINE_SPECS, engine_signature
+from backtest.equity import EquityCurve
+from backtest.sweep import DATA_OVERRIDES, apply_overrides, restore_overrides
+
+# 변형별 결과 DB 저장 위치
+VARIANT_DIR = BT_DB_PATH.parent / "variants"
+
+# 변형별로 격리되는 테이블 (strategy_manager / paper_trader가 기록)
+PRIVATE_TABLES = (
+    "strategy_state", "signal_log", "paper_trades",
+    "paper_l1_funding", "paper_l4_grid", "paper_summary",
+)
+
+# 변형별로 실행되는 엔진 (runner 간격 키)
+VARIANT_ENGINES = ("strategy", "paper_trader")
+
+# 전용 연결로 교체할 모듈 (`from db import get_connection` 로컬 참조)
+_CONNECTION_MODULES = ("engines.strategy_manager", "engines.paper_trader")
+
+# 변형별 상태로 교체할 전략 측 모듈 캐시 (모듈, 속성)
+_VARIANT_CACHES = (("engines.paper_trader", "_l4_last_1m"),)
+
+
+def shared_engine_params(intervals: dict) -> set:
+    """공유 엔진(ATR/Threshold/Grid/Score)이 읽는 config 상수 — 변형별 오버라이드 불가"""
+    names = set()
+
+    def collect(signature):
+        for params in signature["params"].values():
+            names.update(params)
+        for dep in signature["deps"]:
+            collect(dep)
+
+    for name in ENGINE_SPECS:
+        collect(engine_signature(name, intervals))
+    return names
+
+
+class StrategyFanout:
+    """K개 전략 변형의 격리된 strategy_manager / paper_trader 상태
+
+    Args:
+        conn: 백테스트 공유 연결 (팬아웃 단계 전에 commit — 변형 연결이 최신 데이터를 보도록)
+        attach_target: 변형 연결이 ATTACH할 공유 DB (파일 경로 또는 shared-cache 메모리 URI)
+        variants: 변형별 config 오버라이드 [{키: 값}, ...]
+        intervals: 엔진 실행 간격 (공유 엔진 파라미터 검증용)
+    """
+
+    def __init__(self, conn: sqlite3.Connection, attach_target: str, symbols: list,
+                 variants: list[dict], intervals: dict):
+        # 공유 엔진 입력/출력을 바꾸는 키는 변형 간 공유 불가 (별도 실행 또는 스윕 사용)
+        shared = shared_engine_params(intervals)
+        for overrides in variants:
+            clash = sorted(k for k in overrides if k in shared or k in DATA_OVERRIDES)
+            if clash:
+                raise ValueError(f"공유 엔진 파라미터는 변형별로 바꿀 수 없음: {', '.join(clash)}")
+
+        self._shared = conn
+        self.symbols = symbols
+        self.variants = [dict(v) for v in variants]
+        self.names = [f"v{i}" for i in range(len(variants))]
+
+        self._conn_modules = [importlib.import_module(m) for m in _CONNECTION_MODULES]
+        self._base_getters = [m.get_connection for m in self._conn_modules]
+        self._cache_modules = [(importlib.import_module(m), attr) for m, attr in _VARIANT_CACHES]
+
+        self._conns, self._getters, self._patches, self._caches = [], [], [], []
+        for overrides in self.variants:
+            vconn = self._open_variant(attach_target)
+            self._conns.append(vconn)
+            self._getters.append(functools.partial(_NoCloseConnection, vconn))
+
+            # (모듈, 속성, 변형 값, 기본 값) — apply_overrides로 패치 대상 확인 후 즉시 복원
+            original = apply_overrides(overrides)
+            restore_overrides(original)
+            self._patches.append([
+                (importlib.import_module(mod), name, overrides[name], value)
+                for (mod, name), value in original.items()
+            ])
+            self._caches.append([dict(getattr(m, attr)) for m, attr in self._cache_modules])
+
+        self.curves = [EquityCurve(symbols) for _ in self.variants]
+        self.snapshots = [{sym: [] for sym in symbols} for _ in self.variants]
+        self.errors = [0] * len(self.variants)
+
+    @staticmethod
+    def _open_variant(attach_target: str) -> sqlite3.Connection:
+        """변형 전용 in-memory DB + 공유 DB ATTACH (전용 테이블은 공유 DB 스키마/초기 행 복사)"""
+        vconn = sqlite3.connect(":memory:", uri=True)
+        vconn.execute("ATTACH DATABASE ? AS shared", (attach_target,))
+        placeholders = ", ".join("?" * len(PRIVATE_TABLES))
+        schema = vconn.execute(
+            f"SELECT type, sql FROM shared.sqlite_master WHERE tbl_name IN ({placeholders}) "
+            "AND sql IS NOT NULL ORDER BY type = 'index'",
+            PRIVATE_TABLES,
+        ).fetchall()
+        for _, sql in schema:
+            vconn.execute(sql)
+        for table in PRIVATE_TABLES:
+            vconn.execute(f"INSERT INTO main.{table} SELECT * FROM shared.{table}")
+        vconn.commit()
+        return vconn
+
+    def wrap(self, engine):
+        """engine(symbol)을 변형마다 격리 실행 — 한 변형의 예외가 다른 변형을 막지 않음"""
+        @functools.wraps(engine)
+        def fanned(symbol):
+            self._shared.commit()
+            first_error = None
+            for i in range(len(self.variants)):
+                self._activate(i)
+                try:
+                    engine(symbol)
+                except Exception as e:
+                    self.errors[i] += 1
+                    first_error = first_error or e
+                finally:
+                    self._deactivate(i)
+            if first_error:
+                raise first_error  # 프로파일러 예외 집계용
+        return fanned
+
+    def _activate(self, i: int):
+        for module in self._conn_modules:
+            module.get_connection = self._getters[i]
+        for module, name, value, _ in self._patches[i]:
+            setattr(module, name, value)
+        for (module, attr), value in zip(self._cache_modules, self._caches[i]):
+            setattr(module, attr, value)
+
+    def _deactivate(self, i: int):
+        # 공유 DB 잠금을 풀도록 변형 트랜잭션 종료 (shared-cache 메모리 DB는 테이블 잠금)
+        self._conns[i].commit()
+        self._caches[i] = [getattr(m, attr) for m, attr in self._cache_modules]
+        for module, getter in zip(self._conn_modules, self._base_getters):
+            module.get_connection = getter
+        for module, name, _, base in self._patches[i]:
+            setattr(module, name, base)
+        for module, attr in self._cache_modules:
+            setattr(module, attr, {})
+
+    def record(self, ts: float):
+        """변형별 스텝 해상도 equity 곡선 기록"""
+        for curve, vconn in zip(self.curves, self._conns):
+            curve.record(vconn, ts)
+
+    def daily_snapshot(self, date: str, ts: float):
+        """변형별 일별 equity 스냅샷 (runner 일별 로그 시점)"""
+        for curve, snapshots in zip(self.curves, self.snapshots):
+            for sym in self.symbols:
+                equity = curve.snapshot(sym)
+                if equity:
+                    snapshots[sym].append({"date": date, "timestamp": ts, **equity})
+
+    def finish(self, db_path) -> dict:
+        """변형별 전용 DB를 VARIANT_DIR에 기록하고 결과 반환
+
+        Returns:
+            {변형명: {"params": 오버라이드, "db_path": Path, "errors": 예외 수,
+                     "results": {symbol: {equity_snapshots, equity_curve}}}}
+        """
+        VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+        out = {}
+        for i, name in enumerate(self.names):
+            path = VARIANT_DIR / f"{Path(db_path).stem}_{name}.db"
+            remove_backtest_db(path)
+            disk = sqlite3.connect(str(path))
+            try:
+                self._conns[i].backup(disk)
+            finally:
+                disk.close()
+            out[name] = {
+                "params": self.variants[i],
+                "db_path": path,
+                "errors": self.errors[i],
+                "results": {
+                    sym: {"equity_snapshots": self.snapshots[i][sym],
+                          "equity_curve": self.curves[i].arrays(sym)}
+                    for sym in self.symbols
+                },
+            }
+        return out
+
+    def close(self):
+        for vconn in self._conns:
+            vconn.close()
+        self._conns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
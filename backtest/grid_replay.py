@@ -0,0 +1,164 @@
+"""Grid V2 재생 — engines.live_trader 루프를 SimExchange 위에서 가상 시간 30초 사이클로 실행
+
+러너의 5분 스텝마다 새로 들어온 5m 캔들을 O→L→H→C(양봉) / O→H→L→C(음봉) 경로로 펼쳐
+BT_GRID_CYCLE_SECONDS 간격 서브 사이클로 나눈다. 각 서브 사이클에서
+1) 가상 시계를 서브 사이클 시각으로 이동
+2) 직전 사이클 이후 지나간 가격 구간으로 대기 주문 체결 (SimExchange.match)
+3) live_trader.run_live_trader() 실행 — 체결 감지/working window/reconcile/L2 전환까지 라이브 코드 그대로
+
+grid_configs / strategy_state(l4_active)는 러너의 엔진이 같은 시뮬레이션 시간에 기록한 값을 읽는다.
+"""
+from unittest.mock import patch
+
+import numpy as np
+
+from backtest.config_bt import BT_GRID_CYCLE_SECONDS
+from backtest.db_bt import create_grid_v2_tables
+from backtest.sim_exchange import SimExchange
+
+# 재생 시작 시 초기화할 live_trader 모듈 상태
+_LIVE_STATE = [
+    "_initialized_symbols", "_oob_since", "_price_history", "_active_grid_id",
+    "_active_levels", "_active_spacing", "_grid_db_initialized", "_direction_bias",
+    "_current_mode", "_l2_entry_price", "_l2_direction", "_l2_entry_time",
+    "_l2_highest_pnl", "_l2_quantity", "_reconcile_skip_count", "_reconcile_skip_time",
+]
+
+
+def candle_path(o: float, h: float, l: float, c: float) -> tuple[np.ndarray, np.ndarray]:
+    """캔들 내부 가격 경로 (시간 비율 0~1, 가격) — 양봉은 저가 먼저, 음봉은 고가 먼저"""
+    t = np.array([0.0, 1 / 3, 2 / 3, 1.0])
+    if c >= o:
+        return t, np.array([o, l, h, c])
+    return t, np.array([o, h, l, c])
+
+
+def path_segments(t: np.ndarray, p: np.ndarray, cuts: np.ndarray) -> tuple[np.ndarray, ...]:
+    """경로를 cuts(시간 비율) 구간으로 나눠 구간별 (저가, 고가, 종료가) 배열 반환"""
+    ends = np.interp(cuts, t, p)
+    starts = np.concatenate([[p[0]], ends[:-1]])
+    lows = np.minimum(starts, ends)
+    highs = np.maximum(starts, ends)
+    # 구간 안에 들어간 경로 꼭짓점(고가/저가) 반영
+    prev_cuts = np.concatenate([[0.0], cuts[:-1]])
+    for tv, pv in zip(t[1:-1], p[1:-1]):
+        inside = (prev_cuts < tv) & (tv <= cuts)
+        lows = np.where(inside, np.minimum(lows, pv), lows)
+        highs = np.where(inside, np.maximum(highs, pv), highs)
+    return lows, highs, ends
+
+
+class GridReplay:
+    """러너 스텝에 붙는 Grid V2 재생기 (BacktestContext 안에서 사용)"""
+
+    def __init__(self, conn, clock, symbols: list,
+                 exchange: SimExchange = None,
+                 cycle_seconds: int = BT_GRID_CYCLE_SECONDS):
+        self.conn = conn
+        self.clock = clock
+        self.symbols = symbols
+        self.exchange = exchange or SimExchange()
+        self.cycle_seconds = cycle_seconds
+        self.cycles = 0
+        self.candles = 0
+        self._patches = []
+
+    def __enter__(self):
+        import engines.live_trader as live_trader
+
+        create_grid_v2_tables(self.conn)
+        for name in _LIVE_STATE:
+            getattr(live_trader, name).clear()
+        live_trader._balance_ok = False
+
+        self._patches = [
+            patch.object(live_trader, "_executor", self.exchange),
+            patch.object(live_trader, "LIVE_TRADING_ENABLED", True),
+            patch.object(live_trader, "LIVE_SYMBOLS", list(self.symbols)),
+            patch.object(live_trader, "_send_telegram", lambda message: None),
+        ]
+        for p in self._patches:
+            p.start()
+        self._run_live_trader = live_trader.run_live_trader
+        return self
+
+    def __exit__(self, *args):
+        for p in reversed(self._patches):
+            p.stop()
+        self._patches = []
+
+    def step(self, prev_ts: float, current_ts: float):
+        """(prev_ts, current_ts]에 새로 들어온 5m 캔들을 서브 사이클로 재생"""
+        candles = {}
+        for sym in self.symbols:
+            candles[sym] = self.conn.execute(
+                "SELECT open_time, open, high, low, close FROM klines "
+                "WHERE symbol = ? AND interval = '5m' AND open_time > ? AND open_time <= ? "
+                "ORDER BY open_time",
+                (sym, int(prev_ts * 1000), int(current_ts * 1000)),
+            ).fetchall()
+
+        n_candles = max((len(c) for c in candles.values()), default=0)
+        if n_candles == 0:
+            return
+
+        # 스텝 구간을 캔들 수만큼 나눠 캔들마다 같은 서브 사이클 수로 재생
+        span = (current_ts - prev_ts) / n_candles
+        n_cycles = max(1, int(round(span / self.cycle_seconds)))
+        cuts = np.arange(1, n_cycles + 1) / n_cycles
+
+        segments = {}
+        for sym, rows in candles.items():
+            segments[sym] = []
+            for _, o, h, l, c in rows:
+                segments[sym].append(path_segments(*candle_path(o, h, l, c), cuts))
+            if rows and self.exchange.get_mark_price(sym) is None:
+                self.exchange.set_mark(sym, rows[0][1])
+
+        try:
+            for ci in range(n_candles):
+                for k in range(n_cycles):
+                    self.clock.advance(prev_ts + span * (ci + cuts[k]) - self.clock.timestamp)
+                    for sym, segs in segments.items():
+                        if ci < len(segs):
+                            lows, highs, ends = segs[ci]
+                            self.exchange.match(sym, lows[k], highs[k], ends[k])
+                    self._run_live_trader()
+                    self.cycles += 1
+                self.candles += 1
+        finally:
+            # 러너 시계를 스텝 시각으로 복귀 (예외/부동소수 누적 오차와 무관하게)
+            self.clock.advance(current_ts - self.clock.timestamp)
+
+    def summary(self) -> dict:
+        """재생 결과 집계 (SimExchange 결과 + 사이클 수 + 주문 로그)"""
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*), COALESCE(SUM(pnl_usd), 0) FROM grid_order_log "
+            "GROUP BY status"
+        ).fetchall()
+        return {
+            **self.exchange.summary(),
+            "cycles": self.cycles,
+            "cycle_seconds": self.cycle_seconds,
+            "candles": self.candles,
+            "order_log": {status: {"count": n, "pnl_usd": round(pnl, 4)}
+                          for status, n, pnl in rows},
+        }
+
+
+def print_replay_summary(s: dict):
+    """GridReplay.summary() 결과 출력"""
+    print(f"\n{'='*60}")
+    print(f"  GRID V2 REPLAY (SimExchange)")
+    print(f"{'='*60}")
+    print(f"  사이클: {s['cycles']:,}회 ({s['cycle_seconds']}초) | 캔들: {s['candles']:,}개")
+    print(f"  잔고: ${s['initial_balance']:,.2f} → 지갑 ${s['wallet_balance']:,.2f} "
+          f"/ 평가 ${s['equity']:,.2f} ({s['return_pct']:+.2f}%)")
+    print(f"  실현 손익: ${s['realized_pnl']:+,.2f} | 수수료: ${s['fees_paid']:,.2f}")
+    print(f"  체결: maker {s['maker_fills']:,} / taker {s['taker_fills']:,} | "
+          f"거절 {s['rejected']:,} | 미체결 {s['open_orders']:,}")
+    for status, v in s["order_log"].items():
+        print(f"  [grid_order_log] {status:<10} {v['count']:>6,}건  PnL ${v['pnl_usd']:+,.2f}")
+    if s["positions"]:
+        print(f"  잔여 포지션: {s['positions']}")
+    print(f"{'='*60}")
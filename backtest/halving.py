@@ -0,0 +1,225 @@
+"""적응형 파라미터 탐색 — Successive Halving / Hyperband
+
+전체 그리드를 매번 전 구간(BT_DAYS) 실행하는 대신, 후보 설정을 히스토리 앞부분의 짧은 구간에서
+먼저 실행하고 상위 1/eta만 더 긴 구간(x eta)으로 승급시킨다. 지는 설정은 몇 주 분량의
+시뮬레이션 후 제거되므로 전체 계산량이 조합 수 x 전체 기간보다 크게 줄어든다.
+
+모든 rung은 같은 시작 시각(히스토리 시작)에서 출발하는 앞부분 구간이므로
+엔진 캐시(backtest.engine_cache)는 짧은 rung의 스텝을 긴 rung에서 그대로 재사용한다.
+개별 실행은 스윕 워커(backtest.sweep._run_one)와 동일 — 실행별 DB 사본 + config 오버라이드.
+"""
+import math
+import os
+import time as real_time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from backtest.config_bt import (
+    BT_DAYS, BT_DB_PATH, BT_SYMBOLS, BT_SEARCH_ETA, BT_SEARCH_MIN_DAYS, BT_SEARCH_SEED,
+)
+from backtest.sweep import (
+    RANK_KEYS, _run_one, _validate_data_overrides, apply_overrides, expand_grid,
+    print_ranking, rank_results, restore_overrides, split_overrides,
+)
+
+# 탐색 실행 DB 저장 위치
+SEARCH_DIR = BT_DB_PATH.parent / "search"
+
+
+def rung_days(min_days: int, max_days: int, eta: int) -> list[int]:
+    """rung별 시뮬레이션 기간 [min, min*eta, ..., max] (마지막은 max_days)"""
+    days = [min_days]
+    while days[-1] * eta < max_days:
+        days.append(days[-1] * eta)
+    if days[-1] < max_days:
+        days.append(max_days)
+    return days
+
+
+def run_successive_halving(grid: dict, days: int = None, symbols: list = None,
+                           workers: int = None, rank_by: str = "total_pnl",
+                           eta: int = None, min_days: int = None, samples: int = None,
+                           base_db: Path = None, in_memory: bool = True,
+                           engine_cache: bool = True, dataset: str = None,
+                           seed: int = None) -> dict:
+    """Successive Halving — 그리드 조합(또는 samples개 무작위 표본)을 rung마다 1/eta로 축소
+
+    Args:
+        grid: {config 키: [값...]}
+        days: 최종 rung 기간 (일, 기본 BT_DAYS)
+        eta: 승급 비율 (상위 1/eta 승급, rung 기간 x eta)
+        min_days: 첫 rung 기간 (일)
+        samples: 지정 시 조합 중 무작위 samples개만 탐색 (큰 그리드)
+        나머지 인자는 run_sweep()과 동일
+
+    Returns:
+        dict: {"rungs": [{days, results}], "results": 최종 rung 랭킹, "best", "runs", "sim_days"}
+    """
+    search = _Search(grid, days, symbols, workers, rank_by, eta, min_days,
+                     base_db, in_memory, engine_cache, dataset, seed)
+    combos = search.sample(samples)
+    print(f"\n{'='*60}")
+    print(f"  SUCCESSIVE HALVING: {len(combos)}/{len(search.combos)} combinations x "
+          f"{len(search.symbols)} symbols")
+    print(f"  Rungs: {' → '.join(f'{d}d' for d in search.rungs)} | eta={search.eta} | "
+          f"Workers: {search.workers}")
+    print(f"{'='*60}")
+
+    with search.pool() as pool:
+        bracket = search.bracket(pool, "sh", combos, search.rungs)
+    return search.finish([bracket])
+
+
+def run_hyperband(grid: dict, days: int = None, symbols: list = None,
+                  workers: int = None, rank_by: str = "total_pnl",
+                  eta: int = None, min_days: int = None,
+                  base_db: Path = None, in_memory: bool = True,
+                  engine_cache: bool = True, dataset: str = None,
+                  seed: int = None) -> dict:
+    """Hyperband — 시작 기간이 다른 Successive Halving 브래킷 여러 개
+
+    브래킷 s (s_max..0): 조합 ceil((s_max+1)/(s+1) * eta^s)개를 rung[s_max-s]부터 시작.
+    공격적인 조기 제거(많은 조합 x 짧은 구간)와 보수적인 탐색(적은 조합 x 긴 구간)을 함께 수행해
+    짧은 구간 성과가 긴 구간과 어긋나는 파라미터에도 대비한다.
+
+    Returns:
+        dict: run_successive_halving()과 같은 형식 + "brackets"
+    """
+    search = _Search(grid, days, symbols, workers, rank_by, eta, min_days,
+                     base_db, in_memory, engine_cache, dataset, seed)
+    s_max = len(search.rungs) - 1
+    plan = [(s, math.ceil((s_max + 1) / (s + 1) * search.eta ** s))
+            for s in range(s_max, -1, -1)]
+
+    print(f"\n{'='*60}")
+    print(f"  HYPERBAND: {len(plan)} brackets | {len(search.combos)} combinations x "
+          f"{len(search.symbols)} symbols")
+    print(f"  Rungs: {' → '.join(f'{d}d' for d in search.rungs)} | eta={search.eta} | "
+          f"Workers: {search.workers}")
+    print(f"{'='*60}")
+
+    brackets = []
+    with search.pool() as pool:
+        for s, n in plan:
+            combos = search.sample(n)
+            print(f"\n[Search] bracket s={s}: {len(combos)} combinations from "
+                  f"{search.rungs[s_max - s]}d")
+            brackets.append(search.bracket(pool, f"hb{s}", combos, search.rungs[s_max - s:]))
+    out = search.finish(brackets)
+    out["brackets"] = brackets
+    return out
+
+
+class _Search:
+    """탐색 공통 상태 — 히스토리 구간 / 실행 제출 / 결과 집계"""
+
+    def __init__(self, grid, days, symbols, workers, rank_by, eta, min_days,
+                 base_db, in_memory, engine_cache, dataset, seed):
+        self.days = days or BT_DAYS
+        self.symbols = symbols or BT_SYMBOLS
+        self.workers = workers or os.cpu_count() or 1
+        self.rank_by = rank_by
+        self.eta = eta or BT_SEARCH_ETA
+        min_days = min(min_days or BT_SEARCH_MIN_DAYS, self.days)
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"rank_by는 {', '.join(RANK_KEYS)} 중 하나여야 합니다")
+        if self.eta < 2:
+            raise ValueError("eta는 2 이상이어야 합니다")
+
+        self.base_db = base_db
+        if dataset:
+            from backtest.dataset import load_manifest, source_db
+            load_manifest(dataset)
+            self.base_db = source_db(dataset)
+        self.base_db = Path(self.base_db or BT_DB_PATH)
+        self.in_memory = in_memory
+        self.engine_cache = engine_cache
+        self.dataset = dataset
+
+        self.combos = expand_grid(grid)
+        restore_overrides(apply_overrides(split_overrides(self.combos[0])[0]))
+        _validate_data_overrides(grid)
+
+        self.rungs = rung_days(min_days, self.days, self.eta)
+        # 모든 rung은 히스토리 시작 시각에서 출발 (앞부분 구간 — 엔진 캐시 공유)
+        self.history_start = real_time.time() - self.days * 86400
+        self.rng = np.random.default_rng(BT_SEARCH_SEED if seed is None else seed)
+        self.runs = 0
+        self.sim_days = 0
+        self.wall_start = real_time.time()
+
+    def pool(self) -> ProcessPoolExecutor:
+        # max_tasks_per_child=1: 실행마다 새 프로세스 (엔진 모듈 캐시/오버라이드 잔존 방지)
+        return ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1)
+
+    def sample(self, n: int = None) -> list[dict]:
+        """조합 중 n개 무작위 표본 (그리드 순서 유지, n이 없거나 크면 전체)"""
+        if not n or n >= len(self.combos):
+            return list(self.combos)
+        idx = np.sort(self.rng.choice(len(self.combos), size=n, replace=False))
+        return [self.combos[i] for i in idx]
+
+    def bracket(self, pool, tag: str, combos: list[dict], rungs: list[int]) -> dict:
+        """Successive Halving 1회 — rung마다 실행 후 상위 1/eta 승급"""
+        candidates = list(combos)
+        history = []
+        for r, days in enumerate(rungs):
+            results = self._run_rung(pool, f"{tag}_r{r}", candidates, days)
+            history.append({"days": days, "results": results})
+            ok = sum(1 for x in results if not x["error"])
+            if r == len(rungs) - 1:
+                break
+            keep = max(1, len(results) // self.eta)
+            candidates = [x["params"] for x in results[:keep] if not x["error"]]
+            print(f"[Search] {tag} rung {r} ({days}d): {ok}/{len(results)} 완료 → "
+                  f"상위 {len(candidates)}개 승급")
+            if not candidates:
+                break
+        return {"tag": tag, "rungs": history}
+
+    def _run_rung(self, pool, tag: str, combos: list[dict], days: int) -> list[dict]:
+        end_ts = self.history_start + days * 86400
+        submit = lambda i: pool.submit(
+            _run_one, i, combos[i], days, self.symbols, end_ts,
+            str(self.base_db), str(SEARCH_DIR / f"{tag}_{i:04d}.db"),
+            self.in_memory, False, self.engine_cache, self.dataset,
+        )
+        # 엔진 캐시 예열 (run_sweep과 동일): 첫 실행을 먼저 끝내 나머지가 캐시를 재사용
+        warmup = self.engine_cache and len(combos) > self.workers
+        futures = [submit(0)] if warmup else []
+        if warmup:
+            futures[0].result()
+        futures += [submit(i) for i in range(len(futures), len(combos))]
+
+        results = [f.result() for f in as_completed(futures)]
+        self.runs += len(results)
+        self.sim_days += len(results) * days
+        # 동점이면 제출 순서 유지 (run_id 기준 정렬 후 안정 정렬)
+        results.sort(key=lambda x: x["run_id"])
+        return rank_results(results, self.rank_by)
+
+    def finish(self, brackets: list[dict]) -> dict:
+        """최종 rung(전체 기간) 결과 랭킹 + 계산량 요약 출력"""
+        final = [x for b in brackets for rung in b["rungs"] if rung["days"] == self.days
+                 for x in rung["results"]]
+        # Hyperband 브래킷 간 중복 조합은 최고 결과만
+        seen = set()
+        final = [x for x in rank_results(final, self.rank_by)
+                 if not (repr(x["params"]) in seen or seen.add(repr(x["params"])))]
+        best = next((x for x in final if not x["error"]), None)
+        full_days = len(self.combos) * self.days
+
+        print(f"\n[Search] 완료 ({real_time.time() - self.wall_start:.1f}초) | "
+              f"실행 {self.runs}회 | 시뮬레이션 {self.sim_days:,}일 "
+              f"(전체 그리드 {full_days:,}일의 {self.sim_days / full_days * 100:.1f}%)")
+        if final:
+            print_ranking(final, self.rank_by)
+        return {
+            "rungs": [rung for b in brackets for rung in b["rungs"]],
+            "results": final,
+            "best": best,
+            "runs": self.runs,
+            "sim_days": self.sim_days,
+        }
@@ -0,0 +1,221 @@
+"""Monte Carlo 강건성 분석 — 종료된 백테스트의 거래/일간 수익률 부트스트랩
+
+단일 경로 지표(_calc_symbol_metrics)는 거래 순서가 한 번 실현된 결과일 뿐이므로,
+거래 시퀀스(L2 청산 + L4 SELL)와 일간 수익률을 (블록) 부트스트랩으로 재표본해
+총 PnL / 최대 낙폭 / LIVE_DAILY_LOSS_LIMIT 도달 확률의 분포를 구한다.
+
+경로 생성은 (경로 수, 표본 길이) 인덱스 행렬 한 번으로 벡터화하고,
+경로 묶음을 프로세스 풀에 나눠 실행한다 (묶음별 독립 SeedSequence → 워커 수와 무관하게 재현).
+"""
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backtest.config_bt import (
+    BT_DB_PATH, BT_MC_PATHS, BT_MC_TRADE_BLOCK, BT_MC_DAILY_BLOCK, BT_MC_SEED,
+)
+from backtest.equity import daily_values, max_drawdown
+from config import LIVE_DAILY_LOSS_LIMIT
+
+# 묶음당 경로 수 상한 계산용 (경로 수 x 표본 길이 원소 수)
+_CHUNK_ELEMENTS = 2_000_000
+
+# 신뢰구간 백분위
+PERCENTILES = (5, 50, 95)
+
+
+def load_samples(conn: sqlite3.Connection, symbol: str, curve: dict = None) -> dict:
+    """부트스트랩 표본 — {trades: 거래별 PnL%, daily: 일간 수익률%}
+
+    trades: paper_trades(CLOSED, pnl_weighted) + paper_l4_grid(SELL, pnl_pct)을 체결 시각 순으로 병합
+    daily: equity 곡선(curve)이 있으면 24시간 경계 리샘플링, 없으면 DB 일별 PnL
+    """
+    rows = conn.execute(
+        "SELECT exit_time, pnl_weighted FROM paper_trades "
+        "WHERE symbol = ? AND status = 'CLOSED' "
+        "UNION ALL "
+        "SELECT created_at, pnl_pct FROM paper_l4_grid "
+        "WHERE symbol = ? AND side = 'SELL' "
+        "ORDER BY 1",
+        (symbol, symbol),
+    ).fetchall()
+    trades = np.array([pnl or 0 for _, pnl in rows], dtype=np.float64)
+
+    if curve is not None and len(curve["ts"]):
+        daily = np.diff(daily_values(curve["ts"], curve["total"]))
+    else:
+        from backtest.report import _calc_daily_returns
+        daily = np.asarray(_calc_daily_returns(conn, symbol), dtype=np.float64)
+
+    return {"trades": trades, "daily": daily}
+
+
+def bootstrap_indices(rng: np.random.Generator, n_paths: int, n: int, block: int) -> np.ndarray:
+    """(n_paths, n) 재표본 인덱스 — 원형 블록 부트스트랩 (block=1이면 iid)"""
+    block = effective_block(block, n)
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)) % n
+    return idx.reshape(n_paths, -1)[:, :n]
+
+
+def effective_block(block: int, n: int) -> int:
+    """표본 n개에 쓸 블록 길이 — 최대 n // 2
+
+    블록이 표본 길이 이상이면 원형 블록 부트스트랩은 시퀀스를 회전시킬 뿐이라
+    모든 경로의 총 PnL이 같아진다 (p5 = p50 = p95). 블록이 최소 2개는 섞이도록 제한.
+    """
+    return max(1, min(int(block), n // 2))
+
+
+def simulate_paths(samples: np.ndarray, n_paths: int, block: int, seed,
+                   loss_limit: float = None) -> dict:
+    """부트스트랩 경로 n_paths개의 {total, max_dd, breaches} 배열 (워커 실행 단위)"""
+    samples = np.asarray(samples, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    n = len(samples)
+    chunk = max(1, _CHUNK_ELEMENTS // max(n, 1))
+
+    totals, max_dds, breaches = [], [], []
+    for start in range(0, n_paths, chunk):
+        m = min(chunk, n_paths - start)
+        paths = samples[bootstrap_indices(rng, m, n, block)]
+        cum = np.cumsum(paths, axis=1)
+        peak = np.maximum.accumulate(np.maximum(cum, 0.0), axis=1)
+        totals.append(cum[:, -1])
+        max_dds.append((peak - cum).max(axis=1))
+        if loss_limit is not None:
+            breaches.append((paths <= loss_limit).sum(axis=1))
+
+    return {
+        "total": np.concatenate(totals),
+        "max_dd": np.concatenate(max_dds),
+        "breaches": np.concatenate(breaches) if breaches else None,
+    }
+
+
+def _summarize(samples: np.ndarray, sim: dict, block: int, loss_limit: float = None) -> dict:
+    """경로 분포 → 백분위 / 손실 확률 / 실제 단일 경로 값"""
+    pct = lambda a: {f"p{p}": round(float(v), 4)
+                     for p, v in zip(PERCENTILES, np.percentile(a, PERCENTILES))}
+    out = {
+        "samples": int(len(samples)),
+        "paths": int(len(sim["total"])),
+        "block": int(block),
+        "actual_total": round(float(samples.sum()), 4),
+        "actual_max_dd": round(max_drawdown(np.cumsum(samples)), 4),
+        "total_pnl": {**pct(sim["total"]), "mean": round(float(sim["total"].mean()), 4)},
+        "max_drawdown": pct(sim["max_dd"]),
+        "prob_loss": round(float((sim["total"] < 0).mean() * 100), 2),
+    }
+    if sim["breaches"] is not None:
+        out["loss_limit"] = loss_limit
+        out["risk_of_ruin"] = round(float((sim["breaches"] > 0).mean() * 100), 2)
+        out["expected_breaches"] = round(float(sim["breaches"].mean()), 3)
+    return out
+
+
+def bootstrap(samples, n_paths: int = None, block: int = 1, seed: int = None,
+              loss_limit: float = None, workers: int = None) -> dict | None:
+    """표본 부트스트랩 분포 요약 (workers > 1이면 경로 묶음을 프로세스 풀에서 실행)
+
+    Args:
+        samples: 거래별 또는 일간 PnL% 시퀀스
+        block: 블록 길이 (1 = iid, 표본 수 // 2로 제한)
+        loss_limit: 표본 1개가 이 값 이하면 한도 도달 (일간 수익률에 LIVE_DAILY_LOSS_LIMIT)
+        workers: 프로세스 수 (기본: CPU 코어 수, 작은 작업은 단일 프로세스)
+
+    Returns:
+        {samples, paths, block, actual_*, total_pnl{p5,p50,p95,mean}, max_drawdown{...},
+         prob_loss, [loss_limit, risk_of_ruin, expected_breaches]} — 표본 2개 미만이면 None
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    if len(samples) < 2:
+        return None
+    n_paths = n_paths or BT_MC_PATHS
+    requested, block = int(block), effective_block(block, len(samples))
+    if block < requested:
+        print(f"[MC] 표본 {len(samples)}개 — 블록 {requested} → {block}로 축소 (블록 2개 미만이면 회전만 됨)")
+    seed = BT_MC_SEED if seed is None else seed
+    workers = workers or os.cpu_count() or 1
+    # 워커당 최소 작업량 (경로 x 표본) 미만이면 프로세스 생성 비용이 더 큼
+    workers = max(1, min(workers, n_paths * len(samples) // _CHUNK_ELEMENTS))
+
+    # 묶음 분할/시드는 workers와 무관하게 고정 → 같은 seed면 같은 결과
+    n_chunks = max(1, min(64, n_paths * len(samples) // _CHUNK_ELEMENTS))
+    sizes = [len(a) for a in np.array_split(np.arange(n_paths), n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    if workers == 1:
+        parts = [simulate_paths(samples, m, block, s, loss_limit)
+                 for m, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(simulate_paths, [samples] * n_chunks, sizes,
+                                  [block] * n_chunks, seeds, [loss_limit] * n_chunks))
+
+    sim = {
+        "total": np.concatenate([p["total"] for p in parts]),
+        "max_dd": np.concatenate([p["max_dd"] for p in parts]),
+        "breaches": (np.concatenate([p["breaches"] for p in parts])
+                     if loss_limit is not None else None),
+    }
+    return _summarize(samples, sim, block, loss_limit)
+
+
+def run_monte_carlo(symbols: list, equity_data: dict = None, db_path=None,
+                    symbol_dbs: dict = None, n_paths: int = None,
+                    workers: int = None) -> dict:
+    """심볼별 거래 시퀀스 / 일간 수익률 부트스트랩 리포트
+
+    Returns:
+        {symbol: {"trades": bootstrap(...), "daily": bootstrap(...)}}
+    """
+    symbol_dbs = symbol_dbs or {}
+    results = {}
+    for symbol in symbols:
+        conn = sqlite3.connect(str(symbol_dbs.get(symbol) or db_path or BT_DB_PATH))
+        try:
+            curve = ((equity_data or {}).get(symbol) or {}).get("equity_curve")
+            samples = load_samples(conn, symbol, curve)
+        finally:
+            conn.close()
+
+        results[symbol] = {
+            "trades": bootstrap(samples["trades"], n_paths, BT_MC_TRADE_BLOCK,
+                                workers=workers),
+            "daily": bootstrap(samples["daily"], n_paths, BT_MC_DAILY_BLOCK,
+                               loss_limit=LIVE_DAILY_LOSS_LIMIT, workers=workers),
+        }
+    return results
+
+
+def print_monte_carlo(results: dict):
+    """run_monte_carlo() 결과 출력"""
+    width = 52
+    print(f"\n{'='*width}")
+    print(f"  MONTE CARLO ROBUSTNESS (p5 / p50 / p95)")
+    print(f"{'='*width}")
+
+    for symbol, r in results.items():
+        print(f"\n  Symbol: {symbol}")
+        for key, label in (("trades", "Trade sequence"), ("daily", "Daily returns")):
+            s = r[key]
+            print(f"\n  --- {label} ---")
+            if not s:
+                print(f"    표본 부족 (2개 미만)")
+                continue
+            t, d = s["total_pnl"], s["max_drawdown"]
+            print(f"    Samples: {s['samples']} | Paths: {s['paths']:,} | Block: {s['block']}")
+            print(f"    Total PnL: {t['p5']:+.2f}% / {t['p50']:+.2f}% / {t['p95']:+.2f}% "
+                  f"(actual {s['actual_total']:+.2f}%)")
+            print(f"    Max Drawdown: -{d['p5']:.2f}% / -{d['p50']:.2f}% / -{d['p95']:.2f}% "
+                  f"(actual -{s['actual_max_dd']:.2f}%)")
+            print(f"    P(loss): {s['prob_loss']:.1f}%")
+            if "risk_of_ruin" in s:
+                print(f"    Risk of ruin (day <= {s['loss_limit']}%): {s['risk_of_ruin']:.1f}% "
+                      f"| expected breaches {s['expected_breaches']:.2f}")
+
+    print(f"\n{'='*width}")
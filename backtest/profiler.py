@@ -0,0 +1,113 @@
+"""엔진별 프로파일러 — 백테스트 실행 시간/예외/SQL 수 집계
+
+run_backtest(options=RunOptions(profile=True))일 때 각 엔진 호출과 _DataFeeder.drip을 감싸서
+호출 수, 총/평균/p99 시간, 예외 수, 실행된 SQL 문 수를 기록한다.
+SQL 수는 공유 연결의 set_trace_callback으로 세며, 현재 실행 중인 구간에 귀속된다.
+비활성 시에는 기존 루프와 같이 예외만 무시하고 측정 비용은 없다.
+"""
+import json
+import time as real_time
+from pathlib import Path
+
+
+class EngineProfiler:
+    """구간(엔진)별 실행 통계 수집기"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # name -> {"times": [...], "errors": int, "sql": int}
+        self._stats = {}
+        self._current = None
+        self._conn = None
+
+    def attach(self, conn):
+        """SQL 문 카운트용 trace 콜백 등록 (sqlite3.Connection)"""
+        if not self.enabled:
+            return
+        self._conn = conn
+        conn.set_trace_callback(self._on_sql)
+
+    def detach(self):
+        """trace 콜백 해제"""
+        if self._conn is not None:
+            self._conn.set_trace_callback(None)
+            self._conn = None
+
+    def _on_sql(self, statement: str):
+        if self._current is not None:
+            self._current["sql"] += 1
+
+    def _entry(self, name: str) -> dict:
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = self._stats[name] = {"times": [], "errors": 0, "sql": 0}
+        return entry
+
+    def call(self, name: str, fn, *args, swallow: bool = True):
+        """fn(*args) 실행 + 측정. swallow=True면 예외를 기록 후 무시 (엔진 루프 동작)"""
+        if not self.enabled:
+            if not swallow:
+                return fn(*args)
+            try:
+                return fn(*args)
+            except Exception:
+                return None
+
+        entry = self._entry(name)
+        self._current = entry
+        start = real_time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception:
+            entry["errors"] += 1
+            if not swallow:
+                raise
+            return None
+        finally:
+            entry["times"].append(real_time.perf_counter() - start)
+            self._current = None
+
+    def summary(self) -> dict:
+        """{name: {calls, total_s, mean_ms, p99_ms, errors, sql}} (총 시간 내림차순)"""
+        rows = {}
+        for name, entry in self._stats.items():
+            times = sorted(entry["times"])
+            calls = len(times)
+            total = sum(times)
+            p99 = times[min(calls - 1, int(calls * 0.99))] if calls else 0.0
+            rows[name] = {
+                "calls": calls,
+                "total_s": round(total, 4),
+                "mean_ms": round(total / calls * 1000, 3) if calls else 0.0,
+                "p99_ms": round(p99 * 1000, 3),
+                "errors": entry["errors"],
+                "sql": entry["sql"],
+            }
+        return dict(sorted(rows.items(), key=lambda kv: kv[1]["total_s"], reverse=True))
+
+    def print_report(self, wall_total: float = None):
+        """엔진별 통계 테이블 출력"""
+        rows = self.summary()
+        if not rows:
+            return
+        profiled = sum(r["total_s"] for r in rows.values())
+
+        print(f"\n  --- Engine Profile ---")
+        print(f"  {'Engine':<22} {'Calls':>8} {'Total s':>9} {'Share':>6} "
+              f"{'Mean ms':>9} {'p99 ms':>9} {'Errors':>7} {'SQL':>9}")
+        for name, r in rows.items():
+            share = r["total_s"] / profiled * 100 if profiled else 0.0
+            print(f"  {name:<22} {r['calls']:>8,} {r['total_s']:>9.2f} {share:>5.1f}% "
+                  f"{r['mean_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['errors']:>7,} {r['sql']:>9,}")
+        if wall_total:
+            print(f"  측정 구간 합계 {profiled:.2f}초 / 전체 {wall_total:.2f}초 "
+                  f"({profiled / wall_total * 100:.0f}%)")
+
+    def dump_json(self, path, wall_total: float = None):
+        """통계를 JSON 파일로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"wall_time_s": round(wall_total, 4) if wall_total else None,
+                   "engines": self.summary()}
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"[BT] 프로파일 저장: {path}")
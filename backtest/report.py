@@ -1,41 +1,46 @@
 """백테스트 리포트 — 성과 지표 계산 + 출력"""
 import csv
-import math
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from backtest.config_bt import BT_DB_PATH, BT_INITIAL_CAPITAL
+from backtest.equity import curve_metrics
 
 
 def generate_report(symbols: list, start_ts: float, end_ts: float,
-                    equity_data: dict = None, export_csv: bool = False) -> dict:
+                    equity_data: dict = None, export_csv: bool = False,
+                    db_path=None, symbol_dbs: dict = None) -> dict:
     """백테스트 리포트 생성 및 출력
 
     Args:
         symbols: 심볼 리스트
         start_ts: 시작 타임스탬프
         end_ts: 종료 타임스탬프
-        equity_data: runner에서 수집한 equity 스냅샷 (선택)
+        equity_data: runner 결과 (선택). 심볼별 equity_curve가 있으면 Sharpe/낙폭 등을
+            스텝 해상도 곡선으로 계산하고, 없으면 DB 일별 PnL로 계산
         export_csv: CSV 내보내기 여부
+        db_path: 백테스트 DB 경로 (기본: BT_DB_PATH)
+        symbol_dbs: 심볼별 DB 경로 {symbol: path} (샤드 실행 결과 병합용, db_path보다 우선)
 
     Returns:
         dict: 심볼별 성과 지표
     """
-    conn = sqlite3.connect(str(BT_DB_PATH))
-    conn.execute("PRAGMA journal_mode=WAL")
-
     start_date = datetime.fromtimestamp(start_ts).strftime("%Y-%m-%d")
     end_date = datetime.fromtimestamp(end_ts).strftime("%Y-%m-%d")
     days = int((end_ts - start_ts) / 86400)
 
     all_results = {}
+    symbol_dbs = symbol_dbs or {}
 
     for symbol in symbols:
-        result = _calc_symbol_metrics(conn, symbol)
-        all_results[symbol] = result
-
-    conn.close()
+        conn = sqlite3.connect(str(symbol_dbs.get(symbol) or db_path or BT_DB_PATH))
+        conn.execute("PRAGMA journal_mode=WAL")
+        curve = ((equity_data or {}).get(symbol) or {}).get("equity_curve")
+        all_results[symbol] = _calc_symbol_metrics(conn, symbol, curve)
+        conn.close()
 
     # 리포트 출력
     _print_report(all_results, start_date, end_date, days, equity_data)
@@ -47,8 +52,9 @@ def generate_report(symbols: list, start_ts: float, end_ts: float,
     return all_results
 
 
-def _calc_symbol_metrics(conn: sqlite3.Connection, symbol: str) -> dict:
-    """심볼별 성과 지표 계산"""
+def _calc_symbol_metrics(conn: sqlite3.Connection, symbol: str,
+                         curve: dict = None) -> dict:
+    """심볼별 성과 지표 계산 (curve: EquityCurve.arrays() 결과, 선택)"""
 
     # ---- L2 Directional ----
     l2_trades = conn.execute(
@@ -105,10 +111,16 @@ def _calc_symbol_metrics(conn: sqlite3.Connection, symbol: str) -> dict:
     # ---- Combined ----
     combined_pnl = l2_total_pnl + l1_total_pnl + l4_total_pnl
 
-    # ---- Daily Returns (Sharpe / Max DD 계산용) ----
-    daily_returns = _calc_daily_returns(conn, symbol)
-    sharpe = _calc_sharpe(daily_returns)
-    max_dd = _calc_max_drawdown(daily_returns)
+    # ---- 곡선 지표 (Sharpe / Sortino / Calmar / Max DD / 노출도 / 롤링) ----
+    if curve is not None and len(curve["ts"]):
+        perf = curve_metrics(curve["ts"], curve["total"], curve["l2_exposure"])
+        resolution = "step"
+    else:
+        # equity 곡선이 없으면 DB 일별 PnL을 일 단위 곡선으로 사용
+        daily_returns = _calc_daily_returns(conn, symbol)
+        perf = curve_metrics(np.arange(len(daily_returns) + 1) * 86400.0,
+                             np.concatenate([[0.0], np.cumsum(daily_returns)]))
+        resolution = "daily"
 
     # ---- Monthly Breakdown ----
     monthly = _calc_monthly_breakdown(conn, symbol)
@@ -141,8 +153,16 @@ def _calc_symbol_metrics(conn: sqlite3.Connection, symbol: str) -> dict:
         },
         "combined": {
             "total_pnl": round(combined_pnl, 4),
-            "sharpe": round(sharpe, 2),
-            "max_drawdown": round(max_dd, 2),
+            "sharpe": perf["sharpe"],
+            "sortino": perf["sortino"],
+            "calmar": perf["calmar"],
+            "max_drawdown": perf["max_drawdown"],
+            "max_dd_duration_days": perf["max_dd_duration_days"],
+            "exposure_pct": perf["exposure_pct"],
+            "avg_exposure": perf["avg_exposure"],
+            "turnover": perf["turnover"],
+            "rolling": perf["rolling"],
+            "resolution": resolution,
         },
         "monthly": monthly,
         "signal_count": signal_count,
@@ -190,42 +210,6 @@ def _calc_daily_returns(conn: sqlite3.Connection, symbol: str) -> list[float]:
     return [daily_map[d] for d in sorted(daily_map.keys())]
 
 
-def _calc_sharpe(daily_returns: list[float], risk_free: float = 0.0) -> float:
-    """Sharpe Ratio 계산 (연간화)"""
-    if len(daily_returns) < 2:
-        return 0.0
-
-    avg = sum(daily_returns) / len(daily_returns)
-    variance = sum((r - avg) ** 2 for r in daily_returns) / (len(daily_returns) - 1)
-    std = math.sqrt(variance) if variance > 0 else 0
-
-    if std == 0:
-        return 0.0
-
-    daily_sharpe = (avg - risk_free) / std
-    return daily_sharpe * math.sqrt(365)  # 연간화 (crypto = 365일)
-
-
-def _calc_max_drawdown(daily_returns: list[float]) -> float:
-    """최대 낙폭 (%) 계산"""
-    if not daily_returns:
-        return 0.0
-
-    cumulative = 0.0
-    peak = 0.0
-    max_dd = 0.0
-
-    for ret in daily_returns:
-        cumulative += ret
-        if cumulative > peak:
-            peak = cumulative
-        dd = peak - cumulative
-        if dd > max_dd:
-            max_dd = dd
-
-    return max_dd
-
-
 def _calc_monthly_breakdown(conn: sqlite3.Connection, symbol: str) -> list[dict]:
     """월별 수익률 breakdown"""
     # L2 월별
@@ -309,8 +293,19 @@ def _print_report(results: dict, start_date: str, end_date: str,
         c = r["combined"]
         print(f"\n  --- Combined ---")
         print(f"    Total PnL: {c['total_pnl']:+.2f}%")
-        print(f"    Sharpe: {c['sharpe']}")
-        print(f"    Max Drawdown: -{c['max_drawdown']:.2f}%")
+        print(f"    Sharpe: {c['sharpe']} | Sortino: {_ratio_text(c['sortino'])} | "
+              f"Calmar: {c['calmar']}")
+        print(f"    Max Drawdown: -{c['max_drawdown']:.2f}% "
+              f"({c['max_dd_duration_days']:.1f}d underwater, {c['resolution']})")
+        if c["resolution"] == "step":
+            print(f"    L2 Exposure: {c['exposure_pct']:.1f}% of time "
+                  f"(avg {c['avg_exposure']:.2f}) | Turnover: {c['turnover']:.2f}x")
+        for window, stats in c["rolling"].items():
+            if stats:
+                line = f"    Rolling {window}: best {stats['best']:+.2f}% / worst {stats['worst']:+.2f}%"
+                if "sharpe_min" in stats:
+                    line += f" | Sharpe min {stats['sharpe_min']} / median {stats['sharpe_median']}"
+                print(line)
 
         # Monthly
         if r["monthly"]:
@@ -323,6 +318,11 @@ def _print_report(results: dict, start_date: str, end_date: str,
     print(f"\n{'='*width}")
 
 
+def _ratio_text(value) -> str:
+    """지표 출력 — None(정의 불가, 예: 손실일 없는 Sortino)은 n/a"""
+    return "n/a" if value is None else str(value)
+
+
 def _export_csv(results: dict, start_date: str, end_date: str):
     """CSV 파일 내보내기"""
     csv_path = BT_DB_PATH.parent / f"backtest_report_{start_date}_{end_date}.csv"
@@ -333,7 +333,8 @@ def _export_csv(results: dict, start_date: str, end_date: str):
             "Symbol", "L2 Trades", "L2 Win Rate", "L2 PnL",
             "L1 Collections", "L1 PnL",
             "L4 Trades", "L4 PnL",
-            "Combined PnL", "Sharpe", "Max Drawdown",
+            "Combined PnL", "Sharpe", "Sortino", "Calmar", "Max Drawdown",
+            "Max DD Days", "L2 Exposure", "Turnover",
         ])
 
         for symbol, r in results.items():
@@ -348,7 +349,12 @@ def _export_csv(results: dict, start_date: str, end_date: str):
                 f"{r['l4']['total_pnl']:+.4f}%",
                 f"{r['combined']['total_pnl']:+.4f}%",
                 r["combined"]["sharpe"],
+                _ratio_text(r["combined"]["sortino"]),
+                r["combined"]["calmar"],
                 f"-{r['combined']['max_drawdown']:.2f}%",
+                r["combined"]["max_dd_duration_days"],
+                f"{r['combined']['exposure_pct']:.1f}%",
+                r["combined"]["turnover"],
             ])
 
     print(f"\n[Report] CSV 내보내기: {csv_path}")
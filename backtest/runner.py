@@ -1,16 +1,36 @@
 """백테스트 러너 — 메인 시뮬레이션 루프"""
 import io
+import math
 import os
 import sys
 import time as real_time
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 
 from backtest.config_bt import (
     BT_DAYS, BT_STEP_SECONDS, BT_DB_PATH,
     BT_SYMBOLS, BT_LOG_INTERVAL,
+    BT_EVENT_SKIP, BT_ENGINE_INTERVALS,
+    BT_IN_MEMORY, BT_SNAPSHOT_INTERVAL, BT_PROFILE,
+    BT_CHECKPOINT_INTERVAL, BT_GRID_V2, BT_ENGINE_CACHE,
 )
+from backtest import checkpoint
 from backtest.clock import VirtualClock
 from backtest.context import BacktestContext
+from backtest.dataset import clone_template, load_events, load_manifest
+from backtest.engine_cache import ENGINE_SPECS, EngineCache
+from backtest.equity import EquityCurve
+from backtest.fanout import VARIANT_DIR, VARIANT_ENGINES, StrategyFanout
+from backtest.grid_replay import GridReplay, print_replay_summary
+from backtest.profiler import EngineProfiler
+
+
+# 실행 간 초기화가 필요한 엔진 모듈 레벨 캐시 (모듈, 속성)
+_ENGINE_CACHES = [
+    ("engines.scorer", "_story_cache"),
+    ("engines.mtf_analyzer", "_last_patterns"),
+    ("engines.paper_trader", "_l4_last_1m"),
+]
 
 
 class _SuppressPrint:
@@ -42,15 +62,23 @@ class _DataFeeder:
         ("long_short_ratios", "collected_at", "iso", 6),
         ("taker_ratio", "timestamp", "ms", 5),
         ("fear_greed", "fg_timestamp", "s", 3),
+        ("orderbook_walls", "scan_id", "s", 5),
     ]
 
-    def __init__(self, conn):
+    # 상위 봉 (봉 길이, 초) — 봉 마감 시각에 삽입. 엔진이 최근 N개 일봉을 시각 조건 없이 읽으므로
+    # (ATR / Threshold / Score 등) 미리 DB에 두면 미래 봉이 계산에 섞인다 (look-ahead)
+    HTF_INTERVALS = {"1h": 3600, "4h": 14400, "1d": 86400, "1w": 604800}
+
+    def __init__(self, conn, buffers: dict = None):
         self._conn = conn
         # table -> list of (unix_ts, row_tuple)
         self._buffers = {}
         self._cursors = {}
+        # load_buffers()로 미리 읽어둔 버퍼 (walk-forward 등 반복 실행 시 재사용, 읽기 전용)
+        self._preloaded = buffers
 
-    def _to_unix_ts(self, value, unit: str) -> float:
+    @staticmethod
+    def _to_unix_ts(value, unit: str) -> float:
         """시간값을 Unix timestamp(초)로 변환"""
         if unit == "ms":
             return value / 1000.0
@@ -65,48 +93,103 @@ class _DataFeeder:
                 return 0.0
         return 0.0
 
-    def load_and_clear(self):
-        """모든 시계열 데이터를 메모리로 로드 후 DB 테이블 비움"""
-        for table, time_col, unit, col_idx in self.TABLE_SPECS:
-            rows = self._conn.execute(
+    @classmethod
+    def load_buffers(cls, conn) -> dict:
+        """모든 시계열 데이터를 (unix_ts, row) 리스트로 로드 (DB는 변경하지 않음)"""
+        buffers = {}
+        for table, time_col, unit, col_idx in cls.TABLE_SPECS:
+            rows = conn.execute(
                 f"SELECT * FROM {table} ORDER BY {time_col}"
             ).fetchall()
 
             # (unix_ts, row) 쌍으로 저장
             items = []
             for row in rows:
-                ts = self._to_unix_ts(row[col_idx], unit)
+                ts = cls._to_unix_ts(row[col_idx], unit)
                 items.append((ts, row))
             items.sort(key=lambda x: x[0])
-
-            self._buffers[table] = items
-            self._cursors[table] = 0
-            self._conn.execute(f"DELETE FROM {table}")
+            buffers[table] = items
 
         # 5m klines 별도 처리 (open_time = ms, index 3)
-        rows = self._conn.execute(
+        rows = conn.execute(
             "SELECT * FROM klines WHERE interval = '5m' ORDER BY open_time"
         ).fetchall()
         items = [(row[3] / 1000.0, row) for row in rows]  # open_time ms → unix_ts
         items.sort(key=lambda x: x[0])
+        buffers["klines_5m"] = items
+
+        # 1m klines: 봉 마감 시각(open_time + 60초)에 삽입 (paper L4 캔들 내부 체결용)
+        rows = conn.execute(
+            "SELECT * FROM klines WHERE interval = '1m' ORDER BY open_time"
+        ).fetchall()
+        buffers["klines_1m"] = [(row[3] / 1000.0 + 60, row) for row in rows]
+
+        # 1h/4h/1d/1w klines: 봉 마감 시각(open_time + 봉 길이)에 삽입 (interval = index 2)
+        placeholders = ",".join(["?"] * len(cls.HTF_INTERVALS))
+        rows = conn.execute(
+            f"SELECT * FROM klines WHERE interval IN ({placeholders}) ORDER BY open_time",
+            list(cls.HTF_INTERVALS),
+        ).fetchall()
+        items = [(row[3] / 1000.0 + cls.HTF_INTERVALS[row[2]], row) for row in rows]
+        items.sort(key=lambda x: x[0])
+        buffers["klines_htf"] = items
+        return buffers
+
+    @classmethod
+    def clear_tables(cls, conn):
+        """drip 대상 시계열 테이블 비움 (load_buffers()로 읽은 행)"""
+        for table, _, _, _ in cls.TABLE_SPECS:
+            conn.execute(f"DELETE FROM {table}")
+        intervals = ["5m", "1m", *cls.HTF_INTERVALS]
+        conn.execute(
+            f"DELETE FROM klines WHERE interval IN ({','.join(['?'] * len(intervals))})",
+            intervals,
+        )
+        conn.commit()
+
+    def load_and_clear(self):
+        """모든 시계열 데이터를 메모리로 로드 후 DB 테이블 비움"""
+        buffers = self._preloaded
+        if buffers is None:
+            buffers = self.load_buffers(self._conn)
 
-        self._buffers["klines_5m"] = items
-        self._cursors["klines_5m"] = 0
-        self._conn.execute("DELETE FROM klines WHERE interval = '5m'")
-        # 1d klines은 유지 (ATR 계산에 항상 필요)
+        for key, items in buffers.items():
+            self._buffers[key] = items
+            self._cursors[key] = 0
 
-        self._conn.commit()
+        self.clear_tables(self._conn)
 
         total = sum(len(v) for v in self._buffers.values())
         print(f"[BT] 데이터 로드 완료: {total:,}건 → 메모리")
 
+    def load_prepared(self):
+        """준비된 데이터셋: DB는 이미 비워진 템플릿 사본이므로 이벤트 스트림만 연결"""
+        for key, items in self._preloaded.items():
+            self._buffers[key] = items
+            self._cursors[key] = 0
+
+        total = sum(len(v) for v in self._buffers.values())
+        print(f"[BT] 준비된 데이터셋 이벤트 스트림: {total:,}건 → 메모리")
+
+    def restore(self, buffers: dict, cursors: dict):
+        """체크포인트 재개: DB는 이미 커서 위치까지 삽입된 상태이므로 비우지 않음"""
+        for key, items in buffers.items():
+            self._buffers[key] = items
+            self._cursors[key] = cursors.get(key, 0)
+
+        remaining = sum(len(v) - self._cursors[k] for k, v in self._buffers.items())
+        print(f"[BT] 체크포인트 버퍼 복원: 미삽입 {remaining:,}건")
+
     def drip(self, current_ts: float):
         """현재 시뮬레이션 시간까지의 데이터를 DB에 삽입"""
         # 모든 테이블을 일괄 처리
         for table, _, _, _ in self.TABLE_SPECS:
             self._drip_table(table, current_ts)
-        # klines 5m
+        # klines 5m / 1m / 상위 봉 (klines_htf 없는 이전 체크포인트 = 상위 봉이 DB에 남아 있음)
         self._drip_table("klines_5m", current_ts, insert_cmd="INSERT OR IGNORE INTO klines")
+        for key in ("klines_1m", "klines_htf"):
+            if key in self._buffers:
+                self._drip_table(key, current_ts, insert_cmd="INSERT OR IGNORE INTO klines")
 
     def _drip_table(self, key: str, current_ts: float, insert_cmd: str = None):
         """단일 테이블의 데이터를 current_ts까지 삽입"""
@@ -135,17 +218,124 @@ class _DataFeeder:
             )
 
 
-def run_backtest(days: int = None, symbols: list = None):
+@dataclass
+class RunOptions:
+    """run_backtest 실행 모드 (None이면 config_bt 기본값)
+
+    Attributes:
+        event_skip: True면 아무 엔진도 실행 예정이 없는 스텝을 건너뛰고
+            다음 엔진 실행 스텝으로 바로 점프 (엔진 호출 순서/결과는 동일). 기본 BT_EVENT_SKIP.
+            모든 BT_ENGINE_INTERVALS가 BT_STEP_SECONDS보다 길 때만 빨라짐 — 기본 설정은
+            strategy/paper_trader가 60초라 매 스텝이 실행 대상 (건너뛸 스텝 없음).
+        in_memory: True면 backtest.db를 메모리로 복제해 실행하고 BT_SNAPSHOT_INTERVAL
+            마다(0이면 종료 시에만) 디스크에 스냅샷. 기본 BT_IN_MEMORY.
+        profile: True면 엔진별 호출 수/시간/예외/SQL 수를 집계해 종료 시 테이블 출력.
+            기본 BT_PROFILE.
+        profile_json: 지정 시 프로파일 결과를 해당 경로에 JSON으로 저장 (profile 활성화).
+        checkpoint_interval: 체크포인트 간격 (시뮬레이션 초, 0=비활성).
+            기본 BT_CHECKPOINT_INTERVAL.
+        resume: True면 db_path의 마지막 체크포인트에서 재개 (기간/심볼/모드는 체크포인트 값 사용).
+        grid_v2: True면 engines.live_trader Grid V2 루프를 SimExchange 위에서 30초 사이클로
+            함께 재생 (체크포인트 미지원). 기본 BT_GRID_V2.
+        engine_cache: True면 ATR/Threshold/Grid/Score 출력을 backtest.engine_cache에서
+            재사용 (같은 데이터셋/파라미터/구간의 이전 실행 결과). 기본 BT_ENGINE_CACHE.
+        variants: 전략 변형별 config 오버라이드 [{키: 값}, ...]. 지정 시 drip/ATR/Threshold/
+            Grid/Score는 한 번만 실행하고 strategy/paper_trader를 변형별로 격리 실행
+            (backtest.fanout — 체크포인트/Grid V2 미지원, 공유 엔진 파라미터 오버라이드 불가).
+        dataset: 준비된 데이터셋 이름 (backtest.dataset). 지정 시 db_path를 템플릿 사본으로
+            교체하고 이벤트 스트림을 그대로 사용 (DB 읽기/시각 파싱/정렬/DELETE 생략).
+    """
+    event_skip: bool = None
+    in_memory: bool = None
+    profile: bool = None
+    profile_json: str = None
+    checkpoint_interval: int = None
+    resume: bool = False
+    grid_v2: bool = None
+    engine_cache: bool = None
+    variants: list = None
+    dataset: str = None
+
+    def resolved(self) -> "RunOptions":
+        """None 항목을 config_bt 기본값으로 채운 사본"""
+        return replace(
+            self,
+            event_skip=BT_EVENT_SKIP if self.event_skip is None else self.event_skip,
+            in_memory=BT_IN_MEMORY if self.in_memory is None else self.in_memory,
+            profile=BT_PROFILE if self.profile is None else self.profile,
+            checkpoint_interval=(BT_CHECKPOINT_INTERVAL if self.checkpoint_interval is None
+                                 else self.checkpoint_interval),
+            grid_v2=BT_GRID_V2 if self.grid_v2 is None else self.grid_v2,
+            engine_cache=BT_ENGINE_CACHE if self.engine_cache is None else self.engine_cache,
+        )
+
+
+def run_backtest(days: int = None, symbols: list = None, db_path=None, end_ts: float = None,
+                 feeder_buffers: dict = None, options: RunOptions = None):
     """백테스트 메인 루프 실행
 
+    Args:
+        days: 시뮬레이션 기간 (일, 기본: BT_DAYS).
+        symbols: 대상 심볼 (기본: BT_SYMBOLS).
+        db_path: 백테스트 DB 경로 (기본: BT_DB_PATH). 병렬 실행 시 워커별 사본 지정.
+        end_ts: 시뮬레이션 종료 시각 (기본: 현재 시각). 여러 실행의 윈도우 정렬용.
+        feeder_buffers: _DataFeeder.load_buffers() 결과. 지정 시 DB에서 다시 읽지 않음.
+        options: 실행 모드 (RunOptions, 기본: 전부 config_bt 기본값).
+
     Returns:
-        dict: {symbol: {equity_curve: [...], signals: [...], ...}}
+        dict: {symbol: {equity_snapshots: [...], equity_curve: {ts, total, ...}, ...}}
+            equity_curve는 실행 스텝 해상도 NumPy 배열 (backtest.equity.EquityCurve.arrays)
+            variants 지정 시 {변형명: {params, db_path, errors, results: {symbol: {...}}}}
+            (db_path = 변형별 paper_* / signal_log DB — generate_report(db_path=...)로 리포트)
     """
     days = days or BT_DAYS
     symbols = symbols or BT_SYMBOLS
+    db_path = db_path or BT_DB_PATH
+    opts = (options or RunOptions()).resolved()
+    event_skip, in_memory, resume = opts.event_skip, opts.in_memory, opts.resume
+    checkpoint_interval, grid_v2 = opts.checkpoint_interval, opts.grid_v2
+    engine_cache, variants, dataset = opts.engine_cache, opts.variants, opts.dataset
+    profile_json = opts.profile_json
+    profiler = EngineProfiler(enabled=bool(opts.profile or profile_json))
+    if grid_v2 and checkpoint_interval > 0:
+        # SimExchange/live_trader 메모리 상태는 체크포인트에 담기지 않음
+        print("[BT] Grid V2 재생은 체크포인트 미지원 — 체크포인트 비활성화")
+        checkpoint_interval = 0
+    if variants:
+        if resume:
+            raise ValueError("전략 팬아웃은 체크포인트 재개를 지원하지 않음")
+        # 변형별 전용 DB는 in-memory — 체크포인트에 담기지 않음
+        if checkpoint_interval > 0:
+            print("[BT] 전략 팬아웃은 체크포인트 미지원 — 체크포인트 비활성화")
+            checkpoint_interval = 0
+        if grid_v2:
+            print("[BT] 전략 팬아웃은 Grid V2 재생 미지원 — Grid V2 비활성화")
+            grid_v2 = False
+
+    saved = None
+    if resume:
+        # 체크포인트 DB를 실행 DB 위치로 복원 (context가 열기 전에)
+        saved, feeder_buffers = checkpoint.load_checkpoint(db_path)
+        params = saved["params"]
+        days, symbols, end_ts = params["days"], params["symbols"], params["end_ts"]
+        event_skip = params["event_skip"]
+        # 데이터셋 지문은 drip 전 DB 기준 — 체크포인트에 없으면 캐시 사용 불가
+        if engine_cache and not saved.get("engine_cache"):
+            print("[BT] 체크포인트에 엔진 캐시 지문 없음 — 엔진 캐시 비활성화")
+            engine_cache = False
+
+    manifest = None
+    if dataset and not resume:
+        manifest = load_manifest(dataset)
+        missing = [s for s in symbols if s not in manifest["symbols"]]
+        if missing:
+            raise ValueError(f"데이터셋 {dataset}에 없는 심볼: {', '.join(missing)}")
+        clone_template(dataset, db_path)
+        if feeder_buffers is None:
+            feeder_buffers = load_events(dataset)
 
     # 시간 범위 설정
-    end_ts = real_time.time()
+    end_ts = end_ts or real_time.time()
     start_ts = end_ts - (days * 86400)
 
     total_steps = int((end_ts - start_ts) / BT_STEP_SECONDS)
@@ -155,11 +345,15 @@ def run_backtest(days: int = None, symbols: list = None):
     print(f"  Period: {datetime.fromtimestamp(start_ts).strftime('%Y-%m-%d')} ~ "
           f"{datetime.fromtimestamp(end_ts).strftime('%Y-%m-%d')}")
     print(f"  Symbols: {', '.join(symbols)}")
-    print(f"  Steps: {total_steps:,} ({BT_STEP_SECONDS}s each)")
+    print(f"  Steps: {total_steps:,} ({BT_STEP_SECONDS}s each)"
+          f"{' | event-skip' if event_skip else ''}"
+          f"{' | in-memory' if in_memory else ''}"
+          f"{' | grid-v2' if grid_v2 else ''}"
+          f"{f' | variants={len(variants)}' if variants else ''}")
     print(f"{'='*60}\n")
 
     # 가상 시계 초기화
-    clock = VirtualClock(start_ts)
+    clock = VirtualClock(saved["clock_ts"] if saved else start_ts)
 
     # 엔진 임포트 (context 내부에서 패치 적용됨)
     from engines.atr import calculate_atr
@@ -169,219 +363,281 @@ def run_backtest(days: int = None, symbols: list = None):
     from engines.strategy_manager import run_strategy
     from engines.paper_trader import run_paper_trader
 
+    # 엔진 실행 순서: (간격 키, 함수)
+    # ATR 매일 → Threshold 5분 → Grid 4시간 → Score 10분 → Strategy/Paper Trader 매 스텝
+    engines = [
+        ("atr", calculate_atr),
+        ("threshold", calculate_threshold),
+        ("grid", calculate_grid_range),
+        ("score", calculate_score),
+        ("strategy", run_strategy),
+        ("paper_trader", run_paper_trader),
+    ]
+
     # 엔진 실행 간격 (초)
-    intervals = {
-        "atr": 86400,           # 매일
-        "threshold": 300,       # 5분
-        "grid": 14400,          # 4시간
-        "score": 600,           # 10분
-        "strategy": 60,         # 1분 → step 단위로 매번
-        "paper_trader": 60,     # 1분 → step 단위로 매번
-    }
+    intervals = BT_ENGINE_INTERVALS
 
     # 마지막 실행 시간 추적
     last_run = {key: 0.0 for key in intervals}
     last_log = 0.0
+    last_snapshot = start_ts
+    last_checkpoint = start_ts
 
     # 결과 수집
     results = {sym: {"equity_snapshots": []} for sym in symbols}
+    curve = EquityCurve(symbols)
 
     wall_start = real_time.time()
     steps_done = 0
+    steps_executed = 0
+
+    if saved:
+        last_run.update(saved["last_run"])
+        last_log = saved["last_log"]
+        last_snapshot = last_checkpoint = saved["clock_ts"]
+        results = saved["results"]
+        steps_done = saved["steps_done"]
+        steps_executed = saved["steps_executed"]
+        restore_engine_caches(saved["engine_caches"])
+        curve = EquityCurve.from_state(symbols, saved.get("equity_curve", {}))
+        print(f"[BT] 체크포인트 재개: {clock.now().strftime('%Y-%m-%d %H:%M')} "
+              f"({steps_done:,}/{total_steps:,} 스텝)")
+
     print_interval = max(1, total_steps // 20)  # 5% 단위 진행률
 
     # 엔진 출력 억제용
     real_stdout = sys.stdout
     suppress = _SuppressPrint(real_stdout)
 
-    with BacktestContext(clock, BT_DB_PATH) as ctx:
+    with BacktestContext(clock, db_path, in_memory=in_memory,
+                         shareable=bool(variants)) as ctx:
         # In-memory drip-feed 초기화
-        print("[BT] 데이터 로드 (look-ahead bias 방지)...")
-        feeder = _DataFeeder(ctx._shared_conn)
-        feeder.load_and_clear()
-
-        for step in range(total_steps):
-            clock.advance(BT_STEP_SECONDS)
-            current_ts = clock.timestamp
-            steps_done += 1
-
-            # Drip-feed: 현재 시뮬레이션 시간까지의 데이터만 DB에 삽입
-            feeder.drip(current_ts)
-
-            # 주기적 commit (매 스텝이 아닌 200 스텝마다)
-            if steps_done % 200 == 0:
-                ctx._shared_conn.commit()
-
-            # 엔진 print 억제
-            sys.stdout = suppress
-
-            # ---- 엔진 실행 (간격 체크) ----
-
-            # ATR: 매일
-            if current_ts - last_run["atr"] >= intervals["atr"]:
-                for sym in symbols:
-                    try:
-                        calculate_atr(sym)
-                    except Exception:
-                        pass
-                last_run["atr"] = current_ts
-
-            # Threshold: 5분
-            if current_ts - last_run["threshold"] >= intervals["threshold"]:
-                for sym in symbols:
-                    try:
-                        calculate_threshold(sym)
-                    except Exception:
-                        pass
-                last_run["threshold"] = current_ts
-
-            # Grid: 4시간
-            if current_ts - last_run["grid"] >= intervals["grid"]:
-                for sym in symbols:
-                    try:
-                        calculate_grid_range(sym)
-                    except Exception:
-                        pass
-                last_run["grid"] = current_ts
-
-            # Score: 10분
-            if current_ts - last_run["score"] >= intervals["score"]:
-                for sym in symbols:
-                    try:
-                        calculate_score(sym)
-                    except Exception:
-                        pass
-                last_run["score"] = current_ts
-
-            # Strategy: 매 스텝
-            if current_ts - last_run["strategy"] >= intervals["strategy"]:
-                for sym in symbols:
-                    try:
-                        run_strategy(sym)
-                    except Exception:
-                        pass
-                last_run["strategy"] = current_ts
-
-            # Paper Trader: 매 스텝
-            if current_ts - last_run["paper_trader"] >= intervals["paper_trader"]:
-                for sym in symbols:
-                    try:
-                        run_paper_trader(sym)
-                    except Exception:
-                        pass
-                last_run["paper_trader"] = current_ts
-
-            # 엔진 print 복원
+        feeder = _DataFeeder(ctx._shared_conn, buffers=feeder_buffers)
+        cache = None
+        if engine_cache:
+            # 데이터셋 지문 계산 — load_and_clear() 전 (전체 데이터가 DB에 있는 시점)
+            # 템플릿 사본은 drip 대상이 비어 있음 — 지문은 데이터셋 생성 시 계산한 값
+            fingerprints = (saved["engine_cache"] if saved
+                            else manifest["fingerprints"] if manifest else None)
+            cache = EngineCache(ctx._shared_conn, clock, symbols, start_ts, intervals,
+                                fingerprints=fingerprints)
+            ctx._stack.callback(cache.close)
+            engines = [(key, cache.wrap(key, engine) if key in ENGINE_SPECS else engine)
+                       for key, engine in engines]
+        fanout = None
+        if variants:
+            fanout = ctx._stack.enter_context(StrategyFanout(
+                ctx._shared_conn, ctx.attach_target, symbols, variants, intervals))
+            engines = [(key, fanout.wrap(engine) if key in VARIANT_ENGINES else engine)
+                       for key, engine in engines]
+        if saved:
+            feeder.restore(feeder_buffers, saved["cursors"])
+        elif manifest:
+            feeder.load_prepared()
+            if checkpoint_interval > 0:
+                checkpoint.save_buffers(db_path, feeder._buffers)
+        else:
+            print("[BT] 데이터 로드 (look-ahead bias 방지)...")
+            feeder.load_and_clear()
+            if checkpoint_interval > 0:
+                checkpoint.save_buffers(db_path, feeder._buffers)
+        profiler.attach(ctx._shared_conn)
+        replay = None
+        if grid_v2:
+            replay = ctx._stack.enter_context(GridReplay(ctx._shared_conn, clock, symbols))
+
+        try:
+            while steps_done < total_steps:
+                if event_skip:
+                    next_step = _next_event_step(
+                        steps_done, start_ts, total_steps,
+                        last_run, intervals, last_log,
+                    )
+                else:
+                    next_step = steps_done + 1
+                prev_step = steps_done
+                clock.advance((next_step - steps_done) * BT_STEP_SECONDS)
+                current_ts = clock.timestamp
+                steps_done = next_step
+                steps_executed += 1
+
+                # Drip-feed: 현재 시뮬레이션 시간까지의 데이터만 DB에 삽입
+                profiler.call("_DataFeeder.drip", feeder.drip, current_ts, swallow=False)
+
+                # 주기적 commit (매 스텝이 아닌 200 스텝마다)
+                if steps_done // 200 > prev_step // 200:
+                    ctx._shared_conn.commit()
+
+                # in-memory 체크포인트 (디스크 스냅샷)
+                if (in_memory and BT_SNAPSHOT_INTERVAL > 0
+                        and current_ts - last_snapshot >= BT_SNAPSHOT_INTERVAL):
+                    ctx.snapshot()
+                    last_snapshot = current_ts
+
+                # 엔진 print 억제
+                sys.stdout = suppress
+
+                # ---- 엔진 실행 (간격 체크) ----
+
+                for key, engine in engines:
+                    if current_ts - last_run[key] >= intervals[key]:
+                        for sym in symbols:
+                            profiler.call(engine.__name__, engine, sym)
+                        last_run[key] = current_ts
+
+                # Grid V2 재생: 이번 스텝 구간을 30초 사이클로 (가상 시계 이동 후 복귀)
+                if replay:
+                    profiler.call("GridReplay.step", replay.step,
+                                  current_ts - (steps_done - prev_step) * BT_STEP_SECONDS,
+                                  current_ts)
+
+                # 스텝 해상도 equity 곡선 (증분 집계)
+                if fanout:
+                    profiler.call("EquityCurve.record", fanout.record, current_ts)
+                else:
+                    profiler.call("EquityCurve.record", curve.record,
+                                  ctx._shared_conn, current_ts)
+
+                # 엔진 print 복원
+                sys.stdout = real_stdout
+
+                # ---- 일별 로그 ----
+                if current_ts - last_log >= BT_LOG_INTERVAL:
+                    sim_date = clock.now().strftime("%Y-%m-%d")
+                    elapsed_wall = real_time.time() - wall_start
+                    progress = steps_done / total_steps * 100
+
+                    # 일별 equity 스냅샷 (곡선의 마지막 기록 값)
+                    if fanout:
+                        fanout.daily_snapshot(sim_date, current_ts)
+                    for sym in symbols:
+                        equity = curve.snapshot(sym)
+                        if equity:
+                            results[sym]["equity_snapshots"].append({
+                                "date": sim_date,
+                                "timestamp": current_ts,
+                                **equity,
+                                **({"grid_v2_equity": replay.exchange.get_equity()}
+                                   if replay else {}),
+                            })
+
+                    print(f"[BT] {sim_date} | progress={progress:.1f}% | "
+                          f"wall_time={elapsed_wall:.0f}s")
+                    last_log = current_ts
+
+                # 진행률 표시 (5% 단위)
+                elif steps_done // print_interval > prev_step // print_interval:
+                    progress = steps_done / total_steps * 100
+                    sim_date = clock.now().strftime("%Y-%m-%d")
+                    elapsed_wall = real_time.time() - wall_start
+                    print(f"[BT] {sim_date} | progress={progress:.0f}% | "
+                          f"wall_time={elapsed_wall:.0f}s", end="\r")
+
+                # ---- 체크포인트 (스텝 경계에서만 — 엔진 상태가 일관된 시점) ----
+                if (checkpoint_interval > 0 and steps_done < total_steps
+                        and current_ts - last_checkpoint >= checkpoint_interval):
+                    checkpoint.save_checkpoint(ctx._shared_conn, db_path, {
+                        "params": {"days": days, "symbols": symbols, "end_ts": end_ts,
+                                   "event_skip": event_skip},
+                        "clock_ts": current_ts,
+                        "steps_done": steps_done,
+                        "steps_executed": steps_executed,
+                        "last_run": last_run,
+                        "last_log": last_log,
+                        "cursors": feeder._cursors,
+                        "engine_caches": capture_engine_caches(),
+                        "equity_curve": curve.state(),
+                        "engine_cache": cache.fingerprints if cache else None,
+                        "results": results,
+                    })
+                    if cache:
+                        cache.flush()
+                    last_checkpoint = current_ts
+        except KeyboardInterrupt:
             sys.stdout = real_stdout
-
-            # ---- 일별 로그 ----
-            if current_ts - last_log >= BT_LOG_INTERVAL:
-                sim_date = clock.now().strftime("%Y-%m-%d")
-                elapsed_wall = real_time.time() - wall_start
-                progress = steps_done / total_steps * 100
-
-                # 간단한 equity 스냅샷 수집
-                for sym in symbols:
-                    try:
-                        equity = _get_equity_snapshot(sym)
-                        results[sym]["equity_snapshots"].append({
-                            "date": sim_date,
-                            "timestamp": current_ts,
-                            **equity,
-                        })
-                    except Exception:
-                        pass
-
-                print(f"[BT] {sim_date} | progress={progress:.1f}% | "
-                      f"wall_time={elapsed_wall:.0f}s")
-                last_log = current_ts
-
-            # 진행률 표시 (5% 단위)
-            elif steps_done % print_interval == 0:
-                progress = steps_done / total_steps * 100
-                sim_date = clock.now().strftime("%Y-%m-%d")
-                elapsed_wall = real_time.time() - wall_start
-                print(f"[BT] {sim_date} | progress={progress:.0f}% | "
-                      f"wall_time={elapsed_wall:.0f}s", end="\r")
+            if checkpoint_interval > 0 and checkpoint.has_checkpoint(db_path):
+                print(f"\n[BT] 중단됨 — --resume으로 마지막 체크포인트부터 재개 가능")
+            raise
 
         # 루프 종료 후 최종 commit
         ctx._shared_conn.commit()
+        profiler.detach()
+        for sym in symbols:
+            results[sym]["equity_curve"] = curve.arrays(sym)
+        if replay:
+            grid_summary = replay.summary()
+            for sym in symbols:
+                results[sym]["grid_v2"] = grid_summary
+        if fanout:
+            results = fanout.finish(db_path)
+
+    if checkpoint_interval > 0 or resume:
+        checkpoint.clear_checkpoint(db_path)
 
     wall_total = real_time.time() - wall_start
     print(f"\n\n[BT] 백테스트 완료! ({wall_total:.1f}초 소요)")
+    if event_skip:
+        print(f"[BT] 이벤트 스킵: {steps_executed:,}/{total_steps:,} 스텝 실행")
+    if cache:
+        cache.print_summary()
+    if fanout:
+        print(f"[Fanout] 변형 {len(variants)}개 → {VARIANT_DIR}")
+        for name, v in results.items():
+            errors = f" | 예외 {v['errors']}회" if v["errors"] else ""
+            print(f"[Fanout]   {name}: {v['params']}{errors}")
+    if grid_v2:
+        print_replay_summary(results[symbols[0]]["grid_v2"])
+    if profiler.enabled:
+        profiler.print_report(wall_total)
+        if profile_json:
+            profiler.dump_json(profile_json, wall_total)
 
     return results
 
 
-def _get_equity_snapshot(symbol: str) -> dict:
-    """현재 시점의 PnL 스냅샷"""
-    from db import get_connection
-    conn = get_connection()
-
-    # L2 실현 PnL
-    l2_row = conn.execute(
-        "SELECT COALESCE(SUM(pnl_weighted), 0) FROM paper_trades "
-        "WHERE symbol = ? AND status = 'CLOSED'",
-        (symbol,),
-    ).fetchone()
-    l2_realized = l2_row[0] if l2_row else 0
-
-    # L2 미실현 PnL
-    open_trade = conn.execute(
-        "SELECT direction, entry_price, entry_pct FROM paper_trades "
-        "WHERE symbol = ? AND status = 'OPEN' ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
-
-    l2_unrealized = 0.0
-    if open_trade:
-        price_row = conn.execute(
-            "SELECT close FROM klines WHERE symbol = ? AND interval = '5m' "
-            "ORDER BY open_time DESC LIMIT 1",
-            (symbol,),
-        ).fetchone()
-        if price_row and open_trade[1]:
-            current = price_row[0]
-            entry = open_trade[1]
-            direction = open_trade[0]
-            pct = open_trade[2]
-            if direction == "LONG":
-                l2_unrealized = ((current - entry) / entry * 100) * pct
-            else:
-                l2_unrealized = ((entry - current) / entry * 100) * pct
-
-    # L1 펀딩비 PnL
-    l1_row = conn.execute(
-        "SELECT COALESCE(SUM(funding_pnl_pct), 0) FROM paper_l1_funding WHERE symbol = ?",
-        (symbol,),
-    ).fetchone()
-    l1_pnl = l1_row[0] if l1_row else 0
-
-    # L4 그리드 PnL
-    l4_row = conn.execute(
-        "SELECT COALESCE(SUM(pnl_pct), 0) FROM paper_l4_grid "
-        "WHERE symbol = ? AND side = 'SELL'",
-        (symbol,),
-    ).fetchone()
-    l4_pnl = l4_row[0] if l4_row else 0
-
-    conn.close()
-
-    total = l2_realized + l2_unrealized + l1_pnl + l4_pnl
-
-    return {
-        "l2_realized": round(l2_realized, 4),
-        "l2_unrealized": round(l2_unrealized, 4),
-        "l1_pnl": round(l1_pnl, 4),
-        "l4_pnl": round(l4_pnl, 4),
-        "total_pnl": round(total, 4),
-    }
-
-
-if __name__ == "__main__":
-    import sys, os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    if sys.platform == "win32":
-        sys.stdout.reconfigure(encoding="utf-8")
-    results = run_backtest(days=7)
-    print("\nResults:", results)
+def reset_engine_caches():
+    """엔진 모듈 레벨 캐시 초기화 (같은 프로세스에서 백테스트를 반복 실행할 때)"""
+    import importlib
+
+    for mod_name, attr in _ENGINE_CACHES:
+        getattr(importlib.import_module(mod_name), attr).clear()
+
+
+def capture_engine_caches() -> dict:
+    """엔진 모듈 레벨 캐시 사본 (체크포인트용)"""
+    import importlib
+
+    return {f"{mod_name}.{attr}": dict(getattr(importlib.import_module(mod_name), attr))
+            for mod_name, attr in _ENGINE_CACHES}
+
+
+def restore_engine_caches(saved: dict):
+    """capture_engine_caches() 결과로 엔진 캐시 복원"""
+    import importlib
+
+    for mod_name, attr in _ENGINE_CACHES:
+        cache = getattr(importlib.import_module(mod_name), attr)
+        cache.clear()
+        cache.update(saved.get(f"{mod_name}.{attr}", {}))
+
+
+def _next_event_step(step: int, start_ts: float, total_steps: int,
+                     last_run: dict, intervals: dict, last_log: float) -> int:
+    """다음으로 무언가 일어나는 스텝 번호 계산 (이벤트 스킵 모드)
+
+    고정 스텝 루프와 같은 스텝 격자(start_ts + n * BT_STEP_SECONDS) 위에서
+    가장 이른 엔진 실행 예정 시각 / 일별 로그 시각 이후의 첫 스텝을 반환한다.
+    DB를 읽는 것은 엔진과 equity 스냅샷뿐이므로, 건너뛴 스텝의 데이터는
+    다음 실행 스텝의 drip에서 같은 순서로 한꺼번에 삽입되어 엔진이 보는
+    상태와 호출 순서가 고정 루프와 동일하다.
+    """
+    due_ts = min(last_run[key] + intervals[key] for key in intervals)
+    due_ts = min(due_ts, last_log + BT_LOG_INTERVAL)
+
+    n = max(step + 1, math.ceil((due_ts - start_ts) / BT_STEP_SECONDS))
+    # 부동소수점 오차 보정: due_ts 이상인 첫 격자점
+    while n > step + 1 and start_ts + (n - 1) * BT_STEP_SECONDS >= due_ts:
+        n -= 1
+    while n < total_steps and start_ts + n * BT_STEP_SECONDS < due_ts:
+        n += 1
+    return min(n, total_steps)
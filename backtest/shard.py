@@ -0,0 +1,79 @@
+"""심볼 샤딩 병렬 백테스트 — 심볼별로 워커 프로세스 + 개별 DB 슬라이스
+
+모든 엔진이 심볼 단위로 독립이므로, 심볼마다 backtest.db에서 해당 심볼 행만
+남긴 사본(data/shards/{symbol}.db)을 만들어 별도 프로세스에서 run_backtest를
+실행한다. 결과는 generate_report(symbol_dbs=...)로 하나의 리포트로 합친다.
+"""
+import contextlib
+import io
+import os
+import time as real_time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from backtest.config_bt import BT_DAYS, BT_DB_PATH, BT_SYMBOLS
+from backtest.db_bt import clone_backtest_db
+
+# 샤드 DB 저장 위치
+SHARD_DIR = BT_DB_PATH.parent / "shards"
+
+
+def shard_db_path(symbol: str) -> Path:
+    """심볼별 샤드 DB 경로"""
+    return SHARD_DIR / f"{symbol}.db"
+
+
+def _run_shard(symbol: str, days: int, end_ts: float, base_db: str, shard_db: str,
+               in_memory: bool, event_skip: bool) -> tuple[str, dict, float]:
+    """워커 프로세스: 심볼 슬라이스 DB에서 단일 심볼 백테스트"""
+    from backtest.runner import RunOptions, run_backtest
+
+    # 샤드 경로는 부모가 결정 (spawn 워커는 부모의 모듈 상태를 물려받지 않음)
+    shard_db = clone_backtest_db(Path(base_db), Path(shard_db), symbols=[symbol])
+
+    wall_start = real_time.time()
+    # 워커 출력은 버림 (여러 심볼 진행률이 섞이지 않도록)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_backtest(days=days, symbols=[symbol], db_path=shard_db, end_ts=end_ts,
+                               options=RunOptions(event_skip=event_skip, in_memory=in_memory,
+                                                  checkpoint_interval=0))
+    return symbol, results.get(symbol, {}), real_time.time() - wall_start
+
+
+def run_sharded_backtest(days: int = None, symbols: list = None,
+                         workers: int = None, end_ts: float = None,
+                         base_db: Path = None, in_memory: bool = None,
+                         event_skip: bool = None) -> tuple[dict, dict]:
+    """심볼별 프로세스 병렬 백테스트
+
+    Returns:
+        tuple: (run_backtest 형식 결과 {symbol: {...}}, 샤드 DB 경로 {symbol: Path})
+    """
+    days = days or BT_DAYS
+    symbols = symbols or BT_SYMBOLS
+    base_db = Path(base_db or BT_DB_PATH)
+    workers = workers or min(len(symbols), os.cpu_count() or 1)
+    end_ts = end_ts or real_time.time()
+
+    print(f"[BT-Shard] {len(symbols)}개 심볼 → {workers}개 프로세스")
+
+    wall_start = real_time.time()
+    results = {}
+    shard_dbs = {sym: shard_db_path(sym) for sym in symbols}
+    # max_tasks_per_child=1: 심볼마다 새 프로세스 (엔진 모듈 캐시 공유 방지)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [
+            pool.submit(_run_shard, sym, days, end_ts, str(base_db), str(shard_dbs[sym]),
+                        in_memory, event_skip)
+            for sym in symbols
+        ]
+        for future in as_completed(futures):
+            sym, sym_results, elapsed = future.result()
+            results[sym] = sym_results
+            print(f"[BT-Shard] {sym} 완료 ({elapsed:.1f}초)")
+
+    print(f"[BT-Shard] 전체 완료 ({real_time.time() - wall_start:.1f}초)")
+
+    # 입력 순서 유지
+    ordered = {sym: results[sym] for sym in symbols}
+    return ordered, shard_dbs
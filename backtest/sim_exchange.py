@@ -0,0 +1,314 @@
+"""시뮬레이션 선물 거래소 — BinanceExecutor 인터페이스 호환 (오프라인 Grid V2 재생용)
+
+engines.live_trader는 _get_executor()가 돌려주는 객체의 메서드만 호출하므로,
+live_trader._executor에 SimExchange를 넣으면 라이브 코드 그대로 과거 데이터 위에서 돈다.
+
+체결 모델:
+- 지정가(GTC): 대기 주문은 match()에 전달된 가격 구간 [low, high]가 지정가에 닿으면 지정가로 체결 (maker)
+  주문 시점에 이미 현재가를 넘어선 지정가는 즉시 현재가로 체결 (taker)
+- 시장가: 현재가 ± slippage로 즉시 체결 (taker)
+- 포지션: 원웨이 모드 넷 포지션 (평균 진입가, 반대 방향 체결 시 실현 손익 → 지갑 잔고 반영)
+- 증거금: 심볼별 max(|포지션 + 매수 주문|, |포지션 - 매도 주문|) 명목가 / 레버리지 (Binance 원웨이 방식)
+  가용 잔고 = 지갑 + 미실현 손익 - 증거금 합계, 주문으로 늘어나는 증거금이 가용 잔고보다 크면 거절 → None
+
+응답은 Binance REST와 같은 dict 형태(수량/가격은 문자열)로 돌려준다.
+부분 체결, 펀딩비, 청산은 시뮬레이션하지 않는다.
+"""
+import clock
+from backtest.config_bt import BT_INITIAL_CAPITAL, BT_SIM_MARKET_SLIPPAGE
+from config import LIVE_LEVERAGE, MAKER_FEE_RATE, TAKER_FEE_RATE
+from engines.binance_executor import _format_qty, _format_price
+
+
+class SimExchange:
+    """BinanceExecutor 호환 가상 거래소"""
+
+    def __init__(self, initial_balance: float = BT_INITIAL_CAPITAL,
+                 leverage: int = LIVE_LEVERAGE,
+                 maker_fee: float = MAKER_FEE_RATE, taker_fee: float = TAKER_FEE_RATE,
+                 slippage: float = BT_SIM_MARKET_SLIPPAGE):
+        self.wallet = float(initial_balance)
+        self.initial_balance = float(initial_balance)
+        self.default_leverage = leverage
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.slippage = slippage
+
+        self._orders = {}       # orderId → 주문 dict
+        self._open = {}         # symbol → {orderId: 주문 dict}
+        self._positions = {}    # symbol → [positionAmt, entryPrice]
+        self._marks = {}        # symbol → 현재가
+        self._leverage = {}     # symbol → 레버리지
+        self._next_id = 1
+
+        # 집계
+        self.fees_paid = 0.0
+        self.realized_pnl = 0.0
+        self.maker_fills = 0
+        self.taker_fills = 0
+        self.rejected = 0
+
+    # ============================
+    # 가격 피드 / 체결 엔진
+    # ============================
+
+    def set_mark(self, symbol: str, price: float):
+        """현재가 갱신 (체결 판정 없음)"""
+        self._marks[symbol] = float(price)
+
+    def match(self, symbol: str, low: float, high: float, price: float):
+        """가격 구간 [low, high]를 지나간 뒤 현재가가 price가 됨 — 닿은 대기 주문 체결"""
+        for order in list(self._open.get(symbol, {}).values()):
+            limit = float(order["price"])
+            if (order["side"] == "BUY" and low <= limit) or \
+                    (order["side"] == "SELL" and high >= limit):
+                self._fill(order, limit, maker=True)
+        self._marks[symbol] = float(price)
+
+    def _fill(self, order: dict, price: float, maker: bool):
+        symbol = order["symbol"]
+        qty = float(order["origQty"])
+        fee = price * qty * (self.maker_fee if maker else self.taker_fee)
+        self._apply_fill(symbol, order["side"], qty, price, fee)
+
+        order.update({
+            "status": "FILLED",
+            "executedQty": order["origQty"],
+            "avgPrice": f"{price:.8f}",
+            "cumQuote": f"{price * qty:.8f}",
+            "updateTime": int(clock.time() * 1000),
+            "fills": [{"price": f"{price:.8f}", "qty": order["origQty"],
+                       "commission": f"{fee:.8f}", "commissionAsset": "USDT"}],
+        })
+        self._open.get(symbol, {}).pop(order["orderId"], None)
+        if maker:
+            self.maker_fills += 1
+        else:
+            self.taker_fills += 1
+
+    def _apply_fill(self, symbol: str, side: str, qty: float, price: float, fee: float):
+        """넷 포지션 갱신 + 실현 손익/수수료를 지갑에 반영"""
+        amt, entry = self._positions.get(symbol, (0.0, 0.0))
+        signed = qty if side == "BUY" else -qty
+        realized = 0.0
+
+        if amt == 0 or (amt > 0) == (signed > 0):
+            # 신규/추가 진입 → 평균 진입가
+            new_amt = amt + signed
+            entry = (abs(amt) * entry + qty * price) / abs(new_amt)
+        else:
+            # 감소/청산 (초과분은 반대 방향 신규 진입)
+            closed = min(qty, abs(amt))
+            realized = (price - entry) * closed * (1 if amt > 0 else -1)
+            new_amt = amt + signed
+            if abs(new_amt) < 1e-12:
+                new_amt, entry = 0.0, 0.0
+            elif (new_amt > 0) != (amt > 0):
+                entry = price
+
+        self._positions[symbol] = (new_amt, entry)
+        self.wallet += realized - fee
+        self.realized_pnl += realized
+        self.fees_paid += fee
+
+    # ============================
+    # 증거금
+    # ============================
+
+    def _unrealized(self, symbol: str) -> float:
+        amt, entry = self._positions.get(symbol, (0.0, 0.0))
+        mark = self._marks.get(symbol, entry)
+        return (mark - entry) * amt
+
+    def _symbol_margin(self, symbol: str, side: str = None, notional: float = 0.0) -> float:
+        """포지션 + 미체결 주문 증거금 (side/notional: 추가로 낼 주문 가정)"""
+        amt, _ = self._positions.get(symbol, (0.0, 0.0))
+        position = amt * self._marks.get(symbol, 0.0)
+        buys = sells = 0.0
+        for order in self._open.get(symbol, {}).values():
+            value = float(order["origQty"]) * float(order["price"])
+            if order["side"] == "BUY":
+                buys += value
+            else:
+                sells += value
+        if side == "BUY":
+            buys += notional
+        elif side == "SELL":
+            sells += notional
+        return max(abs(position + buys), abs(position - sells)) / self._get_leverage(symbol)
+
+    def _used_margin(self) -> float:
+        symbols = set(self._positions) | set(self._open)
+        return sum(self._symbol_margin(s) for s in symbols)
+
+    def _get_leverage(self, symbol: str) -> int:
+        return self._leverage.get(symbol, self.default_leverage)
+
+    def _has_margin(self, symbol: str, side: str, qty: float, price: float) -> bool:
+        """주문으로 늘어나는 증거금 ≤ 가용 잔고 (포지션을 줄이는 주문은 항상 통과)"""
+        added = self._symbol_margin(symbol, side, qty * price) - self._symbol_margin(symbol)
+        return added <= 0 or self.get_account_balance() >= added
+
+    # ============================
+    # 주문 API (BinanceExecutor 호환)
+    # ============================
+
+    def _new_order(self, symbol: str, side: str, order_type: str, quantity: float,
+                   price: float = None, client_order_id: str = None,
+                   time_in_force: str = None) -> dict | None:
+        side = side.upper()
+        qty_str = _format_qty(symbol, quantity)
+        if float(qty_str) <= 0:
+            self.rejected += 1
+            return None
+
+        order_id = self._next_id
+        self._next_id += 1
+        order = {
+            "orderId": order_id,
+            "clientOrderId": client_order_id or f"sim_{order_id}",
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "timeInForce": time_in_force or "GTC",
+            "price": _format_price(symbol, price) if price is not None else "0",
+            "origQty": qty_str,
+            "executedQty": "0",
+            "avgPrice": "0",
+            "cumQuote": "0",
+            "status": "NEW",
+            "updateTime": int(clock.time() * 1000),
+        }
+        self._orders[order_id] = order
+        return order
+
+    def place_market_order(self, symbol: str, side: str, quantity: float) -> dict | None:
+        """시장가 주문 — 현재가 ± slippage 즉시 체결"""
+        mark = self._marks.get(symbol)
+        if not mark:
+            return None
+        side = side.upper()
+        fill_price = mark * (1 + self.slippage if side == "BUY" else 1 - self.slippage)
+        if not self._has_margin(symbol, side, quantity, fill_price):
+            self.rejected += 1
+            return None
+        order = self._new_order(symbol, side, "MARKET", quantity)
+        if order is None:
+            return None
+        self._fill(order, fill_price, maker=False)
+        return dict(order)
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float,
+                          price: float, time_in_force: str = "GTC") -> dict | None:
+        """지정가 주문 (LIMIT)"""
+        return self.place_limit_order_with_id(symbol, side, quantity, price,
+                                              None, time_in_force)
+
+    def place_limit_order_with_id(self, symbol: str, side: str, quantity: float,
+                                  price: float, client_order_id: str,
+                                  time_in_force: str = "GTC") -> dict | None:
+        """clientOrderId 포함 지정가 주문 — 현재가를 넘어선 가격이면 즉시 체결(taker)"""
+        side = side.upper()
+        if not self._has_margin(symbol, side, quantity, price):
+            self.rejected += 1
+            return None
+        order = self._new_order(symbol, side, "LIMIT", quantity, price,
+                                client_order_id, time_in_force)
+        if order is None:
+            return None
+
+        limit = float(order["price"])
+        mark = self._marks.get(symbol)
+        if mark and ((side == "BUY" and limit >= mark) or (side == "SELL" and limit <= mark)):
+            self._fill(order, mark, maker=False)
+        else:
+            self._open.setdefault(symbol, {})[order["orderId"]] = order
+        return dict(order)
+
+    def cancel_order(self, symbol: str, order_id: str) -> dict | None:
+        """주문 취소 — 이미 체결/취소된 주문이면 None (Binance -2011과 동일)"""
+        order = self._open.get(symbol, {}).pop(int(order_id), None)
+        if order is None:
+            return None
+        order["status"] = "CANCELED"
+        order["updateTime"] = int(clock.time() * 1000)
+        return dict(order)
+
+    def cancel_all_orders(self, symbol: str) -> bool:
+        """심볼의 모든 오픈 주문 취소"""
+        for order_id in list(self._open.get(symbol, {})):
+            self.cancel_order(symbol, order_id)
+        return True
+
+    def get_open_orders(self, symbol: str) -> list:
+        """심볼의 오픈 주문 조회"""
+        return [dict(o) for o in self._open.get(symbol, {}).values()]
+
+    def get_order_status(self, symbol: str, order_id: int) -> dict | None:
+        """특정 주문 상태 조회"""
+        order = self._orders.get(int(order_id))
+        if order is None or order["symbol"] != symbol:
+            return None
+        return dict(order)
+
+    def get_mark_price(self, symbol: str) -> float | None:
+        """현재 가격 (가격 피드 기준)"""
+        return self._marks.get(symbol)
+
+    # ============================
+    # 계좌 조회
+    # ============================
+
+    def get_account_balance(self) -> float:
+        """USDT 가용 잔고 (availableBalance)"""
+        unrealized = sum(self._unrealized(s) for s in self._positions)
+        return max(0.0, self.wallet + unrealized - self._used_margin())
+
+    def get_total_balance(self) -> float:
+        """USDT 지갑 잔고 (walletBalance — 미실현 손익 제외)"""
+        return self.wallet
+
+    def get_equity(self) -> float:
+        """지갑 잔고 + 미실현 손익"""
+        return self.wallet + sum(self._unrealized(s) for s in self._positions)
+
+    def get_positions(self, symbol: str = None) -> list:
+        """오픈 포지션 조회 (positionAmt != 0만)"""
+        positions = []
+        for sym, (amt, entry) in self._positions.items():
+            if amt == 0 or (symbol and sym != symbol):
+                continue
+            positions.append({
+                "symbol": sym,
+                "positionAmt": f"{amt:.8f}",
+                "entryPrice": f"{entry:.8f}",
+                "markPrice": f"{self._marks.get(sym, entry):.8f}",
+                "unRealizedProfit": f"{self._unrealized(sym):.8f}",
+                "leverage": str(self._get_leverage(sym)),
+                "marginType": "cross",
+            })
+        return positions
+
+    def set_leverage(self, symbol: str, leverage: int) -> bool:
+        self._leverage[symbol] = leverage
+        return True
+
+    def set_margin_type(self, symbol: str, margin_type: str = "CROSSED") -> bool:
+        return True
+
+    def summary(self) -> dict:
+        """실행 결과 집계"""
+        equity = self.get_equity()
+        return {
+            "initial_balance": self.initial_balance,
+            "wallet_balance": round(self.wallet, 4),
+            "equity": round(equity, 4),
+            "return_pct": round((equity / self.initial_balance - 1) * 100, 4),
+            "realized_pnl": round(self.realized_pnl, 4),
+            "fees_paid": round(self.fees_paid, 4),
+            "maker_fills": self.maker_fills,
+            "taker_fills": self.taker_fills,
+            "rejected": self.rejected,
+            "open_orders": sum(len(o) for o in self._open.values()),
+            "positions": {s: round(amt, 8) for s, (amt, _) in self._positions.items() if amt},
+        }
@@ -0,0 +1,314 @@
+"""파라미터 스윕 — 설정 조합별 run_backtest를 프로세스 풀에서 병렬 실행
+
+각 워커는 backtest.db의 개별 사본에서 실행되며, config 상수 오버라이드는
+워커 프로세스 안에서만 적용되므로 서로 간섭하지 않는다.
+"""
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import time as real_time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from backtest.config_bt import BT_DAYS, BT_DB_PATH, BT_SYMBOLS
+from backtest.db_bt import clone_backtest_db, remove_backtest_db
+
+# 스윕 실행 결과 DB 저장 위치
+SWEEP_DIR = BT_DB_PATH.parent / "sweep"
+
+# config 상수를 `from config import X`로 가져가는 모듈들 — 오버라이드 시 함께 패치
+_OVERRIDE_MODULES = [
+    "config",
+    "engines.atr",
+    "engines.dynamic_threshold",
+    "engines.grid_range",
+    "engines.scorer",
+    "engines.strategy_manager",
+    "engines.paper_trader",
+    "engines.macro_guard",
+    "engines.mtf_analyzer",
+]
+
+# config 상수가 아니라 실행별 DB 사본의 데이터를 다시 생성하는 키
+# BT_LIQ_MODEL: 합성 청산 모델 (downloader.LIQUIDATION_MODELS) — 사본의 청산 데이터를 교체
+DATA_OVERRIDES = ("BT_LIQ_MODEL",)
+
+# 랭킹 기준: (키, 내림차순 여부)
+RANK_KEYS = {
+    "total_pnl": True,
+    "sharpe": True,
+    "max_drawdown": False,
+    "l2_win_rate": True,
+}
+
+
+def apply_overrides(overrides: dict) -> dict:
+    """config 상수 오버라이드 적용 — config 및 엔진 모듈의 로컬 참조까지 교체
+
+    Returns:
+        dict: 복원용 원래 값 {(module, name): value}
+    """
+    import importlib
+
+    original = {}
+    for mod_name in _OVERRIDE_MODULES:
+        module = importlib.import_module(mod_name)
+        for name, value in overrides.items():
+            if hasattr(module, name):
+                original[(mod_name, name)] = getattr(module, name)
+                setattr(module, name, value)
+
+    unknown = [name for name in overrides
+               if ("config", name) not in original]
+    if unknown:
+        raise KeyError(f"알 수 없는 config 키: {', '.join(unknown)}")
+    return original
+
+
+def split_overrides(overrides: dict) -> tuple[dict, dict]:
+    """오버라이드 → (config 상수, 데이터 재생성 키) 분리"""
+    config = {k: v for k, v in overrides.items() if k not in DATA_OVERRIDES}
+    data = {k: v for k, v in overrides.items() if k in DATA_OVERRIDES}
+    return config, data
+
+
+def prepare_run_db(run_db: Path, symbols: list, data_overrides: dict):
+    """실행별 DB 사본에 데이터 오버라이드 적용 (합성 청산 모델 교체 등)"""
+    model = data_overrides.get("BT_LIQ_MODEL")
+    if model:
+        from backtest.downloader import generate_synthetic_liquidations
+        generate_synthetic_liquidations(symbols, model=model, db_path=run_db, replace=True)
+
+
+def restore_overrides(original: dict):
+    """apply_overrides()가 반환한 원래 값 복원"""
+    import importlib
+
+    for (mod_name, name), value in original.items():
+        setattr(importlib.import_module(mod_name), name, value)
+
+
+def parse_grid(items: list[str], option: str = "--grid") -> dict:
+    """CLI ["KEY=v1,v2", ...] → {KEY: [v1, v2]} (값은 JSON 숫자/불리언 우선, 실패 시 문자열)"""
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not key or not values:
+            raise SystemExit(f"[ERROR] 잘못된 {option} 형식: {item} (KEY=v1,v2,...)")
+        grid[key.strip()] = [_parse_value(v.strip()) for v in values.split(",")]
+    return grid
+
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def rank_results(results: list[dict], rank_by: str) -> list[dict]:
+    """rank_by 기준 정렬 (오류 실행은 맨 뒤)"""
+    descending = RANK_KEYS[rank_by]
+    return sorted(results, key=lambda r: (r["error"] is not None,
+                                          -r[rank_by] if descending else r[rank_by]))
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    """{키: [값...]} 그리드 → 조합 리스트 (카테시안 곱)"""
+    keys = list(grid.keys())
+    return [dict(zip(keys, values))
+            for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def summarize(report: dict) -> dict:
+    """generate_report() 결과 → 심볼 합산 지표"""
+    rows = list(report.values())
+    if not rows:
+        return {"total_pnl": 0.0, "sharpe": 0.0, "max_drawdown": 0.0,
+                "l2_trades": 0, "l2_win_rate": 0.0}
+
+    l2_trades = sum(r["l2"]["total_trades"] for r in rows)
+    l2_wins = sum(r["l2"]["wins"] for r in rows)
+    return {
+        "total_pnl": round(sum(r["combined"]["total_pnl"] for r in rows), 4),
+        "sharpe": round(sum(r["combined"]["sharpe"] for r in rows) / len(rows), 2),
+        "max_drawdown": round(max(r["combined"]["max_drawdown"] for r in rows), 2),
+        "l2_trades": l2_trades,
+        "l2_win_rate": round(l2_wins / l2_trades * 100, 1) if l2_trades else 0.0,
+    }
+
+
+def _run_one(run_id: int, overrides: dict, days: int, symbols: list,
+             end_ts: float, base_db: str, run_db: str, in_memory: bool,
+             keep_db: bool, engine_cache: bool = True, dataset: str = None) -> dict:
+    """워커 프로세스: 개별 DB 사본 + config 오버라이드로 백테스트 1회 실행
+
+    dataset 지정 시 템플릿 사본 + 이벤트 스트림으로 실행 (데이터 재생성 조합은 원본 DB 사본)
+    """
+    from backtest.runner import RunOptions, run_backtest
+    from backtest.report import generate_report
+
+    run_db = Path(run_db)
+    config_overrides, data_overrides = split_overrides(overrides)
+    if data_overrides or not dataset:
+        clone_backtest_db(Path(base_db), run_db)
+        dataset = None
+    apply_overrides(config_overrides)
+
+    wall_start = real_time.time()
+    error = None
+    report = {}
+    try:
+        # 워커 출력은 버림 (진행률/리포트가 섞이지 않도록)
+        with contextlib.redirect_stdout(io.StringIO()):
+            prepare_run_db(run_db, symbols, data_overrides)
+            equity = run_backtest(days=days, symbols=symbols, db_path=run_db, end_ts=end_ts,
+                                  options=RunOptions(in_memory=in_memory, checkpoint_interval=0,
+                                                     engine_cache=engine_cache, dataset=dataset))
+            report = generate_report(symbols, end_ts - days * 86400, end_ts,
+                                     equity_data=equity, db_path=run_db)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        if not keep_db:
+            remove_backtest_db(run_db)
+
+    return {
+        "run_id": run_id,
+        "params": overrides,
+        "wall_time": round(real_time.time() - wall_start, 1),
+        "error": error,
+        "report": report,
+        **summarize(report),
+    }
+
+
+def run_sweep(grid: dict, days: int = None, symbols: list = None,
+              workers: int = None, rank_by: str = "total_pnl",
+              base_db: Path = None, in_memory: bool = True,
+              keep_dbs: bool = False, export_csv: bool = False,
+              engine_cache: bool = True, dataset: str = None) -> list[dict]:
+    """파라미터 그리드 전체 조합을 병렬 백테스트 후 랭킹 반환
+
+    Args:
+        grid: {config 키: [값...]} 예) {"L2_MIN_SSM_SCORE": [1.0, 1.5, 2.0]}
+              DATA_OVERRIDES 키는 실행별 DB 사본에서 데이터를 재생성
+              예) {"BT_LIQ_MODEL": ["oi_delta", "poisson_burst"]}
+        days: 백테스트 기간 (일)
+        symbols: 심볼 리스트
+        workers: 프로세스 수 (기본: CPU 코어 수)
+        rank_by: 랭킹 기준 (RANK_KEYS)
+        base_db: 원본 backtest.db (기본: BT_DB_PATH, 수정되지 않음)
+        in_memory: 워커별 in-memory 실행 여부
+        keep_dbs: 실행별 DB 사본 보존 여부 (SWEEP_DIR)
+        export_csv: 랭킹 CSV 내보내기 여부
+        engine_cache: ATR/Threshold/Grid/Score 출력 재사용 (backtest.engine_cache) —
+            전략 파라미터만 바꾸는 조합은 첫 실행 이후 strategy/paper_trader만 계산
+        dataset: 준비된 데이터셋 이름 (backtest.dataset) — 워커가 템플릿 사본 + 이벤트 스트림으로
+            시작 (base_db 대신 데이터셋 원본 DB 사용)
+
+    Returns:
+        list[dict]: rank_by 기준 정렬된 실행 결과
+    """
+    days = days or BT_DAYS
+    symbols = symbols or BT_SYMBOLS
+    if dataset:
+        from backtest.dataset import load_manifest, source_db
+        load_manifest(dataset)
+        base_db = source_db(dataset)
+    base_db = Path(base_db or BT_DB_PATH)
+    workers = workers or os.cpu_count() or 1
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"rank_by는 {', '.join(RANK_KEYS)} 중 하나여야 합니다")
+
+    combos = expand_grid(grid)
+    # 모든 실행이 같은 시간 윈도우를 쓰도록 종료 시각 고정
+    end_ts = real_time.time()
+
+    print(f"\n{'='*60}")
+    print(f"  PARAMETER SWEEP: {len(combos)} combinations x {len(symbols)} symbols")
+    print(f"  Period: {days} days | Workers: {workers}")
+    print(f"{'='*60}")
+
+    # 원본에 config 키가 실제 존재하는지 실행 전에 확인
+    restore_overrides(apply_overrides(split_overrides(combos[0] if combos else {})[0]))
+    _validate_data_overrides(grid)
+
+    wall_start = real_time.time()
+    results = []
+    # max_tasks_per_child=1: 실행마다 새 프로세스 (엔진 모듈 캐시/오버라이드 잔존 방지)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        submit = lambda i: pool.submit(
+            _run_one, i, combos[i], days, symbols, end_ts,
+            str(base_db), str(SWEEP_DIR / f"run_{i:04d}.db"),
+            in_memory, keep_dbs, engine_cache, dataset,
+        )
+        # 엔진 캐시 예열: 조합이 워커보다 많으면 첫 실행을 먼저 끝내 나머지가 캐시를 재사용
+        warmup = engine_cache and len(combos) > workers
+        futures = [submit(0)] if warmup else []
+        if warmup:
+            futures[0].result()
+        futures += [submit(i) for i in range(len(futures), len(combos))]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            r = future.result()
+            results.append(r)
+            status = f"ERROR {r['error']}" if r["error"] else f"PnL={r['total_pnl']:+.2f}%"
+            print(f"[Sweep] {done}/{len(combos)} run#{r['run_id']} "
+                  f"({r['wall_time']:.0f}s) {status}")
+
+    results = rank_results(results, rank_by)
+
+    print(f"\n[Sweep] 완료 ({real_time.time() - wall_start:.1f}초)")
+    print_ranking(results, rank_by)
+
+    if export_csv:
+        _export_csv(results)
+
+    return results
+
+
+def _validate_data_overrides(grid: dict):
+    """데이터 재생성 키 값 사전 검증"""
+    from backtest.downloader import LIQUIDATION_MODELS
+
+    unknown = [m for m in grid.get("BT_LIQ_MODEL", []) if m not in LIQUIDATION_MODELS]
+    if unknown:
+        raise ValueError(f"알 수 없는 청산 모델: {', '.join(map(str, unknown))} "
+                         f"({', '.join(LIQUIDATION_MODELS)})")
+
+
+def print_ranking(results: list[dict], rank_by: str, top: int = 20):
+    """랭킹 테이블 출력"""
+    print(f"\n  --- Ranking by {rank_by} (top {min(top, len(results))}) ---")
+    print(f"  {'#':>3} {'PnL%':>9} {'Sharpe':>7} {'MaxDD%':>7} {'L2':>4} {'Win%':>6}  Params")
+    for rank, r in enumerate(results[:top], 1):
+        params = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+        if r["error"]:
+            print(f"  {rank:>3} {'ERROR':>9} {'':>7} {'':>7} {'':>4} {'':>6}  {params}")
+            continue
+        print(f"  {rank:>3} {r['total_pnl']:>+9.2f} {r['sharpe']:>7.2f} "
+              f"{r['max_drawdown']:>7.2f} {r['l2_trades']:>4} {r['l2_win_rate']:>6.1f}  {params}")
+
+
+def _export_csv(results: list[dict]):
+    """스윕 랭킹 CSV 내보내기"""
+    csv_path = BT_DB_PATH.parent / f"sweep_{real_time.strftime('%Y%m%d_%H%M%S')}.csv"
+    param_keys = sorted({k for r in results for k in r["params"]})
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Rank", *param_keys, "Combined PnL", "Sharpe",
+                         "Max Drawdown", "L2 Trades", "L2 Win Rate", "Error"])
+        for rank, r in enumerate(results, 1):
+            writer.writerow([
+                rank,
+                *(r["params"].get(k, "") for k in param_keys),
+                r["total_pnl"], r["sharpe"], r["max_drawdown"],
+                r["l2_trades"], r["l2_win_rate"], r["error"] or "",
+            ])
+
+    print(f"\n[Sweep] CSV 내보내기: {csv_path}")
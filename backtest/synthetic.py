@@ -0,0 +1,424 @@
+"""합성 시장 생성기 — 네트워크 없이 N개 심볼 x M일 백테스트 DB 생성
+
+Binance 데이터 엔드포인트는 OI/롱숏/테이커 히스토리를 30일까지만 주므로,
+50+ 심볼 / 수년 규모의 run_backtest·엔진 벤치마크는 이 생성기로 만든 DB를 사용한다.
+
+가격 과정 (기본 해상도 BT_SYNTH_BASE_INTERVAL):
+    레짐 전환 (BT_SYNTH_REGIMES, 지속 기간 지수분포) x 점프 확산
+    r = drift - σ²/2 + σ(√ρ·시장 팩터 + √(1-ρ)·개별 잡음) + 시장 점프·β + 개별 점프
+    시작가 ~ 로그 균등 [BT_SYNTH_MIN_PRICE, BT_SYNTH_MAX_PRICE] (엔진은 가격을 소수 2자리로 반올림하므로
+    1달러 미만 심볼은 그리드 범위가 한 점으로 붕괴해 주문이 나지 않음)
+파생 시계열:
+    klines      : 기본 해상도 → 5m/1h/4h/1d/1w 집계 (1h 이상은 워밍업 구간 포함)
+    liquidations: 변동성 스케일 Poisson + 점프 시 버스트 (하락=SELL 롱 청산, 상승=BUY 숏 청산)
+    oi_snapshots: 1h, 평균 회귀 + 변동 시 증가, 청산 명목가만큼 감소
+    long_short_ratios / taker_ratio: 1h, 가격 변동과 상관 (롱숏은 역추세, 테이커는 추세)
+    funding_rates: 8h, 직전 8시간 수익률 + 잡음
+    fear_greed  : 1d, 시장 팩터 30일 모멘텀
+    orderbook_walls: ORDERBOOK_INTERVAL마다 로그 가격 격자 위 매수/매도벽 (연속 스캔에서 가격 유지)
+
+시간값 형식(ms/s/ISO)은 downloader.build_backtest_db와 같으므로 러너가 그대로 drip 한다.
+"""
+import math
+import sqlite3
+import time as real_time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from backtest.config_bt import (
+    BT_DB_PATH, BT_DAYS,
+    BT_SYNTH_SEED, BT_SYNTH_BASE_INTERVAL, BT_SYNTH_WARMUP_DAYS, BT_SYNTH_CORRELATION,
+    BT_SYNTH_MIN_PRICE, BT_SYNTH_MAX_PRICE,
+    BT_SYNTH_JUMP_MEAN, BT_SYNTH_JUMP_STD, BT_SYNTH_LIQ_PER_HOUR,
+    BT_SYNTH_WALLS_PER_SIDE, BT_SYNTH_REGIMES,
+)
+from backtest.db_bt import init_backtest_db
+from config import ORDERBOOK_INTERVAL
+
+_INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "1h": 3_600_000,
+    "4h": 14_400_000, "1d": 86_400_000, "1w": 604_800_000,
+}
+# Binance 주봉은 월요일 00:00 UTC 시작 (1970-01-05)
+_WEEK_ORIGIN_MS = 4 * 86_400_000
+_HOUR_MS = 3_600_000
+_FUNDING_MS = 8 * _HOUR_MS
+_YEAR_S = 365 * 86400
+
+# 오더북 벽 가격 격자 (로그 간격 0.5%)
+_WALL_GRID = np.log(1.005)
+
+
+def synthetic_symbols(n: int) -> list[str]:
+    """합성 심볼 이름 목록 (SYN000USDT, SYN001USDT, ...)"""
+    return [f"SYN{i:03d}USDT" for i in range(n)]
+
+
+def generate_market_db(db_path: Path = None, symbols: list = None, days: int = None,
+                       end_ts: float = None, seed: int = None,
+                       base_interval: str = None) -> Path:
+    """합성 시장 데이터로 백테스트 DB 생성 (기존 파일은 init_backtest_db가 삭제)
+
+    Args:
+        db_path: DB 경로 (기본: BT_DB_PATH)
+        symbols: 심볼 목록 (기본: synthetic_symbols(10))
+        days: 백테스트 기간 (일)
+        end_ts: 종료 시각 (기본: 현재) — run_backtest의 end_ts와 맞춰야 기간이 일치
+        seed: 난수 시드 (같은 시드/심볼 수/기간이면 같은 DB)
+        base_interval: 가격 경로 해상도 ("1m" 또는 "5m")
+    """
+    db_path = Path(db_path or BT_DB_PATH)
+    symbols = symbols or synthetic_symbols(10)
+    days = days or BT_DAYS
+    seed = BT_SYNTH_SEED if seed is None else seed
+    base_interval = base_interval or BT_SYNTH_BASE_INTERVAL
+    if base_interval not in ("1m", "5m"):
+        raise ValueError(f"base_interval은 1m 또는 5m: {base_interval}")
+
+    step_ms = _INTERVAL_MS[base_interval]
+    end_ms = int((end_ts or real_time.time()) * 1000) // step_ms * step_ms
+    start_ms = end_ms - days * 86_400_000
+    warm_ms = (start_ms - BT_SYNTH_WARMUP_DAYS * 86_400_000) // 86_400_000 * 86_400_000
+    open_ms = np.arange(warm_ms, end_ms, step_ms, dtype=np.int64)
+
+    print(f"[Synthetic] {len(symbols)}개 심볼 x {days}일 ({base_interval}, "
+          f"워밍업 {BT_SYNTH_WARMUP_DAYS}일) → {db_path}")
+    wall_start = real_time.time()
+
+    init_backtest_db(db_path)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA synchronous=OFF")
+
+    seeds = np.random.SeedSequence(seed).spawn(len(symbols) + 1)
+    market = _market_factor(np.random.default_rng(seeds[0]), len(open_ms), step_ms)
+
+    counts = {}
+    try:
+        for sym, sym_seed in zip(symbols, seeds[1:]):
+            sym_start = real_time.time()
+            rng = np.random.default_rng(sym_seed)
+            bars = _price_path(rng, market, open_ms, step_ms)
+            n = {
+                "klines": _write_klines(conn, sym, bars, base_interval, start_ms),
+                **_write_derivatives(conn, rng, sym, bars, step_ms, start_ms, end_ms),
+            }
+            conn.commit()
+            for key, value in n.items():
+                counts[key] = counts.get(key, 0) + value
+            print(f"[Synthetic] {sym}: klines {n['klines']:,} / 청산 {n['liquidations']:,} "
+                  f"/ OI {n['oi_snapshots']:,} ({real_time.time() - sym_start:.1f}초)")
+
+        counts["fear_greed"] = _write_fear_greed(conn, market, open_ms, start_ms, end_ms)
+        conn.commit()
+    finally:
+        conn.close()
+
+    total = sum(counts.values())
+    print(f"[Synthetic] 완료: {total:,}행 ({real_time.time() - wall_start:.1f}초) — "
+          + ", ".join(f"{k} {v:,}" for k, v in counts.items()))
+    return db_path
+
+
+# ============================
+# 가격 과정
+# ============================
+
+def _market_factor(rng: np.random.Generator, n: int, step_ms: int) -> dict:
+    """공통 시장 팩터 — 레짐 경로 + 스텝별 drift/σ + 표준정규 충격 + 점프"""
+    names = list(BT_SYNTH_REGIMES)
+    params = [BT_SYNTH_REGIMES[k] for k in names]
+    step_days = step_ms / 86_400_000
+
+    # 레짐 전환: 지속 기간 ~ 지수분포(평균 days), 다음 레짐은 나머지 중 균등
+    regime = np.empty(n, dtype=np.int64)
+    pos, current = 0, int(rng.integers(len(names)))
+    while pos < n:
+        length = max(1, int(rng.exponential(params[current]["days"]) / step_days))
+        regime[pos:pos + length] = current
+        pos += length
+        others = [i for i in range(len(names)) if i != current]
+        current = int(rng.choice(others)) if others else current
+
+    dt = step_ms / 1000 / _YEAR_S
+    drift = np.array([p["drift"] for p in params])[regime] * dt
+    vol = np.array([p["vol"] for p in params])[regime] * np.sqrt(dt)
+    jump_rate = np.array([p["jump_rate"] for p in params])[regime] * step_days
+
+    return {
+        "regime": regime,
+        "regime_names": names,
+        "drift": drift,
+        "vol": vol,
+        "jump_rate": jump_rate,
+        "z": rng.standard_normal(n),
+        "jumps": _jumps(rng, jump_rate),
+    }
+
+
+def _jumps(rng: np.random.Generator, rate: np.ndarray) -> np.ndarray:
+    """스텝별 복합 Poisson 점프 합 (로그 수익률)"""
+    count = rng.poisson(rate)
+    size = rng.normal(BT_SYNTH_JUMP_MEAN * count, BT_SYNTH_JUMP_STD * np.sqrt(count))
+    return np.where(count > 0, size, 0.0)
+
+
+def _price_path(rng: np.random.Generator, market: dict, open_ms: np.ndarray,
+                step_ms: int) -> dict:
+    """심볼 1개의 기본 해상도 OHLCV + 수익률/충격 크기"""
+    n = len(open_ms)
+    rho = BT_SYNTH_CORRELATION
+    beta = rng.uniform(0.8, 1.6)           # 알트일수록 변동성/점프 민감도 큼
+    p0 = float(np.exp(rng.uniform(np.log(BT_SYNTH_MIN_PRICE), np.log(BT_SYNTH_MAX_PRICE))))
+
+    sigma = market["vol"] * beta
+    noise = np.sqrt(rho) * market["z"] + np.sqrt(1 - rho) * rng.standard_normal(n)
+    jumps = beta * market["jumps"] + _jumps(rng, market["jump_rate"] * 0.5)
+    r = market["drift"] - 0.5 * sigma ** 2 + sigma * noise + jumps
+
+    close = p0 * np.exp(np.cumsum(r))
+    open_ = np.concatenate([[p0], close[:-1]])
+    wick = np.abs(rng.standard_normal((2, n))) * sigma * 0.5
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    # 가격 자릿수: 경로 최저가 기준 유효숫자 6자리
+    decimals = max(0, 5 - int(np.floor(np.log10(low.min()))))
+    shock = np.abs(r) / sigma
+    notional = (rng.lognormal(np.log(2e6), 0.5) * step_ms / 300_000
+                * np.exp(0.3 * rng.standard_normal(n)) * (1 + shock))
+
+    return {
+        "open_ms": open_ms,
+        "open": np.round(open_, decimals),
+        "high": np.round(high, decimals),
+        "low": np.round(low, decimals),
+        "close": np.round(close, decimals),
+        "volume": np.round(notional / close, 3),
+        "r": r,
+        "sigma": sigma,
+        "shock": shock,
+        "jumps": jumps,
+        "decimals": decimals,
+    }
+
+
+def _aggregate(bars: dict, interval_ms: int, origin_ms: int = 0) -> dict:
+    """기본 해상도 캔들 → 상위 인터벌 (open_time 정렬 기준 origin_ms)"""
+    key = (bars["open_ms"] - origin_ms) // interval_ms
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(key)) + 1])
+    ends = np.concatenate([starts[1:], [len(key)]]) - 1
+    return {
+        "open_ms": key[starts] * interval_ms + origin_ms,
+        "open": bars["open"][starts],
+        "high": np.maximum.reduceat(bars["high"], starts),
+        "low": np.minimum.reduceat(bars["low"], starts),
+        "close": bars["close"][ends],
+        "volume": np.add.reduceat(bars["volume"], starts),
+        "var": np.add.reduceat(bars["sigma"] ** 2, starts),
+    }
+
+
+# ============================
+# DB 기록
+# ============================
+
+def _write_klines(conn, symbol: str, bars: dict, base_interval: str, start_ms: int) -> int:
+    """klines 전 인터벌 기록 — 1m/5m는 백테스트 구간만, 1h 이상은 워밍업 포함"""
+    series = []
+    in_range = bars["open_ms"] >= start_ms
+    base = {k: bars[k][in_range] for k in ("open_ms", "open", "high", "low", "close", "volume")}
+    series.append((base_interval, base))
+    if base_interval == "1m":
+        series.append(("5m", _aggregate(base, _INTERVAL_MS["5m"])))
+    for interval in ("1h", "4h", "1d"):
+        series.append((interval, _aggregate(bars, _INTERVAL_MS[interval])))
+    series.append(("1w", _aggregate(bars, _INTERVAL_MS["1w"], _WEEK_ORIGIN_MS)))
+
+    total = 0
+    for interval, k in series:
+        volume = np.round(k["volume"], 3)
+        conn.executemany(
+            "INSERT OR IGNORE INTO klines "
+            "(symbol, interval, open_time, open, high, low, close, volume) "
+            f"VALUES (?, '{interval}', ?, ?, ?, ?, ?, ?)",
+            zip([symbol] * len(k["open_ms"]), k["open_ms"].tolist(), k["open"].tolist(),
+                k["high"].tolist(), k["low"].tolist(), k["close"].tolist(), volume.tolist()),
+        )
+        total += len(k["open_ms"])
+    return total
+
+
+def _write_derivatives(conn, rng: np.random.Generator, symbol: str, bars: dict,
+                       step_ms: int, start_ms: int, end_ms: int) -> dict:
+    """청산 / OI / 롱숏 / 테이커 / 펀딩 / 오더북 벽 기록 (백테스트 구간만)"""
+    open_ms, close = bars["open_ms"], bars["close"]
+    shock, jumps, r = bars["shock"], bars["jumps"], bars["r"]
+
+    # ---- 청산: 변동성 스케일 Poisson + 점프 버스트 ----
+    lam = (BT_SYNTH_LIQ_PER_HOUR * step_ms / _HOUR_MS
+           * (1 + 0.5 * np.maximum(shock - 1.5, 0) ** 2)
+           + 30 * np.abs(jumps) / BT_SYNTH_JUMP_STD)
+    lam[open_ms < start_ms] = 0
+    idx = np.repeat(np.arange(len(open_ms)), rng.poisson(lam))
+    down = r[idx] < 0
+    liq_notional = rng.lognormal(np.log(5_000), 1.2, len(idx)) * (1 + shock[idx])
+    liq_price = np.round(close[idx] * (1 + np.where(down, -1, 1)
+                                       * rng.uniform(0, 0.002, len(idx))), bars["decimals"])
+    liq_time = open_ms[idx] + rng.integers(0, step_ms, len(idx))
+    order = np.argsort(liq_time, kind="stable")
+    conn.executemany(
+        "INSERT INTO liquidations (symbol, side, price, qty, trade_time) VALUES (?, ?, ?, ?, ?)",
+        zip([symbol] * len(idx), np.where(down, "SELL", "BUY")[order].tolist(),
+            liq_price[order].tolist(), np.round(liq_notional / close[idx], 6)[order].tolist(),
+            liq_time[order].tolist()),
+    )
+
+    # ---- 1h 통계: 시간봉 마감 시각에 기록 (러너 drip 시 미래 값 노출 방지) ----
+    hours = _aggregate(bars, _HOUR_MS)
+    hour_r = np.log(hours["close"] / hours["open"])
+    hour_z = hour_r / np.sqrt(hours["var"])
+    hour_liq = np.bincount((open_ms[idx] - open_ms[0]) // _HOUR_MS, weights=liq_notional,
+                           minlength=len(hours["open_ms"]))[:len(hours["open_ms"])]
+    n_hours = len(hours["open_ms"])
+
+    # OI (명목가 로그): 평균 회귀 + 변동 시 증가 - 청산 명목가
+    # (시간 순 재귀 — 스칼라 루프는 math/list로, 시간봉 수만큼만 반복)
+    oi_mean = math.log(hours["volume"][:24].mean() * hours["close"][0] * rng.uniform(20, 60))
+    oi_floor = math.exp(oi_mean) * 0.2
+    oi_noise = (0.01 * rng.standard_normal(n_hours)).tolist()
+    abs_r, liq = np.abs(hour_r).tolist(), hour_liq.tolist()
+    log_oi = [0.0] * n_hours
+    x = oi_mean
+    for h in range(n_hours):
+        x += 0.02 * (oi_mean - x) + oi_noise[h] + 0.5 * abs_r[h]
+        x = math.log(max(math.exp(x) - liq[h], oi_floor))
+        log_oi[h] = x
+    oi_qty = np.exp(log_oi) / hours["close"]
+
+    # 롱숏 비율: 평균 회귀 + 역추세 (하락 시 개인 롱 증가)
+    ls_noise = (0.03 * rng.standard_normal(n_hours)).tolist()
+    signed_r = hour_r.tolist()
+    log_ls = [0.0] * n_hours
+    y = 0.0
+    for h in range(n_hours):
+        y += -0.05 * y - 2.0 * signed_r[h] + ls_noise[h]
+        log_ls[h] = y
+    ls_ratio = 1.2 * np.exp(log_ls)
+    long_acc = ls_ratio / (1 + ls_ratio)
+
+    # 테이커 매수/매도 비율: 추세 추종
+    taker_ratio = np.exp(0.15 * np.clip(hour_z, -5, 5) + 0.05 * rng.standard_normal(n_hours))
+    buy_vol = hours["volume"] * taker_ratio / (1 + taker_ratio)
+
+    ts = hours["open_ms"] + _HOUR_MS
+    sel = (ts > start_ms) & (ts <= end_ms)
+    ts_l, iso = ts[sel].tolist(), _iso_array(ts[sel])
+    conn.executemany(
+        "INSERT INTO oi_snapshots (symbol, open_interest, collected_at) VALUES (?, ?, ?)",
+        zip([symbol] * len(ts_l), np.round(oi_qty[sel], 3).tolist(), iso),
+    )
+    conn.executemany(
+        "INSERT INTO long_short_ratios "
+        "(symbol, long_short_ratio, long_account, short_account, timestamp, collected_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        zip([symbol] * len(ts_l), np.round(ls_ratio[sel], 4).tolist(),
+            np.round(long_acc[sel], 4).tolist(), np.round(1 - long_acc[sel], 4).tolist(),
+            ts_l, iso),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO taker_ratio "
+        "(symbol, buy_sell_ratio, buy_vol, sell_vol, timestamp) VALUES (?, ?, ?, ?, ?)",
+        zip([symbol] * len(ts_l), np.round(taker_ratio[sel], 4).tolist(),
+            np.round(buy_vol[sel], 3).tolist(),
+            np.round(hours["volume"][sel] - buy_vol[sel], 3).tolist(), ts_l),
+    )
+
+    # ---- 펀딩비: 8시간 정산, 직전 8시간 수익률 + 잡음 ----
+    funding_ms = np.arange(-(-start_ms // _FUNDING_MS) * _FUNDING_MS, end_ms, _FUNDING_MS)
+    at = np.clip(np.searchsorted(open_ms, funding_ms) - 1, 0, len(close) - 1)
+    before = np.clip(np.searchsorted(open_ms, funding_ms - _FUNDING_MS) - 1, 0, len(close) - 1)
+    funding = np.clip(0.0001 + 0.03 * np.log(close[at] / close[before])
+                      + 0.00005 * rng.standard_normal(len(funding_ms)), -0.0075, 0.0075)
+    conn.executemany(
+        "INSERT INTO funding_rates (symbol, funding_rate, funding_time, collected_at) "
+        "VALUES (?, ?, ?, ?)",
+        zip([symbol] * len(funding_ms), np.round(funding, 6).tolist(),
+            funding_ms.tolist(), _iso_array(funding_ms)),
+    )
+
+    walls = _write_orderbook_walls(conn, rng, symbol, bars, start_ms, end_ms)
+    return {
+        "liquidations": len(idx),
+        "oi_snapshots": len(ts_l),
+        "long_short_ratios": len(ts_l),
+        "taker_ratio": len(ts_l),
+        "funding_rates": len(funding_ms),
+        "orderbook_walls": walls,
+    }
+
+
+def _write_orderbook_walls(conn, rng: np.random.Generator, symbol: str, bars: dict,
+                           start_ms: int, end_ms: int) -> int:
+    """ORDERBOOK_INTERVAL마다 현재가 주변 로그 격자 위 벽 (격자 고정 → 연속 스캔에서 같은 가격)"""
+    scan_ms = np.arange(start_ms, end_ms, ORDERBOOK_INTERVAL * 1000)
+    if not len(scan_ms):
+        return 0
+    at = np.clip(np.searchsorted(bars["open_ms"], scan_ms) - 1, 0, len(bars["close"]) - 1)
+    price = bars["close"][at]
+    center = np.round(np.log(price) / _WALL_GRID)
+
+    k = BT_SYNTH_WALLS_PER_SIDE
+    # 스캔마다 격자 1~2k칸 중 k칸 선택 (가격이 같은 칸에 머무는 동안 벽 절반가량이 다음 스캔에도 유지)
+    picks = np.sort(rng.random((len(scan_ms), 2, 2 * k)).argsort(axis=2)[:, :, :k] + 1, axis=2)
+    offsets = np.concatenate([-picks[:, 0], picks[:, 1]], axis=1)        # (scan, 2k)
+    wall_price = np.round(np.exp((center[:, None] + offsets) * _WALL_GRID), bars["decimals"])
+    notional = rng.lognormal(np.log(2e5), 0.8, wall_price.shape)
+    qty = np.round(notional / wall_price, 3)
+    sides = np.array(["BID"] * k + ["ASK"] * k)
+
+    scan_ids = np.repeat(scan_ms // 1000, 2 * k)
+    conn.executemany(
+        "INSERT INTO orderbook_walls (symbol, side, price, quantity, scan_id, collected_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        zip([symbol] * scan_ids.size, np.tile(sides, len(scan_ms)).tolist(),
+            wall_price.ravel().tolist(), qty.ravel().tolist(), scan_ids.tolist(),
+            _iso_array(scan_ids * 1000)),
+    )
+    return int(scan_ids.size)
+
+
+def _write_fear_greed(conn, market: dict, open_ms: np.ndarray, start_ms: int,
+                      end_ms: int) -> int:
+    """일별 공포/탐욕 지수 — 전일 마감까지의 시장 팩터 30일 모멘텀"""
+    index = np.cumsum(market["drift"] + market["vol"] * market["z"] + market["jumps"])
+    days_ms = np.arange(-(-start_ms // 86_400_000) * 86_400_000, end_ms, 86_400_000)
+    if not len(days_ms):
+        return 0
+    at = np.clip(np.searchsorted(open_ms, days_ms) - 1, 0, len(index) - 1)
+    ago = np.clip(np.searchsorted(open_ms, days_ms - 30 * 86_400_000) - 1, 0, len(index) - 1)
+    value = np.clip(np.round(50 + 120 * (index[at] - index[ago])), 0, 100).astype(int)
+    labels = np.array(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+    classification = labels[np.searchsorted([25, 45, 56, 76], value, side="right")]
+    conn.executemany(
+        "INSERT INTO fear_greed (value, classification, fg_timestamp, collected_at) "
+        "VALUES (?, ?, ?, ?)",
+        zip(value.tolist(), classification.tolist(), (days_ms // 1000).tolist(),
+            _iso_array(days_ms)),
+    )
+    return len(days_ms)
+
+
+def _iso_array(ts_ms: np.ndarray) -> list[str]:
+    """ms timestamp 배열 → 로컬 ISO 문자열 (downloader._iso와 같은 형식, 시간 단위 UTC 오프셋)"""
+    ts_ms = np.asarray(ts_ms, dtype=np.int64)
+    if not len(ts_ms):
+        return []
+    hours, inverse = np.unique(ts_ms // _HOUR_MS, return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(h) * 3600).astimezone().utcoffset().total_seconds() * 1000
+        for h in hours
+    ], dtype=np.int64)
+    local = (ts_ms + offsets[inverse]).astype("datetime64[ms]")
+    return np.datetime_as_string(local, unit="s").tolist()
@@ -0,0 +1,218 @@
+"""Walk-forward 최적화 — in-sample 그리드 탐색 → out-of-sample 검증을 롤링
+
+히스토리 [end - total_days, end]를 fold 단위로 굴리며:
+    IS  [t, t + is_days]              : 그리드 전 조합 병렬 백테스트 → 최적 파라미터 선택
+    OOS [t + is_days, t + is_days + oos_days] : 최적 파라미터로 1회 검증
+t는 step_days(기본 oos_days)씩 전진. 리포트 지표는 OOS 결과만 합산한다.
+
+워커 프로세스는 시작 시 backtest.db 시계열을 _DataFeeder 버퍼로 한 번만 읽고,
+이후 모든 윈도우 실행에서 SQLite 재조회/ISO 파싱/정렬 없이 재사용한다.
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import time as real_time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from backtest.config_bt import BT_DAYS, BT_DB_PATH, BT_SYMBOLS
+from backtest.dataset import load_events, load_manifest, source_db
+from backtest.db_bt import clone_backtest_db, remove_backtest_db
+from backtest.sweep import (
+    RANK_KEYS, apply_overrides, restore_overrides, expand_grid, summarize,
+)
+
+# walk-forward 실행 DB 저장 위치
+WF_DIR = BT_DB_PATH.parent / "walkforward"
+
+# 워커 프로세스별 상태 (initializer에서 1회 로드)
+_worker = {}
+
+
+def build_folds(end_ts: float, total_days: int, is_days: int, oos_days: int,
+                step_days: int = None) -> list[dict]:
+    """fold 윈도우 목록 생성 (타임스탬프, 초)"""
+    step_days = step_days or oos_days
+    start_ts = end_ts - total_days * 86400
+    folds = []
+    t = start_ts
+    while t + (is_days + oos_days) * 86400 <= end_ts + 1e-6:
+        folds.append({
+            "fold": len(folds),
+            "is_start": t,
+            "is_end": t + is_days * 86400,
+            "oos_end": t + (is_days + oos_days) * 86400,
+        })
+        t += step_days * 86400
+    return folds
+
+
+def _init_worker(base_db: str, dataset: str = None):
+    """워커 초기화: 시계열 버퍼를 한 번만 로드해 모든 윈도우에서 재사용"""
+    from backtest.runner import _DataFeeder
+
+    _worker["base_db"] = Path(base_db)
+    _worker["dataset"] = dataset
+    if dataset:
+        # 준비된 이벤트 스트림 — DB 읽기/시각 파싱/정렬 생략
+        _worker["buffers"] = load_events(dataset)
+        return
+    conn = sqlite3.connect(base_db)
+    try:
+        _worker["buffers"] = _DataFeeder.load_buffers(conn)
+    finally:
+        conn.close()
+
+
+def _run_window(task_id: str, overrides: dict, days: int, end_ts: float,
+                symbols: list, in_memory: bool, engine_cache: bool = True) -> dict:
+    """워커: 지정 윈도우/파라미터로 백테스트 1회 (공유 버퍼 사용)"""
+    from backtest.runner import RunOptions, run_backtest, reset_engine_caches
+    from backtest.report import generate_report
+
+    run_db = WF_DIR / f"{task_id}_{os.getpid()}.db"
+    if not _worker["dataset"]:
+        clone_backtest_db(_worker["base_db"], run_db)
+    reset_engine_caches()
+    original = apply_overrides(overrides)
+
+    error = None
+    report = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            equity = run_backtest(days=days, symbols=symbols, db_path=run_db, end_ts=end_ts,
+                                  feeder_buffers=_worker["buffers"],
+                                  options=RunOptions(in_memory=in_memory, checkpoint_interval=0,
+                                                     engine_cache=engine_cache,
+                                                     dataset=_worker["dataset"]))
+            report = generate_report(symbols, end_ts - days * 86400, end_ts,
+                                     equity_data=equity, db_path=run_db)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        restore_overrides(original)
+        remove_backtest_db(run_db)
+
+    return {"task_id": task_id, "params": overrides, "error": error,
+            "report": report, **summarize(report)}
+
+
+def _best(results: list[dict], rank_by: str) -> dict | None:
+    """rank_by 기준 최고 결과 (에러 제외)"""
+    ok = [r for r in results if not r["error"]]
+    if not ok:
+        return None
+    if RANK_KEYS[rank_by]:
+        return max(ok, key=lambda r: r[rank_by])
+    return min(ok, key=lambda r: r[rank_by])
+
+
+def run_walk_forward(grid: dict, total_days: int = None, is_days: int = 60,
+                     oos_days: int = 30, step_days: int = None,
+                     symbols: list = None, workers: int = None,
+                     rank_by: str = "total_pnl", base_db: Path = None,
+                     in_memory: bool = True, end_ts: float = None,
+                     engine_cache: bool = True, dataset: str = None) -> dict:
+    """Walk-forward 최적화 실행
+
+    Args:
+        grid: {config 키: [값...]} IS 탐색 그리드
+        total_days: 전체 히스토리 길이 (일)
+        is_days / oos_days: in-sample / out-of-sample 윈도우 길이 (일)
+        step_days: fold 간 전진 폭 (기본: oos_days → OOS 구간이 겹치지 않음)
+        rank_by: IS 최적 파라미터 선택 기준 (RANK_KEYS)
+        engine_cache: 같은 fold의 IS 조합 간 ATR/Threshold/Grid/Score 출력 재사용
+        dataset: 준비된 데이터셋 이름 (backtest.dataset) — 윈도우마다 템플릿 사본 + 이벤트 스트림
+
+    Returns:
+        dict: {"folds": [...], "oos": 합산 OOS 지표}
+    """
+    total_days = total_days or BT_DAYS
+    symbols = symbols or BT_SYMBOLS
+    if dataset:
+        load_manifest(dataset)
+        base_db = source_db(dataset)
+    base_db = Path(base_db or BT_DB_PATH)
+    workers = workers or os.cpu_count() or 1
+    end_ts = end_ts or real_time.time()
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"rank_by는 {', '.join(RANK_KEYS)} 중 하나여야 합니다")
+
+    folds = build_folds(end_ts, total_days, is_days, oos_days, step_days)
+    if not folds:
+        raise ValueError(f"{total_days}일 히스토리에 IS {is_days}일 + OOS {oos_days}일 fold를 만들 수 없습니다")
+    combos = expand_grid(grid)
+    restore_overrides(apply_overrides(combos[0]))  # config 키 사전 검증
+
+    print(f"\n{'='*60}")
+    print(f"  WALK-FORWARD: {len(folds)} folds x {len(combos)} combinations")
+    print(f"  IS {is_days}d / OOS {oos_days}d / step {step_days or oos_days}d | Workers: {workers}")
+    print(f"{'='*60}")
+
+    wall_start = real_time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(base_db), dataset)) as pool:
+        # 1) 모든 fold의 IS 탐색을 한꺼번에 제출 (fold 간에도 병렬)
+        is_futures = {
+            (f["fold"], i): pool.submit(_run_window, f"f{f['fold']}_is{i}", params,
+                                        is_days, f["is_end"], symbols, in_memory,
+                                        engine_cache)
+            for f in folds for i, params in enumerate(combos)
+        }
+
+        # 2) fold별 IS 최적 파라미터 → OOS 제출
+        oos_futures = {}
+        for f in folds:
+            is_results = [is_futures[(f["fold"], i)].result() for i in range(len(combos))]
+            best = _best(is_results, rank_by)
+            f["best"] = best
+            if best is None:
+                print(f"[WF] fold {f['fold']}: IS 전 조합 실패 — 건너뜀")
+                continue
+            print(f"[WF] fold {f['fold']}: IS best {rank_by}={best[rank_by]} "
+                  f"params={best['params']}")
+            oos_futures[f["fold"]] = pool.submit(
+                _run_window, f"f{f['fold']}_oos", best["params"],
+                oos_days, f["oos_end"], symbols, in_memory, engine_cache,
+            )
+
+        for f in folds:
+            future = oos_futures.get(f["fold"])
+            f["oos"] = future.result() if future else None
+
+    oos_results = [f["oos"] for f in folds if f["oos"] and not f["oos"]["error"]]
+    oos_total = {
+        "total_pnl": round(sum(r["total_pnl"] for r in oos_results), 4),
+        "max_drawdown": round(max((r["max_drawdown"] for r in oos_results), default=0.0), 2),
+        "l2_trades": sum(r["l2_trades"] for r in oos_results),
+        "folds": len(oos_results),
+    }
+
+    print(f"\n[WF] 완료 ({real_time.time() - wall_start:.1f}초)")
+    _print_folds(folds, oos_total, rank_by)
+    return {"folds": folds, "oos": oos_total}
+
+
+def _print_folds(folds: list[dict], oos_total: dict, rank_by: str):
+    """fold별 IS/OOS 결과 테이블 출력"""
+    def _d(ts):
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+
+    print(f"\n  --- Walk-Forward Folds (IS {rank_by} → OOS) ---")
+    print(f"  {'#':>3} {'IS':^23} {'OOS end':^10} {'IS':>8} {'OOS PnL%':>9} "
+          f"{'Sharpe':>7} {'MaxDD%':>7}  Params")
+    for f in folds:
+        best, oos = f.get("best"), f.get("oos")
+        window = f"{_d(f['is_start'])}~{_d(f['is_end'])}"
+        if not best or not oos or oos["error"]:
+            print(f"  {f['fold']:>3} {window:^23} {_d(f['oos_end']):^10} {'FAILED':>8}")
+            continue
+        params = ", ".join(f"{k}={v}" for k, v in best["params"].items())
+        print(f"  {f['fold']:>3} {window:^23} {_d(f['oos_end']):^10} {best[rank_by]:>8.2f} "
+              f"{oos['total_pnl']:>+9.2f} {oos['sharpe']:>7.2f} {oos['max_drawdown']:>7.2f}  {params}")
+
+    print(f"\n  OOS Total PnL: {oos_total['total_pnl']:+.2f}% | "
+          f"Max DD(fold): -{oos_total['max_drawdown']:.2f}% | "
+          f"L2 Trades: {oos_total['l2_trades']} | Folds: {oos_total['folds']}")
@@ -0,0 +1,30 @@
+"""시간 소스 모듈 — 엔진/컬렉터가 사용하는 현재 시각
+
+엔진은 time.time() / datetime.now() / date.today() 대신
+`import clock` 후 clock.time() / clock.now() / clock.today()를 호출한다.
+라이브에서는 시스템 시계에 그대로 연결되고(추가 비용 없음),
+백테스트에서는 bind(VirtualClock)로 가상 시계에 연결된다.
+"""
+import time as _time
+from datetime import date, datetime
+
+# 시스템 시계 (기본 바인딩)
+time = _time.time
+now = datetime.now
+today = date.today
+
+
+def bind(source):
+    """시간 소스 교체 — source는 time()/now()/today()를 제공 (예: backtest.clock.VirtualClock)"""
+    global time, now, today
+    time = source.time
+    now = source.now
+    today = source.today
+
+
+def reset():
+    """시스템 시계로 복원"""
+    global time, now, today
+    time = _time.time
+    now = datetime.now
+    today = date.today
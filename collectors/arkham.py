@@ -6,6 +6,7 @@ API: https://api.whale-alert.io/v1
 """
 import time
 import requests
+import clock
 from db import get_connection
 from config import WHALE_ALERT_API_KEY
 
@@ -70,7 +71,7 @@ def collect_whale_transactions():
     total_inserted = 0
 
     # 최근 6시간 거래 조회
-    start_ts = int(time.time()) - 6 * 3600
+    start_ts = int(clock.time()) - 6 * 3600
 
     data = _wa_get("/transactions", {
         "min_value": MIN_USD_VALUE,
@@ -151,7 +152,7 @@ def get_whale_direction(asset: str = "bitcoin", hours: int = 6) -> dict:
     - owner_type = "unknown" → 개인 지갑
     """
     conn = get_connection()
-    cutoff_ms = int((time.time() - hours * 3600) * 1000)
+    cutoff_ms = int((clock.time() - hours * 3600) * 1000)
 
     rows = conn.execute(
         "SELECT from_label, to_label, usd_value FROM whale_transactions "
@@ -1,10 +1,13 @@
-"""② 바이낸스 REST API 수집기 — OI, 펀딩비, 롱숏비율, 오더북, klines"""
+"""② 바이낸스 REST API 수집기 — OI, 펀딩비, 롱숏비율, 오더북, klines
+
+DB 기록은 단일 쓰기 스레드 큐(db.write_many)로 넘기고 바로 반환한다 (스케줄러 루프가 쓰기 잠금을 기다리지 않음).
+"""
 import time
 import hashlib
 import hmac
 import requests
 import numpy as np
-from db import get_connection
+from db import write_many, flush
 from config import (
     BINANCE_API_KEY, BINANCE_SECRET_KEY, BINANCE_FUTURES_BASE,
     SYMBOLS, ORDERBOOK_DEPTH_LIMIT, ORDERBOOK_WALL_PERCENTILE,
@@ -61,47 +64,44 @@ def _get(endpoint: str, params: dict = None, signed: bool = False) -> dict | lis
 # === OI 수집 ===
 def collect_open_interest():
     """모든 심볼의 Open Interest 수집"""
-    conn = get_connection()
+    rows = []
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/openInterest", {"symbol": symbol})
             oi = float(data["openInterest"])
-            conn.execute(
-                "INSERT INTO oi_snapshots (symbol, open_interest) VALUES (?, ?)",
-                (symbol, oi),
-            )
+            rows.append((symbol, oi))
             print(f"[OI] {symbol}: {oi:,.2f}")
         except Exception as e:
             print(f"[OI] {symbol} 수집 실패: {e}")
-    conn.commit()
-    conn.close()
+    if rows:
+        write_many("INSERT INTO oi_snapshots (symbol, open_interest) VALUES (?, ?)", rows)
 
 
 # === 펀딩비 수집 ===
 def collect_funding_rate():
     """최신 펀딩비 수집"""
-    conn = get_connection()
+    rows = []
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/fundingRate", {"symbol": symbol, "limit": 1})
             if data:
                 rate = float(data[0]["fundingRate"])
                 ftime = int(data[0]["fundingTime"])
-                conn.execute(
-                    "INSERT INTO funding_rates (symbol, funding_rate, funding_time) VALUES (?, ?, ?)",
-                    (symbol, rate, ftime),
-                )
+                rows.append((symbol, rate, ftime))
                 print(f"[펀딩비] {symbol}: {rate:.6f} ({rate*100:.4f}%)")
         except Exception as e:
             print(f"[펀딩비] {symbol} 수집 실패: {e}")
-    conn.commit()
-    conn.close()
+    if rows:
+        write_many(
+            "INSERT INTO funding_rates (symbol, funding_rate, funding_time) VALUES (?, ?, ?)",
+            rows,
+        )
 
 
 # === 롱/숏 비율 수집 ===
 def collect_long_short_ratio():
     """글로벌 롱/숏 비율 수집"""
-    conn = get_connection()
+    rows = []
     for symbol in SYMBOLS:
         try:
             data = _get("/futures/data/globalLongShortAccountRatio", {
@@ -109,22 +109,23 @@ def collect_long_short_ratio():
             })
             if data:
                 d = data[0]
-                conn.execute(
-                    "INSERT INTO long_short_ratios (symbol, long_short_ratio, long_account, short_account, timestamp) VALUES (?, ?, ?, ?, ?)",
-                    (symbol, float(d["longShortRatio"]), float(d["longAccount"]), float(d["shortAccount"]), int(d["timestamp"])),
-                )
+                rows.append((symbol, float(d["longShortRatio"]), float(d["longAccount"]),
+                             float(d["shortAccount"]), int(d["timestamp"])))
                 long_pct = float(d["longAccount"]) * 100
                 print(f"[롱숏] {symbol}: 롱 {long_pct:.1f}% / 숏 {100-long_pct:.1f}%")
         except Exception as e:
             print(f"[롱숏] {symbol} 수집 실패: {e}")
-    conn.commit()
-    conn.close()
+    if rows:
+        write_many(
+            "INSERT INTO long_short_ratios (symbol, long_short_ratio, long_account, short_account, timestamp) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
 
 
 # === 오더북 벽 수집 ===
 def collect_orderbook_walls():
     """오더북 1000단계에서 상위 10% 벽 추출"""
-    conn = get_connection()
+    rows = []
     scan_id = int(time.time())
 
     for symbol in SYMBOLS:
@@ -143,42 +144,44 @@ def collect_orderbook_walls():
             ask_threshold = np.percentile(ask_quantities, ORDERBOOK_WALL_PERCENTILE)
             ask_walls = [(p, q) for p, q in asks if q >= ask_threshold]
 
-            for price, qty in bid_walls:
-                conn.execute(
-                    "INSERT INTO orderbook_walls (symbol, side, price, quantity, scan_id) VALUES (?, ?, ?, ?, ?)",
-                    (symbol, "BID", price, qty, scan_id),
-                )
-            for price, qty in ask_walls:
-                conn.execute(
-                    "INSERT INTO orderbook_walls (symbol, side, price, quantity, scan_id) VALUES (?, ?, ?, ?, ?)",
-                    (symbol, "ASK", price, qty, scan_id),
-                )
+            rows += [(symbol, "BID", price, qty, scan_id) for price, qty in bid_walls]
+            rows += [(symbol, "ASK", price, qty, scan_id) for price, qty in ask_walls]
 
             print(f"[오더북] {symbol}: 매수벽 {len(bid_walls)}개 / 매도벽 {len(ask_walls)}개")
         except Exception as e:
             print(f"[오더북] {symbol} 수집 실패: {e}")
 
-    conn.commit()
-    conn.close()
+    if rows:
+        write_many(
+            "INSERT INTO orderbook_walls (symbol, side, price, quantity, scan_id) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+# === Klines 공통 ===
+_KLINE_SQL = """INSERT OR REPLACE INTO klines
+    (symbol, interval, open_time, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _kline_rows(symbol: str, interval: str, data: list) -> list:
+    """바이낸스 kline 응답 → klines 행"""
+    return [
+        (symbol, interval, int(k[0]), float(k[1]), float(k[2]),
+         float(k[3]), float(k[4]), float(k[5]))
+        for k in data
+    ]
 
 
 # === Klines 수집 (ATR 계산용 - 일봉) ===
 def collect_klines():
     """일봉 90일치 수집 (ATR + MTF 스윙 분석용)"""
-    conn = get_connection()
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/klines", {
                 "symbol": symbol, "interval": "1d", "limit": 90,
             })
-            for k in data:
-                conn.execute(
-                    """INSERT OR REPLACE INTO klines
-                    (symbol, interval, open_time, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (symbol, "1d", int(k[0]), float(k[1]), float(k[2]),
-                     float(k[3]), float(k[4]), float(k[5])),
-                )
+            write_many(_KLINE_SQL, _kline_rows(symbol, "1d", data))
 
             # ATR 계산 (참고 출력)
             highs = [float(k[2]) for k in data]
@@ -194,115 +197,83 @@ def collect_klines():
 
         except Exception as e:
             print(f"[Klines] {symbol} 일봉 수집 실패: {e}")
-    conn.commit()
-    conn.close()
 
 
 # === 5분봉 수집 (실시간 가격 + 전략 판단용) ===
 def collect_klines_5m():
     """5분봉 최근 300개 수집 (약 25시간치, 방향 판단 228개 + 여유분)"""
-    conn = get_connection()
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/klines", {
                 "symbol": symbol, "interval": "5m", "limit": 300,
             })
-            start_write_time = time.time()
-            for k in data:
-                conn.execute(
-                    """INSERT OR REPLACE INTO klines
-                    (symbol, interval, open_time, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (symbol, "5m", int(k[0]), float(k[1]), float(k[2]),
-                     float(k[3]), float(k[4]), float(k[5])),
-                )
-            conn.commit()
-            write_duration = time.time() - start_write_time
+            write_many(_KLINE_SQL, _kline_rows(symbol, "5m", data))
 
             latest_open_time_ms = int(data[-1][0]) if data else 0
             latest_close = float(data[-1][4]) if data else 0
             current_time_ms = int(time.time() * 1000)
             delay_ms = current_time_ms - latest_open_time_ms
 
-            print(f"[5m] {symbol}: {len(data)}개 수집 (DB 쓰기 {write_duration:.4f}s) | 최신봉 {latest_open_time_ms} | "
+            print(f"[5m] {symbol}: {len(data)}개 수집 (DB 쓰기 큐 적재) | 최신봉 {latest_open_time_ms} | "
                   f"현재가 ${latest_close:,.2f} | 지연 {delay_ms}ms")
 
         except Exception as e:
             print(f"[Klines] {symbol} 5분봉 수집 실패: {e}")
-    conn.commit()
-    conn.close()
+
+
+# === 1분봉 수집 (페이퍼 L4 그리드 캔들 내부 체결용) ===
+def collect_klines_1m():
+    """1분봉 최근 10개 수집 (1분 주기 + 누락 대비 여유분)"""
+    for symbol in SYMBOLS:
+        try:
+            data = _get("/fapi/v1/klines", {
+                "symbol": symbol, "interval": "1m", "limit": 10,
+            })
+            write_many(_KLINE_SQL, _kline_rows(symbol, "1m", data))
+        except Exception as e:
+            print(f"[Klines] {symbol} 1분봉 수집 실패: {e}")
 
 
 # === 주봉 수집 (MTF 장기 추세 분석용) ===
 def collect_klines_1w():
     """주봉 52개 수집 (1년치, 장기 추세 분석용)"""
-    conn = get_connection()
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/klines", {
                 "symbol": symbol, "interval": "1w", "limit": 52,
             })
-            for k in data:
-                conn.execute(
-                    """INSERT OR REPLACE INTO klines
-                    (symbol, interval, open_time, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (symbol, "1w", int(k[0]), float(k[1]), float(k[2]),
-                     float(k[3]), float(k[4]), float(k[5])),
-                )
+            write_many(_KLINE_SQL, _kline_rows(symbol, "1w", data))
             print(f"[1w] {symbol}: {len(data)}개 수집")
         except Exception as e:
             print(f"[Klines] {symbol} 주봉 수집 실패: {e}")
-    conn.commit()
-    conn.close()
 
 
 # === 4시간봉 수집 (MTF 중기 스윙 분석용) ===
 def collect_klines_4h():
     """4시간봉 180개 수집 (30일치, 중기 스윙 분석용)"""
-    conn = get_connection()
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/klines", {
                 "symbol": symbol, "interval": "4h", "limit": 180,
             })
-            for k in data:
-                conn.execute(
-                    """INSERT OR REPLACE INTO klines
-                    (symbol, interval, open_time, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (symbol, "4h", int(k[0]), float(k[1]), float(k[2]),
-                     float(k[3]), float(k[4]), float(k[5])),
-                )
+            write_many(_KLINE_SQL, _kline_rows(symbol, "4h", data))
             print(f"[4h] {symbol}: {len(data)}개 수집")
         except Exception as e:
             print(f"[Klines] {symbol} 4시간봉 수집 실패: {e}")
-    conn.commit()
-    conn.close()
 
 
 # === 1시간봉 수집 (MTF 단기 추세 분석용) ===
 def collect_klines_1h():
     """1시간봉 168개 수집 (7일치, 단기 추세 분석용)"""
-    conn = get_connection()
     for symbol in SYMBOLS:
         try:
             data = _get("/fapi/v1/klines", {
                 "symbol": symbol, "interval": "1h", "limit": 168,
             })
-            for k in data:
-                conn.execute(
-                    """INSERT OR REPLACE INTO klines
-                    (symbol, interval, open_time, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (symbol, "1h", int(k[0]), float(k[1]), float(k[2]),
-                     float(k[3]), float(k[4]), float(k[5])),
-                )
+            write_many(_KLINE_SQL, _kline_rows(symbol, "1h", data))
             print(f"[1h] {symbol}: {len(data)}개 수집")
         except Exception as e:
             print(f"[Klines] {symbol} 1시간봉 수집 실패: {e}")
-    conn.commit()
-    conn.close()
 
 
 if __name__ == "__main__":
@@ -326,3 +297,4 @@ if __name__ == "__main__":
     collect_klines_4h()
     print("=== Klines 1시간봉 ===")
     collect_klines_1h()
+    flush()
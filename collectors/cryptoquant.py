@@ -7,7 +7,8 @@ Binance: Taker Buy/Sell Ratio (REST, 무제한, 실시간)
 import time
 import requests
 
-from datetime import date, timedelta
+from datetime import timedelta
+import clock
 from db import get_connection
 from config import BINANCE_FUTURES_BASE, SYMBOLS
 
@@ -40,7 +41,7 @@ def _santiment_query(metric: str, slug: str = "bitcoin",
                      from_date: str = None, to_date: str = None) -> list | None:
     """Santiment GraphQL API 호출 (최대 3회 재시도)"""
     if not from_date:
-        end = date.today() - timedelta(days=SANTIMENT_DELAY_DAYS - SANTIMENT_RANGE_DAYS)
+        end = clock.today() - timedelta(days=SANTIMENT_DELAY_DAYS - SANTIMENT_RANGE_DAYS)
         start = end - timedelta(days=SANTIMENT_RANGE_DAYS)
         from_date = start.isoformat() + "T00:00:00Z"
         to_date = end.isoformat() + "T00:00:00Z"
@@ -1,7 +1,7 @@
 """⑤ Crypto Fear & Greed Index 수집기"""
 import time
 import requests
-from db import get_connection
+from db import write
 
 
 FEAR_GREED_URL = "https://api.alternative.me/fng/"
@@ -20,13 +20,10 @@ def collect_fear_greed():
             classification = data["value_classification"]
             timestamp = int(data["timestamp"])
 
-            conn = get_connection()
-            conn.execute(
+            write(
                 "INSERT INTO fear_greed (value, classification, fg_timestamp) VALUES (?, ?, ?)",
                 (value, classification, timestamp),
             )
-            conn.commit()
-            conn.close()
 
             print(f"[F&G] {value} — {classification}")
             return
@@ -1,9 +1,10 @@
 """① 바이낸스 WebSocket 실시간 청산 수집기"""
 import asyncio
 import json
+import queue
 import time
 import websockets
-from db import get_connection
+from db import write_many
 from config import BINANCE_WS_BASE, SYMBOLS, WS_RECONNECT_ATTEMPTS, WS_RECONNECT_DELAY
 
 
@@ -14,28 +15,40 @@ _WATCH_SYMBOLS = set(SYMBOLS)
 _buffer = []
 _FLUSH_INTERVAL = 2.0   # 최대 2초마다 flush
 _FLUSH_SIZE = 20         # 20건 이상이면 즉시 flush
+_BUFFER_MAX = 5000       # 쓰기 큐가 밀려 있을 때 보관할 최대 건수 (초과분은 오래된 것부터 버림)
 _last_flush = 0.0
 
 
 def _flush_buffer():
-    """버퍼의 청산 데이터를 DB에 일괄 저장"""
+    """버퍼의 청산 데이터를 DB 쓰기 큐에 넘김 (이벤트 루프에서 쓰기 잠금/큐 자리를 기다리지 않음)
+
+    쓰기 큐가 가득 차 있으면 버퍼를 유지하고 다음 flush에서 재시도 — _BUFFER_MAX 초과분은 버리고 로그.
+    """
     global _buffer, _last_flush
     if not _buffer:
         return
     try:
-        conn = get_connection()
-        conn.executemany(
+        future = write_many(
             "INSERT INTO liquidations (symbol, side, price, qty, trade_time) VALUES (?, ?, ?, ?, ?)",
-            _buffer,
+            _buffer, block=False,
         )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print(f"[WS] DB flush 실패: {e}")
+    except queue.Full:
+        if len(_buffer) > _BUFFER_MAX:
+            dropped = len(_buffer) - _BUFFER_MAX
+            _buffer = _buffer[dropped:]
+            print(f"[WS] DB 쓰기 큐 가득 참 — 청산 {dropped}건 버림 (보관 {len(_buffer)}건)")
+        return
+    future.add_done_callback(_report_flush)
     _buffer = []
     _last_flush = time.time()
 
 
+def _report_flush(future):
+    """쓰기 스레드에서 실패한 flush 로그 (write_many future 완료 콜백)"""
+    if future.exception() is not None:
+        print(f"[WS] DB flush 실패: {future.exception()}")
+
+
 async def _handle_message(msg: str):
     """forceOrder 이벤트 파싱 → 버퍼에 추가"""
     global _buffer
@@ -28,6 +28,7 @@ LONG_SHORT_INTERVAL = 3600  # 롱숏비율: 매 1시간
 ORDERBOOK_INTERVAL = 14400  # 오더북: 매 4시간
 KLINES_DAILY_INTERVAL = 86400   # 일봉(ATR): 매일 1회
 KLINES_5M_INTERVAL = 300        # 5분봉(실시간 가격): 5분마다
+KLINES_1M_INTERVAL = 60         # 1분봉(페이퍼 L4 캔들 내부 체결): 1분마다
 KLINES_1W_INTERVAL = 86400      # 주봉: 매일 1회
 KLINES_4H_INTERVAL = 14400      # 4시간봉: 매 4시간
 KLINES_1H_INTERVAL = 3600       # 1시간봉: 매 1시간
@@ -41,6 +42,17 @@ WS_RECONNECT_DELAY = 10  # 초
 
 # === DB 경로 ===
 DB_PATH = Path(__file__).parent / "data" / "trades.db"
+DB_CACHE_SIZE_KB = 16384  # 연결별 페이지 캐시 (16MB)
+DB_MMAP_SIZE = 256 * 1024 * 1024  # 메모리 매핑 읽기 (256MB)
+DB_WRITE_QUEUE_SIZE = 10000  # 쓰기 큐 최대 작업 수 (가득 차면 호출부 대기 — 역압)
+DB_WRITE_BATCH_MAX = 500  # 한 트랜잭션으로 묶는 최대 작업 수
+DB_WRITE_BUSY_TIMEOUT = 30  # 쓰기 스레드 잠금 대기 (초, 엔진 직접 쓰기와 경합 시)
+DB_RETENTION_SHORT_DAYS = 30  # 고빈도 테이블 보존 (청산/캔들/임계점/점수/시그널)
+DB_RETENTION_LONG_DAYS = 90  # 저빈도 테이블 보존 (OI/펀딩/롱숏/오더북/F&G)
+DB_PURGE_CHUNK_ROWS = 2000  # 보존 정리 청크 크기 (청크마다 짧은 쓰기 트랜잭션)
+DB_PURGE_CHUNK_PAUSE = 0.05  # 청크 사이 양보 (초) — 다른 쓰기가 잠금을 얻도록
+DB_VACUUM_CHUNK_PAGES = 1024  # incremental_vacuum 1회 회수 페이지 수 (4KB 페이지 → 4MB)
+DB_ARCHIVE_DIR = Path(__file__).parent / "data" / "archive"  # 보존 기간 지난 행 월별 압축 보관
 
 # === 오더북 설정 ===
 ORDERBOOK_DEPTH_LIMIT = 1000  # API weight 50 (500과 동일)
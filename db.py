@@ -1,22 +1,437 @@
 """SQLite 데이터베이스 초기화 + 헬퍼 함수"""
+import atexit
+import gzip
+import json
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
 from pathlib import Path
-from config import DB_PATH
+from config import (
+    DB_PATH, DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+    DB_WRITE_QUEUE_SIZE, DB_WRITE_BATCH_MAX, DB_WRITE_BUSY_TIMEOUT,
+    DB_RETENTION_SHORT_DAYS, DB_RETENTION_LONG_DAYS,
+    DB_PURGE_CHUNK_ROWS, DB_PURGE_CHUNK_PAUSE, DB_VACUUM_CHUNK_PAGES, DB_ARCHIVE_DIR,
+)
+
+# 스레드별 상주 연결 {DB 경로: slot}
+# slot: {"conn": sqlite3.Connection, "handles": 열린 핸들 수, "commit_pending": 안쪽 핸들의 commit 요청,
+#        "thread": 소유 스레드 ID, "lock": handles 갱신 잠금 (GC가 다른 스레드에서 핸들을 해제할 수 있음)}
+_local = threading.local()
+
+
+class _PooledConnection:
+    """스레드 상주 연결 핸들 — close()는 연결을 닫지 않고 반납만 한다.
+
+    기존 호출부(get_connection() → ... → conn.close())를 그대로 두기 위한 래퍼
+    (백테스트 _NoCloseConnection과 같은 방식).
+
+    같은 스레드에서 핸들이 중첩되면(핸들을 연 채 get_connection()을 쓰는 함수 호출) 연결이 하나이므로
+    트랜잭션을 공유한다. 바깥 핸들에 commit되지 않은 쓰기가 있는 상태에서 열린 핸들(defer)의
+    commit()/with 종료는 바깥 작업까지 commit하지 않도록 commit 요청만 기록한다 — 쓰기 잠금은
+    바깥 쓰기가 이미 쥐고 있으므로 잠금 보유 시간은 늘지 않는다. 바깥에 미commit 쓰기가 없을 때
+    열린 중첩 핸들의 commit은 즉시 commit (자기 쓰기만 있음 — 쓰기 잠금을 바로 반납).
+    마지막 핸들이 반납될 때 commit 요청이 있었으면 commit, 없으면 미완료 트랜잭션 롤백
+    (연결을 닫던 기존 동작과 동일). rollback()은 중첩과 무관하게 즉시 실행 (실패 전파).
+    """
+    __slots__ = ("_conn", "_slot", "_closed", "_defer")
+
+    def __init__(self, conn: sqlite3.Connection, slot: dict, defer: bool = False):
+        self._conn = conn
+        self._slot = slot
+        self._closed = False
+        self._defer = defer
+
+    def execute(self, *args, **kwargs):
+        return self._conn.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._conn.executemany(*args, **kwargs)
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def commit(self):
+        if self._defer and self._slot["handles"] > 1:
+            self._slot["commit_pending"] = True  # 바깥 미commit 쓰기와 공유 — 반납 시 commit
+            return
+        self._conn.commit()
+        self._slot["commit_pending"] = False
+
+    def rollback(self):
+        self._conn.rollback()
+        self._slot["commit_pending"] = False
+
+    def close(self):
+        if self._release():
+            _settle(self._slot)
+
+    def __del__(self):
+        # 예외로 close()를 건너뛴 핸들 — 순환 참조면 GC가 다른 스레드에서 호출할 수 있으므로
+        # 소유 스레드에서만 트랜잭션 정리, 그 외에는 반납만 (정리는 소유 스레드의 다음 get_connection())
+        if self._release() and threading.get_ident() == self._slot["thread"]:
+            _settle(self._slot)
+
+    def _release(self) -> bool:
+        """핸들 반납 → 마지막 핸들이었으면 True"""
+        with self._slot["lock"]:
+            if self._closed:
+                return False
+            self._closed = True
+            self._slot["handles"] -= 1
+            return self._slot["handles"] == 0
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        # sqlite3.Connection과 동일: 성공 시 commit, 예외 시 rollback (닫지 않음)
+        # 바깥 미commit 쓰기와 공유하는 핸들의 예외는 바깥으로 전파되므로 롤백 여부는 바깥 핸들이 결정
+        if exc_type is None:
+            self.commit()
+        elif not self._defer or self._slot["handles"] == 1:
+            self.rollback()
+
+
+def _settle(slot: dict):
+    """핸들이 모두 반납된 연결의 남은 트랜잭션 정리 — commit 요청이 있었으면 commit, 없으면 롤백"""
+    conn = slot["conn"]
+    if not slot.get("closed") and conn.in_transaction:
+        if slot["commit_pending"]:
+            conn.commit()
+        else:
+            conn.rollback()
+    slot["commit_pending"] = False
 
 
 def get_connection() -> sqlite3.Connection:
-    """동기 SQLite 연결 반환"""
+    """동기 SQLite 연결 반환 — 스레드별 상주 연결의 핸들 (PRAGMA는 연결 생성 시 1회)
+
+    같은 스레드에서 이미 열린 핸들에 commit되지 않은 쓰기가 있으면, 새 핸들의 commit()은
+    그 바깥 핸들이 반납될 때까지 미뤄진다 (연결/트랜잭션 공유 — _PooledConnection 참고).
+    바깥 핸들의 쓰기는 네트워크 호출 등 오래 걸리는 작업 전에 commit해 쓰기 잠금을 반납할 것.
+    """
+    slots = getattr(_local, "slots", None)
+    if slots is None:
+        slots = _local.slots = {}
+    path = str(DB_PATH)
+    slot = slots.get(path)
+    if slot is None:
+        slot = slots[path] = {"conn": _open_connection(path), "handles": 0, "commit_pending": False,
+                              "thread": threading.get_ident(), "lock": threading.Lock()}
+    with slot["lock"]:
+        slot["handles"] += 1
+        first = slot["handles"] == 1
+    if first:
+        _settle(slot)  # 다른 스레드의 GC로 반납된 핸들이 남긴 트랜잭션
+    return _PooledConnection(slot["conn"], slot, defer=not first and slot["conn"].in_transaction)
+
+
+def close_connections():
+    """현재 스레드의 상주 연결 닫기 (DB 파일 교체/삭제 전, 종료 시)"""
+    for slot in getattr(_local, "slots", {}).values():
+        slot["conn"].close()
+        slot["closed"] = True
+    _local.slots = {}
+
+
+def _open_connection(path: str, timeout: float = 5.0) -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(path, timeout=timeout)
     conn.execute("PRAGMA journal_mode=WAL")  # 동시 읽기 성능 향상
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 체크포인트 시에만 fsync
+    conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
-def init_db():
-    """모든 테이블 생성 (없으면 생성)"""
-    conn = get_connection()
-    cursor = conn.cursor()
+# ============================
+# 단일 쓰기 스레드
+# ============================
+# 수집기(REST / WS 청산 / F&G)의 쓰기를 전용 스레드 하나가 큐에서 꺼내 트랜잭션 단위로 묶어 기록한다.
+# 스케줄러 작업과 asyncio 루프는 큐에 넣고 바로 돌아가므로 SQLite 쓰기 잠금을 기다리지 않는다.
+# 쓰기 직후 읽어야 하는 호출부는 반환된 Future.result() 또는 flush()로 기록 완료를 기다린다.
+
+# DB 경로별 쓰기 스레드 {경로: _Writer}
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+class _WriterConnection:
+    """write_transaction() 콜백에 전달되는 연결 — commit/rollback은 쓰기 스레드가 담당"""
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def execute(self, *args, **kwargs):
+        return self._conn.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._conn.executemany(*args, **kwargs)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        raise RuntimeError("write_transaction 안에서는 예외를 발생시켜 롤백하세요")
+
+
+class _Writer:
+    """DB 하나의 쓰기 스레드 — 제한 크기 큐 + 그룹 commit
+
+    큐에 쌓인 작업을 최대 DB_WRITE_BATCH_MAX개씩 꺼내 한 트랜잭션(BEGIN IMMEDIATE ... COMMIT)으로 기록.
+    작업마다 SAVEPOINT로 감싸 한 작업의 실패(제약 위반 등)가 같은 묶음의 다른 작업을 되돌리지 않는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue = queue.Queue(maxsize=DB_WRITE_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, op, block: bool = True) -> Future:
+        future = Future()
+        # 가득 차면 대기 (역압) — block=False면 queue.Full
+        self._queue.put((op, future), block=block)
+        return future
+
+    def stop(self, timeout: float = None):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        conn = _open_connection(self.path, timeout=DB_WRITE_BUSY_TIMEOUT)
+        conn.isolation_level = None  # 트랜잭션은 직접 관리
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None and len(batch) < DB_WRITE_BATCH_MAX:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is None
+                if stop:
+                    batch.pop()
+                if batch:
+                    self._write_batch(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, _ in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    result = op(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    result = e
+                conn.execute("RELEASE op")
+                results.append(result)
+            conn.execute("COMMIT")
+        except Exception as e:
+            # BEGIN/COMMIT 실패 (잠금 시간 초과, 디스크 오류) — 묶음 전체 실패
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"[DBWriter] 트랜잭션 실패 ({len(batch)}건): {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                print(f"[DBWriter] 쓰기 실패: {result}")
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _get_writer() -> _Writer:
+    path = str(DB_PATH)
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = _Writer(path)
+        return writer
+
+
+def write(sql: str, params=()) -> Future:
+    """단일 쓰기를 큐에 넣음 → Future (결과: 영향받은 행 수)"""
+    return _get_writer().submit(lambda conn: conn.execute(sql, params).rowcount)
+
+
+def write_many(sql: str, rows, block: bool = True) -> Future:
+    """executemany 쓰기를 큐에 넣음 → Future (결과: 영향받은 행 수)
+
+    block=False: 큐가 가득 차면 기다리지 않고 queue.Full (asyncio 루프 등 대기하면 안 되는 호출부)
+    """
+    rows = list(rows)
+    return _get_writer().submit(lambda conn: conn.executemany(sql, rows).rowcount, block=block)
+
+
+def write_transaction(fn) -> Future:
+    """fn(conn)을 쓰기 스레드에서 원자적으로 실행 → Future (결과: fn 반환값)
+
+    여러 문장을 하나로 묶거나 읽고-쓰기(read-modify-write)가 필요할 때.
+    fn에서 예외가 나면 fn의 변경만 롤백된다.
+    """
+    return _get_writer().submit(lambda conn: fn(_WriterConnection(conn)))
+
+
+def flush(timeout: float = None):
+    """지금까지 큐에 넣은 쓰기가 모두 commit될 때까지 대기 (read-your-writes)"""
+    writer = _writers.get(str(DB_PATH))
+    if writer is not None:
+        writer.submit(lambda conn: None).result(timeout)
+
+
+def stop_writers(timeout: float = None):
+    """남은 쓰기를 모두 기록하고 쓰기 스레드 종료 (프로세스 종료 시 자동 호출)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop(timeout)
+
+
+atexit.register(stop_writers)
+
+
+# ============================
+# 스키마 마이그레이션
+# ============================
+# 적용된 버전은 PRAGMA user_version에 기록. 스키마 변경은 _MIGRATIONS 끝에 새 버전으로만 추가한다
+# (이미 배포된 마이그레이션은 수정하지 않음). 각 버전은 한 트랜잭션 — 실패 시 해당 버전 전체 롤백.
+
+# ISO 문자열 시각 → epoch 밀리초 (UTC, CURRENT_TIMESTAMP / isoformat() 모두 처리)
+_EPOCH_MS_SQL = "CAST(ROUND((julianday({col}) - 2440587.5) * 86400000) AS INTEGER)"
+
+# epoch 밀리초 정수 시각 컬럼 (테이블, ISO 원본 컬럼) — {원본}_at → {원본}_ms 가상 생성 컬럼
+EPOCH_COLUMNS = (
+    ("liquidations", "collected_at"),
+    ("oi_snapshots", "collected_at"),
+    ("funding_rates", "collected_at"),
+    ("long_short_ratios", "collected_at"),
+    ("orderbook_walls", "collected_at"),
+    ("klines", "collected_at"),
+    ("fear_greed", "collected_at"),
+    ("threshold_signals", "calculated_at"),
+    ("ssm_scores", "calculated_at"),
+    ("signal_log", "created_at"),
+)
+
+
+def epoch_column(iso_col: str) -> str:
+    """ISO 시각 컬럼에 대응하는 epoch 밀리초 컬럼명 (collected_at → collected_ms)"""
+    return iso_col[:-len("_at")] + "_ms"
+
 
+def _has_column(cursor, table: str, column: str) -> bool:
+    # table_xinfo: 생성 컬럼까지 포함
+    return any(row[1] == column for row in cursor.execute(f"PRAGMA table_xinfo({table})"))
+
+
+def _add_column(cursor, table: str, column: str, decl: str):
+    if not _has_column(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _migrate_legacy_columns(cursor):
+    """기존 DB에 나중에 추가된 컬럼 (이전 init_db의 ALTER TABLE)"""
+    _add_column(cursor, "strategy_state", "l2_trailing_stop_price", "REAL")
+    _add_column(cursor, "grid_positions", "direction", "TEXT DEFAULT NULL")
+    _add_column(cursor, "grid_positions", "entry_fill_price", "REAL")
+    _add_column(cursor, "grid_order_log", "direction", "TEXT DEFAULT NULL")
+    _add_column(cursor, "live_daily_pnl", "starting_balance", "REAL NOT NULL DEFAULT 0")
+
+
+def _migrate_epoch_columns(cursor):
+    """시계열 테이블에 epoch 밀리초 정수 시각 컬럼 + 시간 범위 인덱스
+
+    기존 ISO 컬럼에서 계산되는 VIRTUAL 생성 컬럼 — 기존 행 그대로 유지, 삽입 코드 변경 없음
+    (명시적 collected_at을 쓰는 삽입도 일치). 인덱스에는 정수로 저장되어
+    보존 기간 삭제 / 신선도 조회가 문자열 비교 없이 인덱스 범위 검색이 된다.
+    """
+    for table, iso_col in EPOCH_COLUMNS:
+        _add_column(cursor, table, epoch_column(iso_col),
+                    f"INTEGER GENERATED ALWAYS AS ({_EPOCH_MS_SQL.format(col=iso_col)}) VIRTUAL")
+
+    indexes = [
+        # 보존 기간 삭제 (purge_old_data)
+        ("idx_liq_collected_ms", "liquidations(collected_ms)"),
+        ("idx_klines_collected_ms", "klines(collected_ms)"),
+        ("idx_ob_collected_ms", "orderbook_walls(collected_ms)"),
+        ("idx_fg_collected_ms", "fear_greed(collected_ms)"),
+        ("idx_signal_created_ms", "signal_log(created_ms)"),
+        # 심볼별 최신 수집 시각 (check_data_freshness)
+        ("idx_klines_symbol_collected_ms", "klines(symbol, interval, collected_ms)"),
+        ("idx_oi_symbol_ms", "oi_snapshots(symbol, collected_ms)"),
+        ("idx_funding_symbol_ms", "funding_rates(symbol, collected_ms)"),
+        ("idx_ls_symbol_ms", "long_short_ratios(symbol, collected_ms)"),
+        ("idx_threshold_symbol_ms", "threshold_signals(symbol, calculated_ms)"),
+        ("idx_ssm_symbol_ms", "ssm_scores(symbol, calculated_ms)"),
+    ]
+    for name, target in indexes:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _migrate_latest_indexes(cursor):
+    """엔진의 심볼별 최신값 조회(ORDER BY collected_at DESC LIMIT 1)용 커버링 인덱스
+
+    조회 컬럼까지 인덱스에 포함 — 테이블 행을 읽지 않고 인덱스 끝에서 바로 반환.
+    """
+    indexes = [
+        ("idx_oi_latest", "oi_snapshots(symbol, collected_at, open_interest)"),
+        ("idx_funding_latest", "funding_rates(symbol, collected_at, funding_rate)"),
+        ("idx_ls_latest", "long_short_ratios(symbol, collected_at, long_account, short_account)"),
+        ("idx_fg_latest", "fear_greed(collected_at, value, classification)"),
+    ]
+    for name, target in indexes:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _migrate_latest_values(cursor):
+    """엔진 출력 최신값 미러 — (엔진, 심볼)당 1행 (latest_values.publish()가 갱신)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS latest_values (
+            engine TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (engine, symbol)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_retention_indexes(cursor):
+    """보존 정리 청크 선택용 시각 인덱스 (v3에서 (심볼, 시각)만 있던 테이블)"""
+    indexes = [
+        ("idx_oi_collected_ms", "oi_snapshots(collected_ms)"),
+        ("idx_funding_collected_ms", "funding_rates(collected_ms)"),
+        ("idx_ls_collected_ms", "long_short_ratios(collected_ms)"),
+        ("idx_threshold_calculated_ms", "threshold_signals(calculated_ms)"),
+        ("idx_ssm_calculated_ms", "ssm_scores(calculated_ms)"),
+    ]
+    for name, target in indexes:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _create_base_schema(cursor):
+    """기본 테이블 생성 (없으면 생성) — v1"""
     # ① 청산 이벤트 (WebSocket forceOrder)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS liquidations (
@@ -292,12 +707,6 @@ def init_db():
         ON strategy_state(symbol)
     """)
 
-    # Migration: trailing stop 컬럼 추가
-    try:
-        cursor.execute("ALTER TABLE strategy_state ADD COLUMN l2_trailing_stop_price REAL")
-    except Exception:
-        pass  # 이미 존재
-
     # 시그널 로그 (append-only)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS signal_log (
@@ -470,15 +879,6 @@ def init_db():
             UNIQUE(symbol, grid_price)
         )
     """)
-    # Migration: 기존 DB에 새 컬럼 추가
-    try:
-        cursor.execute("ALTER TABLE grid_positions ADD COLUMN direction TEXT DEFAULT NULL")
-    except Exception:
-        pass
-    try:
-        cursor.execute("ALTER TABLE grid_positions ADD COLUMN entry_fill_price REAL")
-    except Exception:
-        pass
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_grid_pos_symbol
         ON grid_positions(symbol, status)
@@ -503,16 +903,6 @@ def init_db():
             filled_at TIMESTAMP
         )
     """)
-    # Migration: 기존 DB에 direction 컬럼 추가
-    try:
-        cursor.execute("ALTER TABLE grid_order_log ADD COLUMN direction TEXT DEFAULT NULL")
-    except Exception:
-        pass
-    # Migration: live_daily_pnl에 starting_balance 컬럼 추가
-    try:
-        cursor.execute("ALTER TABLE live_daily_pnl ADD COLUMN starting_balance REAL NOT NULL DEFAULT 0")
-    except Exception:
-        pass
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_grid_log_symbol
         ON grid_order_log(symbol, created_at)
@@ -540,9 +930,80 @@ def init_db():
         ON mtf_analysis(symbol, calculated_at)
     """)
 
-    conn.commit()
-    conn.close()
-    print("[DB] 테이블 초기화 완료")
+
+# (버전, 설명, 함수(cursor)) — 버전 순서대로 1회씩 적용
+_MIGRATIONS = (
+    (1, "기본 스키마", _create_base_schema),
+    (2, "추가 컬럼 (trailing stop / grid direction / starting_balance)", _migrate_legacy_columns),
+    (3, "epoch 밀리초 시각 컬럼 + 시간 범위 인덱스", _migrate_epoch_columns),
+    (4, "최신값 커버링 인덱스", _migrate_latest_indexes),
+    (5, "엔진 출력 최신값 미러 테이블", _migrate_latest_values),
+    (6, "보존 정리 시각 인덱스", _migrate_retention_indexes),
+)
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def migrate(conn) -> list:
+    """미적용 마이그레이션 실행 → 적용한 버전 목록"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        print(f"[DB] 경고: DB 스키마 v{version}이 코드(v{SCHEMA_VERSION})보다 새로움 — 마이그레이션 건너뜀")
+        return []
+
+    applied = []
+    for target, description, func in _MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            func(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"[DB] 마이그레이션 v{target}: {description}")
+        applied.append(target)
+    return applied
+
+
+def init_db():
+    """스키마 생성 + 미적용 마이그레이션 실행
+
+    새 DB는 테이블 생성 전에 auto_vacuum=INCREMENTAL 설정 (WAL 헤더 반영용 VACUUM — 빈 파일이라 즉시 끝남).
+    기존 DB의 전환은 전체 VACUUM(쓰기 잠금)이 필요하므로 시작 시 하지 않는다 — enable_incremental_vacuum().
+    """
+    conn = get_connection()
+    try:
+        if conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        elif conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            print("[DB] auto_vacuum 미설정 — 정리 후 빈 페이지가 파일에 남음 "
+                  "(봇 중지 후 1회: python db.py --enable-incremental-vacuum)")
+        migrate(conn)
+    finally:
+        conn.close()
+    print(f"[DB] 테이블 초기화 완료 (스키마 v{SCHEMA_VERSION})")
+
+
+def enable_incremental_vacuum():
+    """기존 DB를 auto_vacuum=INCREMENTAL로 전환 — 1회성 유지보수 (전체 VACUUM, 실행 중 쓰기 차단)
+
+    봇을 중지한 상태에서 실행. 이후 purge_old_data()가 빈 페이지를 청크 단위로 회수한다.
+    """
+    conn = get_connection()
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            print("[DB] 이미 auto_vacuum=INCREMENTAL")
+            return
+        size_mb = DB_PATH.stat().st_size / 1e6 if DB_PATH.exists() else 0
+        print(f"[DB] auto_vacuum=INCREMENTAL 전환 — VACUUM ({size_mb:.1f}MB)")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    print("[DB] 전환 완료")
 
 
 def check_data_freshness(symbol: str, max_age_seconds: int = 600) -> dict:
@@ -550,26 +1011,21 @@ def check_data_freshness(symbol: str, max_age_seconds: int = 600) -> dict:
     import time
     conn = get_connection()
     now = time.time()
-    # (테이블, 컬럼, WHERE 조건, 개별 max_age)
+    # (테이블, epoch 밀리초 컬럼, WHERE 조건, 개별 max_age) — (심볼, 시각) 인덱스로 최신값 1건 조회
     tables = {
-        "klines_5m": ("klines", "collected_at", f"symbol = '{symbol}' AND interval = '5m'", 600),
-        "oi": ("oi_snapshots", "collected_at", f"symbol = '{symbol}'", 7200),         # 1시간 수집 → 2시간 허용
-        "funding": ("funding_rates", "collected_at", f"symbol = '{symbol}'", 57600),   # 8시간 수집 → 16시간 허용
-        "threshold": ("threshold_signals", "calculated_at", f"symbol = '{symbol}'", 600),
-        "ssm_score": ("ssm_scores", "calculated_at", f"symbol = '{symbol}'", 1200),    # 10분 수집 → 20분 허용
+        "klines_5m": ("klines", "collected_ms", "symbol = ? AND interval = '5m'", 600),
+        "oi": ("oi_snapshots", "collected_ms", "symbol = ?", 7200),         # 1시간 수집 → 2시간 허용
+        "funding": ("funding_rates", "collected_ms", "symbol = ?", 57600),   # 8시간 수집 → 16시간 허용
+        "threshold": ("threshold_signals", "calculated_ms", "symbol = ?", 600),
+        "ssm_score": ("ssm_scores", "calculated_ms", "symbol = ?", 1200),    # 10분 수집 → 20분 허용
     }
     result = {}
     for key, (table, col, where, src_max_age) in tables.items():
         row = conn.execute(
-            f"SELECT {col} FROM {table} WHERE {where} ORDER BY id DESC LIMIT 1"
+            f"SELECT MAX({col}) FROM {table} WHERE {where}", (symbol,)
         ).fetchone()
-        if row and row[0]:
-            from datetime import datetime
-            try:
-                ts = datetime.fromisoformat(row[0].replace("Z", "+00:00"))
-                age = now - ts.timestamp()
-            except Exception:
-                age = float("inf")
+        if row and row[0] is not None:
+            age = now - row[0] / 1000
             result[key] = {"age_seconds": round(age), "stale": age > src_max_age}
         else:
             result[key] = {"age_seconds": None, "stale": True}
@@ -577,49 +1033,117 @@ def check_data_freshness(symbol: str, max_age_seconds: int = 600) -> dict:
     return result
 
 
-def purge_old_data(days_short: int = 30, days_long: int = 90):
-    """오래된 데이터 자동 삭제 — 고빈도 테이블 30일, 저빈도 90일"""
+# ============================
+# 보존 기간 정리
+# ============================
+# (테이블, epoch 밀리초 컬럼, 보존 구분) — strategy_state(심볼당 1행) / 페이퍼 트레이딩 이력(성과 집계용)은 제외
+RETENTION_TABLES = (
+    ("liquidations", "collected_ms", "short"),
+    ("klines", "collected_ms", "short"),
+    ("threshold_signals", "calculated_ms", "short"),
+    ("ssm_scores", "calculated_ms", "short"),
+    ("signal_log", "created_ms", "short"),
+    ("oi_snapshots", "collected_ms", "long"),
+    ("funding_rates", "collected_ms", "long"),
+    ("long_short_ratios", "collected_ms", "long"),
+    ("orderbook_walls", "collected_ms", "long"),
+    ("fear_greed", "collected_ms", "long"),
+)
+
+
+def purge_old_data(days_short: int = DB_RETENTION_SHORT_DAYS, days_long: int = DB_RETENTION_LONG_DAYS):
+    """보존 기간 지난 행을 월별 압축 파일로 보관 후 청크 단위 삭제 + 빈 페이지 점진 회수
+
+    청크마다 최대 DB_PURGE_CHUNK_ROWS행을 읽어 보관(잠금 없음) → 짧은 쓰기 트랜잭션으로 삭제 →
+    DB_PURGE_CHUNK_PAUSE초 양보. 다른 쓰기(라이브 그리드, 쓰기 스레드)는 청크 사이에 잠금을 얻는다.
+    스케줄러에서는 별도 스레드로 실행 (main._run_in_thread).
+    """
+    now_ms = int(time.time() * 1000)
+    days = {"short": days_short, "long": days_long}
     conn = get_connection()
-    cursor = conn.cursor()
-
-    # 고빈도 테이블 (30일)
-    # strategy_state 제외: UNIQUE(symbol) 행이므로 삭제하면 트레이딩 중단됨
-    short_tables = [
-        ("liquidations", "collected_at"),
-        ("klines", "collected_at"),
-        ("threshold_signals", "calculated_at"),
-        ("ssm_scores", "calculated_at"),
-        ("signal_log", "created_at"),
-    ]
-    for table, col in short_tables:
-        cursor.execute(
-            f"DELETE FROM {table} WHERE {col} < datetime('now', '-{days_short} days')"
-        )
-        deleted = cursor.rowcount
-        if deleted > 0:
-            print(f"[DB Purge] {table}: {deleted}건 삭제 ({days_short}일 이전)")
-
-    # 저빈도 테이블 (90일) — 페이퍼 트레이딩 이력은 보존 (성과 집계용)
-    long_tables = [
-        ("oi_snapshots", "collected_at"),
-        ("funding_rates", "collected_at"),
-        ("long_short_ratios", "collected_at"),
-        ("orderbook_walls", "collected_at"),
-        ("fear_greed", "collected_at"),
-    ]
-    for table, col in long_tables:
-        cursor.execute(
-            f"DELETE FROM {table} WHERE {col} < datetime('now', '-{days_long} days')"
-        )
-        deleted = cursor.rowcount
-        if deleted > 0:
-            print(f"[DB Purge] {table}: {deleted}건 삭제 ({days_long}일 이전)")
+    try:
+        for table, col, kind in RETENTION_TABLES:
+            deleted = _purge_table(conn, table, col, now_ms - days[kind] * 86400000)
+            if deleted > 0:
+                print(f"[DB Purge] {table}: {deleted}건 보관 후 삭제 ({days[kind]}일 이전)")
+        freed = _incremental_vacuum(conn)
+    finally:
+        conn.close()
+    print(f"[DB Purge] 완료 (빈 페이지 {freed}개 회수)")
 
-    conn.commit()
-    conn.close()
-    print("[DB Purge] 완료")
+
+def _purge_table(conn, table: str, col: str, cutoff_ms: int) -> int:
+    # 원본 컬럼만 보관 (생성 컬럼 제외 — table_info는 숨은/생성 컬럼을 포함하지 않음)
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    total = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT rowid, {col}, {', '.join(columns)} FROM {table} "
+            f"WHERE {col} < ? ORDER BY {col} LIMIT ?",
+            (cutoff_ms, DB_PURGE_CHUNK_ROWS),
+        ).fetchall()
+        if not rows:
+            return total
+        _archive_rows(table, columns, rows)
+
+        # 보관한 행만 삭제 — 잠금은 DELETE 동안만
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"DELETE FROM {table} WHERE rowid = ? AND {col} < ?",
+                [(row[0], cutoff_ms) for row in rows],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        total += len(rows)
+        time.sleep(DB_PURGE_CHUNK_PAUSE)
+
+
+def _archive_rows(table: str, columns: list, rows: list):
+    """행을 data/archive/{table}/{table}_{YYYY-MM}.jsonl.gz에 추가 (월 = 행 시각, UTC)
+
+    청크마다 gzip 멤버 하나를 이어 붙임 (gzip.open으로 전체를 순서대로 읽을 수 있음).
+    삭제 전에 fsync — 삭제 직전 중단되면 다음 실행에서 같은 행이 한 번 더 보관될 수 있음.
+    """
+    by_month = {}
+    for row in rows:
+        month = datetime.fromtimestamp(row[1] / 1000, tz=timezone.utc).strftime("%Y-%m")
+        by_month.setdefault(month, []).append(
+            json.dumps(dict(zip(columns, row[2:])), ensure_ascii=False))
+
+    folder = DB_ARCHIVE_DIR / table
+    folder.mkdir(parents=True, exist_ok=True)
+    for month, lines in by_month.items():
+        with open(folder / f"{table}_{month}.jsonl.gz", "ab") as f:
+            f.write(gzip.compress(("\n".join(lines) + "\n").encode("utf-8")))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _incremental_vacuum(conn) -> int:
+    """빈 페이지를 DB_VACUUM_CHUNK_PAGES씩 파일에서 회수 (auto_vacuum=INCREMENTAL일 때만)"""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return 0
+    freed = 0
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    while free > 0:
+        # execute()는 1스텝만 실행 (1페이지 회수) — executescript로 끝까지 실행
+        conn.executescript(f"PRAGMA incremental_vacuum({DB_VACUUM_CHUNK_PAGES});")
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free:
+            break  # 진행 없음 (다른 연결이 읽는 중 등) — 다음 실행에서 이어서
+        freed += free - remaining
+        free = remaining
+        time.sleep(DB_PURGE_CHUNK_PAUSE)
+    return freed
 
 
 if __name__ == "__main__":
-    init_db()
+    import sys
+    if "--enable-incremental-vacuum" in sys.argv[1:]:
+        enable_incremental_vacuum()
+    else:
+        init_db()
     print(f"[DB] 경로: {DB_PATH}")
@@ -1,5 +1,6 @@
 """Engine 1: ATR 계산기 - klines 기반 ATR + 스톱로스 산출"""
 from db import get_connection
+from latest_values import get_latest, publish
 from config import SYMBOLS, ATR_STOP_LOSS_MULTIPLIER
 
 
@@ -50,11 +51,12 @@ def _calc_single(symbol: str, period: int) -> dict | None:
     stop_loss_pct = atr_pct * ATR_STOP_LOSS_MULTIPLIER
 
     # DB 저장
-    conn.execute(
+    cursor = conn.execute(
         "INSERT INTO atr_values (symbol, atr, atr_pct, stop_loss_pct, current_price) "
         "VALUES (?, ?, ?, ?, ?)",
         (symbol, round(atr, 2), round(atr_pct, 4), round(stop_loss_pct, 4), current_price),
     )
+    publish(conn, "atr", symbol, cursor.lastrowid)
     conn.commit()
     conn.close()
 
@@ -73,26 +75,11 @@ def _calc_single(symbol: str, period: int) -> dict | None:
 
 
 def get_latest_atr(symbol: str = "BTCUSDT") -> dict | None:
-    """atr_values 테이블에서 최신 ATR 조회 (재계산 없이)"""
+    """최신 ATR 조회 (재계산 없이) — 최신값 레지스트리 (없으면 atr_values)"""
     conn = get_connection()
-    row = conn.execute(
-        "SELECT atr, atr_pct, stop_loss_pct, current_price, calculated_at "
-        "FROM atr_values WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    latest = get_latest(conn, "atr", symbol)
     conn.close()
-
-    if not row:
-        return None
-
-    return {
-        "symbol": symbol,
-        "atr": row[0],
-        "atr_pct": row[1],
-        "stop_loss_pct": row[2],
-        "current_price": row[3],
-        "calculated_at": row[4],
-    }
+    return latest
 
 
 if __name__ == "__main__":
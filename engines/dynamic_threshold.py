@@ -1,6 +1,7 @@
 """Engine 2: 동적 임계점 - 청산 캐스케이드 감지 + 트리거 판정"""
-import time
+import clock
 from db import get_connection
+from latest_values import get_latest, publish
 from config import SYMBOLS, L2_TRIGGER_THRESHOLD_PCT
 
 
@@ -19,7 +20,7 @@ def _calc_single(symbol: str) -> dict | None:
     conn = get_connection()
 
     # 1. 최근 1시간 청산 금액 (side별)
-    now_ms = int(time.time() * 1000)
+    now_ms = int(clock.time() * 1000)
     one_hour_ago_ms = now_ms - 3600_000
 
     liq_rows = conn.execute(
@@ -111,7 +112,7 @@ def _calc_single(symbol: str) -> dict | None:
             direction = "LONG_CASCADE"   # 롱 청산 우세 = 가격 하락 방향
 
     # DB 저장
-    conn.execute(
+    cursor = conn.execute(
         "INSERT INTO threshold_signals "
         "(symbol, threshold_value, liq_amount_1h, current_oi, liquidity_coeff, trigger_active, direction) "
         "VALUES (?, ?, ?, ?, ?, ?, ?)",
@@ -119,6 +120,7 @@ def _calc_single(symbol: str) -> dict | None:
          current_oi, round(liquidity_coeff, 4),
          1 if trigger_active else 0, direction),
     )
+    publish(conn, "threshold", symbol, cursor.lastrowid)
     conn.commit()
     conn.close()
 
@@ -143,29 +145,11 @@ def _calc_single(symbol: str) -> dict | None:
 
 
 def get_latest_threshold(symbol: str = "BTCUSDT") -> dict | None:
-    """threshold_signals에서 최신 결과 조회"""
+    """최신 임계점 결과 조회 — 최신값 레지스트리 (없으면 threshold_signals)"""
     conn = get_connection()
-    row = conn.execute(
-        "SELECT threshold_value, liq_amount_1h, current_oi, liquidity_coeff, "
-        "trigger_active, direction, calculated_at "
-        "FROM threshold_signals WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    latest = get_latest(conn, "threshold", symbol)
     conn.close()
-
-    if not row:
-        return None
-
-    return {
-        "symbol": symbol,
-        "threshold_value": row[0],
-        "liq_amount_1h": row[1],
-        "current_oi": row[2],
-        "liquidity_coeff": row[3],
-        "trigger_active": bool(row[4]),
-        "direction": row[5],
-        "calculated_at": row[6],
-    }
+    return latest
 
 
 if __name__ == "__main__":
@@ -1,8 +1,7 @@
 """Gemini Flash API 래퍼 - S(Story) 점수용 감성 분석"""
 import json
-import time
-from datetime import date
 
+import clock
 from db import get_connection
 from config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_DAILY_LIMIT
 
@@ -32,7 +31,7 @@ Rules:
 
 def check_daily_budget() -> tuple[int, int]:
     """오늘 사용량 확인. (calls_used, daily_limit) 반환"""
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
     conn = get_connection()
     row = conn.execute(
         "SELECT calls_used, daily_limit FROM gemini_usage WHERE call_date = ?",
@@ -47,7 +46,7 @@ def check_daily_budget() -> tuple[int, int]:
 
 def _increment_usage(count: int = 1):
     """일일 사용량 증가"""
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
     conn = get_connection()
     conn.execute(
         "INSERT INTO gemini_usage (call_date, calls_used, daily_limit) "
@@ -111,7 +110,7 @@ def build_market_prompt(symbol: str) -> str:
             parts.append(f"- 24h price change: {change:+.2f}%")
 
     # 1h liquidation summary
-    now_ms = int(time.time() * 1000)
+    now_ms = int(clock.time() * 1000)
     liq = conn.execute(
         "SELECT side, COUNT(*), SUM(price * qty) FROM liquidations "
         "WHERE symbol = ? AND trade_time > ? GROUP BY side",
@@ -0,0 +1,87 @@
+"""그리드 레벨 교차 카운터 — 캔들 내부 경로를 NumPy로 전 레벨 동시 처리
+
+캔들 하나의 내부 경로를 양봉 O→L→H→C / 음봉 O→H→L→C 꼭짓점 4개로 근사하고,
+꼭짓점 사이는 단조 구간이므로 구간 인덱스 차이만으로 지나간 레벨 수를 센다.
+종가 샘플링으로는 잡히지 않는 캔들 내부 왕복(고가/저가 터치 후 복귀)까지 포함된다.
+
+구간 인덱스 i: levels[i] < p <= levels[i+1] (첫 구간은 levels[0] 포함),
+범위 밖 가격은 양 끝 구간으로 간주 (그리드 전량 체결 상태).
+"""
+import numpy as np
+
+
+def candle_paths(opens, highs, lows, closes) -> np.ndarray:
+    """캔들별 내부 경로 꼭짓점 (n, 4) — 양봉 O→L→H→C, 음봉 O→H→L→C"""
+    o = np.asarray(opens, dtype=np.float64)
+    h = np.asarray(highs, dtype=np.float64)
+    l = np.asarray(lows, dtype=np.float64)
+    c = np.asarray(closes, dtype=np.float64)
+    bullish = c >= o
+    return np.stack([o, np.where(bullish, l, h), np.where(bullish, h, l), c], axis=1)
+
+
+def price_bands(prices, levels) -> np.ndarray:
+    """가격 → 그리드 구간 인덱스 (0 ~ len(levels) - 2)"""
+    levels = np.asarray(levels, dtype=np.float64)
+    bands = np.searchsorted(levels, np.asarray(prices, dtype=np.float64), side="left") - 1
+    return np.clip(bands, 0, len(levels) - 2)
+
+
+def grid_crossings(path, levels, start_band: int) -> tuple[np.ndarray, np.ndarray]:
+    """경로가 지나간 그리드 레벨 이벤트를 발생 순서대로 반환
+
+    Args:
+        path: 가격 경로 (1차원, candle_paths(...).ravel() 등)
+        levels: 오름차순 그리드 레벨 가격
+        start_band: 경로 시작 전 구간 인덱스
+
+    Returns:
+        (grid_level, side) — side +1: 상향 돌파(SELL), -1: 하향 돌파(BUY)
+        상향 a→b는 레벨 a+1..b, 하향 a→b는 레벨 a-1..b (paper_l4_grid 기록 규칙)
+    """
+    start_band = min(max(int(start_band), 0), len(levels) - 2)
+    bands = np.concatenate([[start_band], price_bands(path, levels)])
+    moves = np.diff(bands)
+    counts = np.abs(moves)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    move_idx = np.repeat(np.arange(len(moves)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    sides = np.sign(moves)[move_idx]
+    return bands[move_idx] + sides * (offsets + 1), sides
+
+
+def sell_pnl_pct(levels, fee_rate: float) -> np.ndarray:
+    """레벨별 SELL 1회 포트폴리오 PnL% (인덱스 = grid_level, 0번은 0)
+
+    구간 수익률 - 왕복 수수료를 구간 수로 나눔 (각 그리드는 1/count 자본 사용)
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    count = len(levels) - 1
+    pnl = np.zeros(len(levels))
+    pnl[1:] = ((levels[1:] - levels[:-1]) / levels[:-1] * 100 - fee_rate * 2 * 100) / count
+    return pnl
+
+
+def count_crossings(opens, highs, lows, closes, levels, fee_rate: float,
+                    start_band: int = None) -> dict:
+    """캔들 배열 전체의 그리드 체결 집계 (백테스트/파라미터 탐색용)
+
+    Returns:
+        {sells, buys, pnl_pct, end_band, sells_per_level}
+    """
+    path = candle_paths(opens, highs, lows, closes).ravel()
+    if start_band is None:
+        start_band = int(price_bands(path[:1], levels)[0])
+    grid_levels, sides = grid_crossings(path, levels, start_band)
+    sells = grid_levels[sides > 0]
+    end_band = int(price_bands(path[-1:], levels)[0]) if len(path) else start_band
+    return {
+        "sells": int(len(sells)),
+        "buys": int(len(grid_levels) - len(sells)),
+        "pnl_pct": float(sell_pnl_pct(levels, fee_rate)[sells].sum()),
+        "end_band": end_band,
+        "sells_per_level": np.bincount(sells, minlength=len(levels)),
+    }
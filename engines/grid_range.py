@@ -2,6 +2,7 @@
 from db import get_connection
 from config import SYMBOLS, GRID_COUNT_MIN, GRID_COUNT_MAX, MIN_GRID_SPACING_PCT
 from engines.atr import get_latest_atr
+from latest_values import get_latest, publish
 
 # 스푸핑 방어: 가격 허용 오차 (±0.1%)
 SPOOFING_PRICE_TOLERANCE = 0.001
@@ -217,7 +218,7 @@ def _calc_single(symbol: str) -> dict | None:
             return None
 
     # DB 저장
-    conn.execute(
+    cursor = conn.execute(
         "INSERT INTO grid_configs "
         "(symbol, lower_bound, upper_bound, grid_count, grid_spacing, grid_spacing_pct, spoofing_filtered) "
         "VALUES (?, ?, ?, ?, ?, ?, ?)",
@@ -225,6 +226,7 @@ def _calc_single(symbol: str) -> dict | None:
          grid_count, round(grid_spacing, 2), round(grid_spacing_pct, 4),
          spoofing_filtered),
     )
+    publish(conn, "grid", symbol, cursor.lastrowid)
     conn.commit()
     conn.close()
 
@@ -270,13 +272,14 @@ def _fallback_grid(symbol: str, conn) -> dict | None:
         print(f"[Grid] {symbol}: ATR 폴백 간격 {grid_spacing_pct:.4f}% < 최소 {MIN_GRID_SPACING_PCT}% — 생성 불가")
         return None
 
-    conn.execute(
+    cursor = conn.execute(
         "INSERT INTO grid_configs "
         "(symbol, lower_bound, upper_bound, grid_count, grid_spacing, grid_spacing_pct, spoofing_filtered) "
         "VALUES (?, ?, ?, ?, ?, ?, ?)",
         (symbol, round(lower_bound, 2), round(upper_bound, 2),
          grid_count, round(grid_spacing, 2), round(grid_spacing_pct, 4), -1),
     )
+    publish(conn, "grid", symbol, cursor.lastrowid)
     conn.commit()
 
     result = {
@@ -296,30 +299,11 @@ def _fallback_grid(symbol: str, conn) -> dict | None:
 
 
 def get_latest_grid(symbol: str = "BTCUSDT") -> dict | None:
-    """grid_configs에서 최신 그리드 설정 조회"""
+    """최신 그리드 설정 조회 — 최신값 레지스트리 (없으면 grid_configs)"""
     conn = get_connection()
-    row = conn.execute(
-        "SELECT id, lower_bound, upper_bound, grid_count, grid_spacing, "
-        "grid_spacing_pct, spoofing_filtered, calculated_at "
-        "FROM grid_configs WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    latest = get_latest(conn, "grid", symbol)
     conn.close()
-
-    if not row:
-        return None
-
-    return {
-        "id": row[0],
-        "symbol": symbol,
-        "lower_bound": row[1],
-        "upper_bound": row[2],
-        "grid_count": row[3],
-        "grid_spacing": row[4],
-        "grid_spacing_pct": row[5],
-        "spoofing_filtered": row[6],
-        "calculated_at": row[7],
-    }
+    return latest
 
 
 if __name__ == "__main__":
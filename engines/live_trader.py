@@ -17,9 +17,10 @@ V1 대비 변경:
 6. OOB 가드 (범위 밖 30분 이상시 주문 철수)
 7. grid_order_log 전수 감사 로깅
 """
-import time
 import threading
-from datetime import date, datetime
+from datetime import datetime, timezone
+
+import clock
 
 import requests as _requests
 
@@ -40,6 +41,8 @@ from config import (
     HYBRID_L2_TRAILING_ACTIVATE, HYBRID_L2_TRAILING_DISTANCE,
     HYBRID_L2_MAX_DURATION, HYBRID_L2_ENABLED,
 )
+from engines.grid_range import get_latest_grid
+from engines.scorer import get_latest_score
 
 # 동시 실행 방지 Lock
 _trade_lock = threading.Lock()
@@ -155,7 +158,7 @@ def _get_direction_bias(symbol: str) -> str:
       MA↔스윙 충돌, MA 중립 → NEUTRAL (L3:S3)
     """
     cached = _direction_bias.get(symbol)
-    if cached and time.time() - cached[1] < DIRECTION_BIAS_TTL:
+    if cached and clock.time() - cached[1] < DIRECTION_BIAS_TTL:
         return cached[0]
 
     # 0) 단기 EMA 필터
@@ -171,7 +174,7 @@ def _get_direction_bias(symbol: str) -> str:
     if not mtf:
         # MTF 없어도 단기 필터 적용
         bias = short_term if short_term == "BEARISH" else "NEUTRAL"
-        _direction_bias[symbol] = (bias, time.time())
+        _direction_bias[symbol] = (bias, clock.time())
         print(f"[Grid][{symbol}] bias: {bias} (MTF 없음) | "
               f"short_term={short_term} slope={slope_pct:+.3f}%")
         return bias
@@ -217,7 +220,7 @@ def _get_direction_bias(symbol: str) -> str:
     else:
         bias = mtf_bias
 
-    _direction_bias[symbol] = (bias, time.time())
+    _direction_bias[symbol] = (bias, clock.time())
     print(f"[Grid][{symbol}] bias: {bias} | "
           f"MA={alignment:+.2f}({ma_dir}) "
           f"Swing=1D:{pattern_1d}/4H:{pattern_4h}({swing_dir}) "
@@ -394,17 +397,16 @@ def _run_grid_cycle_inner(symbol: str):
         grid_id = _active_grid_id.get(symbol, 0)
     else:
         # 최초 또는 OOB 리셋 후 → 최신 그리드 사용
-        grid = conn.execute(
-            "SELECT id, lower_bound, upper_bound, grid_count, grid_spacing "
-            "FROM grid_configs WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-            (symbol,),
-        ).fetchone()
+        grid = get_latest_grid(symbol)
 
         if not grid:
             conn.close()
             return
 
-        grid_id, lower, upper, count, spacing = grid
+        grid_id, lower, upper, count, spacing = (
+            grid["id"], grid["lower_bound"], grid["upper_bound"],
+            grid["grid_count"], grid["grid_spacing"],
+        )
         levels = [round(lower + i * spacing, 2) for i in range(count + 1)]
 
         # 메모리에 고정 (OOB 전환 전까지 불변)
@@ -651,10 +653,10 @@ def _detect_fills_and_place_counters(conn, symbol: str, mark_price: float,
                 )
                 conn.execute(
                     "UPDATE grid_order_log SET status = 'FILLED', fill_price = ?, "
-                    "fee = ?, pnl_usd = ?, filled_at = datetime('now') "
+                    "fee = ?, pnl_usd = ?, filled_at = ? "
                     "WHERE order_id = ? AND status = 'PLACED'",
                     (fill_price, fill_price * fill_qty * MAKER_FEE_RATE,
-                     pnl_usd, order_id),
+                     pnl_usd, _db_now(), order_id),
                 )
                 _update_daily_pnl_usd(conn, pnl_usd)
                 conn.commit()
@@ -671,9 +673,9 @@ def _detect_fills_and_place_counters(conn, symbol: str, mark_price: float,
                 )
                 conn.execute(
                     "UPDATE grid_order_log SET status = 'FILLED', fill_price = ?, "
-                    "fee = ?, filled_at = datetime('now') "
+                    "fee = ?, filled_at = ? "
                     "WHERE order_id = ? AND status = 'PLACED'",
-                    (fill_price, fill_price * fill_qty * MAKER_FEE_RATE, order_id),
+                    (fill_price, fill_price * fill_qty * MAKER_FEE_RATE, _db_now(), order_id),
                 )
                 conn.commit()
                 print(f"[Live V2] {symbol}: LONG BUY 체결 @ ${fill_price:,.2f}")
@@ -743,9 +745,9 @@ def _detect_fills_and_place_counters(conn, symbol: str, mark_price: float,
                 )
                 conn.execute(
                     "UPDATE grid_order_log SET status = 'FILLED', fill_price = ?, "
-                    "fee = ?, filled_at = datetime('now') "
+                    "fee = ?, filled_at = ? "
                     "WHERE order_id = ? AND status = 'PLACED'",
-                    (fill_price, fill_price * fill_qty * MAKER_FEE_RATE, order_id),
+                    (fill_price, fill_price * fill_qty * MAKER_FEE_RATE, _db_now(), order_id),
                 )
                 conn.commit()
                 print(f"[Live V2] {symbol}: SHORT SELL 체결 @ ${fill_price:,.2f}")
@@ -770,10 +772,10 @@ def _detect_fills_and_place_counters(conn, symbol: str, mark_price: float,
                 )
                 conn.execute(
                     "UPDATE grid_order_log SET status = 'FILLED', fill_price = ?, "
-                    "fee = ?, pnl_usd = ?, filled_at = datetime('now') "
+                    "fee = ?, pnl_usd = ?, filled_at = ? "
                     "WHERE order_id = ? AND status = 'PLACED'",
                     (fill_price, fill_price * fill_qty * MAKER_FEE_RATE,
-                     pnl_usd, order_id),
+                     pnl_usd, _db_now(), order_id),
                 )
                 _update_daily_pnl_usd(conn, pnl_usd)
                 conn.commit()
@@ -1056,7 +1058,7 @@ def _place_entry_buy_limit(conn, ex, symbol: str, grid_price: float,
     offset = _get_entry_offset(symbol, grid_spacing)
     limit_price = grid_price * (1 + offset)  # 약간 높게 → 체결 확률 ↑
 
-    client_oid = f"gv2_lb_{symbol}_{grid_price}_{int(time.time())}"
+    client_oid = f"gv2_lb_{symbol}_{grid_price}_{int(clock.time())}"
     result = ex.place_limit_order_with_id(symbol, "BUY", quantity, limit_price, client_oid)
     if result:
         order_id = str(result.get("orderId", ""))
@@ -1084,7 +1086,7 @@ def _place_entry_sell_limit(conn, ex, symbol: str, grid_price: float,
     offset = _get_entry_offset(symbol, grid_spacing)
     limit_price = grid_price * (1 - offset)  # 약간 낮게 → 체결 확률 ↑
 
-    client_oid = f"gv2_se_{symbol}_{grid_price}_{int(time.time())}"
+    client_oid = f"gv2_se_{symbol}_{grid_price}_{int(clock.time())}"
     result = ex.place_limit_order_with_id(symbol, "SELL", quantity, limit_price, client_oid)
     if result:
         order_id = str(result.get("orderId", ""))
@@ -1109,7 +1111,7 @@ def _place_entry_sell_limit(conn, ex, symbol: str, grid_price: float,
 def _place_exit_sell_limit(conn, ex, symbol: str, grid_price: float,
                             sell_price: float, quantity: float):
     """LONG 익절: SELL LIMIT (grid_price + spacing)"""
-    client_oid = f"gv2_ls_{symbol}_{grid_price}_{int(time.time())}"
+    client_oid = f"gv2_ls_{symbol}_{grid_price}_{int(clock.time())}"
     result = ex.place_limit_order_with_id(symbol, "SELL", quantity, sell_price, client_oid)
     if result:
         order_id = str(result.get("orderId", ""))
@@ -1132,7 +1134,7 @@ def _place_exit_sell_limit(conn, ex, symbol: str, grid_price: float,
 def _place_exit_buy_limit(conn, ex, symbol: str, grid_price: float,
                            buy_price: float, quantity: float):
     """SHORT 커버: BUY LIMIT (grid_price - spacing)"""
-    client_oid = f"gv2_sb_{symbol}_{grid_price}_{int(time.time())}"
+    client_oid = f"gv2_sb_{symbol}_{grid_price}_{int(clock.time())}"
     result = ex.place_limit_order_with_id(symbol, "BUY", quantity, buy_price, client_oid)
     if result:
         order_id = str(result.get("orderId", ""))
@@ -1158,7 +1160,7 @@ def _place_exit_buy_limit(conn, ex, symbol: str, grid_price: float,
 
 def _is_trend_guard_active(symbol: str, current_price: float) -> bool:
     """4시간 내 5% 이상 방향성 이동 감지"""
-    now = time.time()
+    now = clock.time()
 
     if symbol not in _price_history:
         # 재시작 후 첫 호출: DB에서 최근 4시간 5분봉으로 초기화
@@ -1209,7 +1211,7 @@ def _handle_oob(symbol: str, mark_price: float, levels: list[float], conn) -> st
     - 범위 밖 + 거래량 > 평균 2배             → 즉시 PAUSE (높은 확률 이탈)
     - 범위 밖 + 거래량 보통                    → WAIT (폴백: 30분 후 PAUSE)
     """
-    now = time.time()
+    now = clock.time()
 
     if symbol not in _oob_since:
         _oob_since[symbol] = now
@@ -1288,7 +1290,7 @@ def _check_volume_breakout(conn, symbol: str) -> bool:
 def _check_liquidation_surge(conn, symbol: str) -> bool:
     """최근 1시간 청산 금액이 임계치 이상인지 확인"""
     try:
-        cutoff_ms = int((time.time() - 3600) * 1000)
+        cutoff_ms = int((clock.time() - 3600) * 1000)
         row = conn.execute(
             "SELECT SUM(qty * price) FROM liquidations "
             "WHERE symbol = ? AND trade_time > ?",
@@ -1378,8 +1380,8 @@ def _cleanup_stale_orders(conn, symbol: str):
     stale = conn.execute(
         "SELECT order_id, side, grid_price, direction FROM grid_order_log "
         "WHERE symbol = ? AND status = 'PLACED' "
-        "AND created_at < datetime('now', '-1 hour')",
-        (symbol,),
+        "AND created_at < ?",
+        (symbol, _db_now(-3600)),
     ).fetchall()
 
     for order_id, side, grid_price, direction in stale:
@@ -1432,8 +1434,8 @@ def _cleanup_stale_orders(conn, symbol: str):
             conn.execute(
                 "UPDATE grid_order_log SET status = 'CANCELLED' "
                 "WHERE symbol = ? AND grid_price = ? AND side = ? AND status = 'PLACED' "
-                "AND order_id IS NULL AND created_at < datetime('now', '-1 hour')",
-                (symbol, grid_price, side),
+                "AND order_id IS NULL AND created_at < ?",
+                (symbol, grid_price, side, _db_now(-3600)),
             )
             conn.commit()
 
@@ -1541,7 +1543,7 @@ def _reconcile_positions(conn, symbol: str):
 
             if rechecked:
                 # 타임아웃 체크: 5분 이상 경과 시 카운터 리셋
-                now_ts = time.time()
+                now_ts = clock.time()
                 if symbol in _reconcile_skip_time:
                     if now_ts - _reconcile_skip_time[symbol] > _RECONCILE_SKIP_TIMEOUT:
                         _reconcile_skip_count.pop(symbol, None)
@@ -1628,7 +1630,7 @@ def _reconcile_reset_position(conn, symbol: str, grid_price: float,
 def _is_circuit_breaker_hit() -> bool:
     """일일 손실 한도 체크 — API 실패시 True(안전) 반환"""
     conn = get_connection()
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
 
     # 1. 이미 발동된 경우
     row = conn.execute(
@@ -1709,7 +1711,8 @@ def _is_circuit_breaker_hit() -> bool:
                     "WHERE symbol = ? AND status != 'EMPTY'",
                     (symbol,),
                 )
-            conn.commit()
+                # 심볼마다 commit — 다음 심볼의 거래소 호출 동안 쓰기 잠금을 쥐지 않도록
+                conn.commit()
             print(f"[CB] 전 포지션 청산 완료")
         except Exception as e:
             print(f"[CB] 포지션 청산 중 오류 (수동 확인 필요): {e}")
@@ -1735,7 +1738,7 @@ def _is_circuit_breaker_hit() -> bool:
 
 def _update_daily_pnl_usd(conn, pnl_usd: float):
     """일일 PnL 업데이트 (USD → % 변환, 일일 시작 잔고 기준)"""
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
 
     existing = conn.execute(
         "SELECT id, realized_pnl, total_orders, starting_balance "
@@ -1794,15 +1797,26 @@ def _log_grid_order(conn, symbol: str, side: str, grid_price: float,
     conn.execute(
         "INSERT INTO grid_order_log "
         "(symbol, side, direction, grid_price, quantity, limit_price, "
-        "order_id, client_order_id, status, fill_price, fee, pnl_usd, filled_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        "order_id, client_order_id, status, fill_price, fee, pnl_usd, created_at, filled_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (symbol, side, direction, grid_price, round(quantity, 4), round(limit_price, 2),
          order_id, client_order_id, status, fill_price,
-         round(fee, 6), round(pnl_usd, 4),
-         datetime.utcnow().isoformat() if status == "FILLED" else None),
+         round(fee, 6), round(pnl_usd, 4), _db_now(),
+         _utc_now().isoformat() if status == "FILLED" else None),
     )
 
 
+def _utc_now() -> datetime:
+    """현재 UTC 시각 (naive) — clock 기준이라 백테스트 재생에서는 가상 시각"""
+    return datetime.fromtimestamp(clock.time(), timezone.utc).replace(tzinfo=None)
+
+
+def _db_now(offset_seconds: float = 0) -> str:
+    """SQLite CURRENT_TIMESTAMP 형식 UTC 문자열 (offset_seconds만큼 이동)"""
+    return datetime.fromtimestamp(clock.time() + offset_seconds,
+                                  timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
 # ============================
 # 헬퍼
 # ============================
@@ -1860,7 +1874,7 @@ def _extract_fill_price(result: dict | None) -> float | None:
 def get_live_status() -> dict:
     """라이브 트레이딩 상태 조회 (양방향 지원)"""
     conn = get_connection()
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
 
     # 오늘 주문 수 (grid_order_log에서)
     orders_today = conn.execute(
@@ -1921,7 +1935,7 @@ def get_live_status() -> dict:
             info["direction"] = _l2_direction.get(sym, "?")
             info["entry_price"] = _l2_entry_price.get(sym, 0)
             entry_time = _l2_entry_time.get(sym, 0)
-            info["elapsed_min"] = round((time.time() - entry_time) / 60) if entry_time else 0
+            info["elapsed_min"] = round((clock.time() - entry_time) / 60) if entry_time else 0
             info["highest_pnl"] = round(_l2_highest_pnl.get(sym, 0), 2)
         hybrid_status[sym] = info
 
@@ -1967,17 +1981,13 @@ def _try_enter_l2(symbol: str, mark_price: float,
     Returns: True if L2 entered, False otherwise
     """
     # SSM 점수 + 방향 확인
-    ssm = conn.execute(
-        "SELECT total_score, direction FROM ssm_scores "
-        "WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    ssm = get_latest_score(symbol)
 
-    if not ssm or ssm[0] < HYBRID_L2_MIN_SSM:
-        print(f"[Hybrid][{symbol}] L2 진입 보류: SSM 부족 ({ssm[0] if ssm else 'N/A'} < {HYBRID_L2_MIN_SSM})")
+    if not ssm or ssm["total_score"] < HYBRID_L2_MIN_SSM:
+        print(f"[Hybrid][{symbol}] L2 진입 보류: SSM 부족 ({ssm['total_score'] if ssm else 'N/A'} < {HYBRID_L2_MIN_SSM})")
         return False
 
-    ssm_direction = ssm[1]  # "BULLISH" or "BEARISH"
+    ssm_direction = ssm["direction"]  # "BULLISH" or "BEARISH"
     oob_direction = "BULLISH" if mark_price > levels[-1] else "BEARISH"
     print(f"[Hybrid][{symbol}] SSM={ssm_direction}, OOB={oob_direction}")
 
@@ -2016,7 +2026,7 @@ def _try_enter_l2(symbol: str, mark_price: float,
     _current_mode[symbol] = "L2"
     _l2_entry_price[symbol] = fill_price
     _l2_direction[symbol] = direction
-    _l2_entry_time[symbol] = time.time()
+    _l2_entry_time[symbol] = clock.time()
     _l2_highest_pnl[symbol] = 0.0
     _l2_quantity[symbol] = qty
 
@@ -2029,7 +2039,7 @@ def _try_enter_l2(symbol: str, mark_price: float,
 
     msg = (f"[Hybrid] {symbol}: L2 {direction} 진입!\n"
            f"  가격: ${fill_price:,.2f} | 수량: {qty}\n"
-           f"  SSM: {ssm[0]:.1f} ({ssm_direction}) | 스톱: {HYBRID_L2_STOP_LOSS_PCT}%")
+           f"  SSM: {ssm['total_score']:.1f} ({ssm_direction}) | 스톱: {HYBRID_L2_STOP_LOSS_PCT}%")
     print(msg)
     _send_telegram(msg)
 
@@ -2232,7 +2242,7 @@ def _run_l2_cycle_inner(symbol: str):
         _l2_highest_pnl[symbol] = pnl_pct
 
     highest = _l2_highest_pnl.get(symbol, 0)
-    elapsed = time.time() - _l2_entry_time.get(symbol, time.time())
+    elapsed = clock.time() - _l2_entry_time.get(symbol, clock.time())
     elapsed_min = elapsed / 60
 
     # === 탈출 조건 ===
@@ -2255,19 +2265,13 @@ def _run_l2_cycle_inner(symbol: str):
         return
 
     # 4. SSM 방향 전환
-    conn = get_connection()
-    ssm = conn.execute(
-        "SELECT direction FROM ssm_scores "
-        "WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
-    conn.close()
+    ssm = get_latest_score(symbol)
 
     if ssm:
         expected_ssm = "BULLISH" if direction == "LONG" else "BEARISH"
-        if ssm[0] != expected_ssm:
+        if ssm["direction"] != expected_ssm:
             _exit_l2_mode(symbol,
-                          f"SSM 방향 전환 ({expected_ssm}→{ssm[0]}, PnL {pnl_pct:+.1f}%)")
+                          f"SSM 방향 전환 ({expected_ssm}→{ssm['direction']}, PnL {pnl_pct:+.1f}%)")
             return
 
 
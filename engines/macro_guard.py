@@ -1,9 +1,9 @@
 """Engine 6: 매크로 이벤트 가드 - Tier별 L2 진입 제한"""
-import time
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import clock
 from collectors.macro_events import load_calendar
 
 # Tier별 사전 차단 시간 (초)
@@ -20,7 +20,7 @@ POST_EVENT_COOLDOWN = 3600  # 1시간
 def check_macro_block(symbol: str = "BTCUSDT") -> dict:
     """매크로 이벤트 기반 L2 진입 차단 여부 판정"""
     events = load_calendar()
-    now = time.time()
+    now = clock.time()
 
     # 가장 가까운 차단 이벤트 찾기
     nearest_block = None
@@ -3,6 +3,7 @@ import json
 import math
 import time
 from db import get_connection
+from latest_values import get_latest, publish
 from config import SYMBOLS
 
 # 적응형 스윙 감지 파라미터 (5분봉 전용)
@@ -374,7 +375,7 @@ def _calc_mtf_single(symbol: str) -> dict:
     }
 
     conn = get_connection()
-    conn.execute(
+    cursor = conn.execute(
         """INSERT INTO mtf_analysis
         (symbol, alignment_score, bias, pattern_1d, pattern_4h,
          nearest_support, nearest_resistance, detail_json)
@@ -384,6 +385,7 @@ def _calc_mtf_single(symbol: str) -> dict:
          levels["nearest_support"], levels["nearest_resistance"],
          json.dumps(detail, default=str)),
     )
+    publish(conn, "mtf", symbol, cursor.lastrowid)
     conn.commit()
     conn.close()
 
@@ -438,28 +440,11 @@ def _check_pattern_alert(symbol: str, pattern_1d: dict, pattern_4h: dict, levels
 
 # === 최신 MTF 결과 조회 (다른 엔진 참조용) ===
 def get_latest_mtf(symbol: str) -> dict | None:
-    """최신 MTF 분석 결과 반환"""
+    """최신 MTF 분석 결과 반환 — 최신값 레지스트리 (없으면 mtf_analysis)"""
     conn = get_connection()
-    row = conn.execute(
-        "SELECT alignment_score, bias, pattern_1d, pattern_4h, "
-        "nearest_support, nearest_resistance, detail_json "
-        "FROM mtf_analysis WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    latest = get_latest(conn, "mtf", symbol)
     conn.close()
-
-    if not row:
-        return None
-
-    return {
-        "alignment_score": row[0],
-        "bias": row[1],
-        "pattern_1d": row[2],
-        "pattern_4h": row[3],
-        "nearest_support": row[4],
-        "nearest_resistance": row[5],
-        "detail": json.loads(row[6]) if row[6] else {},
-    }
+    return latest
 
 
 if __name__ == "__main__":
@@ -7,10 +7,16 @@ Phase 3 핵심: L1/L2 조율 로직
 - L4 그리드 매매 추적
 """
 import json
-from datetime import date, datetime
 
+import numpy as np
+
+import clock
 from db import get_connection
 from config import SYMBOLS, L1_FUNDING_THRESHOLD, L4_FEE_RATE, L2_FEE_RATE
+from engines.grid_crossing import candle_paths, grid_crossings, price_bands, sell_pnl_pct
+
+# L4 그리드: 심볼별 마지막으로 처리한 1분봉 open_time (ms)
+_l4_last_1m: dict[str, int] = {}
 
 
 def run_paper_trader(symbol: str = None):
@@ -62,7 +68,7 @@ def _process_l1_funding(symbol: str):
         return
 
     funding_rate = fr_row[0]
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
 
     # 오늘 이미 기록했는지 확인 (펀딩비는 8시간마다이므로 하루 최대 3회)
     last_record = conn.execute(
@@ -285,7 +291,11 @@ def _process_l2_signals(symbol: str):
 # ============================
 
 def _process_l4_grid(symbol: str):
-    """L4 그리드 가상 매매 — 그리드 레벨별 가상 체결 추적"""
+    """L4 그리드 가상 매매 — 그리드 레벨별 가상 체결 추적
+
+    1분봉이 있으면 지난 호출 이후의 1분봉을 캔들 내부 경로(O→H→L→C / O→L→H→C)로 펼쳐
+    모든 레벨 교차를 한 번에 계산하고 (engines.grid_crossing), 없으면 최신 종가 1개로 판단한다.
+    """
     conn = get_connection()
 
     # L4 활성 여부
@@ -316,71 +326,59 @@ def _process_l4_grid(symbol: str):
         return
 
     lower, upper, count, spacing = grid
-    current_price = _get_current_price(conn, symbol)
+    path = _get_price_path(conn, symbol)
 
-    if not current_price:
+    if path is None or not len(path):
         conn.close()
         return
 
     # 그리드 레벨 생성
     levels = [round(lower + i * spacing, 2) for i in range(count + 1)]
 
-    # 현재 가격이 어느 그리드 레벨 사이인지
-    for i in range(len(levels) - 1):
-        grid_low = levels[i]
-        grid_high = levels[i + 1]
-
-        if grid_low <= current_price <= grid_high:
-            # 현재 가격이 이 구간 안에 있음
-            # 이전 체크 시 다른 구간이었다면 매매 발생
-
-            last_grid = conn.execute(
-                "SELECT grid_level FROM paper_l4_grid "
-                "WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-                (symbol,),
-            ).fetchone()
-
-            last_level = last_grid[0] if last_grid else -1
-
-            if last_level != i:
-                if last_level >= 0:
-                    if i > last_level:
-                        # 가격 상승 → 각 레벨별 SELL 기록
-                        for step in range(last_level, i):
-                            g_low = levels[step]
-                            g_high = levels[step + 1]
-                            # /count = 포트폴리오 레벨 PnL (각 그리드는 1/count 자본 사용)
-                            grid_pnl = ((g_high - g_low) / g_low * 100 - L4_FEE_RATE * 2 * 100) / count
-                            conn.execute(
-                                "INSERT INTO paper_l4_grid "
-                                "(symbol, grid_level, grid_price, side, pnl_pct, grid_config_id) "
-                                "VALUES (?, ?, ?, 'SELL', ?, ?)",
-                                (symbol, step + 1, current_price, round(grid_pnl, 4), grid_id),
-                            )
-                            if grid_pnl > 0:
-                                print(f"[Paper L4] {symbol}: SELL @ ${current_price:,.2f} "
-                                      f"| grid#{step+1} PnL={grid_pnl:+.4f}%")
-                        conn.commit()
-                    else:
-                        # 가격 하락 → 각 레벨별 BUY 기록
-                        for step in range(last_level, i, -1):
-                            conn.execute(
-                                "INSERT INTO paper_l4_grid "
-                                "(symbol, grid_level, grid_price, side, pnl_pct, grid_config_id) "
-                                "VALUES (?, ?, ?, 'BUY', 0, ?)",
-                                (symbol, step - 1, current_price, grid_id),
-                            )
-                        conn.commit()
-                else:
-                    # 초기 레벨 기록
-                    conn.execute(
-                        "INSERT INTO paper_l4_grid "
-                        "(symbol, grid_level, grid_price, side, pnl_pct, grid_config_id) "
-                        "VALUES (?, ?, ?, 'INIT', 0, ?)",
-                        (symbol, i, current_price, grid_id),
-                    )
-                    conn.commit()
-            break
+    last_grid = conn.execute(
+        "SELECT grid_level FROM paper_l4_grid "
+        "WHERE symbol = ? ORDER BY id DESC LIMIT 1",
+        (symbol,),
+    ).fetchone()
+    last_level = last_grid[0] if last_grid else -1
+
+    if last_level < 0:
+        # 초기 레벨 기록 — 가격이 그리드 범위 안에 처음 들어온 시점
+        inside = np.flatnonzero((path >= levels[0]) & (path <= levels[-1]))
+        if not len(inside):
+            conn.close()
+            return
+        init_price = float(path[inside[0]])
+        last_level = int(price_bands([init_price], levels)[0])
+        conn.execute(
+            "INSERT INTO paper_l4_grid "
+            "(symbol, grid_level, grid_price, side, pnl_pct, grid_config_id) "
+            "VALUES (?, ?, ?, 'INIT', 0, ?)",
+            (symbol, last_level, init_price, grid_id),
+        )
+        conn.commit()
+        path = path[inside[0] + 1:]
+
+    # 레벨 교차 → 상향 돌파 SELL(구간 수익), 하향 돌파 BUY
+    grid_levels, sides = grid_crossings(path, levels, last_level)
+    if len(grid_levels):
+        pnl = sell_pnl_pct(levels, L4_FEE_RATE)
+        rows = [
+            (symbol, lv, levels[lv], "SELL" if side > 0 else "BUY",
+             round(float(pnl[lv]), 4) if side > 0 else 0, grid_id)
+            for lv, side in zip(grid_levels.tolist(), sides.tolist())
+        ]
+        conn.executemany(
+            "INSERT INTO paper_l4_grid "
+            "(symbol, grid_level, grid_price, side, pnl_pct, grid_config_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+        sells = [r for r in rows if r[3] == "SELL"]
+        if sells:
+            print(f"[Paper L4] {symbol}: SELL {len(sells)}회 / BUY {len(rows) - len(sells)}회 "
+                  f"| PnL={sum(r[4] for r in sells):+.4f}%")
 
     conn.close()
 
@@ -389,6 +387,35 @@ def _process_l4_grid(symbol: str):
 # 헬퍼 함수
 # ============================
 
+def _get_price_path(conn, symbol: str) -> np.ndarray | None:
+    """지난 호출 이후 가격 경로 — 새 1분봉의 캔들 내부 경로, 1분봉이 없으면 최신 종가 1개"""
+    last_open = _l4_last_1m.get(symbol)
+    if last_open is None:
+        # 최초 호출: 과거 1분봉을 소급하지 않고 최신 봉 종가에서 시작
+        row = conn.execute(
+            "SELECT open_time, close FROM klines WHERE symbol = ? AND interval = '1m' "
+            "ORDER BY open_time DESC LIMIT 1",
+            (symbol,),
+        ).fetchone()
+        if row:
+            _l4_last_1m[symbol] = row[0]
+            return np.array([row[1]])
+    else:
+        rows = conn.execute(
+            "SELECT open_time, open, high, low, close FROM klines "
+            "WHERE symbol = ? AND interval = '1m' AND open_time > ? ORDER BY open_time",
+            (symbol, last_open),
+        ).fetchall()
+        if not rows:
+            return None
+        _l4_last_1m[symbol] = rows[-1][0]
+        _, o, h, l, c = zip(*rows)
+        return candle_paths(o, h, l, c).ravel()
+
+    current_price = _get_current_price(conn, symbol)
+    return np.array([current_price]) if current_price else None
+
+
 def _get_current_price(conn, symbol: str) -> float | None:
     """최신 종가 조회 (5분봉 우선, 일봉 폴백)"""
     row = conn.execute(
@@ -407,7 +434,7 @@ def _get_current_price(conn, symbol: str) -> float | None:
 
 def _update_summary(conn, symbol: str, pnl_pct: float):
     """일별 요약 갱신"""
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
 
     existing = conn.execute(
         "SELECT id, total_trades, wins, losses, total_pnl_pct, "
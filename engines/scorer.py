@@ -1,7 +1,8 @@
 """Engine 4: SSM+V+T 스코어링 - 5요소 복합 점수 산출"""
 import json
-import time
+import clock
 from db import get_connection
+from latest_values import get_latest, publish
 from config import SYMBOLS, LIVE_SYMBOLS
 from engines.dynamic_threshold import get_latest_threshold
 from engines.gemini_client import analyze_sentiment_majority
@@ -60,7 +61,7 @@ def _calc_single(symbol: str) -> dict:
     # LIVE_SYMBOLS만 호출 (예산 절약), 4시간 주기 캐시
     s_story_score = 0.0
     gemini_calls = 0
-    now = time.time()
+    now = clock.time()
     cached = _story_cache.get(symbol)
     cache_valid = cached and (now - cached["time"]) < _STORY_CACHE_TTL
 
@@ -147,7 +148,7 @@ def _calc_single(symbol: str) -> dict:
 
     # DB 저장
     conn = get_connection()
-    conn.execute(
+    cursor = conn.execute(
         "INSERT INTO ssm_scores "
         "(symbol, trigger_active, momentum_score, sentiment_score, story_score, "
         "value_score, total_score, direction, score_detail, gemini_calls_used) "
@@ -157,6 +158,7 @@ def _calc_single(symbol: str) -> dict:
          total_score, direction, json.dumps(detail, ensure_ascii=False),
          gemini_calls),
     )
+    publish(conn, "score", symbol, cursor.lastrowid)
     conn.commit()
     conn.close()
 
@@ -474,32 +476,11 @@ def _score_value(symbol: str) -> tuple[float, dict]:
 
 
 def get_latest_score(symbol: str = "BTCUSDT") -> dict | None:
-    """ssm_scores에서 최신 점수 조회"""
+    """최신 점수 조회 — 최신값 레지스트리 (없으면 ssm_scores)"""
     conn = get_connection()
-    row = conn.execute(
-        "SELECT trigger_active, momentum_score, sentiment_score, story_score, "
-        "value_score, total_score, direction, score_detail, gemini_calls_used, calculated_at "
-        "FROM ssm_scores WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    latest = get_latest(conn, "score", symbol)
     conn.close()
-
-    if not row:
-        return None
-
-    return {
-        "symbol": symbol,
-        "trigger_active": bool(row[0]),
-        "momentum_score": row[1],
-        "sentiment_score": row[2],
-        "story_score": row[3],
-        "value_score": row[4],
-        "total_score": row[5],
-        "direction": row[6],
-        "score_detail": json.loads(row[7]) if row[7] else {},
-        "gemini_calls_used": row[8],
-        "calculated_at": row[9],
-    }
+    return latest
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
 """Engine 5: 전략 매니저 - L1/L2/L4 상태머신 + 시그널 생성"""
 import json
-import time
-from datetime import date, datetime
+from datetime import datetime
 
+import clock
 from db import get_connection, check_data_freshness
 from config import (
     SYMBOLS,
@@ -37,7 +37,7 @@ def _run_single(symbol: str) -> dict:
     state = _get_current_state(symbol)
 
     # 일일 방향 전환 카운터 리셋
-    today = date.today().isoformat()
+    today = clock.today().isoformat()
     if state["l2_last_reset_date"] != today:
         state["l2_direction_changes_today"] = 0
         state["l2_last_reset_date"] = today
@@ -120,7 +120,7 @@ def _run_single(symbol: str) -> dict:
                             state["l2_step"] = 1
                             state["l2_entry_pct"] = pa_entry_pct
                             state["l2_direction"] = breakout["direction"]
-                            state["l2_step1_time"] = datetime.now().isoformat()
+                            state["l2_step1_time"] = clock.now().isoformat()
                             state["l2_avg_entry_price"] = breakout["price"]
                             state["l2_trailing_stop_price"] = None
                             state["l4_active"] = False
@@ -166,7 +166,7 @@ def _run_single(symbol: str) -> dict:
                                 state["l2_step"] = 1
                                 state["l2_entry_pct"] = L2_STEP1_PCT
                                 state["l2_direction"] = breakout["direction"]
-                                state["l2_step1_time"] = datetime.now().isoformat()
+                                state["l2_step1_time"] = clock.now().isoformat()
                                 state["l2_avg_entry_price"] = breakout["price"]
                                 state["l2_trailing_stop_price"] = None
                                 state["l4_active"] = False
@@ -320,7 +320,7 @@ def _progress_l2(symbol: str, state: dict, atr: dict, score: dict, grid: dict, s
         return
 
     step1_time = datetime.fromisoformat(state["l2_step1_time"])
-    elapsed = (datetime.now() - step1_time).total_seconds()
+    elapsed = (clock.now() - step1_time).total_seconds()
 
     if state["l2_step"] == 1:
         # 30분 경과 확인 (증가: 15→30분)
@@ -555,7 +555,7 @@ def _check_box_formation(symbol: str) -> bool:
                 conditions_met += 1
 
     # 조건 2: 새 청산 밀집 구간 (최근 1시간 청산 건수)
-    now_ms = int(time.time() * 1000)
+    now_ms = int(clock.time() * 1000)
     liq_count = conn.execute(
         "SELECT COUNT(*) FROM liquidations WHERE symbol = ? AND trade_time > ?",
         (symbol, now_ms - 3600_000),
@@ -732,7 +732,7 @@ def _get_current_state(symbol: str) -> dict:
         "l2_entry_pct": 0, "l2_avg_entry_price": None,
         "l2_step1_time": None, "l2_score_at_entry": None,
         "l2_trailing_stop_price": None,
-        "l2_direction_changes_today": 0, "l2_last_reset_date": date.today().isoformat(),
+        "l2_direction_changes_today": 0, "l2_last_reset_date": clock.today().isoformat(),
         "l4_active": False, "l4_grid_config_id": None,
         "macro_blocked": False, "macro_block_reason": None,
         "pending_signal": None,
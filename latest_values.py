@@ -0,0 +1,230 @@
+"""엔진 출력 최신값 레지스트리 — (엔진, 심볼)별 최신 1행
+
+ATR / Threshold / Grid / Score / MTF 엔진은 이력 테이블(append-only)에 행을 추가할 때
+publish()로 latest_values 미러 테이블(엔진, 심볼당 1행)을 같은 트랜잭션에서 갱신한다.
+get_latest()는 프로세스 내 캐시 → 미러 테이블 순으로 조회해 이력 테이블을 읽지 않는다
+(scripts/oc_* 등 다른 프로세스는 미러 테이블로 조회).
+
+캐시에는 commit된 값만 들어간다:
+- 트랜잭션 중인 연결의 조회는 캐시를 거치지 않고 미러 테이블을 직접 읽음 (자기 미commit 쓰기 포함)
+- publish()는 키를 스레드별 대기 목록에만 기록 — commit(또는 롤백)이 끝난 뒤 같은 스레드의
+  다음 조회에서 해당 키를 무효화 (자기 commit은 자기 연결의 data_version을 바꾸지 않음)
+- 다른 연결(다른 스레드 / 프로세스 / 쓰기 스레드)이 commit하면 PRAGMA data_version이 바뀜 →
+  미러 테이블의 row_id를 한 번에 읽어 캐시 항목의 row_id와 다른 키만 무효화
+  (쓰기 스레드가 수집 데이터를 계속 commit하므로 전체를 비우면 캐시가 거의 적중하지 않음)
+- 무효화 / data_version 변경마다 세대 번호 증가 — 조회 시작 후 증가했으면 읽은 값을 캐시에 넣지 않음
+  (다른 스레드가 commit 전에 읽은 값을 commit 후 캐시에 넣는 경합 방지)
+- 미러 행이 없으면 (레지스트리 도입 전 이력만 있는 경우) 이력 테이블 최신 행으로 대체
+
+백테스트에서는 ENABLED=False (BacktestContext가 패치) — 엔진 캐시 재삽입처럼 엔진을 거치지 않는
+쓰기가 있으므로 이력 테이블을 직접 조회한다.
+"""
+import json
+import threading
+
+ENABLED = True
+
+# 프로세스 내 캐시 {(엔진, 심볼): (미러 row_id, payload JSON)} — 조회마다 json.loads로 새 dict 반환 (호출부 수정 격리)
+_cache = {}
+_cache_lock = threading.Lock()
+# 무효화 세대 번호 (무효화마다 +1)
+_generation = 0
+# 스레드별 마지막 (연결, PRAGMA data_version) / publish 후 commit 대기 키 — 스레드 상주 연결 기준
+_local = threading.local()
+
+
+def _atr(symbol, row):
+    return {
+        "symbol": symbol,
+        "atr": row[0],
+        "atr_pct": row[1],
+        "stop_loss_pct": row[2],
+        "current_price": row[3],
+        "calculated_at": row[4],
+    }
+
+
+def _threshold(symbol, row):
+    return {
+        "symbol": symbol,
+        "threshold_value": row[0],
+        "liq_amount_1h": row[1],
+        "current_oi": row[2],
+        "liquidity_coeff": row[3],
+        "trigger_active": bool(row[4]),
+        "direction": row[5],
+        "calculated_at": row[6],
+    }
+
+
+def _grid(symbol, row):
+    return {
+        "id": row[0],
+        "symbol": symbol,
+        "lower_bound": row[1],
+        "upper_bound": row[2],
+        "grid_count": row[3],
+        "grid_spacing": row[4],
+        "grid_spacing_pct": row[5],
+        "spoofing_filtered": row[6],
+        "calculated_at": row[7],
+    }
+
+
+def _score(symbol, row):
+    return {
+        "symbol": symbol,
+        "trigger_active": bool(row[0]),
+        "momentum_score": row[1],
+        "sentiment_score": row[2],
+        "story_score": row[3],
+        "value_score": row[4],
+        "total_score": row[5],
+        "direction": row[6],
+        "score_detail": json.loads(row[7]) if row[7] else {},
+        "gemini_calls_used": row[8],
+        "calculated_at": row[9],
+    }
+
+
+def _mtf(symbol, row):
+    return {
+        "alignment_score": row[0],
+        "bias": row[1],
+        "pattern_1d": row[2],
+        "pattern_4h": row[3],
+        "nearest_support": row[4],
+        "nearest_resistance": row[5],
+        "detail": json.loads(row[6]) if row[6] else {},
+    }
+
+
+# 엔진별 명세 {엔진: (이력 테이블, 조회 컬럼, 행 → dict)}
+SPECS = {
+    "atr": (
+        "atr_values",
+        "atr, atr_pct, stop_loss_pct, current_price, calculated_at",
+        _atr,
+    ),
+    "threshold": (
+        "threshold_signals",
+        "threshold_value, liq_amount_1h, current_oi, liquidity_coeff, "
+        "trigger_active, direction, calculated_at",
+        _threshold,
+    ),
+    "grid": (
+        "grid_configs",
+        "id, lower_bound, upper_bound, grid_count, grid_spacing, "
+        "grid_spacing_pct, spoofing_filtered, calculated_at",
+        _grid,
+    ),
+    "score": (
+        "ssm_scores",
+        "trigger_active, momentum_score, sentiment_score, story_score, "
+        "value_score, total_score, direction, score_detail, gemini_calls_used, calculated_at",
+        _score,
+    ),
+    "mtf": (
+        "mtf_analysis",
+        "alignment_score, bias, pattern_1d, pattern_4h, "
+        "nearest_support, nearest_resistance, detail_json",
+        _mtf,
+    ),
+}
+
+
+def publish(conn, engine: str, symbol: str, row_id: int):
+    """이력 행 삽입 직후 (commit 전) 호출 — 같은 연결/트랜잭션으로 미러 행 갱신"""
+    if not ENABLED:
+        return
+    table, columns, to_dict = SPECS[engine]
+    row = conn.execute(f"SELECT {columns} FROM {table} WHERE id = ?", (row_id,)).fetchone()
+    conn.execute(
+        "INSERT OR REPLACE INTO latest_values (engine, symbol, row_id, payload) "
+        "VALUES (?, ?, ?, ?)",
+        (engine, symbol, row_id, json.dumps(to_dict(symbol, row), ensure_ascii=False)),
+    )
+    # 캐시는 commit 후 무효화 (지금 지우면 다른 스레드가 commit 전 미러 행을 다시 캐시할 수 있음)
+    _pending().add((engine, symbol))
+
+
+def get_latest(conn, engine: str, symbol: str) -> dict | None:
+    """(엔진, 심볼) 최신값 — 캐시 → 미러 테이블 → 이력 테이블 순"""
+    if ENABLED:
+        payload = _cached_payload(conn, (engine, symbol))
+        if payload is not None:
+            return json.loads(payload)
+
+    table, columns, to_dict = SPECS[engine]
+    row = conn.execute(
+        f"SELECT {columns} FROM {table} WHERE symbol = ? ORDER BY id DESC LIMIT 1",
+        (symbol,),
+    ).fetchone()
+    return to_dict(symbol, row) if row else None
+
+
+def invalidate(engine: str = None, symbol: str = None):
+    """캐시 무효화 (인자 없으면 전체) — 미러 테이블은 그대로"""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        for key in list(_cache):
+            if (engine is None or key[0] == engine) and (symbol is None or key[1] == symbol):
+                del _cache[key]
+
+
+def _cached_payload(conn, key: tuple) -> str | None:
+    """미러 payload — commit된 상태에서만 캐시 사용/저장"""
+    select = ("SELECT row_id, payload FROM latest_values WHERE engine = ? AND symbol = ?", key)
+    if conn.in_transaction:
+        # 자기 미commit 쓰기가 보이는 상태 — 캐시를 읽지도 채우지도 않음
+        row = conn.execute(*select).fetchone()
+        return row[1] if row else None
+
+    _check_data_version(conn)
+    pending = _pending()
+    if pending:
+        # publish한 트랜잭션이 끝남 (commit 또는 롤백) → 해당 키 무효화
+        for engine, symbol in list(pending):
+            invalidate(engine, symbol)
+        pending.clear()
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        generation = _generation
+    if entry is not None:
+        return entry[1]
+    row = conn.execute(*select).fetchone()
+    if not row:
+        return None
+    with _cache_lock:
+        if generation == _generation:
+            _cache[key] = row
+    return row[1]
+
+
+def _pending() -> set:
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        pending = _local.pending = set()
+    return pending
+
+
+def _check_data_version(conn):
+    # 다른 연결의 commit이 있었으면 미러 row_id가 바뀐 키만 무효화 (같은 연결의 publish는 commit 후 키 단위로)
+    global _generation
+    version = (id(getattr(conn, "_conn", conn)),
+               conn.execute("PRAGMA data_version").fetchone()[0])
+    if getattr(_local, "data_version", None) == version:
+        return
+    _local.data_version = version
+    with _cache_lock:
+        _generation += 1  # 이전 버전에서 읽은 진행 중 조회는 캐시에 넣지 않음
+        if not _cache:
+            return
+    current = dict(((engine, symbol), row_id) for engine, symbol, row_id in conn.execute(
+        "SELECT engine, symbol, row_id FROM latest_values"))
+    with _cache_lock:
+        for key, (row_id, _) in list(_cache.items()):
+            if current.get(key) != row_id:
+                del _cache[key]
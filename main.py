@@ -12,10 +12,10 @@ if sys.platform == "win32":
     sys.stderr.reconfigure(encoding="utf-8")
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from db import init_db
+from db import init_db, flush as flush_db_writes
 from config import (
     OI_INTERVAL, FUNDING_INTERVAL, LONG_SHORT_INTERVAL,
-    ORDERBOOK_INTERVAL, KLINES_DAILY_INTERVAL, KLINES_5M_INTERVAL,
+    ORDERBOOK_INTERVAL, KLINES_DAILY_INTERVAL, KLINES_5M_INTERVAL, KLINES_1M_INTERVAL,
     FEAR_GREED_INTERVAL, MACRO_CHECK_INTERVAL,
     KLINES_1W_INTERVAL, KLINES_4H_INTERVAL, KLINES_1H_INTERVAL,
     MTF_ANALYSIS_INTERVAL,
@@ -29,7 +29,7 @@ from collectors.ws_liquidation import run_liquidation_stream
 from collectors.binance_rest import (
     collect_open_interest, collect_funding_rate,
     collect_long_short_ratio, collect_orderbook_walls,
-    collect_klines, collect_klines_5m,
+    collect_klines, collect_klines_5m, collect_klines_1m,
     collect_klines_1w, collect_klines_4h, collect_klines_1h,
 )
 from collectors.arkham import collect_whale_transactions
@@ -62,6 +62,17 @@ def _run_sync(func):
     return wrapper
 
 
+def _run_in_thread(func):
+    """오래 걸리는 동기 작업을 별도 스레드에서 실행 (이벤트 루프 — 라이브 그리드 — 블로킹 방지)"""
+    async def wrapper():
+        try:
+            await asyncio.to_thread(func)
+        except Exception as e:
+            print(f"[오류] {func.__name__}: {e}")
+            traceback.print_exc()
+    return wrapper
+
+
 async def main():
     # DB 초기화
     init_db()
@@ -80,6 +91,7 @@ async def main():
     collect_orderbook_walls()
     collect_klines()
     collect_klines_5m()
+    collect_klines_1m()
     collect_klines_1w()
     collect_klines_4h()
     collect_klines_1h()
@@ -87,6 +99,8 @@ async def main():
     collect_whale_transactions()
     collect_all_onchain()
     check_upcoming_events()
+    # 수집기 쓰기는 쓰기 스레드 큐 경유 — 엔진 초기 실행 전에 기록 완료 대기
+    flush_db_writes()
     print("[Phase 1] 초기 수집 완료\n")
 
     # === Phase 2: 엔진 초기 실행 (의존성 순서) ===
@@ -121,6 +135,7 @@ async def main():
     scheduler.add_job(_run_sync(collect_orderbook_walls), "interval", seconds=ORDERBOOK_INTERVAL, id="orderbook")
     scheduler.add_job(_run_sync(collect_klines), "interval", seconds=KLINES_DAILY_INTERVAL, id="klines_daily")
     scheduler.add_job(_run_sync(collect_klines_5m), "interval", seconds=KLINES_5M_INTERVAL, id="klines_5m")
+    scheduler.add_job(_run_sync(collect_klines_1m), "interval", seconds=KLINES_1M_INTERVAL, id="klines_1m")
     scheduler.add_job(_run_sync(collect_klines_1w), "interval", seconds=KLINES_1W_INTERVAL, id="klines_1w")
     scheduler.add_job(_run_sync(collect_klines_4h), "interval", seconds=KLINES_4H_INTERVAL, id="klines_4h")
     scheduler.add_job(_run_sync(collect_klines_1h), "interval", seconds=KLINES_1H_INTERVAL, id="klines_1h")
@@ -140,13 +155,13 @@ async def main():
     scheduler.add_job(_run_sync(run_paper_trader), "interval", seconds=STRATEGY_INTERVAL, id="paper_trader")
     if LIVE_TRADING_ENABLED:
         scheduler.add_job(_run_sync(run_live_trader), "interval", seconds=GRID_V2_CYCLE_INTERVAL, id="live_trader", max_instances=1, coalesce=True)
-    scheduler.add_job(_run_sync(purge_old_data), "interval", seconds=86400, id="db_purge")
+    scheduler.add_job(_run_in_thread(purge_old_data), "interval", seconds=86400, id="db_purge")
 
     scheduler.start()
     print("[스케줄러] 가동 중")
     print("  --- Phase 1 수집 ---")
     print(f"  OI: {OI_INTERVAL//3600}h | 펀딩비: {FUNDING_INTERVAL//3600}h | 롱숏: {LONG_SHORT_INTERVAL//3600}h")
-    print(f"  오더북: {ORDERBOOK_INTERVAL//3600}h | 일봉: {KLINES_DAILY_INTERVAL//3600}h | 5분봉: {KLINES_5M_INTERVAL}s | F&G: {FEAR_GREED_INTERVAL//3600}h")
+    print(f"  오더북: {ORDERBOOK_INTERVAL//3600}h | 일봉: {KLINES_DAILY_INTERVAL//3600}h | 5분봉: {KLINES_5M_INTERVAL}s | 1분봉: {KLINES_1M_INTERVAL}s | F&G: {FEAR_GREED_INTERVAL//3600}h")
     print(f"  주봉: {KLINES_1W_INTERVAL//3600}h | 4시간봉: {KLINES_4H_INTERVAL//3600}h | 1시간봉: {KLINES_1H_INTERVAL//3600}h")
     print("  --- Phase 2 엔진 ---")
     print(f"  Threshold: {THRESHOLD_INTERVAL}s | Scorer: {SSM_SCORE_INTERVAL}s | Strategy: {STRATEGY_INTERVAL}s")
@@ -6,6 +6,18 @@ Usage:
     python run_backtest.py --download-only    # 데이터 다운로드만
     python run_backtest.py --symbol ETHUSDT   # 특정 심볼
     python run_backtest.py --csv              # CSV 리포트 내보내기
+    python run_backtest.py --event-skip       # 유휴 스텝 건너뛰기 (결과 동일)
+    python run_backtest.py --in-memory        # 메모리 DB로 실행, 종료 시 디스크 기록
+    python run_backtest.py --symbols BTCUSDT,ETHUSDT,SOLUSDT --shard  # 심볼별 병렬 실행
+    python run_backtest.py --profile          # 엔진별 실행 시간/예외/SQL 수 테이블
+    python run_backtest.py --profile-json data/profile.json  # 프로파일 JSON 저장
+    python run_backtest.py --skip-download --resume  # 중단된 실행을 마지막 체크포인트부터 재개
+    python run_backtest.py --grid-v2          # live_trader Grid V2를 SimExchange로 함께 재생
+    python run_backtest.py --monte-carlo      # 거래/일간 수익률 부트스트랩 신뢰구간 + risk-of-ruin
+    python run_backtest.py --synthetic 50 --days 730  # 합성 시장 50개 심볼로 오프라인 벤치마크
+    python run_backtest.py --variant L2_MIN_SSM_SCORE=1.0,1.5,2.0  # 한 번의 데이터 패스로 전략 변형 비교
+    python run_backtest.py --days 180 --download-only --prepare-dataset d180  # 재사용 데이터셋 생성
+    python run_backtest.py --days 30 --dataset d180  # 템플릿 사본 + 이벤트 스트림으로 즉시 시작
 """
 import sys
 import os
@@ -25,16 +37,87 @@ def main():
                         help="백테스트 기간 (일, 기본: 90)")
     parser.add_argument("--symbol", type=str, default=None,
                         help="심볼 (기본: BTCUSDT)")
+    parser.add_argument("--symbols", type=str, default=None,
+                        help="쉼표 구분 심볼 목록 (예: BTCUSDT,ETHUSDT,SOLUSDT)")
+    parser.add_argument("--shard", action="store_true",
+                        help="심볼별 워커 프로세스로 병렬 실행 (data/shards/)")
     parser.add_argument("--download-only", action="store_true",
                         help="데이터 다운로드만 실행")
     parser.add_argument("--skip-download", action="store_true",
                         help="다운로드 건너뛰기 (기존 데이터 사용)")
     parser.add_argument("--csv", action="store_true",
                         help="CSV 리포트 내보내기")
+    parser.add_argument("--event-skip", action="store_true",
+                        help="다음 엔진 실행 시점으로 바로 점프")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="backtest.db를 메모리로 복제해 실행 (결과는 종료 시 기록)")
+    parser.add_argument("--profile", action="store_true",
+                        help="엔진별 호출 수/시간(평균, p99)/예외/SQL 수 출력")
+    parser.add_argument("--profile-json", type=str, default=None,
+                        help="프로파일 결과 JSON 저장 경로 (--profile 포함)")
+    parser.add_argument("--resume", action="store_true",
+                        help="마지막 체크포인트에서 재개 (기간/심볼은 체크포인트 값 사용, --shard 미지원)")
+    parser.add_argument("--checkpoint-days", type=float, default=None,
+                        help="체크포인트 간격 (시뮬레이션 일, 0=비활성, 기본: 7)")
+    parser.add_argument("--engine-cache", action="store_true",
+                        help="ATR/Threshold/Grid/Score 출력을 이전 실행 캐시에서 재사용 (data/cache/engine_outputs.db)")
+    parser.add_argument("--grid-v2", action="store_true",
+                        help="live_trader Grid V2 루프를 SimExchange 위에서 30초 사이클로 재생")
+    parser.add_argument("--monte-carlo", action="store_true",
+                        help="리포트 후 거래 시퀀스/일간 수익률 부트스트랩 분석 (프로세스 병렬)")
+    parser.add_argument("--mc-paths", type=int, default=None,
+                        help="Monte Carlo 경로 수 (기본: BT_MC_PATHS)")
+    parser.add_argument("--liq-model", type=str, default=None,
+                        choices=["oi_delta", "poisson_burst"],
+                        help="합성 청산 모델 (기본: BT_LIQ_MODEL) — --skip-download/--synthetic이면 기존 청산 데이터 교체")
+    parser.add_argument("--synthetic", type=int, default=None, metavar="N",
+                        help="다운로드 대신 합성 심볼 N개 시장 데이터 생성 (네트워크 불필요)")
+    parser.add_argument("--variant", action="append", default=[],
+                        help="전략 변형 그리드 (KEY=v1,v2,...) 반복 지정 가능 — "
+                             "공유 엔진은 한 번만 실행하고 조합별 strategy/paper_trader 비교")
+    parser.add_argument("--prepare-dataset", type=str, default=None, metavar="NAME",
+                        help="데이터 준비 후 재사용 데이터셋 생성 (템플릿 DB + 정렬된 이벤트 스트림)")
+    parser.add_argument("--dataset", type=str, default=None, metavar="NAME",
+                        help="준비된 데이터셋으로 실행 (다운로드/스키마 생성/파싱/정렬 생략)")
     args = parser.parse_args()
 
+    variants = None
+    if args.variant:
+        if args.shard or args.resume:
+            parser.error("--variant는 --shard / --resume과 함께 사용할 수 없음")
+        from backtest.sweep import expand_grid, parse_grid
+        variants = expand_grid(parse_grid(args.variant, option="--variant"))
+
     from backtest.config_bt import BT_SYMBOLS, BT_DB_PATH
-    symbols = [args.symbol] if args.symbol else BT_SYMBOLS
+    if args.symbols:
+        symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    else:
+        symbols = [args.symbol] if args.symbol else BT_SYMBOLS
+
+    dataset_manifest = None
+    if args.dataset:
+        if args.shard or args.resume or args.synthetic or args.liq_model:
+            parser.error("--dataset은 --shard / --resume / --synthetic / --liq-model과 "
+                         "함께 사용할 수 없음")
+        from backtest.dataset import load_manifest
+        dataset_manifest = load_manifest(args.dataset)
+        if not (args.symbols or args.symbol):
+            symbols = dataset_manifest["symbols"]
+
+    synthetic_end_ts = None
+    if args.synthetic:
+        from backtest.synthetic import synthetic_symbols
+        symbols = synthetic_symbols(args.synthetic)
+
+    if args.resume:
+        # 체크포인트의 기간/심볼로 재개 (다운로드 생략 — 체크포인트 DB 사용)
+        from backtest.checkpoint import checkpoint_params
+        resume_params = checkpoint_params(BT_DB_PATH)
+        if not resume_params:
+            print("[ERROR] 체크포인트가 없습니다. --resume 없이 실행하세요.")
+            return
+        args.days, symbols = resume_params["days"], resume_params["symbols"]
+        args.skip_download = True
 
     print(f"{'='*60}")
     print(f"  BACKTEST ENGINE v1.0")
@@ -42,8 +125,23 @@ def main():
     print(f"  DB: {BT_DB_PATH}")
     print(f"{'='*60}")
 
-    # Step 1: DB 초기화 + 데이터 다운로드
-    if not args.skip_download:
+    # Step 1: DB 초기화 + 데이터 다운로드 (또는 합성 데이터 생성)
+    if args.dataset:
+        print(f"\n[1-2/4] 준비된 데이터셋 사용: {args.dataset} "
+              f"({dataset_manifest['created_at']}, 다운로드/스키마 생성 생략)")
+    elif args.synthetic and not args.resume:
+        print("\n[1-2/4] 합성 시장 데이터 생성...")
+        from backtest.synthetic import generate_market_db
+        synthetic_end_ts = time.time()
+        generate_market_db(BT_DB_PATH, symbols, days=args.days, end_ts=synthetic_end_ts)
+        if args.liq_model:
+            _replace_liquidations(symbols, args.liq_model)
+        _prepare_dataset(args.prepare_dataset)
+        if args.download_only:
+            print("\n--download-only 모드: 합성 데이터 생성 완료. 백테스트 스킵.")
+            _print_db_stats()
+            return
+    elif not args.skip_download:
         print("\n[1/4] DB 초기화...")
         from backtest.db_bt import init_backtest_db
         init_backtest_db()
@@ -60,12 +158,13 @@ def main():
         download_all(days=args.days)
 
         print("\n[2.5/4] 합성 청산 데이터 생성...")
-        generate_synthetic_liquidations(symbols)
+        generate_synthetic_liquidations(symbols, model=args.liq_model)
 
         bt_config.BT_SYMBOLS = original_symbols
 
         download_elapsed = time.time() - download_start
         print(f"\n[Download] 완료 ({download_elapsed:.1f}초)")
+        _prepare_dataset(args.prepare_dataset)
 
         if args.download_only:
             print("\n--download-only 모드: 다운로드 완료. 백테스트 스킵.")
@@ -76,17 +175,50 @@ def main():
         if not BT_DB_PATH.exists():
             print("[ERROR] backtest.db가 없습니다. --skip-download 없이 다시 실행하세요.")
             return
+        if args.liq_model and not args.resume:
+            _replace_liquidations(symbols, args.liq_model)
+        if not args.resume:
+            _prepare_dataset(args.prepare_dataset)
 
     # Step 2: 백테스트 실행
     print("\n[3/4] 백테스트 실행...")
-    from backtest.runner import run_backtest
-    results = run_backtest(days=args.days, symbols=symbols)
+    end_ts = resume_params["end_ts"] if args.resume else (synthetic_end_ts or time.time())
+    checkpoint_interval = (None if args.checkpoint_days is None
+                           else int(args.checkpoint_days * 86400))
+    symbol_dbs = None
+    if args.shard:
+        from backtest.shard import run_sharded_backtest
+        results, symbol_dbs = run_sharded_backtest(
+            days=args.days, symbols=symbols, end_ts=end_ts,
+            in_memory=args.in_memory or None,
+            event_skip=args.event_skip or None,
+        )
+    else:
+        from backtest.runner import RunOptions, run_backtest
+        results = run_backtest(days=args.days, symbols=symbols, end_ts=end_ts,
+                               options=RunOptions(
+                                   event_skip=args.event_skip or None,
+                                   in_memory=args.in_memory or None,
+                                   profile=args.profile or None,
+                                   profile_json=args.profile_json,
+                                   checkpoint_interval=checkpoint_interval,
+                                   resume=args.resume,
+                                   grid_v2=args.grid_v2 or None,
+                                   engine_cache=args.engine_cache or None,
+                                   variants=variants,
+                                   dataset=args.dataset,
+                               ))
+
+    if variants:
+        print("\n[4/4] 변형별 리포트 생성...")
+        _report_variants(results, symbols, end_ts - args.days * 86400, end_ts, args.csv)
+        _print_db_stats()
+        return
 
     # Step 3: 리포트 생성
     print("\n[4/4] 리포트 생성...")
     from backtest.report import generate_report
 
-    end_ts = time.time()
     start_ts = end_ts - (args.days * 86400)
     report = generate_report(
         symbols=symbols,
@@ -94,20 +226,69 @@ def main():
         end_ts=end_ts,
         equity_data=results,
         export_csv=args.csv,
+        symbol_dbs=symbol_dbs,
     )
 
-    _print_db_stats()
+    if args.monte_carlo:
+        from backtest.montecarlo import run_monte_carlo, print_monte_carlo
+        mc_start = time.time()
+        mc = run_monte_carlo(symbols, equity_data=results, symbol_dbs=symbol_dbs,
+                             n_paths=args.mc_paths)
+        print_monte_carlo(mc)
+        print(f"[MonteCarlo] 완료 ({time.time() - mc_start:.1f}초)")
+
+    if symbol_dbs:
+        for db_path in symbol_dbs.values():
+            _print_db_stats(db_path)
+    else:
+        _print_db_stats()
+
+
+def _report_variants(variants: dict, symbols: list, start_ts: float, end_ts: float,
+                     export_csv: bool):
+    """전략 팬아웃 결과 — 변형별 리포트 요약 + 랭킹"""
+    import contextlib
+    import io
+    from backtest.report import generate_report
+    from backtest.sweep import print_ranking, rank_results, summarize
+
+    rows = []
+    for i, (name, v) in enumerate(variants.items()):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = generate_report(symbols, start_ts, end_ts, equity_data=v["results"],
+                                     export_csv=export_csv, db_path=v["db_path"])
+        rows.append({"run_id": i, "params": v["params"], "error": None,
+                     "report": report, **summarize(report)})
+        print(f"[Fanout] {name}: PnL={rows[-1]['total_pnl']:+.2f}% → {v['db_path']}")
+    print_ranking(rank_results(rows, "total_pnl"), "total_pnl")
+
+
+def _prepare_dataset(name: str):
+    """--prepare-dataset: 현재 backtest.db로 재사용 데이터셋 생성"""
+    if not name:
+        return
+    from backtest.dataset import prepare_dataset
+    print(f"\n[2.7/4] 데이터셋 준비 ({name})...")
+    prepare_dataset(name)
+
+
+def _replace_liquidations(symbols: list, model: str):
+    """기존 DB의 청산 데이터를 지정 모델의 합성 청산으로 교체"""
+    from backtest.downloader import generate_synthetic_liquidations
+    print(f"\n[2.5/4] 합성 청산 교체 ({model})...")
+    generate_synthetic_liquidations(symbols, model=model, replace=True)
 
 
-def _print_db_stats():
+def _print_db_stats(db_path=None):
     """DB 테이블별 레코드 수 출력"""
     import sqlite3
     from backtest.config_bt import BT_DB_PATH
 
-    if not BT_DB_PATH.exists():
+    db_path = db_path or BT_DB_PATH
+    if not db_path.exists():
         return
 
-    conn = sqlite3.connect(str(BT_DB_PATH))
+    conn = sqlite3.connect(str(db_path))
     tables = [
         "klines", "oi_snapshots", "funding_rates", "long_short_ratios",
         "taker_ratio", "fear_greed", "liquidations",
@@ -117,7 +298,7 @@ def _print_db_stats():
     ]
 
     print(f"\n{'='*40}")
-    print(f"  DB Stats: backtest.db")
+    print(f"  DB Stats: {db_path.name}")
     print(f"{'='*40}")
 
     for table in tables:
@@ -0,0 +1,132 @@
+"""파라미터 스윕 CLI 엔트리포인트
+
+Usage:
+    python run_sweep.py --grid L2_MIN_SSM_SCORE=1.0,1.5,2.0 --grid GRID_COUNT_MIN=8,10
+    python run_sweep.py --grid-file sweep.json --days 30 --workers 16
+    python run_sweep.py --grid ATR_STOP_LOSS_MULTIPLIER=1.0,1.5,2.0 --rank-by sharpe --csv
+    python run_sweep.py --grid L2_MIN_SSM_SCORE=1.0,1.5,2.0 --walk-forward --days 180 --is-days 60 --oos-days 30
+    python run_sweep.py --grid-file big.json --search halving --min-days 7 --eta 3 --samples 81
+    python run_sweep.py --grid-file big.json --search hyperband --days 90
+
+grid 파일 형식 (JSON): {"L2_MIN_SSM_SCORE": [1.0, 1.5], "L2_STEP1_PCT": [0.1, 0.15]}
+합성 청산 모델도 스윕 가능: --grid BT_LIQ_MODEL=oi_delta,poisson_burst (실행별 DB 사본에서 재생성)
+기존 backtest.db를 원본으로 사용 (먼저 run_backtest.py --download-only 실행).
+--dataset NAME: 준비된 데이터셋(run_backtest.py --prepare-dataset NAME)의 템플릿/이벤트 스트림 사용.
+"""
+import sys
+import os
+import argparse
+import json
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest Parameter Sweep")
+    parser.add_argument("--grid", action="append", default=[],
+                        help="config 오버라이드 그리드 (KEY=v1,v2,...) 반복 지정 가능")
+    parser.add_argument("--grid-file", type=str, default=None,
+                        help="JSON 그리드 파일 ({KEY: [값...]})")
+    parser.add_argument("--days", type=int, default=90,
+                        help="백테스트 기간 (일, 기본: 90)")
+    parser.add_argument("--symbol", type=str, default=None,
+                        help="심볼 (기본: BTCUSDT)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--rank-by", type=str, default="total_pnl",
+                        choices=["total_pnl", "sharpe", "max_drawdown", "l2_win_rate"],
+                        help="랭킹 기준 (기본: total_pnl)")
+    parser.add_argument("--on-disk", action="store_true",
+                        help="워커를 in-memory 대신 디스크 DB 사본에서 실행")
+    parser.add_argument("--keep-dbs", action="store_true",
+                        help="실행별 DB 사본 보존 (data/sweep/)")
+    parser.add_argument("--csv", action="store_true",
+                        help="랭킹 CSV 내보내기")
+    parser.add_argument("--no-engine-cache", action="store_true",
+                        help="ATR/Threshold/Grid/Score 출력 재사용 끄기 (매 실행 전체 엔진 계산)")
+    parser.add_argument("--walk-forward", action="store_true",
+                        help="walk-forward 모드 (IS 탐색 → OOS 검증 롤링)")
+    parser.add_argument("--is-days", type=int, default=60,
+                        help="walk-forward in-sample 윈도우 (일, 기본: 60)")
+    parser.add_argument("--oos-days", type=int, default=30,
+                        help="walk-forward out-of-sample 윈도우 (일, 기본: 30)")
+    parser.add_argument("--step-days", type=int, default=None,
+                        help="walk-forward fold 전진 폭 (일, 기본: --oos-days)")
+    parser.add_argument("--dataset", type=str, default=None,
+                        help="준비된 데이터셋 이름 (run_backtest.py --prepare-dataset) — backtest.db 대신 사용")
+    parser.add_argument("--search", choices=("halving", "hyperband"), default=None,
+                        help="조기 제거 탐색: 짧은 앞부분 구간에서 시작해 상위 1/eta만 긴 구간으로 승급")
+    parser.add_argument("--eta", type=int, default=None,
+                        help="탐색 승급 비율 (기본: BT_SEARCH_ETA)")
+    parser.add_argument("--min-days", type=int, default=None,
+                        help="탐색 첫 rung 기간 (일, 기본: BT_SEARCH_MIN_DAYS)")
+    parser.add_argument("--samples", type=int, default=None,
+                        help="halving: 그리드 조합 중 무작위 표본 수")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, encoding="utf-8") as f:
+            grid.update(json.load(f))
+    from backtest.sweep import parse_grid
+    grid.update(parse_grid(args.grid))
+    if not grid:
+        parser.error("--grid 또는 --grid-file 필요")
+
+    from backtest.config_bt import BT_SYMBOLS, BT_DB_PATH
+    if not args.dataset and not BT_DB_PATH.exists():
+        print("[ERROR] backtest.db가 없습니다. run_backtest.py --download-only 먼저 실행하세요.")
+        return
+
+    symbols = [args.symbol] if args.symbol else BT_SYMBOLS
+
+    if args.walk_forward:
+        from backtest.walkforward import run_walk_forward
+        run_walk_forward(
+            grid,
+            total_days=args.days,
+            is_days=args.is_days,
+            oos_days=args.oos_days,
+            step_days=args.step_days,
+            symbols=symbols,
+            workers=args.workers,
+            rank_by=args.rank_by,
+            in_memory=not args.on_disk,
+            engine_cache=not args.no_engine_cache,
+            dataset=args.dataset,
+        )
+        return
+
+    if args.search:
+        from backtest.halving import run_hyperband, run_successive_halving
+        kwargs = dict(days=args.days, symbols=symbols, workers=args.workers,
+                      rank_by=args.rank_by, eta=args.eta, min_days=args.min_days,
+                      in_memory=not args.on_disk, engine_cache=not args.no_engine_cache,
+                      dataset=args.dataset)
+        if args.search == "halving":
+            run_successive_halving(grid, samples=args.samples, **kwargs)
+        else:
+            run_hyperband(grid, **kwargs)
+        return
+
+    from backtest.sweep import run_sweep
+    run_sweep(
+        grid,
+        days=args.days,
+        symbols=symbols,
+        workers=args.workers,
+        rank_by=args.rank_by,
+        in_memory=not args.on_disk,
+        keep_dbs=args.keep_dbs,
+        export_csv=args.csv,
+        engine_cache=not args.no_engine_cache,
+        dataset=args.dataset,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8")
 
 from db import get_connection
+from latest_values import get_latest
 from config import SYMBOLS
 
 
@@ -56,30 +57,21 @@ def analyze_symbol(conn, symbol):
         lines.append(f"  OI: {oi[0]:,.0f} {base}")
 
     # ATR
-    atr = conn.execute(
-        "SELECT atr, atr_pct, stop_loss_pct FROM atr_values WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    atr = get_latest(conn, "atr", symbol)
     if atr:
-        lines.append(f"  ATR(14d): ${atr[0]:,.0f} ({atr[1]:.2f}%) -> 스톱로스 {atr[2]:.2f}%")
+        lines.append(f"  ATR(14d): ${atr['atr']:,.0f} ({atr['atr_pct']:.2f}%) -> 스톱로스 {atr['stop_loss_pct']:.2f}%")
 
     # 임계점
-    thr = conn.execute(
-        "SELECT trigger_active, liq_amount_1h FROM threshold_signals WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    thr = get_latest(conn, "threshold", symbol)
     if thr:
-        lines.append(f"  Trigger: {'ON' if thr[0] else 'OFF'} (1h 청산: ${thr[1]:,.0f})")
+        lines.append(f"  Trigger: {'ON' if thr['trigger_active'] else 'OFF'} (1h 청산: ${thr['liq_amount_1h']:,.0f})")
 
     # SSM 점수
-    score = conn.execute(
-        "SELECT trigger_active, momentum_score, sentiment_score, story_score, "
-        "value_score, total_score, direction FROM ssm_scores WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    score = get_latest(conn, "score", symbol)
     if score:
-        lines.append(f"  SSM+V+T: {score[5]:.2f}/5.0 ({score[6]})")
-        lines.append(f"    T={'ON' if score[0] else 'OFF'} | M={score[1]:.1f} | Ss={score[2]:.1f} | Story={score[3]:.1f} | V={score[4]:.1f}")
+        lines.append(f"  SSM+V+T: {score['total_score']:.2f}/5.0 ({score['direction']})")
+        lines.append(f"    T={'ON' if score['trigger_active'] else 'OFF'} | M={score['momentum_score']:.1f} | "
+                     f"Ss={score['sentiment_score']:.1f} | Story={score['story_score']:.1f} | V={score['value_score']:.1f}")
 
     # 전략 상태
     state = conn.execute(
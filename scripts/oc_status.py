@@ -5,6 +5,7 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8")
 
 from db import get_connection
+from latest_values import get_latest
 from config import SYMBOLS
 
 
@@ -32,61 +33,42 @@ def get_symbol_status(conn, symbol):
         }
 
     # SSM+V+T 점수
-    score = conn.execute(
-        "SELECT trigger_active, momentum_score, sentiment_score, story_score, "
-        "value_score, total_score, direction, calculated_at "
-        "FROM ssm_scores WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    score = get_latest(conn, "score", symbol)
     if score:
         result["score"] = {
-            "trigger": "ON" if score[0] else "OFF",
-            "momentum": score[1], "sentiment": score[2],
-            "story": score[3], "value": score[4],
-            "total": score[5], "direction": score[6],
-            "calculated_at": score[7],
+            "trigger": "ON" if score["trigger_active"] else "OFF",
+            "momentum": score["momentum_score"], "sentiment": score["sentiment_score"],
+            "story": score["story_score"], "value": score["value_score"],
+            "total": score["total_score"], "direction": score["direction"],
+            "calculated_at": score["calculated_at"],
         }
 
     # 그리드
-    grid = conn.execute(
-        "SELECT lower_bound, upper_bound, grid_count, grid_spacing, "
-        "grid_spacing_pct, calculated_at "
-        "FROM grid_configs WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    grid = get_latest(conn, "grid", symbol)
     if grid:
         result["grid"] = {
-            "lower": grid[0], "upper": grid[1],
-            "count": grid[2], "spacing_usd": grid[3],
-            "spacing_pct": grid[4], "calculated_at": grid[5],
+            "lower": grid["lower_bound"], "upper": grid["upper_bound"],
+            "count": grid["grid_count"], "spacing_usd": grid["grid_spacing"],
+            "spacing_pct": grid["grid_spacing_pct"], "calculated_at": grid["calculated_at"],
         }
 
     # ATR
-    atr = conn.execute(
-        "SELECT atr, atr_pct, stop_loss_pct, current_price, calculated_at "
-        "FROM atr_values WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    atr = get_latest(conn, "atr", symbol)
     if atr:
         result["atr"] = {
-            "atr_usd": atr[0], "atr_pct": atr[1],
-            "stop_loss_pct": atr[2], "price": atr[3],
-            "calculated_at": atr[4],
+            "atr_usd": atr["atr"], "atr_pct": atr["atr_pct"],
+            "stop_loss_pct": atr["stop_loss_pct"], "price": atr["current_price"],
+            "calculated_at": atr["calculated_at"],
         }
 
     # 임계점
-    thr = conn.execute(
-        "SELECT trigger_active, liq_amount_1h, current_oi, threshold_value, "
-        "direction, calculated_at "
-        "FROM threshold_signals WHERE symbol=? ORDER BY id DESC LIMIT 1",
-        (symbol,),
-    ).fetchone()
+    thr = get_latest(conn, "threshold", symbol)
     if thr:
         result["threshold"] = {
-            "trigger": "ON" if thr[0] else "OFF",
-            "liq_1h_usd": thr[1], "oi": thr[2],
-            "value": thr[3], "direction": thr[4],
-            "calculated_at": thr[5],
+            "trigger": "ON" if thr["trigger_active"] else "OFF",
+            "liq_1h_usd": thr["liq_amount_1h"], "oi": thr["current_oi"],
+            "value": thr["threshold_value"], "direction": thr["direction"],
+            "calculated_at": thr["calculated_at"],
         }
 
     # 시장 데이터
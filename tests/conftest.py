@@ -0,0 +1,73 @@
+"""공용 pytest 설정 — 저장소 루트 import 경로 + 합성 백테스트 DB 픽스처"""
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+# 합성 시장 종료 시각 (고정 — 실행마다 같은 윈도우)
+SYNTH_END_TS = 1767225600.0  # 2026-01-01 00:00 UTC
+SYNTH_SYMBOL = "SYN000USDT"
+
+# 실행 시각(CURRENT_TIMESTAMP)이 기록되는 컬럼 — 실행 간 비교에서 제외
+WALL_CLOCK_COLUMNS = {"calculated_at", "created_at", "updated_at", "entry_time",
+                      "exit_time", "collected_at"}
+
+
+def pytest_configure(config):
+    # google.generativeai 지원 종료 경고 (engines.gemini_client import 시)
+    config.addinivalue_line("filterwarnings", "ignore::FutureWarning")
+
+
+@pytest.fixture(scope="session")
+def synthetic_source(tmp_path_factory) -> Path:
+    """2일 x 1심볼 합성 시장 DB (세션당 1회 생성 — 테스트는 copy_db로 사본 사용)"""
+    from backtest.synthetic import generate_market_db
+
+    path = tmp_path_factory.mktemp("synthetic") / "source.db"
+    generate_market_db(path, symbols=[SYNTH_SYMBOL], days=2, end_ts=SYNTH_END_TS, seed=3)
+    return path
+
+
+def copy_db(source: Path, target: Path) -> Path:
+    """백테스트 DB 사본 (실행이 시계열 테이블을 비우므로 실행마다 새 사본)"""
+    shutil.copy(source, target)
+    return target
+
+
+def _strip_wall_clock(value):
+    # JSON 상세 컬럼(signal_log.detail 등)에 담긴 실행 시각 키 제거
+    if isinstance(value, str) and value.startswith("{"):
+        try:
+            data = json.loads(value)
+        except ValueError:
+            return value
+        return {k: v for k, v in data.items() if k not in WALL_CLOCK_COLUMNS}
+    return value
+
+
+def table_rows(db_path: Path, table: str, symbol: str = None) -> list[tuple]:
+    """실행 시각 컬럼을 뺀 테이블 전체 행 (id 순)
+
+    symbol 지정 시 해당 심볼 행만, id / *_id(다른 테이블 행 참조) 컬럼 제외
+    (다중 심볼 DB에서는 id가 심볼 간에 섞임)
+    """
+    where, params = ("WHERE symbol = ?", (symbol,)) if symbol else ("", ())
+    conn = sqlite3.connect(str(db_path))
+    try:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                   if row[1] not in WALL_CLOCK_COLUMNS
+                   and not (symbol and (row[1] == "id" or row[1].endswith("_id")))]
+        rows = conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY id", params
+        ).fetchall()
+    finally:
+        conn.close()
+    return [tuple(_strip_wall_clock(v) for v in row) for row in rows]
@@ -0,0 +1,35 @@
+"""clone_backtest_db — 이전 실행 결과가 남은 원본에서 만든 사본도 새 실행과 동일하게 시작"""
+import contextlib
+import io
+
+from conftest import SYNTH_END_TS, SYNTH_SYMBOL, copy_db, table_rows
+
+from backtest.db_bt import OUTPUT_TABLES, clone_backtest_db
+
+COMPARED = ["atr_values", "threshold_signals", "grid_configs", "ssm_scores",
+            "strategy_state", "signal_log", "paper_trades", "paper_l4_grid"]
+
+
+def _run(db_path):
+    from backtest.runner import RunOptions, reset_engine_caches, run_backtest
+
+    reset_engine_caches()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_backtest(days=2, symbols=[SYNTH_SYMBOL], db_path=db_path, end_ts=SYNTH_END_TS,
+                     options=RunOptions(checkpoint_interval=0))
+
+
+def test_clone_of_used_base_matches_fresh_run(synthetic_source, tmp_path):
+    used = copy_db(synthetic_source, tmp_path / "used.db")
+    _run(used)  # 원본 backtest.db에서 한 번 실행한 상태
+    assert table_rows(used, "strategy_state")
+
+    clone = clone_backtest_db(used, tmp_path / "clone.db")
+    for table in OUTPUT_TABLES:
+        assert table_rows(clone, table) == []
+
+    fresh = copy_db(synthetic_source, tmp_path / "fresh.db")
+    _run(clone)
+    _run(fresh)
+    for table in COMPARED:
+        assert table_rows(clone, table) == table_rows(fresh, table), table
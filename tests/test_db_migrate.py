@@ -0,0 +1,110 @@
+"""db.migrate — 마이그레이션 도입 전(user_version 0) DB를 현재 스키마로"""
+import sqlite3
+
+import pytest
+
+import db
+
+# (ISO 시각, 기대 epoch 밀리초) — CURRENT_TIMESTAMP 형식과 isoformat() 형식
+TIMES = [
+    ("2025-06-01 12:00:00", 1748779200000),
+    ("2025-06-01T12:00:00.250000+00:00", 1748779200250),
+]
+
+
+# 도입 전 init_db가 ALTER TABLE로 나중에 추가하던 컬럼
+LEGACY_COLUMNS = [
+    ("strategy_state", "l2_trailing_stop_price"),
+    ("grid_positions", "direction"),
+    ("grid_positions", "entry_fill_price"),
+    ("grid_order_log", "direction"),
+    ("live_daily_pnl", "starting_balance"),
+]
+
+
+def _baseline_db(path, legacy_columns: bool):
+    """도입 전 init_db가 만든 DB (user_version 0)
+
+    legacy_columns=False: ALTER TABLE 컬럼이 추가되기 전 버전으로 만든 DB
+    """
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    db._create_base_schema(cursor)
+    if not legacy_columns:
+        for table, column in LEGACY_COLUMNS:
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+    for iso, _ in TIMES:
+        cursor.execute(
+            "INSERT INTO liquidations (symbol, side, price, qty, trade_time, collected_at) "
+            "VALUES ('BTCUSDT', 'SELL', 1.0, 2.0, 3, ?)", (iso,))
+        cursor.execute(
+            "INSERT INTO ssm_scores (symbol, trigger_active, momentum_score, sentiment_score, "
+            "story_score, value_score, total_score, direction, calculated_at) "
+            "VALUES ('BTCUSDT', 0, 1, 1, 1, 1, 4, 'neutral', ?)", (iso,))
+    conn.commit()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+    return conn
+
+
+def _columns(conn, table) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+
+
+def _indexes(conn) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+@pytest.mark.parametrize("legacy_columns", [False, True])
+def test_baseline_db_migrates_to_current(tmp_path, legacy_columns):
+    conn = _baseline_db(tmp_path / "old.db", legacy_columns)
+    try:
+        assert db.migrate(conn) == [v for v, _, _ in db._MIGRATIONS]
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION == 6
+
+        for table, column in LEGACY_COLUMNS:
+            assert column in _columns(conn, table)
+        for table, iso_col in db.EPOCH_COLUMNS:
+            assert db.epoch_column(iso_col) in _columns(conn, table)
+        assert {"idx_liq_collected_ms", "idx_oi_latest", "idx_oi_collected_ms",
+                "idx_ssm_calculated_ms"} <= _indexes(conn)
+        assert conn.execute("SELECT COUNT(*) FROM latest_values").fetchone()[0] == 0
+
+        # 기존 행 유지 + 생성 컬럼이 ISO 시각에서 epoch 밀리초로 계산됨
+        expected = [(iso, ms) for iso, ms in TIMES]
+        assert conn.execute(
+            "SELECT collected_at, collected_ms FROM liquidations ORDER BY id").fetchall() == expected
+        assert conn.execute(
+            "SELECT calculated_at, calculated_ms FROM ssm_scores ORDER BY id").fetchall() == expected
+
+        assert db.migrate(conn) == []  # 재실행 시 적용할 것 없음
+    finally:
+        conn.close()
+
+
+def test_failed_migration_rolls_back_version(tmp_path, monkeypatch):
+    conn = _baseline_db(tmp_path / "old.db", legacy_columns=False)
+
+    def broken(cursor):
+        cursor.execute("CREATE INDEX idx_partial ON liquidations(symbol)")
+        raise RuntimeError("boom")
+
+    migrations = db._MIGRATIONS[:2] + ((3, "실패", broken),)
+    monkeypatch.setattr(db, "_MIGRATIONS", migrations)
+    try:
+        with pytest.raises(RuntimeError):
+            db.migrate(conn)
+        # v1, v2까지 적용 — v3은 인덱스를 포함해 전체 롤백
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert "idx_partial" not in _indexes(conn)
+    finally:
+        conn.close()
+
+
+def test_newer_db_is_left_alone(tmp_path):
+    conn = sqlite3.connect(tmp_path / "new.db")
+    conn.execute(f"PRAGMA user_version = {db.SCHEMA_VERSION + 1}")
+    try:
+        assert db.migrate(conn) == []
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION + 1
+    finally:
+        conn.close()
@@ -0,0 +1,121 @@
+"""db.get_connection 스레드 상주 연결 — 핸들 수 / 중첩 핸들 트랜잭션 / GC 반납"""
+import sqlite3
+import threading
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def pool_db(tmp_path, monkeypatch):
+    path = tmp_path / "pool.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (v INTEGER)")
+    conn.commit()
+    conn.close()
+    yield path
+    db.close_connections()
+
+
+def _committed(path) -> list:
+    """다른 연결에서 본 commit된 값"""
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT v FROM t ORDER BY v")]
+    finally:
+        conn.close()
+
+
+def _slot(path) -> dict:
+    return db._local.slots[str(path)]
+
+
+def test_handles_share_connection_and_count(pool_db):
+    outer = db.get_connection()
+    inner = db.get_connection()
+    assert outer._conn is inner._conn
+    assert _slot(pool_db)["handles"] == 2
+
+    inner.close()
+    inner.close()  # 중복 close는 한 번만 반납
+    assert _slot(pool_db)["handles"] == 1
+    outer.close()
+    assert _slot(pool_db)["handles"] == 0
+    assert db.get_connection()._conn is outer._conn  # 반납 후에도 같은 연결 재사용
+
+
+def test_last_close_rolls_back_uncommitted(pool_db):
+    conn = db.get_connection()
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()
+    assert _committed(pool_db) == []
+
+
+def test_nested_close_keeps_outer_transaction(pool_db):
+    outer = db.get_connection()
+    outer.execute("INSERT INTO t VALUES (1)")
+    inner = db.get_connection()
+    inner.execute("SELECT COUNT(*) FROM t").fetchone()
+    inner.close()
+    assert outer.in_transaction  # 안쪽 반납이 바깥 작업을 롤백하지 않음
+
+    outer.commit()
+    outer.close()
+    assert _committed(pool_db) == [1]
+
+
+def test_nested_commit_with_clean_outer_commits_now(pool_db):
+    outer = db.get_connection()
+    outer.execute("SELECT COUNT(*) FROM t").fetchone()  # 읽기만 — 미commit 쓰기 없음
+    with db.get_connection() as inner:
+        inner.execute("INSERT INTO t VALUES (2)")
+    inner.close()
+    assert _committed(pool_db) == [2]  # 즉시 commit (쓰기 잠금 반납)
+    assert not outer.in_transaction
+    outer.close()
+
+
+def test_nested_commit_deferred_while_outer_has_writes(pool_db):
+    outer = db.get_connection()
+    outer.execute("INSERT INTO t VALUES (1)")
+    with db.get_connection() as inner:
+        inner.execute("INSERT INTO t VALUES (2)")
+    inner.close()
+    assert _committed(pool_db) == []  # 바깥 미commit 쓰기까지 commit하지 않음
+
+    outer.close()
+    assert _committed(pool_db) == [1, 2]  # 안쪽 commit 요청 → 반납 시 commit
+
+
+def test_nested_exception_leaves_decision_to_outer(pool_db):
+    outer = db.get_connection()
+    outer.execute("INSERT INTO t VALUES (1)")
+    with pytest.raises(ValueError):
+        with db.get_connection() as inner:
+            inner.execute("INSERT INTO t VALUES (2)")
+            raise ValueError
+    inner.close()
+    assert outer.in_transaction
+
+    outer.rollback()
+    outer.close()
+    assert _committed(pool_db) == []
+
+
+def test_release_from_other_thread_only_decrements(pool_db):
+    conn = db.get_connection()
+    conn.execute("INSERT INTO t VALUES (3)")
+    # 순환 참조 GC가 다른 스레드에서 핸들을 해제하는 경우 — 반납만, 트랜잭션은 건드리지 않음
+    thread = threading.Thread(target=conn.__del__)
+    thread.start()
+    thread.join()
+    assert _slot(pool_db)["handles"] == 0
+    assert conn._conn.in_transaction
+
+    # 소유 스레드의 다음 get_connection()에서 정리 (commit 요청 없음 → 롤백)
+    fresh = db.get_connection()
+    assert not fresh.in_transaction
+    fresh.close()
+    assert _committed(pool_db) == []
@@ -0,0 +1,97 @@
+"""db.purge_old_data — 청크 단위 보관/삭제, auto_vacuum 전환"""
+import gzip
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def live_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "trades.db")
+    monkeypatch.setattr(db, "DB_ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.setattr(db, "DB_PURGE_CHUNK_ROWS", 3)  # 여러 청크 (gzip 멤버 여러 개)
+    monkeypatch.setattr(db, "DB_PURGE_CHUNK_PAUSE", 0)
+    db.init_db()
+    yield tmp_path
+    db.close_connections()
+
+
+def _insert_liquidations(rows):
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO liquidations (symbol, side, price, qty, trade_time, collected_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def _read_archive(path) -> list:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_purge_archives_expired_rows_by_month(live_db):
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    old_jan = [("BTCUSDT", "SELL", 40000.0 + i, 0.1, i, f"2020-01-{10 + i:02d} 00:00:00")
+               for i in range(5)]
+    old_feb = [("ETHUSDT", "BUY", 2000.0 + i, 1.0, 100 + i, f"2020-02-{10 + i:02d} 12:00:00")
+               for i in range(2)]
+    recent = [("BTCUSDT", "BUY", 50000.0, 0.2, 999, now)]
+    _insert_liquidations(old_jan + old_feb + recent)
+
+    db.purge_old_data(days_short=30, days_long=90)
+
+    conn = db.get_connection()
+    remaining = conn.execute("SELECT symbol, trade_time FROM liquidations").fetchall()
+    conn.close()
+    assert remaining == [("BTCUSDT", 999)]
+
+    folder = live_db / "archive" / "liquidations"
+    assert sorted(p.name for p in folder.iterdir()) == [
+        "liquidations_2020-01.jsonl.gz", "liquidations_2020-02.jsonl.gz"]
+    jan = _read_archive(folder / "liquidations_2020-01.jsonl.gz")
+    feb = _read_archive(folder / "liquidations_2020-02.jsonl.gz")
+    # 원본 컬럼만 보관 (생성 컬럼 collected_ms 제외), 행 내용 그대로
+    assert set(jan[0]) == {"id", "symbol", "side", "price", "qty", "trade_time", "collected_at"}
+    columns = ("symbol", "side", "price", "qty", "trade_time", "collected_at")
+    assert [tuple(r[c] for c in columns) for r in jan] == old_jan
+    assert [tuple(r[c] for c in columns) for r in feb] == old_feb
+
+
+def test_purge_twice_archives_nothing_new(live_db):
+    _insert_liquidations([("BTCUSDT", "SELL", 1.0, 1.0, 1, "2020-01-01 00:00:00")])
+    db.purge_old_data()
+    db.purge_old_data()
+    rows = _read_archive(live_db / "archive" / "liquidations" / "liquidations_2020-01.jsonl.gz")
+    assert len(rows) == 1
+
+
+def test_new_db_uses_incremental_auto_vacuum(live_db):
+    conn = db.get_connection()
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.close()
+
+
+def test_existing_db_converted_only_on_request(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE legacy (v INTEGER)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db, "DB_PATH", path)
+    try:
+        db.init_db()  # 시작 시에는 VACUUM 하지 않음
+        conn = db.get_connection()
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+        conn.close()
+
+        db.enable_incremental_vacuum()
+        conn = db.get_connection()
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        conn.close()
+    finally:
+        db.close_connections()
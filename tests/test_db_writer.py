@@ -0,0 +1,130 @@
+"""db 단일 쓰기 스레드 — 기록 순서 / flush / 오류 전달 / 큐 역압"""
+import queue
+import sqlite3
+import threading
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def writer_db(tmp_path, monkeypatch):
+    path = tmp_path / "writer.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")  # 운영 DB와 동일 (쓰기 스레드 연결 생성 시 모드 전환 잠금 없음)
+    conn.execute("CREATE TABLE t (v INTEGER UNIQUE)")
+    conn.commit()
+    conn.close()
+    yield path
+    db.stop_writers()
+
+
+def _values(path) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT v FROM t ORDER BY rowid")]
+    finally:
+        conn.close()
+
+
+def test_writes_commit_in_submission_order(writer_db):
+    futures = [db.write("INSERT INTO t VALUES (?)", (i,)) for i in range(5)]
+    futures.append(db.write_many("INSERT INTO t VALUES (?)", [(i,) for i in range(5, 50)]))
+    futures.append(db.write_transaction(
+        lambda conn: conn.execute("INSERT INTO t VALUES (50)").rowcount))
+    db.flush(timeout=10)
+
+    assert all(f.done() for f in futures)  # flush 이전에 넣은 쓰기는 모두 완료
+    assert [f.result() for f in futures] == [1] * 5 + [45, 1]
+    assert _values(writer_db) == list(range(51))
+
+
+def test_failed_op_surfaces_error_without_undoing_others(writer_db):
+    ok = db.write("INSERT INTO t VALUES (1)")
+    dup = db.write("INSERT INTO t VALUES (1)")  # UNIQUE 위반
+    after = db.write("INSERT INTO t VALUES (2)")
+    db.flush(timeout=10)
+
+    assert ok.result() == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        dup.result()
+    assert after.result() == 1
+    assert _values(writer_db) == [1, 2]
+
+
+def test_write_transaction_exception_rolls_back_only_its_changes(writer_db):
+    def fn(conn):
+        conn.execute("INSERT INTO t VALUES (7)")
+        raise ValueError("boom")
+
+    before = db.write("INSERT INTO t VALUES (6)")
+    failed = db.write_transaction(fn)
+    db.flush(timeout=10)
+
+    assert before.result() == 1
+    with pytest.raises(ValueError, match="boom"):
+        failed.result()
+    assert _values(writer_db) == [6]
+
+
+def test_write_transaction_rejects_manual_rollback(writer_db):
+    future = db.write_transaction(lambda conn: conn.rollback())
+    with pytest.raises(RuntimeError):
+        future.result(timeout=10)
+
+
+def test_lock_timeout_fails_whole_batch(writer_db, monkeypatch):
+    monkeypatch.setattr(db, "DB_WRITE_BUSY_TIMEOUT", 0.1)
+    blocker = sqlite3.connect(writer_db)
+    blocker.execute("BEGIN IMMEDIATE")  # 다른 프로세스가 쓰기 잠금을 쥔 상황
+    try:
+        future = db.write("INSERT INTO t VALUES (1)")
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=10)
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert _values(writer_db) == []
+
+
+def test_non_blocking_submit_raises_when_queue_full(writer_db, monkeypatch):
+    monkeypatch.setattr(db, "DB_WRITE_QUEUE_SIZE", 1)
+    started, release = threading.Event(), threading.Event()
+
+    def hold(conn):
+        started.set()
+        release.wait(10)
+
+    busy = db.write_transaction(hold)
+    assert started.wait(10)  # 쓰기 스레드가 첫 작업을 실행 중
+    queued = db.write("INSERT INTO t VALUES (1)")  # 큐 1칸 채움
+    with pytest.raises(queue.Full):
+        db.write_many("INSERT INTO t VALUES (?)", [(2,)], block=False)
+
+    release.set()
+    db.flush(timeout=10)
+    assert busy.result() is None and queued.result() == 1
+    assert _values(writer_db) == [1]
+
+
+def test_liquidation_flush_keeps_buffer_when_queue_full(monkeypatch):
+    from collectors import ws_liquidation
+
+    def full(*args, **kwargs):
+        raise queue.Full
+
+    monkeypatch.setattr(ws_liquidation, "write_many", full)
+    monkeypatch.setattr(ws_liquidation, "_BUFFER_MAX", 3)
+    rows = [("BTCUSDT", "SELL", 1.0, 1.0, i) for i in range(5)]
+    monkeypatch.setattr(ws_liquidation, "_buffer", list(rows[:2]))
+    monkeypatch.setattr(ws_liquidation, "_last_flush", 0.0)
+
+    ws_liquidation._flush_buffer()
+    assert ws_liquidation._buffer == rows[:2]  # 다음 flush에서 재시도
+    assert ws_liquidation._last_flush == 0.0   # 재시도를 _FLUSH_INTERVAL만큼 미루지 않음
+
+    ws_liquidation._buffer.extend(rows[2:])
+    ws_liquidation._flush_buffer()
+    assert ws_liquidation._buffer == rows[2:]  # 상한 초과분(오래된 것)만 버림
@@ -0,0 +1,18 @@
+"""equity 지표 — 경계 케이스"""
+import math
+
+from backtest.equity import sortino_ratio
+
+
+def test_sortino_without_down_days_is_undefined():
+    # 손실일 없음 + 양의 평균 → 상한 없음 (0.0과 구분)
+    assert sortino_ratio([0.01, 0.02, 0.005]) is None
+
+
+def test_sortino_flat_returns_is_zero():
+    assert sortino_ratio([0.0, 0.0, 0.0]) == 0.0
+
+
+def test_sortino_with_down_days():
+    value = sortino_ratio([0.02, -0.01, 0.01, -0.02])
+    assert value is not None and math.isfinite(value)
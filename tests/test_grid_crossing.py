@@ -0,0 +1,92 @@
+"""그리드 레벨 교차 카운터 — 손으로 만든 가격 경로 (user-012)"""
+import numpy as np
+import pytest
+
+from engines.grid_crossing import candle_paths, count_crossings, grid_crossings, price_bands
+
+# 구간: 0 = [100, 110], 1 = (110, 120], 2 = (120, 130], 3 = (130, 140]
+LEVELS = [100.0, 110.0, 120.0, 130.0, 140.0]
+
+
+def _events(path, start_band):
+    levels, sides = grid_crossings(np.asarray(path, dtype=np.float64), LEVELS, start_band)
+    return levels.tolist(), sides.tolist()
+
+
+def _naive_events(path, start_band):
+    # 가격 하나씩, 구간 하나씩 이동하며 기록 (상향 a→a+1: 레벨 a+1, 하향 a→a-1: 레벨 a-1)
+    band = min(max(start_band, 0), len(LEVELS) - 2)
+    levels, sides = [], []
+    for price in path:
+        target = int(price_bands([price], LEVELS)[0])
+        while band != target:
+            side = 1 if target > band else -1
+            band += side
+            levels.append(band)
+            sides.append(side)
+    return levels, sides
+
+
+@pytest.mark.parametrize("price, band", [
+    (90.0, 0), (100.0, 0), (105.0, 0), (110.0, 0), (110.01, 1),
+    (120.0, 1), (135.0, 3), (140.0, 3), (150.0, 3),
+])
+def test_price_bands_boundaries(price, band):
+    assert price_bands([price], LEVELS).tolist() == [band]
+
+
+def test_no_crossing_inside_band():
+    assert _events([105.0, 108.0, 110.0], start_band=0) == ([], [])
+
+
+def test_touching_level_from_below_is_not_a_crossing():
+    # 110은 구간 0의 상단 (포함) — 넘어야 SELL
+    assert _events([110.0], start_band=0) == ([], [])
+    assert _events([110.0, 110.01], start_band=0) == ([1], [1])
+
+
+def test_multi_level_up_move():
+    assert _events([125.0], start_band=0) == ([1, 2], [1, 1])
+
+
+def test_multi_level_down_move():
+    assert _events([105.0], start_band=3) == ([2, 1, 0], [-1, -1, -1])
+
+
+def test_bullish_candle_round_trip():
+    # 양봉 O→L→H→C: 115 → 105 → 125 → 118
+    path = candle_paths([115.0], [125.0], [105.0], [118.0]).ravel()
+    assert path.tolist() == [115.0, 105.0, 125.0, 118.0]
+    assert _events(path, start_band=1) == ([0, 1, 2, 1], [-1, 1, 1, -1])
+
+
+def test_bearish_candle_round_trip():
+    # 음봉 O→H→L→C: 118 → 125 → 105 → 115
+    path = candle_paths([118.0], [125.0], [105.0], [115.0]).ravel()
+    assert path.tolist() == [118.0, 125.0, 105.0, 115.0]
+    assert _events(path, start_band=1) == ([2, 1, 0, 1], [1, -1, -1, 1])
+
+
+def test_out_of_range_prices_clip_to_edge_bands():
+    assert _events([150.0, 90.0], start_band=1) == ([2, 3, 2, 1, 0], [1, 1, -1, -1, -1])
+    # 범위 밖 시작 구간도 양 끝으로
+    assert _events([115.0], start_band=-1) == ([1], [1])
+    assert _events([125.0], start_band=9) == ([2], [-1])
+
+
+def test_matches_step_by_step_reference():
+    rng = np.random.default_rng(0)
+    path = 120.0 + np.cumsum(rng.normal(0, 6.0, 400))
+    assert _events(path, start_band=2) == _naive_events(path, start_band=2)
+
+
+def test_count_crossings_totals():
+    # 두 캔들: 양봉 왕복 후 음봉 왕복 (시작 구간은 첫 시가 기준 = 1)
+    result = count_crossings([115.0, 118.0], [125.0, 125.0], [105.0, 105.0],
+                             [118.0, 115.0], LEVELS, fee_rate=0.0)
+    # 양봉: BUY 0, SELL 1, SELL 2, BUY 1 / 음봉: SELL 2, BUY 1, BUY 0, SELL 1
+    assert (result["sells"], result["buys"], result["end_band"]) == (4, 4, 1)
+    assert result["sells_per_level"].tolist() == [0, 2, 2, 0, 0]
+    # 레벨 n SELL = (levels[n] - levels[n-1]) / levels[n-1] / 그리드 수
+    expected_pnl = (2 * (110 - 100) / 100 + 2 * (120 - 110) / 110) * 100 / 4
+    assert result["pnl_pct"] == pytest.approx(expected_pnl)
@@ -0,0 +1,126 @@
+"""latest_values 캐시 — commit 전 publish / 롤백 / 다른 스레드 조회"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import db
+import latest_values
+
+
+@pytest.fixture
+def registry_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "trades.db")
+    db.init_db()
+    latest_values.invalidate()
+    # 다른 스레드 — 자기 상주 연결 / data_version을 유지하도록 전용 스레드 1개
+    other = ThreadPoolExecutor(max_workers=1)
+    yield other
+    other.submit(db.close_connections).result()
+    other.shutdown()
+    db.close_connections()
+    latest_values.invalidate()
+
+
+def _insert_atr(conn, atr: float) -> int:
+    cursor = conn.execute(
+        "INSERT INTO atr_values (symbol, atr, atr_pct, stop_loss_pct, current_price) "
+        "VALUES ('BTCUSDT', ?, 1.0, 2.0, 100.0)", (atr,))
+    latest_values.publish(conn, "atr", "BTCUSDT", cursor.lastrowid)
+    return cursor.lastrowid
+
+
+def _read_atr():
+    conn = db.get_connection()
+    try:
+        latest = latest_values.get_latest(conn, "atr", "BTCUSDT")
+        return latest and latest["atr"]
+    finally:
+        conn.close()
+
+
+def _publish_committed(atr: float):
+    conn = db.get_connection()
+    _insert_atr(conn, atr)
+    conn.commit()
+    conn.close()
+
+
+def test_other_thread_read_before_commit_does_not_stick(registry_db):
+    _publish_committed(1.0)
+    assert _read_atr() == 1.0
+
+    conn = db.get_connection()
+    _insert_atr(conn, 2.0)
+    # commit 전: 다른 스레드는 commit된 값(1.0)을 읽어 캐시
+    assert registry_db.submit(_read_atr).result() == 1.0
+    assert latest_values.get_latest(conn, "atr", "BTCUSDT")["atr"] == 2.0  # 자기 미commit 쓰기
+    conn.commit()
+    conn.close()
+
+    # 발행 스레드 — 자기 commit은 data_version을 바꾸지 않지만 commit 후 무효화
+    assert _read_atr() == 2.0
+    assert registry_db.submit(_read_atr).result() == 2.0
+
+
+def test_rolled_back_publish_is_never_cached(registry_db):
+    _publish_committed(1.0)
+
+    conn = db.get_connection()
+    _insert_atr(conn, 3.0)
+    assert latest_values.get_latest(conn, "atr", "BTCUSDT")["atr"] == 3.0
+    conn.rollback()
+    conn.close()
+
+    assert _read_atr() == 1.0
+    assert registry_db.submit(_read_atr).result() == 1.0
+
+
+def test_commit_from_other_thread_invalidates_cache(registry_db):
+    _publish_committed(1.0)
+    assert _read_atr() == 1.0
+
+    registry_db.submit(_publish_committed, 4.0).result()
+    assert _read_atr() == 4.0
+
+
+def test_unrelated_commit_keeps_cache(registry_db):
+    _publish_committed(1.0)
+    assert _read_atr() == 1.0
+
+    # 쓰기 스레드의 수집 데이터 commit — data_version은 바뀌지만 미러 row_id는 그대로
+    db.write("INSERT INTO liquidations (symbol, side, price, qty, trade_time) "
+             "VALUES ('BTCUSDT', 'SELL', 1.0, 1.0, 1)").result(timeout=10)
+    db.stop_writers()
+
+    conn = db.get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        assert latest_values.get_latest(conn, "atr", "BTCUSDT")["atr"] == 1.0
+    finally:
+        conn.set_trace_callback(None)
+        conn.close()
+    # 캐시 적중 — 키 단위 payload 재조회 없음
+    assert not [s for s in statements if "SELECT row_id, payload" in s]
+
+
+class _RacingConnection:
+    """미러 SELECT 직후 다른 스레드의 무효화(commit 감지)가 끼어드는 연결"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.in_transaction = False
+
+    def execute(self, sql, *args):
+        cursor = self._conn.execute(sql, *args)
+        if "FROM latest_values" in sql:
+            latest_values.invalidate()
+        return cursor
+
+
+def test_fill_skipped_when_invalidated_during_read(registry_db):
+    _publish_committed(1.0)
+    conn = db.get_connection()
+    assert latest_values.get_latest(_RacingConnection(conn), "atr", "BTCUSDT")["atr"] == 1.0
+    conn.close()
+    assert latest_values._cache == {}  # 읽는 도중 무효화 → 읽은 값을 캐시에 넣지 않음
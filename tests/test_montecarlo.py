@@ -0,0 +1,14 @@
+"""Monte Carlo 부트스트랩 — 블록 길이 경계 케이스"""
+from backtest.montecarlo import bootstrap
+
+
+def test_block_longer_than_samples_still_spreads():
+    # 블록 >= 표본 수면 회전만 되어 모든 경로 총 PnL이 같아짐 → n // 2로 축소돼야 함
+    result = bootstrap([3.0, -1.0, -2.0, 4.0], n_paths=500, block=5, seed=1, workers=1)
+    assert result["block"] == 2
+    assert result["total_pnl"]["p5"] < result["total_pnl"]["p95"]
+
+
+def test_block_within_limit_is_kept():
+    result = bootstrap(list(range(-5, 5)), n_paths=100, block=3, seed=1, workers=1)
+    assert result["block"] == 3
@@ -0,0 +1,69 @@
+"""이벤트 스킵 모드 — 고정 스텝 루프와 같은 엔진 출력 (user-001)"""
+import contextlib
+import io
+import re
+
+import pytest
+
+from conftest import SYNTH_END_TS, SYNTH_SYMBOL, copy_db, table_rows
+
+ENGINE_TABLES = ["atr_values", "threshold_signals", "grid_configs", "ssm_scores",
+                 "strategy_state", "signal_log", "paper_trades", "paper_l4_grid"]
+
+# 모든 엔진 간격 > BT_STEP_SECONDS(300) — 기본값(strategy/paper_trader 60초)이면 매 스텝이 실행 대상이라
+# 건너뛸 스텝이 없어 두 모드가 자명하게 같아짐
+SPARSE_INTERVALS = {
+    "atr": 86400,
+    "threshold": 900,
+    "grid": 14400,
+    "score": 1800,
+    "strategy": 600,
+    "paper_trader": 600,
+}
+
+
+def _run(db_path, event_skip: bool) -> tuple[dict, str]:
+    from backtest.runner import RunOptions, reset_engine_caches, run_backtest
+
+    reset_engine_caches()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        results = run_backtest(days=2, symbols=[SYNTH_SYMBOL], db_path=db_path,
+                               end_ts=SYNTH_END_TS,
+                               options=RunOptions(event_skip=event_skip, checkpoint_interval=0))
+    return results, out.getvalue()
+
+
+@pytest.fixture(scope="module")
+def fixed_and_skipped(synthetic_source, tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("event_skip")
+    fixed_db = copy_db(synthetic_source, tmp / "fixed.db")
+    skip_db = copy_db(synthetic_source, tmp / "skip.db")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("backtest.runner.BT_ENGINE_INTERVALS", SPARSE_INTERVALS)
+        fixed, _ = _run(fixed_db, False)
+        skipped, log = _run(skip_db, True)
+
+    match = re.search(r"이벤트 스킵: ([\d,]+)/([\d,]+) 스텝 실행", log)
+    executed, total = (int(g.replace(",", "")) for g in match.groups())
+    # 실제로 스텝을 건너뛰었어야 비교가 의미 있음
+    assert executed < total
+    return (fixed_db, fixed), (skip_db, skipped)
+
+
+@pytest.mark.parametrize("table", ENGINE_TABLES)
+def test_engine_outputs_match(fixed_and_skipped, table):
+    (fixed_db, _), (skip_db, _) = fixed_and_skipped
+    assert table_rows(skip_db, table) == table_rows(fixed_db, table)
+
+
+def test_engines_ran(fixed_and_skipped):
+    (fixed_db, _), _ = fixed_and_skipped
+    assert table_rows(fixed_db, "threshold_signals")
+    assert table_rows(fixed_db, "ssm_scores")
+
+
+def test_daily_snapshots_match(fixed_and_skipped):
+    (_, fixed), (_, skipped) = fixed_and_skipped
+    assert (skipped[SYNTH_SYMBOL]["equity_snapshots"]
+            == fixed[SYNTH_SYMBOL]["equity_snapshots"])
@@ -0,0 +1,47 @@
+"""drip 재생 — 실행 구간이 데이터보다 먼저 끝나도 미래 봉이 DB에 없어야 함 (user-005 / user-020)"""
+import contextlib
+import io
+import sqlite3
+
+import pytest
+
+from conftest import SYNTH_END_TS, SYNTH_SYMBOL, copy_db, table_rows
+
+# 합성 데이터(2일)보다 하루 먼저 끝나는 1일 윈도우 — walk-forward IS 윈도우 / halving 초기 rung과 같은 상황
+WINDOW_END_TS = SYNTH_END_TS - 86400
+
+
+@pytest.fixture(scope="module")
+def early_window_db(synthetic_source, tmp_path_factory):
+    from backtest.runner import RunOptions, reset_engine_caches, run_backtest
+
+    db_path = copy_db(synthetic_source, tmp_path_factory.mktemp("lookahead") / "run.db")
+    reset_engine_caches()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_backtest(days=1, symbols=[SYNTH_SYMBOL], db_path=db_path, end_ts=WINDOW_END_TS,
+                     options=RunOptions(checkpoint_interval=0))
+    return db_path
+
+
+def test_no_unclosed_higher_timeframe_bars(early_window_db):
+    from backtest.runner import _DataFeeder
+
+    conn = sqlite3.connect(str(early_window_db))
+    try:
+        for interval, seconds in _DataFeeder.HTF_INTERVALS.items():
+            latest_close = conn.execute(
+                "SELECT MAX(open_time) / 1000.0 + ? FROM klines WHERE interval = ?",
+                (seconds, interval),
+            ).fetchone()[0]
+            if latest_close is not None:
+                assert latest_close <= WINDOW_END_TS, interval
+        latest_5m = conn.execute(
+            "SELECT MAX(open_time) / 1000.0 FROM klines WHERE interval = '5m'").fetchone()[0]
+        assert latest_5m <= WINDOW_END_TS
+    finally:
+        conn.close()
+
+
+def test_atr_uses_warmup_bars(early_window_db):
+    # 시작 전에 마감된 일봉(워밍업)은 첫 스텝에 삽입되어 ATR이 계산됨
+    assert table_rows(early_window_db, "atr_values")
@@ -0,0 +1,58 @@
+"""심볼 샤딩 — 단일 프로세스 다중 심볼 실행과 같은 결과 (user-004)"""
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from conftest import SYNTH_END_TS, copy_db, table_rows
+
+SYMBOLS = ["SYN000USDT", "SYN001USDT"]
+SYMBOL_TABLES = ["atr_values", "threshold_signals", "grid_configs", "ssm_scores",
+                 "strategy_state", "paper_trades", "paper_l4_grid"]
+
+
+@pytest.fixture(scope="module")
+def single_and_sharded(tmp_path_factory):
+    import backtest.shard as shard
+    from backtest.runner import RunOptions, reset_engine_caches, run_backtest
+    from backtest.synthetic import generate_market_db
+
+    tmp = tmp_path_factory.mktemp("shard")
+    with contextlib.redirect_stdout(io.StringIO()):
+        source = generate_market_db(tmp / "source.db", symbols=SYMBOLS, days=1,
+                                    end_ts=SYNTH_END_TS, seed=5)
+    base_db = copy_db(source, tmp / "base.db")
+
+    single_db = copy_db(source, tmp / "single.db")
+    reset_engine_caches()
+    with contextlib.redirect_stdout(io.StringIO()):
+        single = run_backtest(days=1, symbols=SYMBOLS, db_path=single_db, end_ts=SYNTH_END_TS,
+                              options=RunOptions(checkpoint_interval=0))
+
+    # 샤드 DB 위치만 임시 디렉터리로 (워커는 부모가 정한 경로를 받음)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(shard, "SHARD_DIR", tmp / "shards")
+        with contextlib.redirect_stdout(io.StringIO()):
+            sharded, shard_dbs = shard.run_sharded_backtest(
+                days=1, symbols=SYMBOLS, workers=2, end_ts=SYNTH_END_TS, base_db=base_db)
+    return single_db, single, sharded, shard_dbs
+
+
+@pytest.mark.parametrize("symbol", SYMBOLS)
+@pytest.mark.parametrize("table", SYMBOL_TABLES)
+def test_shard_tables_match_single_process(single_and_sharded, symbol, table):
+    single_db, _, _, shard_dbs = single_and_sharded
+    assert (table_rows(shard_dbs[symbol], table, symbol=symbol)
+            == table_rows(single_db, table, symbol=symbol))
+
+
+@pytest.mark.parametrize("symbol", SYMBOLS)
+def test_shard_equity_matches_single_process(single_and_sharded, symbol):
+    _, single, sharded, _ = single_and_sharded
+    assert list(sharded) == SYMBOLS
+    assert sharded[symbol]["equity_snapshots"] == single[symbol]["equity_snapshots"]
+    expected, actual = single[symbol]["equity_curve"], sharded[symbol]["equity_curve"]
+    assert set(actual) == set(expected)
+    for key in expected:
+        np.testing.assert_array_equal(actual[key], expected[key])
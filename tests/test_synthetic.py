@@ -0,0 +1,55 @@
+"""합성 시장 생성기 — 엔진이 다룰 수 있는 가격대 (엔진은 가격을 소수 2자리로 반올림)"""
+import contextlib
+import io
+import sqlite3
+
+import pytest
+
+from conftest import SYNTH_END_TS
+
+SYMBOL_COUNT = 20
+
+
+@pytest.fixture(scope="module")
+def market(tmp_path_factory):
+    from backtest.synthetic import generate_market_db, synthetic_symbols
+
+    path = tmp_path_factory.mktemp("synth_prices") / "synth.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_market_db(path, symbols=synthetic_symbols(SYMBOL_COUNT), days=2,
+                           end_ts=SYNTH_END_TS, seed=3)
+    conn = sqlite3.connect(path)
+    try:
+        lows = dict(conn.execute(
+            "SELECT symbol, MIN(low) FROM klines WHERE interval = '5m' GROUP BY symbol"))
+    finally:
+        conn.close()
+    return path, lows
+
+
+def test_no_sub_dollar_symbols(market):
+    _, lows = market
+    assert len(lows) == SYMBOL_COUNT
+    assert min(lows.values()) >= 1.0
+
+
+def test_cheapest_symbol_gets_a_real_grid(market, tmp_path):
+    from conftest import copy_db
+    from backtest.runner import RunOptions, reset_engine_caches, run_backtest
+
+    source, lows = market
+    symbol = min(lows, key=lows.get)
+    db_path = copy_db(source, tmp_path / "run.db")
+    reset_engine_caches()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_backtest(days=2, symbols=[symbol], db_path=db_path, end_ts=SYNTH_END_TS,
+                     options=RunOptions(checkpoint_interval=0))
+    conn = sqlite3.connect(db_path)
+    try:
+        grids = conn.execute(
+            "SELECT lower_bound, upper_bound, grid_spacing FROM grid_configs WHERE symbol = ?",
+            (symbol,)).fetchall()
+    finally:
+        conn.close()
+    # 소수 2자리 반올림 후에도 범위/간격이 0이 아님
+    assert grids and all(upper > lower and spacing > 0 for lower, upper, spacing in grids)